@@ -16,15 +16,29 @@
 ;   2. Initialize the SD card
 ;   3. Read descriptor block 1002 into RAM at 0x0400
 ;   4. Validate descriptor magic / version
-;   5. Copy payload block, load address, and sector count
-;   6. Read all payload sectors into RAM
-;   7. Jump to the descriptor-provided load address
+;   5. Copy payload block, load address, and sector count,
+;      or select one entry of the descriptor's entry table
+;   6. Read all payload sectors into RAM, decompressing them
+;      when the payload is compressed
+;   7. Jump to the descriptor-provided entry / load address
 ;
 ; BT1 descriptor fields used here:
 ;   0x0400..0x0402 = 'B' 'T' '1'
+;   0x0403         = flags, 0x80 = entry table present,
+;                    0x40 = LZ-compressed payload
 ;   0x0404..0x0407 = payload start block
 ;   0x0408..0x0409 = load address
 ;   0x040A..0x040B = sector count
+;   0x040D         = default entry index (table only)
+;   0x0410..0x0411 = LZ staging address (compressed only)
+;
+; With an entry table, the monitor's BOOT N request mailbox
+; (see bt1_table.asm) picks the entry. Otherwise the default
+; entry boots. A table entry that fails its CRC falls back to
+; the default entry.
+;
+; A compressed payload is loaded at its staging address and
+; then decompressed to the load address by lz_decompress.asm.
 ;
 ; Pointer convention on this CPU:
 ;   C = low byte
@@ -40,6 +54,13 @@
 ;   0x0109         = current destination high
 ;   0x010A         = successful sector-read counter used by the
 ;                    current ROM-side debug display markers
+;   0x010B..0x0114 = entry-table scratch and boot request
+;                    mailbox (bt1_table.asm)
+;   0x0115..0x011C = LZ decoder state (lz_decompress.asm)
+;   0x011E         = nonzero when the payload is compressed
+;
+; Left alone for the booted program:
+;   0x0120..0x0122 = boot argument mailbox (bt1_table.asm)
 ; ==========================================================
 
 #addr 0xC000
@@ -48,9 +69,11 @@
 JMP START
 
 #include "../libs/timing.asm"
+#include "../libs/lz_decompress.asm"
 #include "../drivers/spi_sd/SPI_init.asm"
 #include "../drivers/spi_sd/SPI_routines.asm"
 #include "../drivers/spi_sd/sd_block_io.asm"
+#include "../drivers/spi_sd/bt1_table.asm"
 
 START:
     MOV $CLK, 0xFF
@@ -111,6 +134,11 @@ START:
     SDL $A
     SDH $A
 
+    ; An entry table replaces the fixed fields below.
+    MOV $A, 0x0403
+    AND $A, 0x80
+    JNZ SELECT_TABLE_ENTRY
+
     ; Copy payload start block into the working SD block buffer.
     MOV $A, 0x0404
     MOV 0x0100, $A
@@ -148,6 +176,28 @@ START:
     OR  $A, $B
     JZ  FAIL
 
+    ; A compressed payload loads at its staging address and is
+    ; decompressed to the load address after the load phase.
+    MOV $A, 0x0403
+    AND $A, 0x40
+    MOV 0x011E, $A
+    JZ  LOAD_PHASE
+
+    MOV $A, 0x0411
+    MOV 0x0108, $A
+    MOV LZ_SRC_LO, $A
+
+    MOV $A, 0x0410
+    MOV 0x0109, $A
+    MOV LZ_SRC_HI, $A
+
+    MOV $A, 0x0104
+    MOV LZ_DST_LO, $A
+
+    MOV $A, 0x0105
+    MOV LZ_DST_HI, $A
+
+LOAD_PHASE:
     ; Marker: descriptor fields copied and load phase begins.
     MOV $A, 0x44
     SDL $A
@@ -159,6 +209,14 @@ START:
     JSR LOAD_STAGE2_N_SECTORS
     JC  FAIL
 
+    MOV $A, 0x011E
+    STC
+    CMP $A, 0x00
+    JZ  LOADED
+
+    JSR LZ_DECOMPRESS
+
+LOADED:
     ; Marker: all payload sectors loaded.
     MOV $A, 0x55
     SDL $A
@@ -170,6 +228,33 @@ START:
     JMP [$CD]
 
 
+; ----------------------------------------------------------
+; SELECT_TABLE_ENTRY
+;
+; Picks the requested entry, or the default entry when no
+; request is pending, then continues with the load phase.
+; ----------------------------------------------------------
+SELECT_TABLE_ENTRY:
+    ; Table entries are stored uncompressed.
+    MOV $A, 0x00
+    MOV 0x011E, $A
+
+    MOV $D, 0x04
+    JSR BT1_TAKE_BOOT_REQUEST
+
+    MOV $D, 0x04
+    JSR BT1_SELECT_ENTRY
+    JNC LOAD_PHASE
+
+    ; Requested entry is missing or corrupt: use the default.
+    MOV $A, 0x040D
+    MOV $D, 0x04
+    JSR BT1_SELECT_ENTRY
+    JC  FAIL
+
+    JMP LOAD_PHASE
+
+
 ; ----------------------------------------------------------
 ; LOAD_STAGE2_N_SECTORS
 ;
@@ -137,6 +137,25 @@ MON_CP_DST_HI       = 0x72B3
 MON_CP_COUNT        = 0x72B4
 MON_CP_BYTE_TMP     = 0x72B5
 
+; ---------- LOAD N / BOOT N ----------
+MON_ENTRY_INDEX     = 0x72C0
+
+; BT1 descriptor sector read by LOAD N (512 bytes).
+MON_BT1_DESC_BUF    = 0x7400
+MON_BT1_DESC_BUF_HI = 0x74
+
+; LOAD N only loads entries that start at 0x8000 or above and
+; end at 0xBF00 or below, clear of the monitor below and the
+; stack at the top of RAM.
+MON_LOAD_MIN_HI     = 0x80
+MON_LOAD_END_HI     = 0xBF
+
+; ---------- line-batched text runs ----------
+; Used by the text libraries built with --strings line.
+OLED_RUN_SRC_LO     = 0x72D0
+OLED_RUN_SRC_HI     = 0x72D1
+OLED_RUN_COUNT      = 0x72D2
+
 ; ---------- display geometry ----------
 OLED_SCREEN_W       = 128
 OLED_SCREEN_H       = 64
@@ -1,12 +1,14 @@
 ; ==========================================================
 ; oled_text_4x6.asm
 ; ==========================================================
-; Generated by make_oled_text_4x6_library.py
+; Generated by oled_font_compiler.py --font 4x6
 ; SSD1325 compact 4x6 monitor text layer.
+; Font: project compact 4x6 font table
 ;
 ; Cell size:
 ;   4 pixels wide  = 2 grouped SSD1325 columns
 ;   7 pixels tall  = 6 font rows + 1 spacer row
+;   32 columns by 9 rows, pending wrap
 ;
 ; Pixel packing for OLED_INIT / A0h = 0x52:
 ;   left pixel  -> high nibble
@@ -29,10 +31,17 @@
 ;
 ;   OLED4_DRAW_CHAR:
 ;       A = ASCII character
+;       character dispatch: tree
+;       glyph rendering: code
+;       cursor base: table
 ;
 ;   OLED4_DRAW_STRING:
 ;       CD = pointer to null-terminated RAM string
 ;       newline = 0x0A
+;       string rendering: char
+;
+;   This renderer uses fixed foreground/background bytes for
+;   monitor text output.
 ; ==========================================================
 
 ; ---------- 4x6 terminal geometry ----------
@@ -57,15 +66,18 @@ OLED4_SET_CURSOR:
     RTS
 
 OLED4_NEWLINE:
+    ; Move to column 0.
     MOV $A, 0x00
     MOV OLED_CURSOR_COL, $A
     MOV OLED4_PENDING_WRAP, $A
 
+    ; row++
     MOV $A, OLED_CURSOR_ROW
     CLC
     ADD $A, 0x01
     MOV OLED_CURSOR_ROW, $A
 
+    ; If row == OLED4_MAX_ROWS, wrap back to row 0.
     STC
     CMP $A, OLED4_MAX_ROWS
     JZ OLED4_NEWLINE_WRAP_TOP
@@ -78,6 +90,7 @@ OLED4_NEWLINE_WRAP_TOP:
     RTS
 
 OLED4_ADVANCE_CURSOR:
+    ; On the last column, set the pending wrap instead of col++.
     MOV $A, OLED_CURSOR_COL
     STC
     CMP $A, OLED4_LAST_COL
@@ -122,523 +135,528 @@ OLED4_DRAW_STRING_DONE:
 OLED4_DRAW_CHAR:
     MOV OLED_CHAR_TMP, $A
 
-    MOV $A, OLED_CHAR_TMP
     STC
-    CMP $A, 0x20       ; SPACE
-    JZ OLED4_CHAR_SPACE
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x4F       ; O
+    JC OLED4_DRAW_CHAR_GE_4F
     STC
-    CMP $A, 0x30       ; 0
-    JZ OLED4_CHAR_DIGIT_0
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x37       ; 7
+    JC OLED4_DRAW_CHAR_GE_37
     STC
-    CMP $A, 0x31       ; 1
-    JZ OLED4_CHAR_DIGIT_1
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x2B       ; +
+    JC OLED4_DRAW_CHAR_GE_2B
     STC
-    CMP $A, 0x32       ; 2
-    JZ OLED4_CHAR_DIGIT_2
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x25       ; %
+    JC OLED4_DRAW_CHAR_GE_25
     STC
-    CMP $A, 0x33       ; 3
-    JZ OLED4_CHAR_DIGIT_3
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x22       ; "
+    JC OLED4_DRAW_CHAR_GE_22
     STC
-    CMP $A, 0x34       ; 4
-    JZ OLED4_CHAR_DIGIT_4
+    CMP $A, 0x20       ; SPACE
+    JC OLED4_DRAW_CHAR_GE_20
+    JMP OLED4_CHAR_QUESTION
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_20:
     STC
-    CMP $A, 0x35       ; 5
-    JZ OLED4_CHAR_DIGIT_5
+    CMP $A, 0x21       ; !
+    JC OLED4_CHAR_EXCLAMATION
+    JMP OLED4_CHAR_SPACE
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_22:
     STC
-    CMP $A, 0x36       ; 6
-    JZ OLED4_CHAR_DIGIT_6
+    CMP $A, 0x23       ; #
+    JC OLED4_DRAW_CHAR_GE_23
+    JMP OLED4_CHAR_DOUBLE_QUOTE
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_23:
     STC
-    CMP $A, 0x37       ; 7
-    JZ OLED4_CHAR_DIGIT_7
+    CMP $A, 0x24       ; $
+    JC OLED4_CHAR_DOLLAR
+    JMP OLED4_CHAR_HASH
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_25:
     STC
-    CMP $A, 0x38       ; 8
-    JZ OLED4_CHAR_DIGIT_8
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x28       ; (
+    JC OLED4_DRAW_CHAR_GE_28
     STC
-    CMP $A, 0x39       ; 9
-    JZ OLED4_CHAR_DIGIT_9
+    CMP $A, 0x26       ; &
+    JC OLED4_DRAW_CHAR_GE_26
+    JMP OLED4_CHAR_PERCENT
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_26:
     STC
-    CMP $A, 0x41       ; A
-    JZ OLED4_CHAR_A
+    CMP $A, 0x27       ; '
+    JC OLED4_CHAR_APOSTROPHE
+    JMP OLED4_CHAR_AMPERSAND
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_28:
     STC
-    CMP $A, 0x42       ; B
-    JZ OLED4_CHAR_B
+    CMP $A, 0x29       ; )
+    JC OLED4_DRAW_CHAR_GE_29
+    JMP OLED4_CHAR_LPAREN
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_29:
     STC
-    CMP $A, 0x43       ; C
-    JZ OLED4_CHAR_C
+    CMP $A, 0x2A       ; *
+    JC OLED4_CHAR_ASTERISK
+    JMP OLED4_CHAR_RPAREN
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_2B:
     STC
-    CMP $A, 0x44       ; D
-    JZ OLED4_CHAR_D
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x31       ; 1
+    JC OLED4_DRAW_CHAR_GE_31
     STC
-    CMP $A, 0x45       ; E
-    JZ OLED4_CHAR_E
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x2E       ; .
+    JC OLED4_DRAW_CHAR_GE_2E
     STC
-    CMP $A, 0x46       ; F
-    JZ OLED4_CHAR_F
+    CMP $A, 0x2C       ; ,
+    JC OLED4_DRAW_CHAR_GE_2C
+    JMP OLED4_CHAR_PLUS
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_2C:
     STC
-    CMP $A, 0x47       ; G
-    JZ OLED4_CHAR_G
+    CMP $A, 0x2D       ; -
+    JC OLED4_CHAR_DASH
+    JMP OLED4_CHAR_COMMA
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_2E:
     STC
-    CMP $A, 0x48       ; H
-    JZ OLED4_CHAR_H
+    CMP $A, 0x2F       ; /
+    JC OLED4_DRAW_CHAR_GE_2F
+    JMP OLED4_CHAR_DOT
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_2F:
     STC
-    CMP $A, 0x49       ; I
-    JZ OLED4_CHAR_I
+    CMP $A, 0x30       ; 0
+    JC OLED4_CHAR_DIGIT_0
+    JMP OLED4_CHAR_SLASH
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_31:
     STC
-    CMP $A, 0x4A       ; J
-    JZ OLED4_CHAR_J
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x34       ; 4
+    JC OLED4_DRAW_CHAR_GE_34
     STC
-    CMP $A, 0x4B       ; K
-    JZ OLED4_CHAR_K
+    CMP $A, 0x32       ; 2
+    JC OLED4_DRAW_CHAR_GE_32
+    JMP OLED4_CHAR_DIGIT_1
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_32:
     STC
-    CMP $A, 0x4C       ; L
-    JZ OLED4_CHAR_L
+    CMP $A, 0x33       ; 3
+    JC OLED4_CHAR_DIGIT_3
+    JMP OLED4_CHAR_DIGIT_2
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_34:
     STC
-    CMP $A, 0x4D       ; M
-    JZ OLED4_CHAR_M
+    CMP $A, 0x35       ; 5
+    JC OLED4_DRAW_CHAR_GE_35
+    JMP OLED4_CHAR_DIGIT_4
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_35:
     STC
-    CMP $A, 0x4E       ; N
-    JZ OLED4_CHAR_N
+    CMP $A, 0x36       ; 6
+    JC OLED4_CHAR_DIGIT_6
+    JMP OLED4_CHAR_DIGIT_5
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_37:
     STC
-    CMP $A, 0x4F       ; O
-    JZ OLED4_CHAR_O
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x43       ; C
+    JC OLED4_DRAW_CHAR_GE_43
     STC
-    CMP $A, 0x50       ; P
-    JZ OLED4_CHAR_P
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x3D       ; =
+    JC OLED4_DRAW_CHAR_GE_3D
     STC
-    CMP $A, 0x51       ; Q
-    JZ OLED4_CHAR_Q
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x3A       ; :
+    JC OLED4_DRAW_CHAR_GE_3A
     STC
-    CMP $A, 0x52       ; R
-    JZ OLED4_CHAR_R
+    CMP $A, 0x38       ; 8
+    JC OLED4_DRAW_CHAR_GE_38
+    JMP OLED4_CHAR_DIGIT_7
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_38:
     STC
-    CMP $A, 0x53       ; S
-    JZ OLED4_CHAR_S
+    CMP $A, 0x39       ; 9
+    JC OLED4_CHAR_DIGIT_9
+    JMP OLED4_CHAR_DIGIT_8
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_3A:
     STC
-    CMP $A, 0x54       ; T
-    JZ OLED4_CHAR_T
+    CMP $A, 0x3B       ; ;
+    JC OLED4_DRAW_CHAR_GE_3B
+    JMP OLED4_CHAR_COLON
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_3B:
     STC
-    CMP $A, 0x55       ; U
-    JZ OLED4_CHAR_U
+    CMP $A, 0x3C       ; <
+    JC OLED4_CHAR_LT
+    JMP OLED4_CHAR_SEMICOLON
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_3D:
     STC
-    CMP $A, 0x56       ; V
-    JZ OLED4_CHAR_V
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x40       ; @
+    JC OLED4_DRAW_CHAR_GE_40
     STC
-    CMP $A, 0x57       ; W
-    JZ OLED4_CHAR_W
+    CMP $A, 0x3E       ; >
+    JC OLED4_DRAW_CHAR_GE_3E
+    JMP OLED4_CHAR_EQUALS
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_3E:
     STC
-    CMP $A, 0x58       ; X
-    JZ OLED4_CHAR_X
+    CMP $A, 0x3F       ; ?
+    JC OLED4_CHAR_QUESTION
+    JMP OLED4_CHAR_GT
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_40:
     STC
-    CMP $A, 0x59       ; Y
-    JZ OLED4_CHAR_Y
+    CMP $A, 0x41       ; A
+    JC OLED4_DRAW_CHAR_GE_41
+    JMP OLED4_CHAR_AT
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_41:
     STC
-    CMP $A, 0x5A       ; Z
-    JZ OLED4_CHAR_Z
+    CMP $A, 0x42       ; B
+    JC OLED4_CHAR_B
+    JMP OLED4_CHAR_A
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_43:
     STC
-    CMP $A, 0x21       ; !
-    JZ OLED4_CHAR_EXCLAMATION
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x49       ; I
+    JC OLED4_DRAW_CHAR_GE_49
     STC
-    CMP $A, 0x22       ; "
-    JZ OLED4_CHAR_DOUBLE_QUOTE
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x46       ; F
+    JC OLED4_DRAW_CHAR_GE_46
     STC
-    CMP $A, 0x23       ; #
-    JZ OLED4_CHAR_HASH
+    CMP $A, 0x44       ; D
+    JC OLED4_DRAW_CHAR_GE_44
+    JMP OLED4_CHAR_C
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_44:
     STC
-    CMP $A, 0x24       ; $
-    JZ OLED4_CHAR_DOLLAR
+    CMP $A, 0x45       ; E
+    JC OLED4_CHAR_E
+    JMP OLED4_CHAR_D
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_46:
     STC
-    CMP $A, 0x25       ; %
-    JZ OLED4_CHAR_PERCENT
+    CMP $A, 0x47       ; G
+    JC OLED4_DRAW_CHAR_GE_47
+    JMP OLED4_CHAR_F
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_47:
     STC
-    CMP $A, 0x26       ; &
-    JZ OLED4_CHAR_AMPERSAND
+    CMP $A, 0x48       ; H
+    JC OLED4_CHAR_H
+    JMP OLED4_CHAR_G
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_49:
     STC
-    CMP $A, 0x27       ; '
-    JZ OLED4_CHAR_APOSTROPHE
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x4C       ; L
+    JC OLED4_DRAW_CHAR_GE_4C
     STC
-    CMP $A, 0x28       ; (
-    JZ OLED4_CHAR_LPAREN
+    CMP $A, 0x4A       ; J
+    JC OLED4_DRAW_CHAR_GE_4A
+    JMP OLED4_CHAR_I
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_4A:
     STC
-    CMP $A, 0x29       ; )
-    JZ OLED4_CHAR_RPAREN
+    CMP $A, 0x4B       ; K
+    JC OLED4_CHAR_K
+    JMP OLED4_CHAR_J
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_4C:
     STC
-    CMP $A, 0x2A       ; *
-    JZ OLED4_CHAR_ASTERISK
+    CMP $A, 0x4D       ; M
+    JC OLED4_DRAW_CHAR_GE_4D
+    JMP OLED4_CHAR_L
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_4D:
     STC
-    CMP $A, 0x2B       ; +
-    JZ OLED4_CHAR_PLUS
+    CMP $A, 0x4E       ; N
+    JC OLED4_CHAR_N
+    JMP OLED4_CHAR_M
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_4F:
     STC
-    CMP $A, 0x2C       ; ,
-    JZ OLED4_CHAR_COMMA
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x67       ; g
+    JC OLED4_DRAW_CHAR_GE_67
     STC
-    CMP $A, 0x2D       ; -
-    JZ OLED4_CHAR_DASH
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x5B       ; [
+    JC OLED4_DRAW_CHAR_GE_5B
     STC
-    CMP $A, 0x2E       ; .
-    JZ OLED4_CHAR_DOT
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x55       ; U
+    JC OLED4_DRAW_CHAR_GE_55
     STC
-    CMP $A, 0x2F       ; /
-    JZ OLED4_CHAR_SLASH
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x52       ; R
+    JC OLED4_DRAW_CHAR_GE_52
     STC
-    CMP $A, 0x3A       ; :
-    JZ OLED4_CHAR_COLON
+    CMP $A, 0x50       ; P
+    JC OLED4_DRAW_CHAR_GE_50
+    JMP OLED4_CHAR_O
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_50:
     STC
-    CMP $A, 0x3B       ; ;
-    JZ OLED4_CHAR_SEMICOLON
+    CMP $A, 0x51       ; Q
+    JC OLED4_CHAR_Q
+    JMP OLED4_CHAR_P
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_52:
     STC
-    CMP $A, 0x3C       ; <
-    JZ OLED4_CHAR_LT
+    CMP $A, 0x53       ; S
+    JC OLED4_DRAW_CHAR_GE_53
+    JMP OLED4_CHAR_R
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_53:
     STC
-    CMP $A, 0x3D       ; =
-    JZ OLED4_CHAR_EQUALS
+    CMP $A, 0x54       ; T
+    JC OLED4_CHAR_T
+    JMP OLED4_CHAR_S
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_55:
     STC
-    CMP $A, 0x3E       ; >
-    JZ OLED4_CHAR_GT
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x58       ; X
+    JC OLED4_DRAW_CHAR_GE_58
     STC
-    CMP $A, 0x3F       ; ?
-    JZ OLED4_CHAR_QUESTION
+    CMP $A, 0x56       ; V
+    JC OLED4_DRAW_CHAR_GE_56
+    JMP OLED4_CHAR_U
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_56:
     STC
-    CMP $A, 0x40       ; @
-    JZ OLED4_CHAR_AT
+    CMP $A, 0x57       ; W
+    JC OLED4_CHAR_W
+    JMP OLED4_CHAR_V
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_58:
     STC
-    CMP $A, 0x5B       ; [
-    JZ OLED4_CHAR_LBRACKET
+    CMP $A, 0x59       ; Y
+    JC OLED4_DRAW_CHAR_GE_59
+    JMP OLED4_CHAR_X
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_59:
     STC
-    CMP $A, 0x5C       ; \
-    JZ OLED4_CHAR_BACKSLASH
+    CMP $A, 0x5A       ; Z
+    JC OLED4_CHAR_Z
+    JMP OLED4_CHAR_Y
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_5B:
     STC
-    CMP $A, 0x5D       ; ]
-    JZ OLED4_CHAR_RBRACKET
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x61       ; a
+    JC OLED4_DRAW_CHAR_GE_61
     STC
     CMP $A, 0x5E       ; ^
-    JZ OLED4_CHAR_CARET
-
-    MOV $A, OLED_CHAR_TMP
-    STC
-    CMP $A, 0x5F       ; _
-    JZ OLED4_CHAR_UNDERSCORE
-
-    MOV $A, OLED_CHAR_TMP
-    STC
-    CMP $A, 0x60       ; `
-    JZ OLED4_CHAR_BACKTICK
-
-    MOV $A, OLED_CHAR_TMP
+    JC OLED4_DRAW_CHAR_GE_5E
     STC
-    CMP $A, 0x7B       ; {
-    JZ OLED4_CHAR_LBRACE
+    CMP $A, 0x5C       ; \
+    JC OLED4_DRAW_CHAR_GE_5C
+    JMP OLED4_CHAR_LBRACKET
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_5C:
     STC
-    CMP $A, 0x7C       ; |
-    JZ OLED4_CHAR_PIPE
+    CMP $A, 0x5D       ; ]
+    JC OLED4_CHAR_RBRACKET
+    JMP OLED4_CHAR_BACKSLASH
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_5E:
     STC
-    CMP $A, 0x7D       ; }
-    JZ OLED4_CHAR_RBRACE
+    CMP $A, 0x5F       ; _
+    JC OLED4_DRAW_CHAR_GE_5F
+    JMP OLED4_CHAR_CARET
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_5F:
     STC
-    CMP $A, 0x7E       ; ~
-    JZ OLED4_CHAR_TILDE
+    CMP $A, 0x60       ; `
+    JC OLED4_CHAR_BACKTICK
+    JMP OLED4_CHAR_UNDERSCORE
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_61:
     STC
-    CMP $A, 0x61       ; a
-    JZ OLED4_CHAR_A
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x64       ; d
+    JC OLED4_DRAW_CHAR_GE_64
     STC
     CMP $A, 0x62       ; b
-    JZ OLED4_CHAR_B
+    JC OLED4_DRAW_CHAR_GE_62
+    JMP OLED4_CHAR_A
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_62:
     STC
     CMP $A, 0x63       ; c
-    JZ OLED4_CHAR_C
-
-    MOV $A, OLED_CHAR_TMP
-    STC
-    CMP $A, 0x64       ; d
-    JZ OLED4_CHAR_D
+    JC OLED4_CHAR_C
+    JMP OLED4_CHAR_B
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_64:
     STC
     CMP $A, 0x65       ; e
-    JZ OLED4_CHAR_E
+    JC OLED4_DRAW_CHAR_GE_65
+    JMP OLED4_CHAR_D
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_65:
     STC
     CMP $A, 0x66       ; f
-    JZ OLED4_CHAR_F
+    JC OLED4_CHAR_F
+    JMP OLED4_CHAR_E
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_67:
     STC
-    CMP $A, 0x67       ; g
-    JZ OLED4_CHAR_G
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x73       ; s
+    JC OLED4_DRAW_CHAR_GE_73
+    STC
+    CMP $A, 0x6D       ; m
+    JC OLED4_DRAW_CHAR_GE_6D
+    STC
+    CMP $A, 0x6A       ; j
+    JC OLED4_DRAW_CHAR_GE_6A
     STC
     CMP $A, 0x68       ; h
-    JZ OLED4_CHAR_H
+    JC OLED4_DRAW_CHAR_GE_68
+    JMP OLED4_CHAR_G
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_68:
     STC
     CMP $A, 0x69       ; i
-    JZ OLED4_CHAR_I
-
-    MOV $A, OLED_CHAR_TMP
-    STC
-    CMP $A, 0x6A       ; j
-    JZ OLED4_CHAR_J
+    JC OLED4_CHAR_I
+    JMP OLED4_CHAR_H
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_6A:
     STC
     CMP $A, 0x6B       ; k
-    JZ OLED4_CHAR_K
+    JC OLED4_DRAW_CHAR_GE_6B
+    JMP OLED4_CHAR_J
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_6B:
     STC
     CMP $A, 0x6C       ; l
-    JZ OLED4_CHAR_L
+    JC OLED4_CHAR_L
+    JMP OLED4_CHAR_K
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_6D:
     STC
-    CMP $A, 0x6D       ; m
-    JZ OLED4_CHAR_M
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x70       ; p
+    JC OLED4_DRAW_CHAR_GE_70
     STC
     CMP $A, 0x6E       ; n
-    JZ OLED4_CHAR_N
+    JC OLED4_DRAW_CHAR_GE_6E
+    JMP OLED4_CHAR_M
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_6E:
     STC
     CMP $A, 0x6F       ; o
-    JZ OLED4_CHAR_O
+    JC OLED4_CHAR_O
+    JMP OLED4_CHAR_N
 
-    MOV $A, OLED_CHAR_TMP
-    STC
-    CMP $A, 0x70       ; p
-    JZ OLED4_CHAR_P
-
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_70:
     STC
     CMP $A, 0x71       ; q
-    JZ OLED4_CHAR_Q
+    JC OLED4_DRAW_CHAR_GE_71
+    JMP OLED4_CHAR_P
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_71:
     STC
     CMP $A, 0x72       ; r
-    JZ OLED4_CHAR_R
+    JC OLED4_CHAR_R
+    JMP OLED4_CHAR_Q
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_73:
     STC
-    CMP $A, 0x73       ; s
-    JZ OLED4_CHAR_S
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x79       ; y
+    JC OLED4_DRAW_CHAR_GE_79
+    STC
+    CMP $A, 0x76       ; v
+    JC OLED4_DRAW_CHAR_GE_76
     STC
     CMP $A, 0x74       ; t
-    JZ OLED4_CHAR_T
+    JC OLED4_DRAW_CHAR_GE_74
+    JMP OLED4_CHAR_S
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_74:
     STC
     CMP $A, 0x75       ; u
-    JZ OLED4_CHAR_U
-
-    MOV $A, OLED_CHAR_TMP
-    STC
-    CMP $A, 0x76       ; v
-    JZ OLED4_CHAR_V
+    JC OLED4_CHAR_U
+    JMP OLED4_CHAR_T
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_76:
     STC
     CMP $A, 0x77       ; w
-    JZ OLED4_CHAR_W
+    JC OLED4_DRAW_CHAR_GE_77
+    JMP OLED4_CHAR_V
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_77:
     STC
     CMP $A, 0x78       ; x
-    JZ OLED4_CHAR_X
+    JC OLED4_CHAR_X
+    JMP OLED4_CHAR_W
 
-    MOV $A, OLED_CHAR_TMP
+OLED4_DRAW_CHAR_GE_79:
     STC
-    CMP $A, 0x79       ; y
-    JZ OLED4_CHAR_Y
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x7C       ; |
+    JC OLED4_DRAW_CHAR_GE_7C
     STC
     CMP $A, 0x7A       ; z
-    JZ OLED4_CHAR_Z
+    JC OLED4_DRAW_CHAR_GE_7A
+    JMP OLED4_CHAR_Y
 
-    JMP OLED4_CHAR_QUESTION
-
-OLED4_COMPUTE_CURSOR_BASE:
-    ; base grouped column = origin_x + col * 2
-    MOV $A, OLED_TEXT_ORIGIN_X
-    MOV $B, OLED_CURSOR_COL
-
-OLED4_CURSOR_X_LOOP:
+OLED4_DRAW_CHAR_GE_7A:
     STC
-    CMP $B, 0x00
-    JZ OLED4_CURSOR_X_DONE
-
-    CLC
-    ADD $A, 0x02
+    CMP $A, 0x7B       ; {
+    JC OLED4_CHAR_LBRACE
+    JMP OLED4_CHAR_Z
 
+OLED4_DRAW_CHAR_GE_7C:
     STC
-    SUB $B, 0x01
-    JMP OLED4_CURSOR_X_LOOP
-
-OLED4_CURSOR_X_DONE:
-    MOV OLED_GLYPH_BASE_X, $A
-
-    ; base row = origin_y + row * 7
-    MOV $A, OLED_TEXT_ORIGIN_Y
-    MOV $B, OLED_CURSOR_ROW
+    CMP $A, 0x7E       ; ~
+    JC OLED4_DRAW_CHAR_GE_7E
+    STC
+    CMP $A, 0x7D       ; }
+    JC OLED4_CHAR_RBRACE
+    JMP OLED4_CHAR_PIPE
 
-OLED4_CURSOR_Y_LOOP:
+OLED4_DRAW_CHAR_GE_7E:
     STC
-    CMP $B, 0x00
-    JZ OLED4_CURSOR_Y_DONE
+    CMP $A, 0x7F
+    JC OLED4_CHAR_QUESTION
+    JMP OLED4_CHAR_TILDE
 
-    CLC
-    ADD $A, 0x07
+OLED4_COMPUTE_CURSOR_BASE:
+    ; CD is the caller's string pointer.
+    PSH $C
+    PSH $D
 
-    STC
-    SUB $B, 0x01
-    JMP OLED4_CURSOR_Y_LOOP
+    ; base grouped column = origin_x + OLED4_CURSOR_X_TABLE[col]
+    MOV $C, (OLED4_CURSOR_X_TABLE & 0xFF)
+    MOV $D, (OLED4_CURSOR_X_TABLE >> 8)
+    CLC
+    ADD $C, OLED_CURSOR_COL
+    ADD $D, 0x00
+    MOV $A, [$CD]
+    CLC
+    ADD $A, OLED_TEXT_ORIGIN_X
+    MOV OLED_GLYPH_BASE_X, $A
 
-OLED4_CURSOR_Y_DONE:
+    ; base row = origin_y + OLED4_CURSOR_Y_TABLE[row]
+    MOV $C, (OLED4_CURSOR_Y_TABLE & 0xFF)
+    MOV $D, (OLED4_CURSOR_Y_TABLE >> 8)
+    CLC
+    ADD $C, OLED_CURSOR_ROW
+    ADD $D, 0x00
+    MOV $A, [$CD]
+    CLC
+    ADD $A, OLED_TEXT_ORIGIN_Y
     MOV OLED_GLYPH_BASE_Y, $A
+
+    PUL $D
+    PUL $C
     RTS
 
+; col * 2, cols 0..31
+OLED4_CURSOR_X_TABLE:
+    #d8 0x00, 0x02, 0x04, 0x06, 0x08, 0x0A, 0x0C, 0x0E
+    #d8 0x10, 0x12, 0x14, 0x16, 0x18, 0x1A, 0x1C, 0x1E
+    #d8 0x20, 0x22, 0x24, 0x26, 0x28, 0x2A, 0x2C, 0x2E
+    #d8 0x30, 0x32, 0x34, 0x36, 0x38, 0x3A, 0x3C, 0x3E
+
+; row * 7, rows 0..8
+OLED4_CURSOR_Y_TABLE:
+    #d8 0x00, 0x07, 0x0E, 0x15, 0x1C, 0x23, 0x2A, 0x31
+    #d8 0x38
+
 OLED4_RENDER_BEGIN:
     JSR OLED4_COMPUTE_CURSOR_BASE
 
@@ -660,6 +678,7 @@ OLED4_RENDER_BEGIN:
     ADD $A, 0x06
     OLC $A
 
+    ; begin GDDRAM burst
     MOV $A, 0x5C
     OLC $A
     RTS
@@ -1,12 +1,14 @@
 ; ==========================================================
 ; oled_text_5x7.asm
 ; ==========================================================
-; Generated by make_oled_text_5x7_library.py
+; Generated by oled_font_compiler.py --font 5x7
 ; SSD1325 5x7 monitor text layer.
+; Font: Adafruit_GFX glcdfont.c fixed-space ASCII font table
 ;
 ; Cell size:
 ;   6 pixels wide  = 3 grouped SSD1325 columns
 ;   8 pixels tall  = 8 font rows
+;   21 columns by 8 rows, immediate wrap
 ;
 ; Pixel packing for OLED_INIT / A0h = 0x52:
 ;   left pixel  -> high nibble
@@ -16,6 +18,7 @@
 ;   OLED5_SET_CURSOR
 ;   OLED5_DRAW_CHAR
 ;   OLED5_DRAW_STRING
+;   OLED5_PUTC
 ;
 ; Calling convention:
 ;   OLED5_SET_CURSOR:
@@ -24,15 +27,25 @@
 ;
 ;   OLED5_DRAW_CHAR:
 ;       A = ASCII character
+;       character dispatch: tree
+;       glyph rendering: code
+;       cursor base: table
 ;
 ;   OLED5_DRAW_STRING:
 ;       CD = pointer to null-terminated RAM string
 ;       newline = 0x0A
+;       string rendering: char
 ;
 ;   This renderer uses fixed foreground/background bytes for
 ;   monitor text output.
 ; ==========================================================
 
+; ---------- 5x7 terminal geometry ----------
+; OLED5_MAX_COLS and the rest are in oled_constants.asm.
+OLED5_CELL_BYTES       = 0x03
+OLED5_CELL_H           = 0x08
+OLED5_SAFE_MAX_RAW_ROW = 0x3F
+
 OLED5_SET_CURSOR:
     ; in: A = col, B = row
     MOV OLED_CURSOR_COL, $A
@@ -134,524 +147,523 @@ OLED5_DRAW_STRING_DONE:
 OLED5_DRAW_CHAR:
     MOV OLED_CHAR_TMP, $A
 
-    MOV $A, OLED_CHAR_TMP
     STC
-    CMP $A, 0x20       ; SPACE
-    JZ OLED5_CHAR_SPACE
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x50       ; P
+    JC OLED5_DRAW_CHAR_GE_50
     STC
-    CMP $A, 0x30       ; 0
-    JZ OLED5_CHAR_DIGIT_0
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x38       ; 8
+    JC OLED5_DRAW_CHAR_GE_38
     STC
-    CMP $A, 0x31       ; 1
-    JZ OLED5_CHAR_DIGIT_1
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x2C       ; ,
+    JC OLED5_DRAW_CHAR_GE_2C
     STC
-    CMP $A, 0x32       ; 2
-    JZ OLED5_CHAR_DIGIT_2
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x26       ; &
+    JC OLED5_DRAW_CHAR_GE_26
     STC
-    CMP $A, 0x33       ; 3
-    JZ OLED5_CHAR_DIGIT_3
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x23       ; #
+    JC OLED5_DRAW_CHAR_GE_23
     STC
-    CMP $A, 0x34       ; 4
-    JZ OLED5_CHAR_DIGIT_4
+    CMP $A, 0x21       ; !
+    JC OLED5_DRAW_CHAR_GE_21
+    JMP OLED5_CHAR_SPACE
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_21:
     STC
-    CMP $A, 0x35       ; 5
-    JZ OLED5_CHAR_DIGIT_5
+    CMP $A, 0x22       ; "
+    JC OLED5_CHAR_DOUBLE_QUOTE
+    JMP OLED5_CHAR_EXCLAMATION
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_23:
     STC
-    CMP $A, 0x36       ; 6
-    JZ OLED5_CHAR_DIGIT_6
+    CMP $A, 0x24       ; $
+    JC OLED5_DRAW_CHAR_GE_24
+    JMP OLED5_CHAR_HASH
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_24:
     STC
-    CMP $A, 0x37       ; 7
-    JZ OLED5_CHAR_DIGIT_7
+    CMP $A, 0x25       ; %
+    JC OLED5_CHAR_PERCENT
+    JMP OLED5_CHAR_DOLLAR
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_26:
     STC
-    CMP $A, 0x38       ; 8
-    JZ OLED5_CHAR_DIGIT_8
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x29       ; )
+    JC OLED5_DRAW_CHAR_GE_29
     STC
-    CMP $A, 0x39       ; 9
-    JZ OLED5_CHAR_DIGIT_9
+    CMP $A, 0x27       ; '
+    JC OLED5_DRAW_CHAR_GE_27
+    JMP OLED5_CHAR_AMPERSAND
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_27:
     STC
-    CMP $A, 0x41       ; A
-    JZ OLED5_CHAR_A
+    CMP $A, 0x28       ; (
+    JC OLED5_CHAR_LPAREN
+    JMP OLED5_CHAR_APOSTROPHE
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_29:
     STC
-    CMP $A, 0x42       ; B
-    JZ OLED5_CHAR_B
+    CMP $A, 0x2A       ; *
+    JC OLED5_DRAW_CHAR_GE_2A
+    JMP OLED5_CHAR_RPAREN
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_2A:
     STC
-    CMP $A, 0x43       ; C
-    JZ OLED5_CHAR_C
+    CMP $A, 0x2B       ; +
+    JC OLED5_CHAR_PLUS
+    JMP OLED5_CHAR_ASTERISK
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_2C:
     STC
-    CMP $A, 0x44       ; D
-    JZ OLED5_CHAR_D
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x32       ; 2
+    JC OLED5_DRAW_CHAR_GE_32
     STC
-    CMP $A, 0x45       ; E
-    JZ OLED5_CHAR_E
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x2F       ; /
+    JC OLED5_DRAW_CHAR_GE_2F
     STC
-    CMP $A, 0x46       ; F
-    JZ OLED5_CHAR_F
+    CMP $A, 0x2D       ; -
+    JC OLED5_DRAW_CHAR_GE_2D
+    JMP OLED5_CHAR_COMMA
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_2D:
     STC
-    CMP $A, 0x47       ; G
-    JZ OLED5_CHAR_G
+    CMP $A, 0x2E       ; .
+    JC OLED5_CHAR_DOT
+    JMP OLED5_CHAR_DASH
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_2F:
     STC
-    CMP $A, 0x48       ; H
-    JZ OLED5_CHAR_H
+    CMP $A, 0x30       ; 0
+    JC OLED5_DRAW_CHAR_GE_30
+    JMP OLED5_CHAR_SLASH
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_30:
     STC
-    CMP $A, 0x49       ; I
-    JZ OLED5_CHAR_I
+    CMP $A, 0x31       ; 1
+    JC OLED5_CHAR_DIGIT_1
+    JMP OLED5_CHAR_DIGIT_0
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_32:
     STC
-    CMP $A, 0x4A       ; J
-    JZ OLED5_CHAR_J
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x35       ; 5
+    JC OLED5_DRAW_CHAR_GE_35
     STC
-    CMP $A, 0x4B       ; K
-    JZ OLED5_CHAR_K
+    CMP $A, 0x33       ; 3
+    JC OLED5_DRAW_CHAR_GE_33
+    JMP OLED5_CHAR_DIGIT_2
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_33:
     STC
-    CMP $A, 0x4C       ; L
-    JZ OLED5_CHAR_L
+    CMP $A, 0x34       ; 4
+    JC OLED5_CHAR_DIGIT_4
+    JMP OLED5_CHAR_DIGIT_3
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_35:
     STC
-    CMP $A, 0x4D       ; M
-    JZ OLED5_CHAR_M
+    CMP $A, 0x36       ; 6
+    JC OLED5_DRAW_CHAR_GE_36
+    JMP OLED5_CHAR_DIGIT_5
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_36:
     STC
-    CMP $A, 0x4E       ; N
-    JZ OLED5_CHAR_N
+    CMP $A, 0x37       ; 7
+    JC OLED5_CHAR_DIGIT_7
+    JMP OLED5_CHAR_DIGIT_6
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_38:
     STC
-    CMP $A, 0x4F       ; O
-    JZ OLED5_CHAR_O
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x44       ; D
+    JC OLED5_DRAW_CHAR_GE_44
     STC
-    CMP $A, 0x50       ; P
-    JZ OLED5_CHAR_P
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x3E       ; >
+    JC OLED5_DRAW_CHAR_GE_3E
     STC
-    CMP $A, 0x51       ; Q
-    JZ OLED5_CHAR_Q
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x3B       ; ;
+    JC OLED5_DRAW_CHAR_GE_3B
     STC
-    CMP $A, 0x52       ; R
-    JZ OLED5_CHAR_R
+    CMP $A, 0x39       ; 9
+    JC OLED5_DRAW_CHAR_GE_39
+    JMP OLED5_CHAR_DIGIT_8
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_39:
     STC
-    CMP $A, 0x53       ; S
-    JZ OLED5_CHAR_S
+    CMP $A, 0x3A       ; :
+    JC OLED5_CHAR_COLON
+    JMP OLED5_CHAR_DIGIT_9
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_3B:
     STC
-    CMP $A, 0x54       ; T
-    JZ OLED5_CHAR_T
+    CMP $A, 0x3C       ; <
+    JC OLED5_DRAW_CHAR_GE_3C
+    JMP OLED5_CHAR_SEMICOLON
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_3C:
     STC
-    CMP $A, 0x55       ; U
-    JZ OLED5_CHAR_U
+    CMP $A, 0x3D       ; =
+    JC OLED5_CHAR_EQUALS
+    JMP OLED5_CHAR_LT
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_3E:
     STC
-    CMP $A, 0x56       ; V
-    JZ OLED5_CHAR_V
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x41       ; A
+    JC OLED5_DRAW_CHAR_GE_41
     STC
-    CMP $A, 0x57       ; W
-    JZ OLED5_CHAR_W
+    CMP $A, 0x3F       ; ?
+    JC OLED5_DRAW_CHAR_GE_3F
+    JMP OLED5_CHAR_GT
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_3F:
     STC
-    CMP $A, 0x58       ; X
-    JZ OLED5_CHAR_X
+    CMP $A, 0x40       ; @
+    JC OLED5_CHAR_AT
+    JMP OLED5_CHAR_QUESTION
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_41:
     STC
-    CMP $A, 0x59       ; Y
-    JZ OLED5_CHAR_Y
+    CMP $A, 0x42       ; B
+    JC OLED5_DRAW_CHAR_GE_42
+    JMP OLED5_CHAR_A
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_42:
     STC
-    CMP $A, 0x5A       ; Z
-    JZ OLED5_CHAR_Z
+    CMP $A, 0x43       ; C
+    JC OLED5_CHAR_C
+    JMP OLED5_CHAR_B
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_44:
     STC
-    CMP $A, 0x3D       ; =
-    JZ OLED5_CHAR_EQUALS
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x4A       ; J
+    JC OLED5_DRAW_CHAR_GE_4A
     STC
-    CMP $A, 0x24       ; $
-    JZ OLED5_CHAR_DOLLAR
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x47       ; G
+    JC OLED5_DRAW_CHAR_GE_47
     STC
-    CMP $A, 0x3E       ; >
-    JZ OLED5_CHAR_GT
+    CMP $A, 0x45       ; E
+    JC OLED5_DRAW_CHAR_GE_45
+    JMP OLED5_CHAR_D
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_45:
     STC
-    CMP $A, 0x3A       ; :
-    JZ OLED5_CHAR_COLON
+    CMP $A, 0x46       ; F
+    JC OLED5_CHAR_F
+    JMP OLED5_CHAR_E
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_47:
     STC
-    CMP $A, 0x2D       ; -
-    JZ OLED5_CHAR_DASH
+    CMP $A, 0x48       ; H
+    JC OLED5_DRAW_CHAR_GE_48
+    JMP OLED5_CHAR_G
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_48:
     STC
-    CMP $A, 0x5F       ; _
-    JZ OLED5_CHAR_UNDERSCORE
+    CMP $A, 0x49       ; I
+    JC OLED5_CHAR_I
+    JMP OLED5_CHAR_H
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_4A:
     STC
-    CMP $A, 0x2E       ; .
-    JZ OLED5_CHAR_DOT
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x4D       ; M
+    JC OLED5_DRAW_CHAR_GE_4D
     STC
-    CMP $A, 0x2F       ; /
-    JZ OLED5_CHAR_SLASH
+    CMP $A, 0x4B       ; K
+    JC OLED5_DRAW_CHAR_GE_4B
+    JMP OLED5_CHAR_J
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_4B:
     STC
-    CMP $A, 0x61       ; a
-    JZ OLED5_CHAR_LOWER_A
+    CMP $A, 0x4C       ; L
+    JC OLED5_CHAR_L
+    JMP OLED5_CHAR_K
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_4D:
     STC
-    CMP $A, 0x62       ; b
-    JZ OLED5_CHAR_LOWER_B
+    CMP $A, 0x4E       ; N
+    JC OLED5_DRAW_CHAR_GE_4E
+    JMP OLED5_CHAR_M
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_4E:
     STC
-    CMP $A, 0x63       ; c
-    JZ OLED5_CHAR_LOWER_C
+    CMP $A, 0x4F       ; O
+    JC OLED5_CHAR_O
+    JMP OLED5_CHAR_N
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_50:
     STC
-    CMP $A, 0x64       ; d
-    JZ OLED5_CHAR_LOWER_D
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x68       ; h
+    JC OLED5_DRAW_CHAR_GE_68
     STC
-    CMP $A, 0x65       ; e
-    JZ OLED5_CHAR_LOWER_E
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x5C       ; \
+    JC OLED5_DRAW_CHAR_GE_5C
     STC
-    CMP $A, 0x66       ; f
-    JZ OLED5_CHAR_LOWER_F
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x56       ; V
+    JC OLED5_DRAW_CHAR_GE_56
     STC
-    CMP $A, 0x67       ; g
-    JZ OLED5_CHAR_LOWER_G
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x53       ; S
+    JC OLED5_DRAW_CHAR_GE_53
     STC
-    CMP $A, 0x68       ; h
-    JZ OLED5_CHAR_LOWER_H
+    CMP $A, 0x51       ; Q
+    JC OLED5_DRAW_CHAR_GE_51
+    JMP OLED5_CHAR_P
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_51:
     STC
-    CMP $A, 0x69       ; i
-    JZ OLED5_CHAR_LOWER_I
+    CMP $A, 0x52       ; R
+    JC OLED5_CHAR_R
+    JMP OLED5_CHAR_Q
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_53:
     STC
-    CMP $A, 0x6A       ; j
-    JZ OLED5_CHAR_LOWER_J
+    CMP $A, 0x54       ; T
+    JC OLED5_DRAW_CHAR_GE_54
+    JMP OLED5_CHAR_S
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_54:
     STC
-    CMP $A, 0x6B       ; k
-    JZ OLED5_CHAR_LOWER_K
+    CMP $A, 0x55       ; U
+    JC OLED5_CHAR_U
+    JMP OLED5_CHAR_T
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_56:
     STC
-    CMP $A, 0x6C       ; l
-    JZ OLED5_CHAR_LOWER_L
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x59       ; Y
+    JC OLED5_DRAW_CHAR_GE_59
     STC
-    CMP $A, 0x6D       ; m
-    JZ OLED5_CHAR_LOWER_M
+    CMP $A, 0x57       ; W
+    JC OLED5_DRAW_CHAR_GE_57
+    JMP OLED5_CHAR_V
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_57:
     STC
-    CMP $A, 0x6E       ; n
-    JZ OLED5_CHAR_LOWER_N
+    CMP $A, 0x58       ; X
+    JC OLED5_CHAR_X
+    JMP OLED5_CHAR_W
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_59:
     STC
-    CMP $A, 0x6F       ; o
-    JZ OLED5_CHAR_LOWER_O
+    CMP $A, 0x5A       ; Z
+    JC OLED5_DRAW_CHAR_GE_5A
+    JMP OLED5_CHAR_Y
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_5A:
     STC
-    CMP $A, 0x70       ; p
-    JZ OLED5_CHAR_LOWER_P
+    CMP $A, 0x5B       ; [
+    JC OLED5_CHAR_LBRACKET
+    JMP OLED5_CHAR_Z
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_5C:
     STC
-    CMP $A, 0x71       ; q
-    JZ OLED5_CHAR_LOWER_Q
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x62       ; b
+    JC OLED5_DRAW_CHAR_GE_62
     STC
-    CMP $A, 0x72       ; r
-    JZ OLED5_CHAR_LOWER_R
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x5F       ; _
+    JC OLED5_DRAW_CHAR_GE_5F
     STC
-    CMP $A, 0x73       ; s
-    JZ OLED5_CHAR_LOWER_S
+    CMP $A, 0x5D       ; ]
+    JC OLED5_DRAW_CHAR_GE_5D
+    JMP OLED5_CHAR_BACKSLASH
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_5D:
     STC
-    CMP $A, 0x74       ; t
-    JZ OLED5_CHAR_LOWER_T
+    CMP $A, 0x5E       ; ^
+    JC OLED5_CHAR_CARET
+    JMP OLED5_CHAR_RBRACKET
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_5F:
     STC
-    CMP $A, 0x75       ; u
-    JZ OLED5_CHAR_LOWER_U
+    CMP $A, 0x60       ; `
+    JC OLED5_DRAW_CHAR_GE_60
+    JMP OLED5_CHAR_UNDERSCORE
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_60:
     STC
-    CMP $A, 0x76       ; v
-    JZ OLED5_CHAR_LOWER_V
+    CMP $A, 0x61       ; a
+    JC OLED5_CHAR_LOWER_A
+    JMP OLED5_CHAR_BACKTICK
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_62:
     STC
-    CMP $A, 0x77       ; w
-    JZ OLED5_CHAR_LOWER_W
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x65       ; e
+    JC OLED5_DRAW_CHAR_GE_65
     STC
-    CMP $A, 0x78       ; x
-    JZ OLED5_CHAR_LOWER_X
+    CMP $A, 0x63       ; c
+    JC OLED5_DRAW_CHAR_GE_63
+    JMP OLED5_CHAR_LOWER_B
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_63:
     STC
-    CMP $A, 0x79       ; y
-    JZ OLED5_CHAR_LOWER_Y
+    CMP $A, 0x64       ; d
+    JC OLED5_CHAR_LOWER_D
+    JMP OLED5_CHAR_LOWER_C
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_65:
     STC
-    CMP $A, 0x7A       ; z
-    JZ OLED5_CHAR_LOWER_Z
+    CMP $A, 0x66       ; f
+    JC OLED5_DRAW_CHAR_GE_66
+    JMP OLED5_CHAR_LOWER_E
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_66:
     STC
-    CMP $A, 0x21       ; !
-    JZ OLED5_CHAR_EXCLAMATION
+    CMP $A, 0x67       ; g
+    JC OLED5_CHAR_LOWER_G
+    JMP OLED5_CHAR_LOWER_F
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_68:
     STC
-    CMP $A, 0x22       ; "
-    JZ OLED5_CHAR_DOUBLE_QUOTE
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x74       ; t
+    JC OLED5_DRAW_CHAR_GE_74
     STC
-    CMP $A, 0x23       ; #
-    JZ OLED5_CHAR_HASH
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x6E       ; n
+    JC OLED5_DRAW_CHAR_GE_6E
     STC
-    CMP $A, 0x25       ; %
-    JZ OLED5_CHAR_PERCENT
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x6B       ; k
+    JC OLED5_DRAW_CHAR_GE_6B
     STC
-    CMP $A, 0x26       ; &
-    JZ OLED5_CHAR_AMPERSAND
+    CMP $A, 0x69       ; i
+    JC OLED5_DRAW_CHAR_GE_69
+    JMP OLED5_CHAR_LOWER_H
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_69:
     STC
-    CMP $A, 0x27       ; '
-    JZ OLED5_CHAR_APOSTROPHE
+    CMP $A, 0x6A       ; j
+    JC OLED5_CHAR_LOWER_J
+    JMP OLED5_CHAR_LOWER_I
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_6B:
     STC
-    CMP $A, 0x28       ; (
-    JZ OLED5_CHAR_LPAREN
+    CMP $A, 0x6C       ; l
+    JC OLED5_DRAW_CHAR_GE_6C
+    JMP OLED5_CHAR_LOWER_K
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_6C:
     STC
-    CMP $A, 0x29       ; )
-    JZ OLED5_CHAR_RPAREN
+    CMP $A, 0x6D       ; m
+    JC OLED5_CHAR_LOWER_M
+    JMP OLED5_CHAR_LOWER_L
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_6E:
     STC
-    CMP $A, 0x2A       ; *
-    JZ OLED5_CHAR_ASTERISK
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x71       ; q
+    JC OLED5_DRAW_CHAR_GE_71
     STC
-    CMP $A, 0x2B       ; +
-    JZ OLED5_CHAR_PLUS
+    CMP $A, 0x6F       ; o
+    JC OLED5_DRAW_CHAR_GE_6F
+    JMP OLED5_CHAR_LOWER_N
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_6F:
     STC
-    CMP $A, 0x2C       ; ,
-    JZ OLED5_CHAR_COMMA
+    CMP $A, 0x70       ; p
+    JC OLED5_CHAR_LOWER_P
+    JMP OLED5_CHAR_LOWER_O
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_71:
     STC
-    CMP $A, 0x3B       ; ;
-    JZ OLED5_CHAR_SEMICOLON
+    CMP $A, 0x72       ; r
+    JC OLED5_DRAW_CHAR_GE_72
+    JMP OLED5_CHAR_LOWER_Q
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_72:
     STC
-    CMP $A, 0x3C       ; <
-    JZ OLED5_CHAR_LT
+    CMP $A, 0x73       ; s
+    JC OLED5_CHAR_LOWER_S
+    JMP OLED5_CHAR_LOWER_R
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_74:
     STC
-    CMP $A, 0x3F       ; ?
-    JZ OLED5_CHAR_QUESTION
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x7A       ; z
+    JC OLED5_DRAW_CHAR_GE_7A
     STC
-    CMP $A, 0x40       ; @
-    JZ OLED5_CHAR_AT
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x77       ; w
+    JC OLED5_DRAW_CHAR_GE_77
     STC
-    CMP $A, 0x5B       ; [
-    JZ OLED5_CHAR_LBRACKET
+    CMP $A, 0x75       ; u
+    JC OLED5_DRAW_CHAR_GE_75
+    JMP OLED5_CHAR_LOWER_T
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_75:
     STC
-    CMP $A, 0x5C       ; \
-    JZ OLED5_CHAR_BACKSLASH
+    CMP $A, 0x76       ; v
+    JC OLED5_CHAR_LOWER_V
+    JMP OLED5_CHAR_LOWER_U
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_77:
     STC
-    CMP $A, 0x5D       ; ]
-    JZ OLED5_CHAR_RBRACKET
+    CMP $A, 0x78       ; x
+    JC OLED5_DRAW_CHAR_GE_78
+    JMP OLED5_CHAR_LOWER_W
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_78:
     STC
-    CMP $A, 0x5E       ; ^
-    JZ OLED5_CHAR_CARET
+    CMP $A, 0x79       ; y
+    JC OLED5_CHAR_LOWER_Y
+    JMP OLED5_CHAR_LOWER_X
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_7A:
     STC
-    CMP $A, 0x60       ; `
-    JZ OLED5_CHAR_BACKTICK
-
-    MOV $A, OLED_CHAR_TMP
+    CMP $A, 0x7D       ; }
+    JC OLED5_DRAW_CHAR_GE_7D
     STC
     CMP $A, 0x7B       ; {
-    JZ OLED5_CHAR_LBRACE
+    JC OLED5_DRAW_CHAR_GE_7B
+    JMP OLED5_CHAR_LOWER_Z
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_7B:
     STC
     CMP $A, 0x7C       ; |
-    JZ OLED5_CHAR_PIPE
-
-    MOV $A, OLED_CHAR_TMP
-    STC
-    CMP $A, 0x7D       ; }
-    JZ OLED5_CHAR_RBRACE
+    JC OLED5_CHAR_PIPE
+    JMP OLED5_CHAR_LBRACE
 
-    MOV $A, OLED_CHAR_TMP
+OLED5_DRAW_CHAR_GE_7D:
     STC
     CMP $A, 0x7E       ; ~
-    JZ OLED5_CHAR_TILDE
+    JC OLED5_DRAW_CHAR_GE_7E
+    JMP OLED5_CHAR_RBRACE
 
-    ; Unsupported character: draw a space-sized blank cell.
-    JMP OLED5_CHAR_SPACE
+OLED5_DRAW_CHAR_GE_7E:
+    STC
+    CMP $A, 0x7F
+    JC OLED5_CHAR_SPACE
+    JMP OLED5_CHAR_TILDE
 
 OLED5_COMPUTE_CURSOR_BASE:
-    ; base grouped column = origin_x + col * 3
-    MOV $A, OLED_TEXT_ORIGIN_X
-    MOV $B, OLED_CURSOR_COL
-
-OLED5_CURSOR_X_LOOP:
-    STC
-    CMP $B, 0x00
-    JZ OLED5_CURSOR_X_DONE
+    ; CD is the caller's string pointer.
+    PSH $C
+    PSH $D
 
+    ; base grouped column = origin_x + OLED5_CURSOR_X_TABLE[col]
+    MOV $C, (OLED5_CURSOR_X_TABLE & 0xFF)
+    MOV $D, (OLED5_CURSOR_X_TABLE >> 8)
     CLC
-    ADD $A, 0x03
-
-    STC
-    SUB $B, 0x01
-    JMP OLED5_CURSOR_X_LOOP
-
-OLED5_CURSOR_X_DONE:
+    ADD $C, OLED_CURSOR_COL
+    ADD $D, 0x00
+    MOV $A, [$CD]
+    CLC
+    ADD $A, OLED_TEXT_ORIGIN_X
     MOV OLED_GLYPH_BASE_X, $A
 
-    ; base row = origin_y + row * 8
-    MOV $A, OLED_TEXT_ORIGIN_Y
-    MOV $B, OLED_CURSOR_ROW
-
-OLED5_CURSOR_Y_LOOP:
-    STC
-    CMP $B, 0x00
-    JZ OLED5_CURSOR_Y_DONE
-
+    ; base row = origin_y + OLED5_CURSOR_Y_TABLE[row]
+    MOV $C, (OLED5_CURSOR_Y_TABLE & 0xFF)
+    MOV $D, (OLED5_CURSOR_Y_TABLE >> 8)
     CLC
-    ADD $A, 0x08
-
-    STC
-    SUB $B, 0x01
-    JMP OLED5_CURSOR_Y_LOOP
-
-OLED5_CURSOR_Y_DONE:
+    ADD $C, OLED_CURSOR_ROW
+    ADD $D, 0x00
+    MOV $A, [$CD]
+    CLC
+    ADD $A, OLED_TEXT_ORIGIN_Y
     MOV OLED_GLYPH_BASE_Y, $A
+
+    PUL $D
+    PUL $C
     RTS
 
+; col * 3, cols 0..20
+OLED5_CURSOR_X_TABLE:
+    #d8 0x00, 0x03, 0x06, 0x09, 0x0C, 0x0F, 0x12, 0x15
+    #d8 0x18, 0x1B, 0x1E, 0x21, 0x24, 0x27, 0x2A, 0x2D
+    #d8 0x30, 0x33, 0x36, 0x39, 0x3C
+
+; row * 8, rows 0..7
+OLED5_CURSOR_Y_TABLE:
+    #d8 0x00, 0x08, 0x10, 0x18, 0x20, 0x28, 0x30, 0x38
+
 OLED5_RENDER_BEGIN:
     JSR OLED5_COMPUTE_CURSOR_BASE
 
@@ -5841,7 +5853,7 @@ OLED5_CLEAR_TEXT_SCREEN:
     OLC $A
     MOV $A, 0x00
     OLC $A
-    MOV $A, 0x3F
+    MOV $A, OLED5_SAFE_MAX_RAW_ROW
     OLC $A
 
     MOV $A, 0x5C
@@ -5927,51 +5939,31 @@ OLED5_CLEAR_CURRENT_CELL_DIRECT:
     PSH $B
     PSH $D
 
-    MOV $A, OLED_CURSOR_COL
-    MOV $B, $A
-    CLC
-    ADD $A, $B
-    CLC
-    ADD $A, $B
-    CLC
-    ADD $A, OLED_TEXT_ORIGIN_X
-    MOV OLED_WIN_COL_START, $A
-    CLC
-    ADD $A, 0x02
-    MOV OLED_WIN_COL_END, $A
-
-    MOV $A, OLED_CURSOR_ROW
-    LSL $A
-    LSL $A
-    LSL $A
-    CLC
-    ADD $A, OLED_TEXT_ORIGIN_Y
-    MOV OLED_WIN_ROW_START, $A
-    CLC
-    ADD $A, 0x07
-    MOV OLED_WIN_ROW_END, $A
+    JSR OLED5_COMPUTE_CURSOR_BASE
 
     MOV $A, 0x15
     OLC $A
-    MOV $A, OLED_WIN_COL_START
+    MOV $A, OLED_GLYPH_BASE_X
     OLC $A
-    MOV $A, OLED_WIN_COL_END
+    CLC
+    ADD $A, 0x02
     OLC $A
 
     MOV $A, 0x75
     OLC $A
-    MOV $A, OLED_WIN_ROW_START
+    MOV $A, OLED_GLYPH_BASE_Y
     OLC $A
-    MOV $A, OLED_WIN_ROW_END
+    CLC
+    ADD $A, 0x07
     OLC $A
 
     MOV $A, 0x5C
     OLC $A
     MOV $A, 0x00
-    MOV $D, 0x08
+    MOV $D, OLED5_CELL_H
 
 .OLED5_CLEAR_CELL_ROW:
-    MOV $B, 0x03
+    MOV $B, OLED5_CELL_BYTES
 
 .OLED5_CLEAR_CELL_COL:
     OLD $A
@@ -5993,51 +5985,31 @@ OLED5_DRAW_CURRENT_CELL_BLOCK_DIRECT:
     PSH $B
     PSH $D
 
-    MOV $A, OLED_CURSOR_COL
-    MOV $B, $A
-    CLC
-    ADD $A, $B
-    CLC
-    ADD $A, $B
-    CLC
-    ADD $A, OLED_TEXT_ORIGIN_X
-    MOV OLED_WIN_COL_START, $A
-    CLC
-    ADD $A, 0x02
-    MOV OLED_WIN_COL_END, $A
-
-    MOV $A, OLED_CURSOR_ROW
-    LSL $A
-    LSL $A
-    LSL $A
-    CLC
-    ADD $A, OLED_TEXT_ORIGIN_Y
-    MOV OLED_WIN_ROW_START, $A
-    CLC
-    ADD $A, 0x07
-    MOV OLED_WIN_ROW_END, $A
+    JSR OLED5_COMPUTE_CURSOR_BASE
 
     MOV $A, 0x15
     OLC $A
-    MOV $A, OLED_WIN_COL_START
+    MOV $A, OLED_GLYPH_BASE_X
     OLC $A
-    MOV $A, OLED_WIN_COL_END
+    CLC
+    ADD $A, 0x02
     OLC $A
 
     MOV $A, 0x75
     OLC $A
-    MOV $A, OLED_WIN_ROW_START
+    MOV $A, OLED_GLYPH_BASE_Y
     OLC $A
-    MOV $A, OLED_WIN_ROW_END
+    CLC
+    ADD $A, 0x07
     OLC $A
 
     MOV $A, 0x5C
     OLC $A
     MOV $A, 0xFF
-    MOV $D, 0x08
+    MOV $D, OLED5_CELL_H
 
 .OLED5_DRAW_CELL_BLOCK_ROW:
-    MOV $B, 0x03
+    MOV $B, OLED5_CELL_BYTES
 
 .OLED5_DRAW_CELL_BLOCK_COL:
     OLD $A
@@ -0,0 +1,444 @@
+; ==========================================================
+; bt1_table.asm
+; BT1 descriptor entry-table helpers
+;
+; This file is a library file.
+; It should be included by another program.
+; Do NOT put a top-level JMP here.
+;
+; Needs sd_block_io.asm for SD_READ_BLOCK_TO_RAM_512.
+;
+; A BT1 descriptor with flag 0x80 set in byte 0x03 carries a
+; table of up to 15 payload entries after its usual header:
+;   0x0C       = entry count
+;   0x0D       = default entry index
+;   0x20 + 32n = entry n
+;
+; Entry layout (big-endian fields):
+;   +0x00..+0x03 = payload start block
+;   +0x04..+0x05 = load address
+;   +0x06..+0x07 = sector count
+;   +0x08..+0x09 = entry address
+;   +0x0C..+0x1B = name
+;   +0x1E..+0x1F = CRC-16/CCITT-FALSE of +0x00..+0x1D
+;
+; Selecting an entry fills the same working RAM the ROM
+; bootstrap loader uses, so either loader can run next.
+;
+; Boot request mailbox:
+;   The monitor's BOOT N command writes the magic, the entry
+;   index, and its complement here before RST. The ROM reads
+;   the descriptor once and boots that entry instead of the
+;   default.
+;
+; Boot argument mailbox:
+;   BOOT N XX also leaves the byte XX here for the program
+;   that boots. The ROM bootstrap does not touch it. The
+;   program checks the magic and the complement, then clears
+;   the magic so the argument is used once. The SD video
+;   library player reads its starting clip from it.
+;
+; Calling convention:
+;   - Carry flag is used as the return status:
+;       C = 0  success
+;       C = 1  failure
+;
+; Original version: May 2026
+; Fadil Isamotu
+; ==========================================================
+
+; ---------- working state shared with the ROM loader ----------
+BT1_ENTRY_ADDR_LO   = 0x0104
+BT1_ENTRY_ADDR_HI   = 0x0105
+BT1_COUNT_HI        = 0x0106
+BT1_COUNT_LO        = 0x0107
+BT1_DEST_LO         = 0x0108
+BT1_DEST_HI         = 0x0109
+
+; ---------- boot request mailbox ----------
+BT1_BOOT_MAGIC      = 0x010C
+BT1_BOOT_INDEX      = 0x010D
+BT1_BOOT_CHECK      = 0x010E
+BT1_BOOT_MAGIC_VALUE = 0xB7
+
+; ---------- boot argument mailbox ----------
+BT1_ARG_MAGIC       = 0x0120
+BT1_ARG_VALUE       = 0x0121
+BT1_ARG_CHECK       = 0x0122
+BT1_ARG_MAGIC_VALUE = 0xA7
+
+; ---------- table scratch ----------
+BT1_INDEX           = 0x010B
+BT1_ENTRY_PTR_LO    = 0x010F
+BT1_ENTRY_PTR_HI    = 0x0110
+BT1_CRC_HI          = 0x0111
+BT1_CRC_LO          = 0x0112
+BT1_CRC_COUNT       = 0x0113
+BT1_CRC_BITS        = 0x0114
+
+BT1_FLAG_TABLE      = 0x80
+
+; ----------------------------------------------------------
+; BT1_SELECT_ENTRY
+;
+; Looks up one entry of a BT1 entry table and loads its
+; fields into the loader working state.
+;
+; Input:
+;   $A = entry index
+;   $D = high byte of the 512-byte descriptor buffer
+;        (the buffer starts at $D:00)
+;
+; Output on success:
+;   0x0100..0x0103 = payload start block
+;   0x0104..0x0105 = entry address (low, high)
+;   0x0106..0x0107 = sector count  (high, low)
+;   0x0108..0x0109 = load address  (low, high)
+;
+; Returns:
+;   carry clear = entry found and its CRC matches
+;   carry set   = no table, index out of range, bad CRC,
+;                 or zero sector count
+; ----------------------------------------------------------
+BT1_SELECT_ENTRY:
+    MOV BT1_INDEX, $A
+
+    ; The table flag must be set.
+    MOV $C, 0x03
+    MOV $A, [$CD]
+    AND $A, 0x80       ; BT1_FLAG_TABLE
+    JZ BT1_SELECT_ENTRY_FAIL
+
+    ; Index must be below the entry count.
+    MOV $C, 0x0C
+    MOV $A, BT1_INDEX
+    STC
+    CMP $A, [$CD]
+    JC BT1_SELECT_ENTRY_FAIL
+
+    ; Entry pointer = buffer + 0x20 + index * 0x20.
+    MOV $C, 0x20
+    MOV $B, BT1_INDEX
+
+.BT1_SELECT_ENTRY_STEP:
+    STC
+    CMP $B, 0x00
+    JZ .BT1_SELECT_ENTRY_FOUND
+
+    CLC
+    ADD $C, 0x20
+    JNC .BT1_SELECT_ENTRY_NO_CARRY
+
+    CLC
+    ADD $D, 0x01
+
+.BT1_SELECT_ENTRY_NO_CARRY:
+    STC
+    SUB $B, 0x01
+    JMP .BT1_SELECT_ENTRY_STEP
+
+.BT1_SELECT_ENTRY_FOUND:
+    MOV BT1_ENTRY_PTR_LO, $C
+    MOV BT1_ENTRY_PTR_HI, $D
+
+    JSR BT1_CHECK_ENTRY_CRC
+    JC BT1_SELECT_ENTRY_FAIL
+
+    ; Entries never cross a 256-byte page, so only $C advances.
+    MOV $C, BT1_ENTRY_PTR_LO
+    MOV $D, BT1_ENTRY_PTR_HI
+
+    ; Payload start block.
+    MOV $A, [$CD]
+    MOV SD_BLOCK_ADDR_MSB, $A
+    CLC
+    ADD $C, 0x01
+    MOV $A, [$CD]
+    MOV SD_BLOCK_ADDR_B2, $A
+    CLC
+    ADD $C, 0x01
+    MOV $A, [$CD]
+    MOV SD_BLOCK_ADDR_B1, $A
+    CLC
+    ADD $C, 0x01
+    MOV $A, [$CD]
+    MOV SD_BLOCK_ADDR_LSB, $A
+
+    ; Load address becomes the RAM destination.
+    CLC
+    ADD $C, 0x01
+    MOV $A, [$CD]
+    MOV BT1_DEST_HI, $A
+    CLC
+    ADD $C, 0x01
+    MOV $A, [$CD]
+    MOV BT1_DEST_LO, $A
+
+    ; Sector count.
+    CLC
+    ADD $C, 0x01
+    MOV $A, [$CD]
+    MOV BT1_COUNT_HI, $A
+    CLC
+    ADD $C, 0x01
+    MOV $A, [$CD]
+    MOV BT1_COUNT_LO, $A
+
+    ; Entry address.
+    CLC
+    ADD $C, 0x01
+    MOV $A, [$CD]
+    MOV BT1_ENTRY_ADDR_HI, $A
+    CLC
+    ADD $C, 0x01
+    MOV $A, [$CD]
+    MOV BT1_ENTRY_ADDR_LO, $A
+
+    ; Require sector count != 0.
+    MOV $A, BT1_COUNT_HI
+    MOV $B, BT1_COUNT_LO
+    OR  $A, $B
+    JZ BT1_SELECT_ENTRY_FAIL
+
+    CLC
+    RTS
+
+BT1_SELECT_ENTRY_FAIL:
+    STC
+    RTS
+
+; ----------------------------------------------------------
+; BT1_CHECK_ENTRY_CRC
+;
+; Runs CRC-16/CCITT-FALSE (poly 0x1021, init 0xFFFF) over the
+; first 30 bytes of the entry at [$CD] and compares it with
+; the stored CRC in the last two bytes.
+;
+; Each bit shifts the 16-bit CRC left by adding it to itself:
+; the low-byte ADD leaves its top bit in carry for the
+; high-byte ADD, whose carry out selects the XOR.
+;
+; Modifies:
+;   $A, $C
+;
+; Returns:
+;   carry clear = CRC matches
+;   carry set   = CRC mismatch
+; ----------------------------------------------------------
+BT1_CHECK_ENTRY_CRC:
+    MOV $A, 0xFF
+    MOV BT1_CRC_HI, $A
+    MOV BT1_CRC_LO, $A
+
+    MOV $A, 0x1E
+    MOV BT1_CRC_COUNT, $A
+
+.BT1_CRC_BYTE:
+    MOV $A, [$CD]
+    XOR $A, BT1_CRC_HI
+    MOV BT1_CRC_HI, $A
+
+    MOV $A, 0x08
+    MOV BT1_CRC_BITS, $A
+
+.BT1_CRC_BIT:
+    MOV $A, BT1_CRC_LO
+    CLC
+    ADD $A, BT1_CRC_LO
+    MOV BT1_CRC_LO, $A
+
+    MOV $A, BT1_CRC_HI
+    ADD $A, BT1_CRC_HI
+    MOV BT1_CRC_HI, $A
+    JNC .BT1_CRC_NO_POLY
+
+    XOR $A, 0x10
+    MOV BT1_CRC_HI, $A
+    MOV $A, BT1_CRC_LO
+    XOR $A, 0x21
+    MOV BT1_CRC_LO, $A
+
+.BT1_CRC_NO_POLY:
+    STC
+    MOV $A, BT1_CRC_BITS
+    SUB $A, 0x01
+    MOV BT1_CRC_BITS, $A
+    JNZ .BT1_CRC_BIT
+
+    CLC
+    ADD $C, 0x01
+
+    STC
+    MOV $A, BT1_CRC_COUNT
+    SUB $A, 0x01
+    MOV BT1_CRC_COUNT, $A
+    JNZ .BT1_CRC_BYTE
+
+    ; [$CD] now points at the stored CRC, high byte first.
+    MOV $A, [$CD]
+    STC
+    CMP $A, BT1_CRC_HI
+    JNZ BT1_CHECK_ENTRY_CRC_FAIL
+
+    CLC
+    ADD $C, 0x01
+    MOV $A, [$CD]
+    STC
+    CMP $A, BT1_CRC_LO
+    JNZ BT1_CHECK_ENTRY_CRC_FAIL
+
+    CLC
+    RTS
+
+BT1_CHECK_ENTRY_CRC_FAIL:
+    STC
+    RTS
+
+; ----------------------------------------------------------
+; BT1_TAKE_BOOT_REQUEST
+;
+; Returns the entry index to boot and clears the mailbox.
+;
+; Input:
+;   $D = high byte of the descriptor buffer
+;
+; Output:
+;   $A = requested index when the mailbox holds a valid
+;        request, otherwise the descriptor's default index
+; ----------------------------------------------------------
+BT1_TAKE_BOOT_REQUEST:
+    MOV $A, BT1_BOOT_MAGIC
+    STC
+    CMP $A, 0xB7       ; BT1_BOOT_MAGIC_VALUE
+    JNZ BT1_TAKE_BOOT_REQUEST_DEFAULT
+
+    ; Index and complement must agree, so stale RAM is ignored.
+    MOV $A, BT1_BOOT_INDEX
+    XOR $A, 0xFF
+    STC
+    CMP $A, BT1_BOOT_CHECK
+    JNZ BT1_TAKE_BOOT_REQUEST_DEFAULT
+
+    MOV $A, 0x00
+    MOV BT1_BOOT_MAGIC, $A
+    MOV $A, BT1_BOOT_INDEX
+    RTS
+
+BT1_TAKE_BOOT_REQUEST_DEFAULT:
+    MOV $A, 0x00
+    MOV BT1_BOOT_MAGIC, $A
+    MOV $C, 0x0D
+    MOV $A, [$CD]
+    RTS
+
+; ----------------------------------------------------------
+; BT1_REQUEST_BOOT
+;
+; Writes a boot request for the ROM bootstrap.
+;
+; Input:
+;   $A = entry index
+;
+; The caller then runs RST.
+; ----------------------------------------------------------
+BT1_REQUEST_BOOT:
+    MOV BT1_BOOT_INDEX, $A
+    XOR $A, 0xFF
+    MOV BT1_BOOT_CHECK, $A
+    MOV $A, 0xB7       ; BT1_BOOT_MAGIC_VALUE
+    MOV BT1_BOOT_MAGIC, $A
+    RTS
+
+; ----------------------------------------------------------
+; BT1_REQUEST_ARG
+;
+; Leaves an argument byte for the program that boots next.
+;
+; Input:
+;   $A = argument
+; ----------------------------------------------------------
+BT1_REQUEST_ARG:
+    MOV BT1_ARG_VALUE, $A
+    XOR $A, 0xFF
+    MOV BT1_ARG_CHECK, $A
+    MOV $A, 0xA7       ; BT1_ARG_MAGIC_VALUE
+    MOV BT1_ARG_MAGIC, $A
+    RTS
+
+; ----------------------------------------------------------
+; BT1_CLEAR_ARG
+;
+; Drops any argument left by an earlier BOOT N XX, so the
+; next program boots without one.
+; ----------------------------------------------------------
+BT1_CLEAR_ARG:
+    MOV $A, 0x00
+    MOV BT1_ARG_MAGIC, $A
+    RTS
+
+; ----------------------------------------------------------
+; BT1_LOAD_SECTORS
+;
+; Reads the selected entry's sectors into RAM.
+;
+; Working state in RAM:
+;   0x0100..0x0103 = current SD block number (big-endian u32)
+;   0x0106..0x0107 = sectors remaining      (big-endian u16)
+;   0x0108..0x0109 = current RAM destination (low, high)
+;
+; Unlike the ROM loader, there are no debug markers or delays
+; between sectors.
+;
+; Returns:
+;   carry clear = success
+;   carry set   = SD read failure
+; ----------------------------------------------------------
+BT1_LOAD_SECTORS:
+    MOV $A, BT1_COUNT_HI
+    MOV $B, BT1_COUNT_LO
+    OR  $A, $B
+    JZ BT1_LOAD_SECTORS_DONE
+
+    MOV $C, BT1_DEST_LO
+    MOV $D, BT1_DEST_HI
+
+    JSR SD_READ_BLOCK_TO_RAM_512
+    JC BT1_LOAD_SECTORS_FAIL
+
+    ; The read advanced CD by one sector.
+    MOV BT1_DEST_LO, $C
+    MOV BT1_DEST_HI, $D
+
+    ; Next SD block.
+    CLC
+    MOV $A, SD_BLOCK_ADDR_LSB
+    ADD $A, 0x01
+    MOV SD_BLOCK_ADDR_LSB, $A
+    MOV $A, SD_BLOCK_ADDR_B1
+    ADD $A, 0x00
+    MOV SD_BLOCK_ADDR_B1, $A
+    MOV $A, SD_BLOCK_ADDR_B2
+    ADD $A, 0x00
+    MOV SD_BLOCK_ADDR_B2, $A
+    MOV $A, SD_BLOCK_ADDR_MSB
+    ADD $A, 0x00
+    MOV SD_BLOCK_ADDR_MSB, $A
+
+    ; One sector fewer.
+    STC
+    MOV $A, BT1_COUNT_LO
+    SUB $A, 0x01
+    MOV BT1_COUNT_LO, $A
+    MOV $A, BT1_COUNT_HI
+    SUB $A, 0x00
+    MOV BT1_COUNT_HI, $A
+
+    JMP BT1_LOAD_SECTORS
+
+BT1_LOAD_SECTORS_DONE:
+    CLC
+    RTS
+
+BT1_LOAD_SECTORS_FAIL:
+    STC
+    RTS
@@ -0,0 +1,156 @@
+; ------------------------------------------------------------------------------------
+; lz_decompress.asm
+;
+; Decoder for LZ-compressed SD payloads made by
+; tools/deployment/lz_payload.py (deploy_asm.py sd --compress).
+;
+; Stream tokens:
+;   0x00                 end of stream
+;   0x01..0x7F           literal run: that many bytes follow
+;   0x80..0xBF  D        short match: (token & 0x3F) + 3 bytes from D + 1 back
+;   0xC0..0xFF  DH DL    long match:  (token & 0x3F) + 3 bytes from DH:DL + 1 back
+;
+; Matches are copied one byte at a time, so a match may overlap the
+; bytes it is producing (distance 1 repeats one byte).
+;
+; The stream may sit above the output in the same RAM as long as it
+; starts at least the tool's staging gap above it. The decoder then
+; never writes over a byte it has not read yet.
+; ------------------------------------------------------------------------------------
+
+; ---------- decoder state ----------
+LZ_SRC_LO           = 0x0115
+LZ_SRC_HI           = 0x0116
+LZ_DST_LO           = 0x0117
+LZ_DST_HI           = 0x0118
+LZ_MATCH_LO         = 0x0119
+LZ_MATCH_HI         = 0x011A
+LZ_TOKEN            = 0x011B
+LZ_DIST_HI          = 0x011C
+
+; ------------------------------------------------------------------------------------
+; LZ_DECOMPRESS
+;
+; Input:
+;   LZ_SRC_LO / LZ_SRC_HI = start of the compressed stream
+;   LZ_DST_LO / LZ_DST_HI = output address
+;
+; Output:
+;   LZ_DST_LO / LZ_DST_HI = one past the last byte written
+;
+; Modifies:
+;   $A, $B, $C, $D
+; ------------------------------------------------------------------------------------
+LZ_DECOMPRESS:
+
+.LZ_NEXT_TOKEN:
+    JSR LZ_READ_SRC_BYTE
+    STC
+    CMP $A, 0x00
+    JZ .LZ_DONE
+
+    MOV LZ_TOKEN, $A
+    AND $A, 0x80
+    JNZ .LZ_MATCH
+
+    ; Literal run: the token is the byte count.
+    MOV $B, LZ_TOKEN
+
+.LZ_LITERAL:
+    JSR LZ_READ_SRC_BYTE
+    JSR LZ_WRITE_DST_BYTE
+
+    STC
+    SUB $B, 0x01
+    JNZ .LZ_LITERAL
+
+    JMP .LZ_NEXT_TOKEN
+
+.LZ_MATCH:
+    ; Length = (token & 0x3F) + 3.
+    MOV $B, LZ_TOKEN
+    AND $B, 0x3F
+    CLC
+    ADD $B, 0x03
+
+    ; Bit 6 selects a two-byte distance.
+    MOV $A, 0x00
+    MOV LZ_DIST_HI, $A
+
+    MOV $A, LZ_TOKEN
+    AND $A, 0x40
+    JZ .LZ_SHORT
+
+    JSR LZ_READ_SRC_BYTE
+    MOV LZ_DIST_HI, $A
+
+.LZ_SHORT:
+    ; $A = distance - 1, low byte.
+    JSR LZ_READ_SRC_BYTE
+
+    ; Match pointer = output - (distance - 1) - 1.
+    ; SUB with carry clear subtracts one more.
+    MOV $C, LZ_DST_LO
+    MOV $D, LZ_DST_HI
+    CLC
+    SUB $C, $A
+    SUB $D, LZ_DIST_HI
+    MOV LZ_MATCH_LO, $C
+    MOV LZ_MATCH_HI, $D
+
+.LZ_COPY:
+    MOV $C, LZ_MATCH_LO
+    MOV $D, LZ_MATCH_HI
+    MOV $A, [$CD]
+
+    CLC
+    ADD $C, 0x01
+    ADD $D, 0x00
+    MOV LZ_MATCH_LO, $C
+    MOV LZ_MATCH_HI, $D
+
+    JSR LZ_WRITE_DST_BYTE
+
+    STC
+    SUB $B, 0x01
+    JNZ .LZ_COPY
+
+    JMP .LZ_NEXT_TOKEN
+
+.LZ_DONE:
+    RTS
+
+; ------------------------------------------------------------------------------------
+; LZ_READ_SRC_BYTE
+;
+; Returns the next stream byte in $A and advances LZ_SRC.
+; The carry out of the low byte ADD carries into the high byte.
+; ------------------------------------------------------------------------------------
+LZ_READ_SRC_BYTE:
+    MOV $C, LZ_SRC_LO
+    MOV $D, LZ_SRC_HI
+    MOV $A, [$CD]
+
+    CLC
+    ADD $C, 0x01
+    ADD $D, 0x00
+    MOV LZ_SRC_LO, $C
+    MOV LZ_SRC_HI, $D
+    RTS
+
+; ------------------------------------------------------------------------------------
+; LZ_WRITE_DST_BYTE
+;
+; Stores $A at LZ_DST and advances LZ_DST.
+; ------------------------------------------------------------------------------------
+LZ_WRITE_DST_BYTE:
+    MOV $C, LZ_DST_LO
+    MOV $D, LZ_DST_HI
+    MOV [$CD], $A
+
+    CLC
+    ADD $C, 0x01
+    ADD $D, 0x00
+    MOV LZ_DST_LO, $C
+    MOV LZ_DST_HI, $D
+    RTS
@@ -3,6 +3,12 @@
 ; ==========================================================
 ; Monitor prompt, command dispatch, and command handlers.
 ;
+; Needs ../drivers/spi_sd/bt1_table.asm, and sd_block_io.asm
+; under it, for LOAD N and BOOT N:
+;   BT1_SELECT_ENTRY, BT1_LOAD_SECTORS
+;   BT1_REQUEST_BOOT, BT1_REQUEST_ARG, BT1_CLEAR_ARG
+;   BT1_DEST_*, BT1_COUNT_*, BT1_ENTRY_ADDR_* working RAM
+;
 ; Original version: April 2026
 ; Last Modified: May 2026
 ; Fadil Isamotu
@@ -345,6 +351,15 @@ MON_DISPATCH_COMMAND:
     JSR MON_INPUT_IS_BOOT
     JNC MON_CMD_BOOT_DEFAULT
 
+    JSR MON_INPUT_IS_LOAD_ENTRY
+    JNC MON_CMD_LOAD_ENTRY
+
+    JSR MON_INPUT_IS_BOOT_ENTRY
+    JNC MON_CMD_BOOT_ENTRY
+
+    JSR MON_INPUT_IS_BOOT_ENTRY_ARG
+    JNC MON_CMD_BOOT_ENTRY_ARG
+
     JSR MON_INPUT_IS_CALL_ADDR
     JNC MON_CMD_CALL_ADDR
 
@@ -1164,6 +1179,7 @@ MON_CMD_LOAD_DEFAULT_FAIL:
 ;   BOOT
 ;
 ; Behavior:
+;   - Clears any boot argument left by BOOT N XX.
 ;   - Hides the OLED cursor.
 ;   - Executes RST.
 ;
@@ -1175,10 +1191,244 @@ MON_CMD_LOAD_DEFAULT_FAIL:
 ; ----------------------------------------------------------
 MON_CMD_BOOT_DEFAULT:
     JSR OLED5_NEWLINE
+    JSR BT1_CLEAR_ARG
     JSR OLED5_CURSOR_HIDE
 
     RST
 
+; ----------------------------------------------------------
+; MON_CMD_LOAD_ENTRY
+;
+; Parses and runs:
+;   LOAD N
+;
+; Example:
+;   LOAD 2
+;
+; Behavior:
+;   - Reads the BT1 descriptor at SD block 1002.
+;   - Selects entry N of its entry table and checks the
+;     entry CRC.
+;   - Copies all of the entry's sectors to its load address.
+;   - Leaves execution in the monitor.
+;
+; The entry must load at 0x8000 or above and end at 0xBF00
+; or below, so it cannot overwrite the monitor or the stack.
+;
+; Output on success:
+;   LOAD XXXX   (entry address, ready for RUN XXXX)
+;
+; Output on failure:
+;   LOAD FAIL   SD error, no table, bad entry, or the entry
+;               is outside the load window
+;   BAD BYTE    N is not a hex digit
+; ----------------------------------------------------------
+MON_CMD_LOAD_ENTRY:
+    JSR OLED5_NEWLINE
+
+    ; Parse the entry index from MON_INPUT_BUF + 5.
+    MOV $A, MON_INPUT_BUF + 5
+    JSR MON_ASCII_HEX_TO_NIBBLE
+    JC MON_CMD_ENTRY_BAD_INDEX
+    MOV MON_ENTRY_INDEX, $A
+
+    ; SD block 1002 = 0x000003EA.
+    MOV $A, 0x00
+    MOV 0x0100, $A
+    MOV 0x0101, $A
+
+    MOV $A, 0x03
+    MOV 0x0102, $A
+
+    MOV $A, 0xEA
+    MOV 0x0103, $A
+
+    MOV $C, 0x00
+    MOV $D, MON_BT1_DESC_BUF_HI
+
+    JSR SD_READ_BLOCK_TO_RAM_512
+    JC MON_CMD_LOAD_DEFAULT_FAIL
+
+    ; Descriptor magic: "BT1".
+    MOV $A, MON_BT1_DESC_BUF
+    STC
+    CMP $A, 0x42       ; B
+    JNZ MON_CMD_LOAD_DEFAULT_FAIL
+
+    MOV $A, MON_BT1_DESC_BUF + 1
+    STC
+    CMP $A, 0x54       ; T
+    JNZ MON_CMD_LOAD_DEFAULT_FAIL
+
+    MOV $A, MON_BT1_DESC_BUF + 2
+    STC
+    CMP $A, 0x31       ; 1
+    JNZ MON_CMD_LOAD_DEFAULT_FAIL
+
+    MOV $A, MON_ENTRY_INDEX
+    MOV $D, MON_BT1_DESC_BUF_HI
+    JSR BT1_SELECT_ENTRY
+    JC MON_CMD_LOAD_DEFAULT_FAIL
+
+    ; Load address high byte must be at least MON_LOAD_MIN_HI.
+    MOV $A, BT1_DEST_HI
+    STC
+    CMP $A, MON_LOAD_MIN_HI
+    JNC MON_CMD_LOAD_DEFAULT_FAIL
+
+    ; End high byte = load high + 2 * sector count.
+    MOV $A, BT1_COUNT_HI
+    STC
+    CMP $A, 0x00
+    JNZ MON_CMD_LOAD_DEFAULT_FAIL
+
+    MOV $A, BT1_COUNT_LO
+    CLC
+    ADD $A, BT1_COUNT_LO
+    JC MON_CMD_LOAD_DEFAULT_FAIL
+
+    CLC
+    ADD $A, BT1_DEST_HI
+    JC MON_CMD_LOAD_DEFAULT_FAIL
+
+    ; End high byte below MON_LOAD_END_HI fits. Equal fits only
+    ; when the load address low byte is 0, ending at 0xBF00.
+    STC
+    CMP $A, MON_LOAD_END_HI
+    JNC MON_CMD_LOAD_ENTRY_FITS
+    JNZ MON_CMD_LOAD_DEFAULT_FAIL
+
+    MOV $A, BT1_DEST_LO
+    STC
+    CMP $A, 0x00
+    JNZ MON_CMD_LOAD_DEFAULT_FAIL
+
+MON_CMD_LOAD_ENTRY_FITS:
+    JSR BT1_LOAD_SECTORS
+    JC MON_CMD_LOAD_DEFAULT_FAIL
+
+    ; Print "LOAD ".
+    MOV $A, 0x4C       ; L
+    JSR OLED5_PUTC
+    MOV $A, 0x4F       ; O
+    JSR OLED5_PUTC
+    MOV $A, 0x41       ; A
+    JSR OLED5_PUTC
+    MOV $A, 0x44       ; D
+    JSR OLED5_PUTC
+    MOV $A, 0x20
+    JSR OLED5_PUTC
+
+    ; Print the entry address.
+    MOV $C, BT1_ENTRY_ADDR_LO
+    MOV $D, BT1_ENTRY_ADDR_HI
+    JSR OLED5_PRINT_HEX_WORD_CD
+
+    JSR OLED5_NEWLINE
+    JSR MON_PRINT_FRESH_PROMPT
+
+    CLC
+    RTS
+
+MON_CMD_ENTRY_BAD_INDEX:
+    JSR MON_PREP_BAD_BYTE
+    MOV $C, 0x40
+    MOV $D, 0x70
+    JSR OLED5_DRAW_STRING
+
+    JSR OLED5_NEWLINE
+    JSR MON_PRINT_FRESH_PROMPT
+
+    CLC
+    RTS
+
+; ----------------------------------------------------------
+; MON_CMD_BOOT_ENTRY
+;
+; Parses and runs:
+;   BOOT N
+;
+; Behavior:
+;   - Leaves a boot request for entry N in the BT1 mailbox.
+;   - Clears any boot argument left by BOOT N XX.
+;   - Hides the OLED cursor.
+;   - Executes RST.
+;
+; The ROM bootstrap takes the request and boots entry N of
+; the descriptor's entry table. If entry N does not exist or
+; fails its CRC, the ROM boots the default entry instead.
+;
+; The command does not return to the monitor.
+;
+; Errors:
+;   BAD BYTE if N is not a hex digit.
+; ----------------------------------------------------------
+MON_CMD_BOOT_ENTRY:
+    JSR OLED5_NEWLINE
+
+    MOV $A, MON_INPUT_BUF + 5
+    JSR MON_ASCII_HEX_TO_NIBBLE
+    JC MON_CMD_ENTRY_BAD_INDEX
+
+    JSR BT1_REQUEST_BOOT
+    JSR BT1_CLEAR_ARG
+    JSR OLED5_CURSOR_HIDE
+
+    RST
+
+; ----------------------------------------------------------
+; MON_CMD_BOOT_ENTRY_ARG
+;
+; Parses and runs:
+;   BOOT N XX
+;
+; Example:
+;   BOOT 2 01
+;
+; Behavior:
+;   - Leaves a boot request for entry N in the BT1 mailbox.
+;   - Leaves the byte XX in the BT1 boot argument mailbox.
+;   - Hides the OLED cursor.
+;   - Executes RST.
+;
+; The booted program decides what XX means. The SD video
+; library player starts with clip XX.
+;
+; The command does not return to the monitor.
+;
+; Errors:
+;   BAD BYTE if N is not a hex digit or XX is not a hex byte.
+; ----------------------------------------------------------
+MON_CMD_BOOT_ENTRY_ARG:
+    JSR OLED5_NEWLINE
+
+    MOV $A, MON_INPUT_BUF + 5
+    JSR MON_ASCII_HEX_TO_NIBBLE
+    JC MON_CMD_ENTRY_BAD_INDEX
+    PSH $A
+
+    ; Parse the argument byte from MON_INPUT_BUF + 7.
+    MOV $C, 0x07
+    MOV $D, MON_INPUT_BUF_HI
+    JSR MON_PARSE_HEX_BYTE_AT_CD
+
+    MOV $A, MON_HEX_STATUS
+    STC
+    CMP $A, 0x00
+    JNZ MON_CMD_BOOT_ENTRY_ARG_BAD
+
+    MOV $A, MON_HEX_BYTE_RESULT
+    JSR BT1_REQUEST_ARG
+    PUL $A
+    JSR BT1_REQUEST_BOOT
+    JSR OLED5_CURSOR_HIDE
+
+    RST
+
+MON_CMD_BOOT_ENTRY_ARG_BAD:
+    PUL $A
+    JMP MON_CMD_ENTRY_BAD_INDEX
+
 ; ----------------------------------------------------------
 ; MON_CMD_CALL_ADDR
 ;
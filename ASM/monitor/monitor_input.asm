@@ -599,6 +599,183 @@ MON_INPUT_IS_BOOT:
     JSR MON_INPUT_EQUALS_STRING
     RTS
 
+; ----------------------------------------------------------
+; MON_INPUT_IS_LOAD_ENTRY
+;
+; Checks whether the input has the command shape:
+;   LOAD N
+;
+; Only checks:
+;   LOAD
+;   space after LOAD
+;   null terminator after the index digit
+;
+; The index digit is parsed later by
+; MON_CMD_LOAD_ENTRY.
+;
+; Returns:
+;   carry clear = input shape matches "LOAD N"
+;   carry set   = input does not match
+; ----------------------------------------------------------
+MON_INPUT_IS_LOAD_ENTRY:
+    MOV $A, MON_INPUT_BUF
+    STC
+    CMP $A, 0x4C       ; L
+    JNZ MON_INPUT_IS_LOAD_ENTRY_NO
+
+    MOV $A, MON_INPUT_BUF + 1
+    STC
+    CMP $A, 0x4F       ; O
+    JNZ MON_INPUT_IS_LOAD_ENTRY_NO
+
+    MOV $A, MON_INPUT_BUF + 2
+    STC
+    CMP $A, 0x41       ; A
+    JNZ MON_INPUT_IS_LOAD_ENTRY_NO
+
+    MOV $A, MON_INPUT_BUF + 3
+    STC
+    CMP $A, 0x44       ; D
+    JNZ MON_INPUT_IS_LOAD_ENTRY_NO
+
+    MOV $A, MON_INPUT_BUF + 4
+    STC
+    CMP $A, 0x20       ; space after LOAD
+    JNZ MON_INPUT_IS_LOAD_ENTRY_NO
+
+    MOV $A, MON_INPUT_BUF + 6
+    STC
+    CMP $A, 0x00       ; exact end after index
+    JNZ MON_INPUT_IS_LOAD_ENTRY_NO
+
+MON_INPUT_IS_LOAD_ENTRY_YES:
+    CLC
+    RTS
+
+MON_INPUT_IS_LOAD_ENTRY_NO:
+    STC
+    RTS
+
+; ----------------------------------------------------------
+; MON_INPUT_IS_BOOT_ENTRY
+;
+; Checks whether the input has the command shape:
+;   BOOT N
+;
+; Only checks:
+;   BOOT
+;   space after BOOT
+;   null terminator after the index digit
+;
+; The index digit is parsed later by
+; MON_CMD_BOOT_ENTRY.
+;
+; Returns:
+;   carry clear = input shape matches "BOOT N"
+;   carry set   = input does not match
+; ----------------------------------------------------------
+MON_INPUT_IS_BOOT_ENTRY:
+    MOV $A, MON_INPUT_BUF
+    STC
+    CMP $A, 0x42       ; B
+    JNZ MON_INPUT_IS_BOOT_ENTRY_NO
+
+    MOV $A, MON_INPUT_BUF + 1
+    STC
+    CMP $A, 0x4F       ; O
+    JNZ MON_INPUT_IS_BOOT_ENTRY_NO
+
+    MOV $A, MON_INPUT_BUF + 2
+    STC
+    CMP $A, 0x4F       ; O
+    JNZ MON_INPUT_IS_BOOT_ENTRY_NO
+
+    MOV $A, MON_INPUT_BUF + 3
+    STC
+    CMP $A, 0x54       ; T
+    JNZ MON_INPUT_IS_BOOT_ENTRY_NO
+
+    MOV $A, MON_INPUT_BUF + 4
+    STC
+    CMP $A, 0x20       ; space after BOOT
+    JNZ MON_INPUT_IS_BOOT_ENTRY_NO
+
+    MOV $A, MON_INPUT_BUF + 6
+    STC
+    CMP $A, 0x00       ; exact end after index
+    JNZ MON_INPUT_IS_BOOT_ENTRY_NO
+
+MON_INPUT_IS_BOOT_ENTRY_YES:
+    CLC
+    RTS
+
+MON_INPUT_IS_BOOT_ENTRY_NO:
+    STC
+    RTS
+
+; ----------------------------------------------------------
+; MON_INPUT_IS_BOOT_ENTRY_ARG
+;
+; Checks whether the input has the command shape:
+;   BOOT N XX
+;
+; Only checks:
+;   BOOT
+;   space after BOOT
+;   space after the index digit
+;   null terminator after the argument byte
+;
+; The index digit and the argument byte are parsed later by
+; MON_CMD_BOOT_ENTRY_ARG.
+;
+; Returns:
+;   carry clear = input shape matches "BOOT N XX"
+;   carry set   = input does not match
+; ----------------------------------------------------------
+MON_INPUT_IS_BOOT_ENTRY_ARG:
+    MOV $A, MON_INPUT_BUF
+    STC
+    CMP $A, 0x42       ; B
+    JNZ MON_INPUT_IS_BOOT_ENTRY_ARG_NO
+
+    MOV $A, MON_INPUT_BUF + 1
+    STC
+    CMP $A, 0x4F       ; O
+    JNZ MON_INPUT_IS_BOOT_ENTRY_ARG_NO
+
+    MOV $A, MON_INPUT_BUF + 2
+    STC
+    CMP $A, 0x4F       ; O
+    JNZ MON_INPUT_IS_BOOT_ENTRY_ARG_NO
+
+    MOV $A, MON_INPUT_BUF + 3
+    STC
+    CMP $A, 0x54       ; T
+    JNZ MON_INPUT_IS_BOOT_ENTRY_ARG_NO
+
+    MOV $A, MON_INPUT_BUF + 4
+    STC
+    CMP $A, 0x20       ; space after BOOT
+    JNZ MON_INPUT_IS_BOOT_ENTRY_ARG_NO
+
+    MOV $A, MON_INPUT_BUF + 6
+    STC
+    CMP $A, 0x20       ; space after index
+    JNZ MON_INPUT_IS_BOOT_ENTRY_ARG_NO
+
+    MOV $A, MON_INPUT_BUF + 9
+    STC
+    CMP $A, 0x00       ; exact end after argument
+    JNZ MON_INPUT_IS_BOOT_ENTRY_ARG_NO
+
+MON_INPUT_IS_BOOT_ENTRY_ARG_YES:
+    CLC
+    RTS
+
+MON_INPUT_IS_BOOT_ENTRY_ARG_NO:
+    STC
+    RTS
+
 ; ----------------------------------------------------------
 ; MON_INPUT_IS_REG
 ;
@@ -0,0 +1,507 @@
+#addr 0x0200
+#include "../../../../ruledef.asm"
+#include "../../../../drivers/oled/oled_constants.asm"
+
+JMP START
+
+#include "../../../../drivers/oled/oled_lowlevel.asm"
+#include "../../../../drivers/oled/oled_text_4x6.asm"
+#include "../../../../drivers/oled/oled_graphics.asm"
+#include "../../../../drivers/spi_sd/SPI_routines.asm"
+#include "../../../../drivers/spi_sd/SPI_init.asm"
+#include "../../../../drivers/spi_sd/sd_block_io.asm"
+
+; ---------- SD delta video state ----------
+VID_FRAME_LEFT    = 0x7340
+VID_SECTORS_LEFT  = 0x7341
+VID_RUNS_LEFT     = 0x7342
+VID_RUN_COL       = 0x7343
+VID_RUN_ROW       = 0x7344
+VID_RUN_COUNT     = 0x7345
+VID_PTR_LO        = 0x7346
+VID_PTR_HI        = 0x7347
+VID_FRAME_NUM     = 0x7348
+VID_LOAD_LO       = 0x7349
+VID_LOAD_HI       = 0x734A
+VID_DRAW_LO       = 0x734B
+VID_DRAW_HI       = 0x734C
+VID_RUN_KIND      = 0x734D
+
+VID_BUFFER_LO     = 0x00
+VID_BUFFER_HI     = 0x60
+VID_INDEX_LO      = 0x00
+VID_INDEX_HI      = 0x5E
+VID_RESTART_FLAG  = 0x80
+VID_SECTOR_MASK   = 0x0F
+VID_FRAME_COUNT   = 0x07
+VID_RESUME_FRAME  = 0x01
+VID_RESUME_COUNT  = 0x06
+VID_KEYFRAME_FLAG = 0x80
+VID_COL_MASK      = 0x3F
+VID_KIND_FILL     = 0x40
+VID_KIND_COPY     = 0x80
+
+START:
+    MOV $CLK, 0x07
+    JSR OLED_INIT
+    JSR OLED4_SET_DEFAULT_ORIGIN
+    JSR OLED4_HOME
+    JSR OLEDG_CLEAR_SAFE_AREA
+    JSR VID_PRINT_START_TEXT
+    JSR SD_INIT_RELIABLE
+    JSR VID_LOAD_INDEX
+    JC VID_READ_FAIL
+
+VID_LOOP:
+    JSR OLEDG_CLEAR_SAFE_AREA
+    JSR VID_SET_START_BLOCK
+    JSR VID_INC_SD_BLOCK
+    MOV $A, 0x00
+    MOV VID_FRAME_NUM, $A
+    MOV $A, VID_FRAME_COUNT
+    MOV VID_FRAME_LEFT, $A
+
+VID_FRAME_LOOP:
+    JSR VID_LOAD_FRAME_SECTORS
+    JC VID_READ_FAIL
+
+    JSR VID_DRAW_DELTA_FRAME
+    JSR VID_DELAY_FRAME
+
+    MOV $A, VID_FRAME_NUM
+    CLC
+    ADD $A, 0x01
+    MOV VID_FRAME_NUM, $A
+
+    MOV $A, VID_FRAME_LEFT
+    STC
+    SUB $A, 0x01
+    PSF
+    MOV VID_FRAME_LEFT, $A
+    PLF
+    JNZ VID_FRAME_LOOP
+
+VID_RESUME:
+    ; The loop frame restored frame 0, so carry on from frame 1.
+    JSR VID_SET_RESUME_BLOCK
+    MOV $A, VID_RESUME_FRAME
+    MOV VID_FRAME_NUM, $A
+    MOV $A, VID_RESUME_COUNT
+    MOV VID_FRAME_LEFT, $A
+    JMP VID_FRAME_LOOP
+
+VID_SET_START_BLOCK:
+    MOV $A, 0x00
+    MOV SD_BLOCK_ADDR_MSB, $A
+    MOV $A, 0x00
+    MOV SD_BLOCK_ADDR_B2, $A
+    MOV $A, 0x07
+    MOV SD_BLOCK_ADDR_B1, $A
+    MOV $A, 0xD0
+    MOV SD_BLOCK_ADDR_LSB, $A
+    RTS
+
+VID_SET_RESUME_BLOCK:
+    MOV $A, 0x00
+    MOV SD_BLOCK_ADDR_MSB, $A
+    MOV $A, 0x00
+    MOV SD_BLOCK_ADDR_B2, $A
+    MOV $A, 0x07
+    MOV SD_BLOCK_ADDR_B1, $A
+    MOV $A, 0xD2
+    MOV SD_BLOCK_ADDR_LSB, $A
+    RTS
+
+VID_INC_SD_BLOCK:
+    MOV $A, SD_BLOCK_ADDR_LSB
+    CLC
+    ADD $A, 0x01
+    PSF
+    MOV SD_BLOCK_ADDR_LSB, $A
+    PLF
+    JNC .VID_INC_DONE
+
+    MOV $A, SD_BLOCK_ADDR_B1
+    CLC
+    ADD $A, 0x01
+    PSF
+    MOV SD_BLOCK_ADDR_B1, $A
+    PLF
+    JNC .VID_INC_DONE
+
+    MOV $A, SD_BLOCK_ADDR_B2
+    CLC
+    ADD $A, 0x01
+    PSF
+    MOV SD_BLOCK_ADDR_B2, $A
+    PLF
+    JNC .VID_INC_DONE
+
+    MOV $A, SD_BLOCK_ADDR_MSB
+    CLC
+    ADD $A, 0x01
+    MOV SD_BLOCK_ADDR_MSB, $A
+
+.VID_INC_DONE:
+    RTS
+
+VID_LOAD_INDEX:
+    ; Frame index sector sits at the first video block.
+    JSR VID_SET_START_BLOCK
+    MOV $C, VID_INDEX_LO
+    MOV $D, VID_INDEX_HI
+    JSR SD_READ_BLOCK_TO_RAM_512
+    RTS
+
+VID_LOAD_FRAME_SECTORS:
+    ; Index byte: bit 7 restarts at the buffer base, low bits are sectors to append.
+    MOV $C, VID_FRAME_NUM
+    MOV $D, VID_INDEX_HI
+    MOV $A, [$CD]
+    MOV $B, $A
+    AND $A, VID_SECTOR_MASK
+    MOV VID_SECTORS_LEFT, $A
+
+    MOV $A, $B
+    AND $A, VID_RESTART_FLAG
+    JZ .VID_LOAD_APPEND
+
+    MOV $A, VID_BUFFER_LO
+    MOV VID_LOAD_LO, $A
+    MOV VID_DRAW_LO, $A
+    MOV $A, VID_BUFFER_HI
+    MOV VID_LOAD_HI, $A
+    MOV VID_DRAW_HI, $A
+
+.VID_LOAD_APPEND:
+    MOV $A, VID_SECTORS_LEFT
+    STC
+    CMP $A, 0x00
+    JZ .VID_LOAD_DONE
+
+    MOV $C, VID_LOAD_LO
+    MOV $D, VID_LOAD_HI
+
+.VID_LOAD_SECTOR:
+    JSR SD_READ_BLOCK_TO_RAM_512
+    JC .VID_LOAD_FAIL
+    JSR VID_INC_SD_BLOCK
+
+    MOV $A, VID_SECTORS_LEFT
+    STC
+    SUB $A, 0x01
+    PSF
+    MOV VID_SECTORS_LEFT, $A
+    PLF
+    JNZ .VID_LOAD_SECTOR
+
+    MOV VID_LOAD_LO, $C
+    MOV VID_LOAD_HI, $D
+
+.VID_LOAD_DONE:
+    CLC
+    RTS
+
+.VID_LOAD_FAIL:
+    STC
+    RTS
+
+VID_INC_CD:
+    CLC
+    ADD $C, 0x01
+    JNC .VID_INC_CD_DONE
+    CLC
+    ADD $D, 0x01
+
+.VID_INC_CD_DONE:
+    RTS
+
+VID_SAVE_PTR:
+    MOV VID_PTR_LO, $C
+    MOV VID_PTR_HI, $D
+    RTS
+
+VID_RESTORE_PTR:
+    MOV $C, VID_PTR_LO
+    MOV $D, VID_PTR_HI
+    RTS
+
+VID_DRAW_DELTA_FRAME:
+    MOV $C, VID_DRAW_LO
+    MOV $D, VID_DRAW_HI
+    MOV $A, [$CD]
+    MOV VID_RUNS_LEFT, $A
+    JSR VID_INC_CD
+    MOV $A, [$CD]
+    JSR VID_INC_CD
+
+    AND $A, VID_KEYFRAME_FLAG
+    JZ .VID_RUN_LOOP
+    JSR OLEDG_CLEAR_SAFE_AREA
+
+.VID_RUN_LOOP:
+    MOV $A, VID_RUNS_LEFT
+    STC
+    CMP $A, 0x00
+    JZ .VID_RUNS_DONE
+
+    MOV $A, [$CD]
+    MOV VID_RUN_KIND, $A
+    AND $A, VID_COL_MASK
+    MOV VID_RUN_COL, $A
+    JSR VID_INC_CD
+
+    MOV $A, [$CD]
+    MOV VID_RUN_ROW, $A
+    JSR VID_INC_CD
+
+    MOV $A, [$CD]
+    MOV VID_RUN_COUNT, $A
+    JSR VID_INC_CD
+
+    JSR VID_SAVE_PTR
+    JSR VID_BEGIN_RUN_WINDOW
+    JSR VID_RESTORE_PTR
+
+    MOV $B, VID_RUN_COUNT
+    MOV $A, VID_RUN_KIND
+    AND $A, VID_KIND_FILL
+    JNZ .VID_FILL_RUN
+    MOV $A, VID_RUN_KIND
+    AND $A, VID_KIND_COPY
+    JNZ .VID_COPY_RUN
+
+.VID_DATA_LOOP:
+    MOV $A, [$CD]
+    OLD $A
+    JSR VID_INC_CD
+    STC
+    SUB $B, 0x01
+    JNZ .VID_DATA_LOOP
+
+.VID_RUN_NEXT:
+    MOV $A, VID_RUNS_LEFT
+    STC
+    SUB $A, 0x01
+    MOV VID_RUNS_LEFT, $A
+    JMP .VID_RUN_LOOP
+
+.VID_RUNS_DONE:
+    MOV VID_DRAW_LO, $C
+    MOV VID_DRAW_HI, $D
+    RTS
+
+.VID_FILL_RUN:
+    ; One stored byte repeated for the whole run.
+    MOV $A, [$CD]
+    JSR VID_INC_CD
+
+.VID_FILL_LOOP:
+    OLD $A
+    STC
+    SUB $B, 0x01
+    JNZ .VID_FILL_LOOP
+    JMP .VID_RUN_NEXT
+
+.VID_COPY_RUN:
+    ; 16-bit distance back from the next byte to earlier raw run data.
+    MOV $A, [$CD]
+    JSR VID_INC_CD
+    MOV $B, [$CD]
+    JSR VID_INC_CD
+    JSR VID_SAVE_PTR
+    STC
+    SUB $C, $A
+    SUB $D, $B
+    MOV $B, VID_RUN_COUNT
+
+.VID_COPY_LOOP:
+    MOV $A, [$CD]
+    OLD $A
+    JSR VID_INC_CD
+    STC
+    SUB $B, 0x01
+    JNZ .VID_COPY_LOOP
+
+    JSR VID_RESTORE_PTR
+    JMP .VID_RUN_NEXT
+
+VID_BEGIN_RUN_WINDOW:
+    MOV $A, 0x15
+    OLC $A
+    MOV $A, VID_RUN_COL
+    OLC $A
+    MOV $A, VID_RUN_COUNT
+    STC
+    SUB $A, 0x01
+    CLC
+    ADD $A, VID_RUN_COL
+    OLC $A
+
+    MOV $A, 0x75
+    OLC $A
+    MOV $A, VID_RUN_ROW
+    OLC $A
+    MOV $A, VID_RUN_ROW
+    OLC $A
+
+    MOV $A, 0x5C
+    OLC $A
+    RTS
+
+VID_DELAY_FRAME:
+    PSH $A
+    PSH $B
+    MOV $A, 0x20
+
+.VID_DELAY_FRAME_OUTER:
+    MOV $B, 0xFF
+
+.VID_DELAY_FRAME_INNER:
+    NOP
+    NOP
+    STC
+    SUB $B, 0x01
+    JNZ .VID_DELAY_FRAME_INNER
+
+    STC
+    SUB $A, 0x01
+    JNZ .VID_DELAY_FRAME_OUTER
+
+    PUL $B
+    PUL $A
+    RTS
+
+VID_DELAY_HOLD:
+    JSR VID_DELAY_FRAME
+    JSR VID_DELAY_FRAME
+    RTS
+
+VID_READ_FAIL:
+    JSR OLEDG_CLEAR_SAFE_AREA
+    JSR OLED4_HOME
+    JSR VID_PRINT_READ_FAIL
+
+.VID_FAIL_HOLD:
+    JSR VID_DELAY_HOLD
+    JMP .VID_FAIL_HOLD
+
+VID_PRINT_START_TEXT:
+    MOV $A, 0x53 ; S
+    JSR OLED4_PUTC
+    MOV $A, 0x44 ; D
+    JSR OLED4_PUTC
+    MOV $A, 0x20 ; space
+    JSR OLED4_PUTC
+    MOV $A, 0x44 ; D
+    JSR OLED4_PUTC
+    MOV $A, 0x45 ; E
+    JSR OLED4_PUTC
+    MOV $A, 0x4C ; L
+    JSR OLED4_PUTC
+    MOV $A, 0x54 ; T
+    JSR OLED4_PUTC
+    MOV $A, 0x41 ; A
+    JSR OLED4_PUTC
+    MOV $A, 0x20 ; space
+    JSR OLED4_PUTC
+    MOV $A, 0x56 ; V
+    JSR OLED4_PUTC
+    MOV $A, 0x49 ; I
+    JSR OLED4_PUTC
+    MOV $A, 0x44 ; D
+    JSR OLED4_PUTC
+    MOV $A, 0x45 ; E
+    JSR OLED4_PUTC
+    MOV $A, 0x4F ; O
+    JSR OLED4_PUTC
+    MOV $A, 0x0A
+    JSR OLED4_PUTC
+    MOV $A, 0x42 ; B
+    JSR OLED4_PUTC
+    MOV $A, 0x4C ; L
+    JSR OLED4_PUTC
+    MOV $A, 0x4F ; O
+    JSR OLED4_PUTC
+    MOV $A, 0x43 ; C
+    JSR OLED4_PUTC
+    MOV $A, 0x4B ; K
+    JSR OLED4_PUTC
+    MOV $A, 0x20 ; space
+    JSR OLED4_PUTC
+    MOV $A, 0x32 ; 2
+    JSR OLED4_PUTC
+    MOV $A, 0x30 ; 0
+    JSR OLED4_PUTC
+    MOV $A, 0x30 ; 0
+    JSR OLED4_PUTC
+    MOV $A, 0x30 ; 0
+    JSR OLED4_PUTC
+    MOV $A, 0x0A
+    JSR OLED4_PUTC
+    MOV $A, 0x46 ; F
+    JSR OLED4_PUTC
+    MOV $A, 0x52 ; R
+    JSR OLED4_PUTC
+    MOV $A, 0x41 ; A
+    JSR OLED4_PUTC
+    MOV $A, 0x4D ; M
+    JSR OLED4_PUTC
+    MOV $A, 0x45 ; E
+    JSR OLED4_PUTC
+    MOV $A, 0x53 ; S
+    JSR OLED4_PUTC
+    MOV $A, 0x20 ; space
+    JSR OLED4_PUTC
+    MOV $A, 0x36 ; 6
+    JSR OLED4_PUTC
+    MOV $A, 0x0A
+    JSR OLED4_PUTC
+    MOV $A, 0x53 ; S
+    JSR OLED4_PUTC
+    MOV $A, 0x45 ; E
+    JSR OLED4_PUTC
+    MOV $A, 0x43 ; C
+    JSR OLED4_PUTC
+    MOV $A, 0x54 ; T
+    JSR OLED4_PUTC
+    MOV $A, 0x4F ; O
+    JSR OLED4_PUTC
+    MOV $A, 0x52 ; R
+    JSR OLED4_PUTC
+    MOV $A, 0x53 ; S
+    JSR OLED4_PUTC
+    MOV $A, 0x20 ; space
+    JSR OLED4_PUTC
+    MOV $A, 0x34 ; 4
+    JSR OLED4_PUTC
+    MOV $A, 0x0A
+    JSR OLED4_PUTC
+    RTS
+
+VID_PRINT_READ_FAIL:
+    MOV $A, 0x53 ; S
+    JSR OLED4_PUTC
+    MOV $A, 0x44 ; D
+    JSR OLED4_PUTC
+    MOV $A, 0x20 ; space
+    JSR OLED4_PUTC
+    MOV $A, 0x52 ; R
+    JSR OLED4_PUTC
+    MOV $A, 0x45 ; E
+    JSR OLED4_PUTC
+    MOV $A, 0x41 ; A
+    JSR OLED4_PUTC
+    MOV $A, 0x44 ; D
+    JSR OLED4_PUTC
+    MOV $A, 0x20 ; space
+    JSR OLED4_PUTC
+    MOV $A, 0x46 ; F
+    JSR OLED4_PUTC
+    MOV $A, 0x41 ; A
+    JSR OLED4_PUTC
+    MOV $A, 0x49 ; I
+    JSR OLED4_PUTC
+    MOV $A, 0x4C ; L
+    JSR OLED4_PUTC
+    RTS
@@ -0,0 +1,611 @@
+#!/usr/bin/env python3
+r"""
+Raw SD-card block I/O shared by the deployment and video tools.
+
+Opens block devices as file-style objects:
+  - Windows raw disks (\\.\PhysicalDriveN) through Win32 handles
+  - Linux block devices with O_DIRECT, so reads and writes skip the page
+    cache and a readback actually comes from the card
+  - SD card image files through a shared mmap, so provisioning can be done
+    offline and flashed later with sd_image.py
+"""
+
+from __future__ import annotations
+
+import ctypes
+import ctypes.wintypes as wintypes
+import mmap
+import os
+import stat
+from contextlib import nullcontext
+from typing import List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows
+    fcntl = None
+
+
+SECTOR_SIZE = 512
+
+# Largest single O_DIRECT transfer. Bigger requests are split.
+DIRECT_BUFFER_SIZE = 0x100000
+
+# linux/fs.h: flush and invalidate the buffer cache of a block device.
+BLKFLSBUF = 0x1261
+
+# Image writes are compared against the mapping in pages of this size.
+# Pages that already hold the data are skipped, so zero pages over a hole
+# stay unallocated and rewriting an unchanged payload dirties nothing.
+IMAGE_PAGE_SIZE = mmap.PAGESIZE
+
+# Every block range written to an image is recorded next to it in
+# <image>.written. A zero page over a hole stays a hole, so the record,
+# not the allocation, says what sd_image.py flash has to copy.
+WRITTEN_SUFFIX = ".written"
+
+
+class WindowsRawDevice:
+    # Small file-style wrapper for Windows raw disk HANDLE objects.
+    GENERIC_READ = 0x80000000
+    GENERIC_WRITE = 0x40000000
+    FILE_SHARE_READ = 0x00000001
+    FILE_SHARE_WRITE = 0x00000002
+    OPEN_EXISTING = 3
+    FILE_ATTRIBUTE_NORMAL = 0x00000080
+
+    def __init__(self, device: str, mode: str):
+        self.device = device
+        self.mode = mode
+        self.handle = None
+        self.writable = any(ch in mode for ch in "+wa")
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self.kernel32 = kernel32
+
+        kernel32.CreateFileW.argtypes = [
+            wintypes.LPCWSTR,
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.LPVOID,
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.HANDLE,
+        ]
+        kernel32.CreateFileW.restype = wintypes.HANDLE
+        kernel32.SetFilePointerEx.argtypes = [
+            wintypes.HANDLE,
+            ctypes.c_longlong,
+            ctypes.POINTER(ctypes.c_longlong),
+            wintypes.DWORD,
+        ]
+        kernel32.SetFilePointerEx.restype = wintypes.BOOL
+        kernel32.ReadFile.argtypes = [
+            wintypes.HANDLE,
+            wintypes.LPVOID,
+            wintypes.DWORD,
+            ctypes.POINTER(wintypes.DWORD),
+            wintypes.LPVOID,
+        ]
+        kernel32.ReadFile.restype = wintypes.BOOL
+        kernel32.WriteFile.argtypes = [
+            wintypes.HANDLE,
+            wintypes.LPCVOID,
+            wintypes.DWORD,
+            ctypes.POINTER(wintypes.DWORD),
+            wintypes.LPVOID,
+        ]
+        kernel32.WriteFile.restype = wintypes.BOOL
+        kernel32.FlushFileBuffers.argtypes = [wintypes.HANDLE]
+        kernel32.FlushFileBuffers.restype = wintypes.BOOL
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        kernel32.CloseHandle.restype = wintypes.BOOL
+
+        access = self.GENERIC_READ
+        if self.writable:
+            access |= self.GENERIC_WRITE
+
+        handle = kernel32.CreateFileW(
+            device,
+            access,
+            self.FILE_SHARE_READ | self.FILE_SHARE_WRITE,
+            None,
+            self.OPEN_EXISTING,
+            self.FILE_ATTRIBUTE_NORMAL,
+            None,
+        )
+
+        if handle == wintypes.HANDLE(-1).value:
+            self._raise_last_error()
+
+        self.handle = handle
+
+    def _raise_last_error(self) -> None:
+        code = ctypes.get_last_error()
+        raise OSError(code, ctypes.FormatError(code), self.device)
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        new_pos = ctypes.c_longlong(0)
+        if not self.kernel32.SetFilePointerEx(
+            self.handle,
+            ctypes.c_longlong(offset),
+            ctypes.byref(new_pos),
+            whence,
+        ):
+            self._raise_last_error()
+        return new_pos.value
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            raise ValueError("Raw block-device reads require an explicit byte count.")
+
+        buffer = ctypes.create_string_buffer(size)
+        bytes_read = wintypes.DWORD(0)
+        if not self.kernel32.ReadFile(
+            self.handle,
+            buffer,
+            size,
+            ctypes.byref(bytes_read),
+            None,
+        ):
+            self._raise_last_error()
+        return buffer.raw[:bytes_read.value]
+
+    def write(self, data: bytes) -> int:
+        view = memoryview(data)
+        total = 0
+        while total < len(view):
+            chunk = view[total:total + 0x100000].tobytes()
+            buffer = ctypes.create_string_buffer(chunk)
+            bytes_written = wintypes.DWORD(0)
+            if not self.kernel32.WriteFile(
+                self.handle,
+                buffer,
+                len(chunk),
+                ctypes.byref(bytes_written),
+                None,
+            ):
+                self._raise_last_error()
+            total += bytes_written.value
+            if bytes_written.value != len(chunk):
+                raise OSError(f"Short write to {self.device}")
+        return total
+
+    def flush(self) -> None:
+        if self.writable and not self.kernel32.FlushFileBuffers(self.handle):
+            self._raise_last_error()
+
+    def close(self) -> None:
+        if self.handle is not None:
+            self.kernel32.CloseHandle(self.handle)
+            self.handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class WindowsVolumeLock:
+    # Windows volume lock remains open during raw disk access.
+    GENERIC_READ = 0x80000000
+    GENERIC_WRITE = 0x40000000
+    FILE_SHARE_READ = 0x00000001
+    FILE_SHARE_WRITE = 0x00000002
+    OPEN_EXISTING = 3
+    FILE_ATTRIBUTE_NORMAL = 0x00000080
+    FSCTL_LOCK_VOLUME = 0x00090018
+    FSCTL_UNLOCK_VOLUME = 0x0009001C
+    FSCTL_DISMOUNT_VOLUME = 0x00090020
+
+    def __init__(self, volume: str):
+        self.volume = volume.rstrip(r"\/")
+        self.handle = None
+
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        self.kernel32 = kernel32
+
+        kernel32.CreateFileW.argtypes = [
+            wintypes.LPCWSTR,
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.LPVOID,
+            wintypes.DWORD,
+            wintypes.DWORD,
+            wintypes.HANDLE,
+        ]
+        kernel32.CreateFileW.restype = wintypes.HANDLE
+        kernel32.DeviceIoControl.argtypes = [
+            wintypes.HANDLE,
+            wintypes.DWORD,
+            wintypes.LPVOID,
+            wintypes.DWORD,
+            wintypes.LPVOID,
+            wintypes.DWORD,
+            ctypes.POINTER(wintypes.DWORD),
+            wintypes.LPVOID,
+        ]
+        kernel32.DeviceIoControl.restype = wintypes.BOOL
+        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
+        kernel32.CloseHandle.restype = wintypes.BOOL
+
+        handle = kernel32.CreateFileW(
+            self.volume,
+            self.GENERIC_READ | self.GENERIC_WRITE,
+            self.FILE_SHARE_READ | self.FILE_SHARE_WRITE,
+            None,
+            self.OPEN_EXISTING,
+            self.FILE_ATTRIBUTE_NORMAL,
+            None,
+        )
+
+        if handle == wintypes.HANDLE(-1).value:
+            self._raise_last_error()
+
+        self.handle = handle
+        self._device_io_control(self.FSCTL_LOCK_VOLUME)
+        self._device_io_control(self.FSCTL_DISMOUNT_VOLUME)
+
+    def _raise_last_error(self) -> None:
+        code = ctypes.get_last_error()
+        raise OSError(code, ctypes.FormatError(code), self.volume)
+
+    def _device_io_control(self, code: int) -> None:
+        bytes_returned = wintypes.DWORD(0)
+        if not self.kernel32.DeviceIoControl(
+            self.handle,
+            code,
+            None,
+            0,
+            None,
+            0,
+            ctypes.byref(bytes_returned),
+            None,
+        ):
+            self._raise_last_error()
+
+    def close(self) -> None:
+        if self.handle is not None:
+            self.kernel32.DeviceIoControl(
+                self.handle,
+                self.FSCTL_UNLOCK_VOLUME,
+                None,
+                0,
+                None,
+                0,
+                ctypes.byref(wintypes.DWORD(0)),
+                None,
+            )
+            self.kernel32.CloseHandle(self.handle)
+            self.handle = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def lock_windows_volume(volume: Optional[str]):
+    if volume is None:
+        return nullcontext()
+    if os.name != "nt":
+        raise ValueError("--windows-lock-volume is only supported on Windows.")
+    return WindowsVolumeLock(volume)
+
+
+def is_windows_raw_device(device: str) -> bool:
+    windows_raw_prefix = "\\\\.\\"
+    return os.name == "nt" and device.startswith(windows_raw_prefix)
+
+
+class LinuxDirectDevice:
+    # File-style wrapper for a Linux block device opened with O_DIRECT.
+    # O_DIRECT needs the buffer, offset, and length aligned to the logical
+    # block size, so transfers go through one page-aligned mmap buffer and
+    # use pread/pwrite at explicit offsets.
+
+    def __init__(self, device: str, mode: str):
+        if mode not in {"rb", "r+b"}:
+            raise ValueError("Linux block device mode must be rb or r+b")
+        self.device = device
+        self.writable = "+" in mode
+        self.position = 0
+        self.fd = os.open(device, (os.O_RDWR if self.writable else os.O_RDONLY) | os.O_DIRECT)
+        self.buffer = mmap.mmap(-1, DIRECT_BUFFER_SIZE)
+
+    def fileno(self) -> int:
+        return self.fd
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence != os.SEEK_SET:
+            raise ValueError("O_DIRECT block devices only support absolute seeks")
+        self.position = offset
+        return offset
+
+    def _check_aligned(self, offset: int, length: int) -> None:
+        if offset % SECTOR_SIZE or length % SECTOR_SIZE:
+            raise ValueError(f"O_DIRECT transfers must be whole {SECTOR_SIZE}-byte sectors")
+
+    def pread(self, offset: int, size: int) -> bytes:
+        self._check_aligned(offset, size)
+        out = bytearray()
+        while len(out) < size:
+            length = min(DIRECT_BUFFER_SIZE, size - len(out))
+            view = memoryview(self.buffer)[:length]
+            try:
+                count = os.preadv(self.fd, [view], offset + len(out))
+            finally:
+                view.release()
+            if count == 0:
+                break
+            out += self.buffer[:count]
+            if count < length:
+                break
+        return bytes(out)
+
+    def pwrite(self, offset: int, data: bytes) -> int:
+        self._check_aligned(offset, len(data))
+        source = memoryview(data)
+        total = 0
+        while total < len(source):
+            length = min(DIRECT_BUFFER_SIZE, len(source) - total)
+            self.buffer[:length] = source[total:total + length]
+            view = memoryview(self.buffer)[:length]
+            try:
+                count = os.pwritev(self.fd, [view], offset + total)
+            finally:
+                view.release()
+            if count != length:
+                raise OSError(f"Short write to {self.device}")
+            total += count
+        return total
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            raise ValueError("raw block-device reads need an explicit byte count")
+        data = self.pread(self.position, size)
+        self.position += len(data)
+        return data
+
+    def write(self, data: bytes) -> int:
+        count = self.pwrite(self.position, data)
+        self.position += count
+        return count
+
+    def flush(self) -> None:
+        # O_DIRECT skips the page cache, but the drive may still hold the data
+        # in its own cache. fsync asks it to commit, and BLKFLSBUF drops any
+        # cached copy left by other openers of the device.
+        if self.writable:
+            os.fsync(self.fd)
+        if fcntl is None:
+            return
+        try:
+            fcntl.ioctl(self.fd, BLKFLSBUF, 0)
+        except OSError:
+            # BLKFLSBUF needs CAP_SYS_ADMIN. O_DIRECT reads skip the cache anyway.
+            pass
+
+    def close(self) -> None:
+        if self.fd is not None:
+            os.close(self.fd)
+            self.fd = None
+            self.buffer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def written_record_path(image: str) -> str:
+    return image + WRITTEN_SUFFIX
+
+
+def merge_block_ranges(ranges: List[Tuple[int, int]]) -> List[Tuple[int, int]]:
+    # Sorts (first block, count) ranges and joins the ones that overlap or touch.
+    merged: List[Tuple[int, int]] = []
+    for first, count in sorted(ranges):
+        if merged and first <= merged[-1][0] + merged[-1][1]:
+            last = max(merged[-1][0] + merged[-1][1], first + count)
+            merged[-1] = (merged[-1][0], last - merged[-1][0])
+        else:
+            merged.append((first, count))
+    return merged
+
+
+def load_written_blocks(image: str) -> List[Tuple[int, int]]:
+    # (first block, count) ranges recorded for an image; empty without a record.
+    try:
+        with open(written_record_path(image), "r", encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except FileNotFoundError:
+        return []
+    ranges = []
+    for line in lines:
+        line = line.split("#", 1)[0].strip()
+        if line:
+            first, count = (int(part) for part in line.split())
+            ranges.append((first, count))
+    return merge_block_ranges(ranges)
+
+
+def record_written_blocks(image: str, ranges: List[Tuple[int, int]]) -> None:
+    # Adds ranges to the image's record, merged with what is already there.
+    merged = merge_block_ranges(load_written_blocks(image) + ranges)
+    with open(written_record_path(image), "w", encoding="utf-8") as f:
+        f.write(f"# Blocks written to {os.path.basename(image)}: first block, block count\n")
+        for first, count in merged:
+            f.write(f"{first} {count}\n")
+
+
+class ImageFileDevice:
+    # File-style wrapper for an SD card image file, mapped shared into memory.
+    # The image keeps its size; writes past the end fail the way they would
+    # on a card of that size. Every handle on the same image sees the same
+    # pages, so a readback on a second handle needs no sync. The data is
+    # committed to disk on close, and the written blocks are added to the
+    # image's .written record.
+
+    def __init__(self, device: str, mode: str):
+        if mode not in {"rb", "r+b"}:
+            raise ValueError("image file mode must be rb or r+b")
+        self.device = device
+        self.writable = "+" in mode
+        self.position = 0
+        self.written: List[Tuple[int, int]] = []
+        self.file = open(device, mode, buffering=0)
+        self.size = os.fstat(self.file.fileno()).st_size
+        if self.size == 0 or self.size % SECTOR_SIZE:
+            self.file.close()
+            raise ValueError(
+                f"{device} is not a whole number of {SECTOR_SIZE}-byte sectors; create it with sd_image.py create"
+            )
+        access = mmap.ACCESS_WRITE if self.writable else mmap.ACCESS_READ
+        self.map = mmap.mmap(self.file.fileno(), 0, access=access)
+
+    def fileno(self) -> int:
+        return self.file.fileno()
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence != os.SEEK_SET:
+            raise ValueError("image files only support absolute seeks")
+        self.position = offset
+        return offset
+
+    def pread(self, offset: int, size: int) -> bytes:
+        return self.map[offset:offset + size]
+
+    def pwrite(self, offset: int, data: bytes) -> int:
+        if offset + len(data) > self.size:
+            raise OSError(f"Write past the end of {self.device} ({self.size // SECTOR_SIZE} sectors)")
+        source = memoryview(data)
+        if source.nbytes:
+            first = offset // SECTOR_SIZE
+            last = (offset + source.nbytes - 1) // SECTOR_SIZE
+            self.written.append((first, last - first + 1))
+        start = offset
+        while start < offset + len(source):
+            end = min((start // IMAGE_PAGE_SIZE + 1) * IMAGE_PAGE_SIZE, offset + len(source))
+            piece = source[start - offset:end - offset]
+            if self.map[start:end] != piece:
+                self.map[start:end] = piece
+            start = end
+        return len(source)
+
+    def read(self, size: int = -1) -> bytes:
+        if size < 0:
+            raise ValueError("raw block-device reads need an explicit byte count")
+        data = self.pread(self.position, size)
+        self.position += len(data)
+        return data
+
+    def write(self, data: bytes) -> int:
+        count = self.pwrite(self.position, data)
+        self.position += count
+        return count
+
+    def flush(self) -> None:
+        # The mapping is shared, so other handles already see the writes.
+        pass
+
+    def close(self) -> None:
+        if self.map is None:
+            return
+        if self.writable:
+            self.map.flush()
+            os.fsync(self.file.fileno())
+            if self.written:
+                record_written_blocks(self.device, self.written)
+                self.written = []
+        self.map.close()
+        self.map = None
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+def is_image_file(device: str) -> bool:
+    try:
+        return stat.S_ISREG(os.stat(device).st_mode)
+    except OSError:
+        return False
+
+
+def is_linux_block_device(device: str) -> bool:
+    if not hasattr(os, "O_DIRECT"):
+        return False
+    try:
+        return stat.S_ISBLK(os.stat(device).st_mode)
+    except OSError:
+        return False
+
+
+def open_block_device(device: str, mode: str):
+    # Block-device access uses Win32 handles for Windows raw disks, a shared
+    # mmap for card images, and O_DIRECT for Linux block devices. Anything
+    # that refuses O_DIRECT falls back to a plain unbuffered file.
+    if is_windows_raw_device(device):
+        return WindowsRawDevice(device, mode)
+    if is_image_file(device):
+        return ImageFileDevice(device, mode)
+    if is_linux_block_device(device):
+        try:
+            return LinuxDirectDevice(device, mode)
+        except OSError:
+            pass
+    return open(device, mode, buffering=0)
+
+
+def sync_block_device(f) -> None:
+    # Commits written blocks before they are read back for verification.
+    f.flush()
+    if isinstance(f, (LinuxDirectDevice, ImageFileDevice)) or not hasattr(f, "fileno"):
+        return
+    os.fsync(f.fileno())
+
+
+def write_sector_to_device(device: str, block_index: int, sector: bytes, sector_size: int = SECTOR_SIZE) -> None:
+    # Writes exactly one sector to the block device at the requested block offset.
+    if len(sector) != sector_size:
+        raise ValueError(f"Sector write expects exactly {sector_size} bytes.")
+    write_blocks_to_device(device, block_index, sector, sector_size)
+
+
+def write_blocks_to_device(device: str, start_block: int, payload: bytes, sector_size: int = SECTOR_SIZE) -> None:
+    # Writes a whole multi-sector payload contiguously starting at start_block.
+    if len(payload) % sector_size != 0:
+        raise ValueError("Payload length must be a whole number of sectors.")
+    with open_block_device(device, "r+b") as f:
+        f.seek(start_block * sector_size)
+        f.write(payload)
+        sync_block_device(f)
+
+
+def read_sector_from_device(device: str, block_index: int, sector_size: int = SECTOR_SIZE) -> bytes:
+    # Reads exactly one sector back for verification.
+    return read_blocks_from_device(device, block_index, 1, sector_size)
+
+
+def read_blocks_from_device(device: str, start_block: int, block_count: int, sector_size: int = SECTOR_SIZE) -> bytes:
+    # Reads a contiguous set of sectors back for verification.
+    total = block_count * sector_size
+    with open_block_device(device, "rb") as f:
+        f.seek(start_block * sector_size)
+        data = f.read(total)
+    if len(data) != total:
+        raise RuntimeError(
+            f"Could not read {block_count} full sectors from {device} starting at block {start_block}."
+        )
+    return data
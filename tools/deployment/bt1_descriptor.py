@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+BT1 boot descriptor sectors with an optional entry table.
+
+Sector layout (big-endian fields):
+  0x00..0x02  'B' 'T' '1'
+  0x03        flags. BT1_FLAG_TABLE marks an entry table, BT1_FLAG_LZ an
+              LZ-compressed payload (see lz_payload.py)
+  0x04..0x07  payload start block  \
+  0x08..0x09  load address          > the default entry, read by every ROM
+  0x0A..0x0B  sector count         /
+  0x0C        table entry count
+  0x0D        default entry index
+  0x10..0x11  LZ staging address
+  0x12..0x13  LZ uncompressed size
+  0x20..      entry table, BT1_ENTRY_SIZE bytes per entry
+
+Entry layout:
+  +0x00  payload start block (u32)
+  +0x04  load address (u16)
+  +0x06  sector count (u16)
+  +0x08  entry address (u16)
+  +0x0C  name, ASCII, NUL padded
+  +0x1E  CRC-16/CCITT-FALSE of bytes +0x00..+0x1D
+
+A bootstrap that only knows the original format still finds the default
+entry in bytes 0x04..0x0B. ASM/drivers/spi_sd/bt1_table.asm reads the table.
+
+Original version: May 2026
+Fadil Isamotu
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import List, Optional
+
+
+SECTOR_SIZE = 512
+BT1_MAGIC = b"BT1"
+BT1_FLAG_TABLE = 0x80
+BT1_FLAG_LZ = 0x40
+BT1_LZ_STAGING_OFFSET = 0x10
+BT1_LZ_SIZE_OFFSET = 0x12
+BT1_TABLE_OFFSET = 0x20
+BT1_ENTRY_SIZE = 0x20
+BT1_NAME_SIZE = 16
+BT1_CRC_OFFSET = 0x1E
+BT1_MAX_ENTRIES = (SECTOR_SIZE - BT1_TABLE_OFFSET) // BT1_ENTRY_SIZE
+
+
+@dataclass
+class BootEntry:
+    payload_block: int
+    load_addr: int
+    block_count: int
+    entry_addr: Optional[int] = None
+    name: str = ""
+
+    def start(self) -> int:
+        return self.load_addr if self.entry_addr is None else self.entry_addr
+
+
+def crc16_ccitt(data: bytes, crc: int = 0xFFFF) -> int:
+    # CRC-16/CCITT-FALSE, bit by bit, the same way bt1_table.asm computes it.
+    for byte in data:
+        crc ^= byte << 8
+        for _ in range(8):
+            crc = ((crc << 1) ^ 0x1021) if crc & 0x8000 else (crc << 1)
+            crc &= 0xFFFF
+    return crc
+
+
+def check_entry(entry: BootEntry) -> None:
+    if not (0 <= entry.payload_block <= 0xFFFFFFFF):
+        raise ValueError("payload_block must fit in 32 bits")
+    if not (0 <= entry.load_addr <= 0xFFFF):
+        raise ValueError("load_addr must fit in 16 bits")
+    if not (1 <= entry.block_count <= 0xFFFF):
+        raise ValueError("block_count must be 1..65535")
+    if not (0 <= entry.start() <= 0xFFFF):
+        raise ValueError("entry_addr must fit in 16 bits")
+    if len(entry.name.encode("ascii")) > BT1_NAME_SIZE:
+        raise ValueError(f"entry name must be at most {BT1_NAME_SIZE} ASCII characters")
+
+
+def pack_entry(entry: BootEntry) -> bytes:
+    check_entry(entry)
+    data = bytearray(BT1_ENTRY_SIZE)
+    data[0:4] = entry.payload_block.to_bytes(4, "big")
+    data[4:6] = entry.load_addr.to_bytes(2, "big")
+    data[6:8] = entry.block_count.to_bytes(2, "big")
+    data[8:10] = entry.start().to_bytes(2, "big")
+    name = entry.name.upper().encode("ascii")
+    data[12:12 + len(name)] = name
+    data[BT1_CRC_OFFSET:] = crc16_ccitt(bytes(data[:BT1_CRC_OFFSET])).to_bytes(2, "big")
+    return bytes(data)
+
+
+def build_table_descriptor(entries: List[BootEntry], default_index: int = 0, flags: int = 0) -> bytes:
+    # Builds one 512-byte BT1 sector carrying an entry table.
+    if not 1 <= len(entries) <= BT1_MAX_ENTRIES:
+        raise ValueError(f"a BT1 entry table holds 1..{BT1_MAX_ENTRIES} entries")
+    if not 0 <= default_index < len(entries):
+        raise ValueError(f"default entry must be 0..{len(entries) - 1}")
+    if not (0 <= flags <= 0xFF):
+        raise ValueError("flags must fit in 8 bits")
+    if flags & BT1_FLAG_LZ:
+        raise ValueError("entry table payloads are stored uncompressed")
+
+    default = entries[default_index]
+    data = bytearray(SECTOR_SIZE)
+    data[0:3] = BT1_MAGIC
+    data[3] = flags | BT1_FLAG_TABLE
+    data[4:8] = default.payload_block.to_bytes(4, "big")
+    data[8:10] = default.load_addr.to_bytes(2, "big")
+    data[10:12] = default.block_count.to_bytes(2, "big")
+    data[12] = len(entries)
+    data[13] = default_index
+    for number, entry in enumerate(entries):
+        base = BT1_TABLE_OFFSET + number * BT1_ENTRY_SIZE
+        data[base:base + BT1_ENTRY_SIZE] = pack_entry(entry)
+    return bytes(data)
+
+
+def mark_lz_descriptor(descriptor: bytes, staging_addr: int, size: int) -> bytes:
+    # Flags a single-payload descriptor as LZ-compressed. Its block count is
+    # the compressed sector count; the bootstrap loads those sectors at
+    # staging_addr and decompresses size bytes to the load address.
+    if descriptor[3] & BT1_FLAG_TABLE:
+        raise ValueError("entry table payloads are stored uncompressed")
+    if not (0 <= staging_addr <= 0xFFFF) or not (0 <= size <= 0xFFFF):
+        raise ValueError("LZ staging address and size must fit in 16 bits")
+    data = bytearray(descriptor)
+    data[3] |= BT1_FLAG_LZ
+    data[BT1_LZ_STAGING_OFFSET:BT1_LZ_STAGING_OFFSET + 2] = staging_addr.to_bytes(2, "big")
+    data[BT1_LZ_SIZE_OFFSET:BT1_LZ_SIZE_OFFSET + 2] = size.to_bytes(2, "big")
+    return bytes(data)
+
+
+def parse_descriptor(data: bytes) -> tuple[List[BootEntry], int]:
+    # Returns (entries, default index). A sector without a table reads as one entry.
+    if len(data) != SECTOR_SIZE or data[0:3] != BT1_MAGIC:
+        raise ValueError("not a BT1 descriptor sector")
+    if not data[3] & BT1_FLAG_TABLE:
+        entry = BootEntry(
+            int.from_bytes(data[4:8], "big"),
+            int.from_bytes(data[8:10], "big"),
+            int.from_bytes(data[10:12], "big"),
+        )
+        return [entry], 0
+
+    count = data[12]
+    if not 1 <= count <= BT1_MAX_ENTRIES or data[13] >= count:
+        raise ValueError("BT1 entry table header is out of range")
+    entries: List[BootEntry] = []
+    for number in range(count):
+        raw = data[BT1_TABLE_OFFSET + number * BT1_ENTRY_SIZE:][:BT1_ENTRY_SIZE]
+        if crc16_ccitt(raw[:BT1_CRC_OFFSET]) != int.from_bytes(raw[BT1_CRC_OFFSET:], "big"):
+            raise ValueError(f"BT1 entry {number} fails its CRC")
+        entries.append(
+            BootEntry(
+                int.from_bytes(raw[0:4], "big"),
+                int.from_bytes(raw[4:6], "big"),
+                int.from_bytes(raw[6:8], "big"),
+                int.from_bytes(raw[8:10], "big"),
+                raw[12:BT1_CRC_OFFSET].rstrip(b"\0").decode("ascii"),
+            )
+        )
+    return entries, data[13]
+
+
+def parse_entry_spec(value: str) -> BootEntry:
+    # BLOCK:LOAD:COUNT[:ENTRY[:NAME]], numbers in any int() base, e.g. 1003:0x0200:3:0x0200:MONITOR
+    parts = value.split(":")
+    if not 3 <= len(parts) <= 5:
+        raise ValueError(f"entry {value!r} must be BLOCK:LOAD:COUNT[:ENTRY[:NAME]]")
+    entry = BootEntry(int(parts[0], 0), int(parts[1], 0), int(parts[2], 0))
+    if len(parts) > 3 and parts[3]:
+        entry.entry_addr = int(parts[3], 0)
+    if len(parts) > 4:
+        entry.name = parts[4]
+    check_entry(entry)
+    return entry
+
+
+def describe_entries(entries: List[BootEntry], default_index: int) -> List[str]:
+    lines = []
+    for number, entry in enumerate(entries):
+        marker = "*" if number == default_index else " "
+        lines.append(
+            f"{marker}{number:X} {entry.name or '-':16s} block {entry.payload_block} "
+            f"load 0x{entry.load_addr:04X} count {entry.block_count} entry 0x{entry.start():04X}"
+        )
+    return lines
@@ -10,6 +10,9 @@ In SD mode, it automatically chooses between:
   - a one-sector path when the trimmed payload fits in 512 bytes
   - a BT1 multi-sector install path when the payload is larger
 
+With --compress the payload is stored LZ-compressed (see lz_payload.py)
+and always goes through the BT1 descriptor path.
+
 Original version: April 2026
 Updated: May 2026
 Fadil Isamotu
@@ -18,10 +21,6 @@ Fadil Isamotu
 from __future__ import annotations
 
 import argparse
-import ctypes
-import ctypes.wintypes as wintypes
-import os
-from contextlib import nullcontext
 import math
 import pathlib
 import re
@@ -30,6 +29,17 @@ import subprocess
 import sys
 from typing import List, Optional
 
+from block_io import (
+    lock_windows_volume,
+    read_blocks_from_device,
+    read_sector_from_device,
+    write_blocks_to_device,
+    write_sector_to_device,
+)
+from bt1_descriptor import BootEntry, build_table_descriptor, describe_entries, mark_lz_descriptor, parse_descriptor
+from lz_payload import compress, decompress, staging_address
+from sd_layout import check_region_fits, load_plan, plan_region
+
 
 # Matches bytes written like 0x12 inside customasm hexcomma output.
 HEX_BYTE_RE = re.compile(r"0x([0-9a-fA-F]{1,2})")
@@ -243,318 +253,43 @@ def build_bt1_descriptor(payload_block: int, load_addr: int, block_count: int, f
 
 
 
-class WindowsRawDevice:
-    # Small file-style wrapper for Windows raw disk HANDLE objects.
-    GENERIC_READ = 0x80000000
-    GENERIC_WRITE = 0x40000000
-    FILE_SHARE_READ = 0x00000001
-    FILE_SHARE_WRITE = 0x00000002
-    OPEN_EXISTING = 3
-    FILE_ATTRIBUTE_NORMAL = 0x00000080
-
-    def __init__(self, device: str, mode: str):
-        self.device = device
-        self.mode = mode
-        self.handle = None
-        self.writable = any(ch in mode for ch in "+wa")
-
-        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-        self.kernel32 = kernel32
-
-        kernel32.CreateFileW.argtypes = [
-            wintypes.LPCWSTR,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            wintypes.HANDLE,
-        ]
-        kernel32.CreateFileW.restype = wintypes.HANDLE
-        kernel32.SetFilePointerEx.argtypes = [
-            wintypes.HANDLE,
-            ctypes.c_longlong,
-            ctypes.POINTER(ctypes.c_longlong),
-            wintypes.DWORD,
-        ]
-        kernel32.SetFilePointerEx.restype = wintypes.BOOL
-        kernel32.ReadFile.argtypes = [
-            wintypes.HANDLE,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.DWORD),
-            wintypes.LPVOID,
-        ]
-        kernel32.ReadFile.restype = wintypes.BOOL
-        kernel32.WriteFile.argtypes = [
-            wintypes.HANDLE,
-            wintypes.LPCVOID,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.DWORD),
-            wintypes.LPVOID,
-        ]
-        kernel32.WriteFile.restype = wintypes.BOOL
-        kernel32.FlushFileBuffers.argtypes = [wintypes.HANDLE]
-        kernel32.FlushFileBuffers.restype = wintypes.BOOL
-        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
-        kernel32.CloseHandle.restype = wintypes.BOOL
-
-        access = self.GENERIC_READ
-        if self.writable:
-            access |= self.GENERIC_WRITE
-
-        handle = kernel32.CreateFileW(
-            device,
-            access,
-            self.FILE_SHARE_READ | self.FILE_SHARE_WRITE,
-            None,
-            self.OPEN_EXISTING,
-            self.FILE_ATTRIBUTE_NORMAL,
-            None,
-        )
-
-        if handle == wintypes.HANDLE(-1).value:
-            self._raise_last_error()
-
-        self.handle = handle
-
-    def _raise_last_error(self) -> None:
-        code = ctypes.get_last_error()
-        raise OSError(code, ctypes.FormatError(code), self.device)
-
-    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
-        new_pos = ctypes.c_longlong(0)
-        if not self.kernel32.SetFilePointerEx(
-            self.handle,
-            ctypes.c_longlong(offset),
-            ctypes.byref(new_pos),
-            whence,
-        ):
-            self._raise_last_error()
-        return new_pos.value
-
-    def read(self, size: int = -1) -> bytes:
-        if size < 0:
-            raise ValueError("Raw block-device reads require an explicit byte count.")
-
-        buffer = ctypes.create_string_buffer(size)
-        bytes_read = wintypes.DWORD(0)
-        if not self.kernel32.ReadFile(
-            self.handle,
-            buffer,
-            size,
-            ctypes.byref(bytes_read),
-            None,
-        ):
-            self._raise_last_error()
-        return buffer.raw[:bytes_read.value]
-
-    def write(self, data: bytes) -> int:
-        view = memoryview(data)
-        total = 0
-        while total < len(view):
-            chunk = view[total:total + 0x100000].tobytes()
-            buffer = ctypes.create_string_buffer(chunk)
-            bytes_written = wintypes.DWORD(0)
-            if not self.kernel32.WriteFile(
-                self.handle,
-                buffer,
-                len(chunk),
-                ctypes.byref(bytes_written),
-                None,
-            ):
-                self._raise_last_error()
-            total += bytes_written.value
-            if bytes_written.value != len(chunk):
-                raise OSError(f"Short write to {self.device}")
-        return total
-
-    def flush(self) -> None:
-        if self.writable and not self.kernel32.FlushFileBuffers(self.handle):
-            self._raise_last_error()
-
-    def close(self) -> None:
-        if self.handle is not None:
-            self.kernel32.CloseHandle(self.handle)
-            self.handle = None
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        self.close()
-        return False
-
-
-class WindowsVolumeLock:
-    # Windows volume lock remains open during raw disk access.
-    GENERIC_READ = 0x80000000
-    GENERIC_WRITE = 0x40000000
-    FILE_SHARE_READ = 0x00000001
-    FILE_SHARE_WRITE = 0x00000002
-    OPEN_EXISTING = 3
-    FILE_ATTRIBUTE_NORMAL = 0x00000080
-    FSCTL_LOCK_VOLUME = 0x00090018
-    FSCTL_UNLOCK_VOLUME = 0x0009001C
-    FSCTL_DISMOUNT_VOLUME = 0x00090020
-
-    def __init__(self, volume: str):
-        self.volume = volume.rstrip(r"\/")
-        self.handle = None
-
-        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-        self.kernel32 = kernel32
-
-        kernel32.CreateFileW.argtypes = [
-            wintypes.LPCWSTR,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            wintypes.HANDLE,
-        ]
-        kernel32.CreateFileW.restype = wintypes.HANDLE
-        kernel32.DeviceIoControl.argtypes = [
-            wintypes.HANDLE,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.DWORD),
-            wintypes.LPVOID,
-        ]
-        kernel32.DeviceIoControl.restype = wintypes.BOOL
-        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
-        kernel32.CloseHandle.restype = wintypes.BOOL
-
-        handle = kernel32.CreateFileW(
-            self.volume,
-            self.GENERIC_READ | self.GENERIC_WRITE,
-            self.FILE_SHARE_READ | self.FILE_SHARE_WRITE,
-            None,
-            self.OPEN_EXISTING,
-            self.FILE_ATTRIBUTE_NORMAL,
-            None,
-        )
-
-        if handle == wintypes.HANDLE(-1).value:
-            self._raise_last_error()
-
-        self.handle = handle
-        self._device_io_control(self.FSCTL_LOCK_VOLUME)
-        self._device_io_control(self.FSCTL_DISMOUNT_VOLUME)
-
-    def _raise_last_error(self) -> None:
-        code = ctypes.get_last_error()
-        raise OSError(code, ctypes.FormatError(code), self.volume)
-
-    def _device_io_control(self, code: int) -> None:
-        bytes_returned = wintypes.DWORD(0)
-        if not self.kernel32.DeviceIoControl(
-            self.handle,
-            code,
-            None,
-            0,
-            None,
-            0,
-            ctypes.byref(bytes_returned),
-            None,
-        ):
-            self._raise_last_error()
-
-    def close(self) -> None:
-        if self.handle is not None:
-            self.kernel32.DeviceIoControl(
-                self.handle,
-                self.FSCTL_UNLOCK_VOLUME,
-                None,
-                0,
-                None,
-                0,
-                ctypes.byref(wintypes.DWORD(0)),
-                None,
-            )
-            self.kernel32.CloseHandle(self.handle)
-            self.handle = None
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        self.close()
-        return False
-
-
-def lock_windows_volume(volume: Optional[str]):
-    if volume is None:
-        return nullcontext()
-    if os.name != "nt":
-        raise ValueError("--windows-lock-volume is only supported on Windows.")
-    return WindowsVolumeLock(volume)
-
-
-def is_windows_raw_device(device: str) -> bool:
-    windows_raw_prefix = "\\\\.\\"
-    return os.name == "nt" and device.startswith(windows_raw_prefix)
-
-
-def open_block_device(device: str, mode: str):
-    # Block-device access uses POSIX file paths on Linux and Win32 handles for Windows raw disks.
-    if is_windows_raw_device(device):
-        return WindowsRawDevice(device, mode)
-    return open(device, mode, buffering=0)
-
-
-
-
-def write_sector_to_device(device: str, block_index: int, sector: bytes) -> None:
-    # Writes exactly one 512-byte sector to the block device at the requested block offset.
-    if len(sector) != SECTOR_SIZE:
-        raise ValueError("Sector write currently expects exactly 512 bytes.")
-    offset = block_index * SECTOR_SIZE
-    with open_block_device(device, "r+b") as f:
-        f.seek(offset)
-        f.write(sector)
-
-
-
-def write_blocks_to_device(device: str, start_block: int, payload: bytes, sector_size: int = SECTOR_SIZE) -> None:
-    # Writes a whole multi-sector payload contiguously starting at start_block.
-    if len(payload) % sector_size != 0:
-        raise ValueError("Payload length must be a whole number of sectors.")
-    offset = start_block * sector_size
-    with open_block_device(device, "r+b") as f:
-        f.seek(offset)
-        f.write(payload)
-
-
-
-def read_sector_from_device(device: str, block_index: int, sector_size: int = SECTOR_SIZE) -> bytes:
-    # Reads exactly one sector back for verification.
-    offset = block_index * sector_size
-    with open_block_device(device, "rb") as f:
-        f.seek(offset)
-        data = f.read(sector_size)
-    if len(data) != sector_size:
-        raise RuntimeError(f"Could not read full sector from {device} at block {block_index}.")
-    return data
-
-
-
-def read_blocks_from_device(device: str, start_block: int, block_count: int, sector_size: int = SECTOR_SIZE) -> bytes:
-    # Reads a contiguous set of sectors back for verification.
-    total = block_count * sector_size
-    offset = start_block * sector_size
-    with open_block_device(device, "rb") as f:
-        f.seek(offset)
-        data = f.read(total)
-    if len(data) != total:
-        raise RuntimeError(
-            f"Could not read {block_count} full sectors from {device} starting at block {start_block}."
-        )
-    return data
+def build_table_entry_descriptor(
+    current: Optional[bytes],
+    index: int,
+    entry: BootEntry,
+    default_index: Optional[int],
+    new_table: bool = False,
+    where: str = "the descriptor block",
+) -> bytes:
+    # Puts entry into slot index of the BT1 table read from the card, keeping
+    # the other entries. index may be one past the last entry to append. A
+    # blank sector starts a new table; anything else that does not parse is
+    # refused unless new_table says to replace it.
+    entries: List[BootEntry] = []
+    keep_default = 0
+    if current is not None and any(current):
+        try:
+            entries, keep_default = parse_descriptor(current)
+        except ValueError as exc:
+            if not new_table:
+                raise ValueError(
+                    f"{where} does not hold a readable BT1 descriptor ({exc}). "
+                    "Check --descriptor-block, or pass --new-table to replace it with a table holding only this entry."
+                ) from None
+            print(f"Replacing {where} ({exc}) with a new entry table.")
+    elif new_table and current is not None:
+        print(f"{where} is blank; starting a new entry table.")
+    if new_table:
+        entries, keep_default = [], 0
+    if not 0 <= index <= len(entries):
+        raise ValueError(f"--entry-index must be 0..{len(entries)} for the descriptor on the card.")
+    if index == len(entries):
+        entries.append(entry)
+    else:
+        entries[index] = entry
+    if default_index is None:
+        default_index = keep_default
+    return build_table_descriptor(entries, default_index)
 
 
 
@@ -660,9 +395,48 @@ def sd_mode(args: argparse.Namespace) -> int:
 
     trimmed = trim_from_origin(all_bytes, origin, span_end)
     block_count = math.ceil(len(trimmed) / SECTOR_SIZE)
-    is_multisector = block_count > 1
+    if args.entry_index is None and (args.entry_name or args.entry_addr or args.default_entry is not None or args.new_table):
+        raise ValueError("--entry-name, --entry-addr, --default-entry and --new-table need --entry-index.")
+    if args.compress and args.entry_index is not None:
+        raise ValueError("--compress does not apply to BT1 entry table payloads.")
     load_addr = parse_int(args.load_addr) if args.load_addr else origin
+
+    # The compressed stream replaces the payload on the card; its sector
+    # count is what the bootstrap reads and what the layout has to hold.
+    lz_stream: Optional[bytes] = None
+    lz_staging: Optional[int] = None
+    if args.compress:
+        lz_stream = compress(bytes(trimmed))
+        if decompress(lz_stream) != bytes(trimmed):
+            raise ValueError("LZ round trip failed; deploy uncompressed.")
+        lz_blocks = math.ceil(len(lz_stream) / SECTOR_SIZE)
+        print(f"LZ stream: {len(lz_stream)} bytes, {lz_blocks} sectors instead of {block_count}")
+        if lz_blocks >= block_count:
+            print("Compression saves no sectors; writing the payload uncompressed.")
+            lz_stream = None
+        else:
+            lz_staging = staging_address(load_addr, lz_stream)
+            block_count = lz_blocks
+            print(f"LZ staging address: 0x{lz_staging:04X}")
+
+    # A BT1 entry table or a compressed payload always goes through the
+    # descriptor path, even for one sector.
+    is_multisector = block_count > 1 or args.entry_index is not None or lz_stream is not None
     descriptor_block = parse_int(args.descriptor_block) if args.descriptor_block else DEFAULT_DESCRIPTOR_BLOCK
+    if args.sd_layout is not None:
+        # Block numbers come from the layout plan instead of --block/--descriptor-block.
+        if args.block is not None:
+            raise ValueError("--sd-layout replaces --block. Pass one or the other.")
+        region = plan_region(load_plan(args.sd_layout), args.region or source.stem, "payload")
+        check_region_fits(region, block_count)
+        args.block = str(region["block"])
+        if is_multisector:
+            if "descriptor_block" not in region:
+                raise ValueError(f"Layout region {region['name']} has no descriptor; multi-sector payloads need one.")
+            descriptor_block = region["descriptor_block"]
+        print(f"Layout region {region['name']}: block {region['block']}, {block_count} of {region['capacity']} blocks")
+    elif args.region is not None:
+        raise ValueError("--region requires --sd-layout.")
     if args.windows_lock_volume and args.device is None:
         raise ValueError("--windows-lock-volume requires --device.")
 
@@ -720,10 +494,35 @@ def sd_mode(args: argparse.Namespace) -> int:
         if args.block is None:
             raise ValueError("Multi-sector SD mode requires --block for the payload start block.")
         payload_block = parse_int(args.block)
-        padded_payload = pad_payload_to_sector_boundary(trimmed, sector_size=SECTOR_SIZE)
-        padded_payload_out = out_dir / f"{source.stem}_payload_padded.bin"
+        if lz_stream is not None:
+            padded_payload = pad_payload_to_sector_boundary(list(lz_stream), sector_size=SECTOR_SIZE)
+            padded_payload_out = out_dir / f"{source.stem}_payload_lz.bin"
+        else:
+            padded_payload = pad_payload_to_sector_boundary(trimmed, sector_size=SECTOR_SIZE)
+            padded_payload_out = out_dir / f"{source.stem}_payload_padded.bin"
         padded_payload_out.write_bytes(padded_payload)
-        descriptor = build_bt1_descriptor(payload_block, load_addr, block_count)
+        if args.entry_index is None:
+            descriptor = build_bt1_descriptor(payload_block, load_addr, block_count)
+            if lz_stream is not None:
+                descriptor = mark_lz_descriptor(descriptor, lz_staging, len(trimmed))
+        else:
+            entry = BootEntry(
+                payload_block,
+                load_addr,
+                block_count,
+                parse_int(args.entry_addr) if args.entry_addr else None,
+                args.entry_name if args.entry_name is not None else source.stem.upper()[:16],
+            )
+            with lock_windows_volume(args.windows_lock_volume if args.device is not None else None):
+                current = read_sector_from_device(args.device, descriptor_block) if args.device is not None else None
+            descriptor = build_table_entry_descriptor(
+                current,
+                args.entry_index,
+                entry,
+                args.default_entry,
+                args.new_table,
+                f"Descriptor block {descriptor_block} on {args.device}",
+            )
         descriptor_out = out_dir / f"{source.stem}_bootdesc_bt1.bin"
         descriptor_out.write_bytes(descriptor)
 
@@ -732,6 +531,11 @@ def sd_mode(args: argparse.Namespace) -> int:
         print(f"Payload start block: {payload_block}")
         print(f"Descriptor block: {descriptor_block}")
         print(f"Load / entry address: 0x{load_addr:04X}")
+        if args.entry_index is not None:
+            entries, default_index = parse_descriptor(descriptor)
+            print(f"BT1 entry table: {len(entries)} entries, default {default_index}")
+            for line in describe_entries(entries, default_index):
+                print(f"  {line}")
 
         if args.device is not None:
             with lock_windows_volume(args.windows_lock_volume):
@@ -773,8 +577,13 @@ def sd_mode(args: argparse.Namespace) -> int:
         "device": device_value,
         "windows_lock_volume": args.windows_lock_volume if args.windows_lock_volume else "not used",
         "block": block_value,
+        "sd_layout": args.sd_layout if args.sd_layout else "not used",
         "load_address": f"0x{load_addr:04X}",
         "descriptor_block": str(descriptor_block),
+        "descriptor_entry": str(args.entry_index) if args.entry_index is not None else "not used",
+        "compression": "lz" if lz_stream is not None else "none",
+        "lz_stream_byte_count": str(len(lz_stream)) if lz_stream is not None else "not used",
+        "lz_staging_address": f"0x{lz_staging:04X}" if lz_staging is not None else "not used",
         "payload_readback_match": readback_match,
         "payload_readback_first_16_bytes": readback_first16,
         "payload_readback_last_16_bytes": readback_last16,
@@ -843,6 +652,44 @@ def build_parser() -> argparse.ArgumentParser:
         default=str(DEFAULT_DESCRIPTOR_BLOCK),
         help=f"Descriptor block for automatic BT1 multi-sector installs (default: {DEFAULT_DESCRIPTOR_BLOCK})",
     )
+    sd.add_argument(
+        "--sd-layout",
+        help="Layout plan from sd_layout.py. Sets the payload and descriptor blocks from the plan",
+    )
+    sd.add_argument(
+        "--region",
+        help="Payload region name in the --sd-layout plan. Defaults to the source file stem",
+    )
+    sd.add_argument(
+        "--entry-index",
+        type=int,
+        help="Write the payload into this slot of a BT1 entry table instead of a single-payload descriptor. "
+        "Other entries on the card are kept; one past the last entry appends",
+    )
+    sd.add_argument(
+        "--entry-name",
+        help="Entry table name, up to 16 characters. Defaults to the source file stem",
+    )
+    sd.add_argument(
+        "--entry-addr",
+        help="Entry table start address. Defaults to the load address",
+    )
+    sd.add_argument(
+        "--default-entry",
+        type=int,
+        help="Entry the ROM boots when the monitor has not asked for another. Defaults to the current one",
+    )
+    sd.add_argument(
+        "--new-table",
+        action="store_true",
+        help="Start a new entry table instead of editing the one on the card. "
+        "Needed when the descriptor block holds something that is not a readable BT1 descriptor",
+    )
+    sd.add_argument(
+        "--compress",
+        action="store_true",
+        help="Store the payload LZ-compressed. Needs the v2 bootstrap with lz_decompress.asm",
+    )
     sd.add_argument(
         "--load-addr",
         help="Descriptor load address for automatic BT1 multi-sector installs. Defaults to --origin.",
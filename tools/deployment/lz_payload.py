@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+LZ compression for BT1 SD payloads.
+
+The stream is a sequence of tokens, decoded by ASM/libs/lz_decompress.asm:
+  0x00                 end of stream
+  0x01..0x7F           literal run: that many bytes follow
+  0x80..0xBF  D        short match: (token & 0x3F) + 3 bytes from D + 1 back
+  0xC0..0xFF  DH DL    long match:  (token & 0x3F) + 3 bytes from DH:DL + 1 back
+
+Assembled F8-BB code repeats short opcode / operand patterns at small
+distances (MOV $A, 0x.. / OLD $A pairs, JSR to the same few routines), so
+most matches fit the two-byte short form.
+
+The bootstrap loads the compressed stream at a staging address above the
+load address and decompresses it in place. staging_gap() gives the
+smallest distance between the two that keeps the decoder's writes behind
+its reads.
+
+Original version: May 2026
+Fadil Isamotu
+"""
+
+from __future__ import annotations
+
+from typing import Dict, List, Tuple
+
+
+LZ_MIN_MATCH = 3
+LZ_MAX_MATCH = 0x3F + LZ_MIN_MATCH
+LZ_MAX_LITERALS = 0x7F
+LZ_SHORT_WINDOW = 0x100
+LZ_LONG_WINDOW = 0x10000
+
+SECTOR_SIZE = 512
+
+# Staged sectors must end below the stack page at the top of RAM.
+LZ_STAGING_LIMIT = 0xBF00
+
+# Hash-chain candidates checked per position. Payloads are at most a few
+# tens of KiB, so a deep search stays quick.
+LZ_CHAIN_LIMIT = 512
+
+
+def find_matches(data: bytes) -> List[Tuple[int, int, int, int]]:
+    # Per position: (short length, short distance, long length, long distance).
+    # A length of 0 means no match of at least LZ_MIN_MATCH bytes.
+    size = len(data)
+    chains: Dict[bytes, List[int]] = {}
+    found = []
+    for pos in range(size):
+        best_short = (0, 0)
+        best_long = (0, 0)
+        key = data[pos:pos + LZ_MIN_MATCH]
+        if len(key) == LZ_MIN_MATCH:
+            limit = min(LZ_MAX_MATCH, size - pos)
+            chain = chains.setdefault(key, [])
+            for cand in reversed(chain[-LZ_CHAIN_LIMIT:]):
+                distance = pos - cand
+                if distance > LZ_LONG_WINDOW:
+                    break
+                length = LZ_MIN_MATCH
+                # Overlapping matches are fine: the decoder copies byte by byte.
+                while length < limit and data[cand + length] == data[pos + length]:
+                    length += 1
+                if distance <= LZ_SHORT_WINDOW and length > best_short[0]:
+                    best_short = (length, distance)
+                if length > best_long[0]:
+                    best_long = (length, distance)
+                if best_short[0] == limit:
+                    break
+            chain.append(pos)
+        found.append((best_short[0], best_short[1], best_long[0], best_long[1]))
+    return found
+
+
+def compress(data: bytes) -> bytes:
+    # Shortest-path parse over literal and match steps. Each position keeps
+    # its cheapest arrival, with the literal run length it ends in, so
+    # literal run headers are counted where they are paid.
+    size = len(data)
+    matches = find_matches(data)
+    infinity = float("inf")
+    cost = [infinity] * (size + 1)
+    run = [0] * (size + 1)
+    step: List[Tuple[str, int, int]] = [("", 0, 0)] * (size + 1)
+    cost[0] = 0
+
+    for pos in range(size):
+        here = cost[pos]
+        if here == infinity:
+            continue
+
+        header = 1 if run[pos] % LZ_MAX_LITERALS == 0 else 0
+        if here + 1 + header < cost[pos + 1]:
+            cost[pos + 1] = here + 1 + header
+            run[pos + 1] = run[pos] + 1
+            step[pos + 1] = ("L", 1, 0)
+
+        short_len, short_dist, long_len, long_dist = matches[pos]
+        for length in range(LZ_MIN_MATCH, max(short_len, long_len) + 1):
+            if length <= short_len:
+                price, distance = 2, short_dist
+            else:
+                price, distance = 3, long_dist
+            if here + price < cost[pos + length]:
+                cost[pos + length] = here + price
+                run[pos + length] = 0
+                step[pos + length] = ("M", length, distance)
+
+    tokens: List[Tuple[str, int, int]] = []
+    pos = size
+    while pos > 0:
+        kind, length, distance = step[pos]
+        tokens.append((kind, length, distance))
+        pos -= length
+    tokens.reverse()
+
+    out = bytearray()
+    literals = bytearray()
+    pos = 0
+
+    def flush_literals() -> None:
+        for start in range(0, len(literals), LZ_MAX_LITERALS):
+            chunk = literals[start:start + LZ_MAX_LITERALS]
+            out.append(len(chunk))
+            out.extend(chunk)
+        literals.clear()
+
+    for kind, length, distance in tokens:
+        if kind == "L":
+            literals.append(data[pos])
+        else:
+            flush_literals()
+            if distance <= LZ_SHORT_WINDOW:
+                out.append(0x80 | (length - LZ_MIN_MATCH))
+                out.append(distance - 1)
+            else:
+                out.append(0xC0 | (length - LZ_MIN_MATCH))
+                out.extend((distance - 1).to_bytes(2, "big"))
+        pos += length
+    flush_literals()
+    out.append(0x00)
+    return bytes(out)
+
+
+def decompress(stream: bytes) -> bytes:
+    # Reference decoder, the same steps as lz_decompress.asm.
+    out = bytearray()
+    pos = 0
+    while True:
+        token = stream[pos]
+        pos += 1
+        if token == 0x00:
+            return bytes(out)
+        if token < 0x80:
+            out.extend(stream[pos:pos + token])
+            pos += token
+            continue
+        length = (token & 0x3F) + LZ_MIN_MATCH
+        if token & 0x40:
+            distance = int.from_bytes(stream[pos:pos + 2], "big") + 1
+            pos += 2
+        else:
+            distance = stream[pos] + 1
+            pos += 1
+        for _ in range(length):
+            out.append(out[-distance])
+
+
+def staging_gap(stream: bytes) -> int:
+    # Smallest staging - load distance for in-place decompression: after
+    # every token, the bytes written must not reach the next unread byte.
+    written = 0
+    gap = 0
+    pos = 0
+    while True:
+        token = stream[pos]
+        pos += 1
+        if token == 0x00:
+            return gap
+        if token < 0x80:
+            written += token
+            pos += token
+        else:
+            written += (token & 0x3F) + LZ_MIN_MATCH
+            pos += 2 if token & 0x40 else 1
+        gap = max(gap, written - pos)
+
+
+def staging_address(load_addr: int, stream: bytes) -> int:
+    # Lowest staging address for the stream. The bootstrap reads whole
+    # sectors, so the padded stream has to fit below LZ_STAGING_LIMIT.
+    staging = load_addr + staging_gap(stream)
+    padded = -(-len(stream) // SECTOR_SIZE) * SECTOR_SIZE
+    if staging + padded > LZ_STAGING_LIMIT:
+        raise ValueError(
+            f"Compressed payload needs RAM up to 0x{staging + padded:04X} for staging, "
+            f"past 0x{LZ_STAGING_LIMIT:04X}. Deploy it uncompressed."
+        )
+    return staging
@@ -2,7 +2,8 @@
 """
 BT1 boot descriptor generator for the F8-BB breadboard CPU.
 
-Creates a 512-byte BT1 descriptor sector for the SD bootstrap flow.
+Creates a 512-byte BT1 descriptor sector for the SD bootstrap flow, either
+for one payload or with an entry table of several payloads.
 
 Original version: April 2026
 Updated: May 2026
@@ -12,13 +13,12 @@ Fadil Isamotu
 from __future__ import annotations
 
 import argparse
-import ctypes
-import ctypes.wintypes as wintypes
-import os
-from contextlib import nullcontext
 import pathlib
 import sys
 
+from block_io import lock_windows_volume, read_sector_from_device, write_sector_to_device
+from bt1_descriptor import build_table_descriptor, describe_entries, parse_entry_spec
+
 
 def parse_int(value: str) -> int:
     return int(value, 0)
@@ -63,294 +63,18 @@ def write_file(path: pathlib.Path, data: bytes) -> None:
     path.write_bytes(data)
 
 
-class WindowsRawDevice:
-    # Small file-style wrapper for Windows raw disk HANDLE objects.
-    GENERIC_READ = 0x80000000
-    GENERIC_WRITE = 0x40000000
-    FILE_SHARE_READ = 0x00000001
-    FILE_SHARE_WRITE = 0x00000002
-    OPEN_EXISTING = 3
-    FILE_ATTRIBUTE_NORMAL = 0x00000080
-
-    def __init__(self, device: str, mode: str):
-        self.device = device
-        self.mode = mode
-        self.handle = None
-        self.writable = any(ch in mode for ch in "+wa")
-
-        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-        self.kernel32 = kernel32
-
-        kernel32.CreateFileW.argtypes = [
-            wintypes.LPCWSTR,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            wintypes.HANDLE,
-        ]
-        kernel32.CreateFileW.restype = wintypes.HANDLE
-        kernel32.SetFilePointerEx.argtypes = [
-            wintypes.HANDLE,
-            ctypes.c_longlong,
-            ctypes.POINTER(ctypes.c_longlong),
-            wintypes.DWORD,
-        ]
-        kernel32.SetFilePointerEx.restype = wintypes.BOOL
-        kernel32.ReadFile.argtypes = [
-            wintypes.HANDLE,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.DWORD),
-            wintypes.LPVOID,
-        ]
-        kernel32.ReadFile.restype = wintypes.BOOL
-        kernel32.WriteFile.argtypes = [
-            wintypes.HANDLE,
-            wintypes.LPCVOID,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.DWORD),
-            wintypes.LPVOID,
-        ]
-        kernel32.WriteFile.restype = wintypes.BOOL
-        kernel32.FlushFileBuffers.argtypes = [wintypes.HANDLE]
-        kernel32.FlushFileBuffers.restype = wintypes.BOOL
-        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
-        kernel32.CloseHandle.restype = wintypes.BOOL
-
-        access = self.GENERIC_READ
-        if self.writable:
-            access |= self.GENERIC_WRITE
-
-        handle = kernel32.CreateFileW(
-            device,
-            access,
-            self.FILE_SHARE_READ | self.FILE_SHARE_WRITE,
-            None,
-            self.OPEN_EXISTING,
-            self.FILE_ATTRIBUTE_NORMAL,
-            None,
-        )
-
-        if handle == wintypes.HANDLE(-1).value:
-            self._raise_last_error()
-
-        self.handle = handle
-
-    def _raise_last_error(self) -> None:
-        code = ctypes.get_last_error()
-        raise OSError(code, ctypes.FormatError(code), self.device)
-
-    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
-        new_pos = ctypes.c_longlong(0)
-        if not self.kernel32.SetFilePointerEx(
-            self.handle,
-            ctypes.c_longlong(offset),
-            ctypes.byref(new_pos),
-            whence,
-        ):
-            self._raise_last_error()
-        return new_pos.value
-
-    def read(self, size: int = -1) -> bytes:
-        if size < 0:
-            raise ValueError("Raw block-device reads require an explicit byte count.")
-
-        buffer = ctypes.create_string_buffer(size)
-        bytes_read = wintypes.DWORD(0)
-        if not self.kernel32.ReadFile(
-            self.handle,
-            buffer,
-            size,
-            ctypes.byref(bytes_read),
-            None,
-        ):
-            self._raise_last_error()
-        return buffer.raw[:bytes_read.value]
-
-    def write(self, data: bytes) -> int:
-        view = memoryview(data)
-        total = 0
-        while total < len(view):
-            chunk = view[total:total + 0x100000].tobytes()
-            buffer = ctypes.create_string_buffer(chunk)
-            bytes_written = wintypes.DWORD(0)
-            if not self.kernel32.WriteFile(
-                self.handle,
-                buffer,
-                len(chunk),
-                ctypes.byref(bytes_written),
-                None,
-            ):
-                self._raise_last_error()
-            total += bytes_written.value
-            if bytes_written.value != len(chunk):
-                raise OSError(f"Short write to {self.device}")
-        return total
-
-    def flush(self) -> None:
-        if self.writable and not self.kernel32.FlushFileBuffers(self.handle):
-            self._raise_last_error()
-
-    def close(self) -> None:
-        if self.handle is not None:
-            self.kernel32.CloseHandle(self.handle)
-            self.handle = None
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        self.close()
-        return False
-
-
-class WindowsVolumeLock:
-    # Windows volume lock remains open during raw disk access.
-    GENERIC_READ = 0x80000000
-    GENERIC_WRITE = 0x40000000
-    FILE_SHARE_READ = 0x00000001
-    FILE_SHARE_WRITE = 0x00000002
-    OPEN_EXISTING = 3
-    FILE_ATTRIBUTE_NORMAL = 0x00000080
-    FSCTL_LOCK_VOLUME = 0x00090018
-    FSCTL_UNLOCK_VOLUME = 0x0009001C
-    FSCTL_DISMOUNT_VOLUME = 0x00090020
-
-    def __init__(self, volume: str):
-        self.volume = volume.rstrip(r"\/")
-        self.handle = None
-
-        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-        self.kernel32 = kernel32
-
-        kernel32.CreateFileW.argtypes = [
-            wintypes.LPCWSTR,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            wintypes.HANDLE,
-        ]
-        kernel32.CreateFileW.restype = wintypes.HANDLE
-        kernel32.DeviceIoControl.argtypes = [
-            wintypes.HANDLE,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.DWORD),
-            wintypes.LPVOID,
-        ]
-        kernel32.DeviceIoControl.restype = wintypes.BOOL
-        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
-        kernel32.CloseHandle.restype = wintypes.BOOL
-
-        handle = kernel32.CreateFileW(
-            self.volume,
-            self.GENERIC_READ | self.GENERIC_WRITE,
-            self.FILE_SHARE_READ | self.FILE_SHARE_WRITE,
-            None,
-            self.OPEN_EXISTING,
-            self.FILE_ATTRIBUTE_NORMAL,
-            None,
-        )
-
-        if handle == wintypes.HANDLE(-1).value:
-            self._raise_last_error()
-
-        self.handle = handle
-        self._device_io_control(self.FSCTL_LOCK_VOLUME)
-        self._device_io_control(self.FSCTL_DISMOUNT_VOLUME)
-
-    def _raise_last_error(self) -> None:
-        code = ctypes.get_last_error()
-        raise OSError(code, ctypes.FormatError(code), self.volume)
-
-    def _device_io_control(self, code: int) -> None:
-        bytes_returned = wintypes.DWORD(0)
-        if not self.kernel32.DeviceIoControl(
-            self.handle,
-            code,
-            None,
-            0,
-            None,
-            0,
-            ctypes.byref(bytes_returned),
-            None,
-        ):
-            self._raise_last_error()
-
-    def close(self) -> None:
-        if self.handle is not None:
-            self.kernel32.DeviceIoControl(
-                self.handle,
-                self.FSCTL_UNLOCK_VOLUME,
-                None,
-                0,
-                None,
-                0,
-                ctypes.byref(wintypes.DWORD(0)),
-                None,
-            )
-            self.kernel32.CloseHandle(self.handle)
-            self.handle = None
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        self.close()
-        return False
-
-
-def lock_windows_volume(volume: str | None):
-    if volume is None:
-        return nullcontext()
-    if os.name != "nt":
-        raise ValueError("--windows-lock-volume is only supported on Windows.")
-    return WindowsVolumeLock(volume)
-
-
-def is_windows_raw_device(device: str) -> bool:
-    windows_raw_prefix = "\\\\.\\"
-    return os.name == "nt" and device.startswith(windows_raw_prefix)
-
-
-def open_block_device(device: str, mode: str):
-    # Block-device access uses POSIX file paths on Linux and Win32 handles for Windows raw disks.
-    if is_windows_raw_device(device):
-        return WindowsRawDevice(device, mode)
-    return open(device, mode, buffering=0)
-
-
-
-def write_sector_to_device(device: str, block_index: int, sector: bytes) -> None:
-    if len(sector) != 512:
-        raise ValueError("Sector must be exactly 512 bytes.")
-
-    with open_block_device(device, "r+b") as f:
-        f.seek(block_index * 512)
-        f.write(sector)
-
-
-def read_sector_from_device(device: str, block_index: int) -> bytes:
-    with open_block_device(device, "rb") as f:
-        f.seek(block_index * 512)
-        data = f.read(512)
-    if len(data) != 512:
-        raise RuntimeError(f"Could not read full 512-byte sector from {device} block {block_index}")
-    return data
-
-
 def main() -> int:
     parser = argparse.ArgumentParser(description="Create a BT1 boot descriptor sector file.")
-    parser.add_argument("--payload-block", required=True, type=parse_int, help="Payload block number, e.g. 1003 or 0x3EB")
-    parser.add_argument("--load-addr", required=True, type=parse_int, help="Payload load address, e.g. 0x0200")
-    parser.add_argument("--block-count", required=True, type=parse_int, help="Number of payload blocks, e.g. 1")
+    parser.add_argument("--payload-block", type=parse_int, help="Payload block number, e.g. 1003 or 0x3EB")
+    parser.add_argument("--load-addr", type=parse_int, help="Payload load address, e.g. 0x0200")
+    parser.add_argument("--block-count", type=parse_int, help="Number of payload blocks, e.g. 1")
+    parser.add_argument(
+        "--entry",
+        action="append",
+        default=[],
+        help="Entry table row BLOCK:LOAD:COUNT[:ENTRY[:NAME]], e.g. 1003:0x0200:3:0x0200:MONITOR. Repeat for each payload",
+    )
+    parser.add_argument("--default-entry", default="0", type=parse_int, help="Entry booted when nothing else is requested, default 0")
     parser.add_argument("--flags", default="0", type=parse_int, help="Descriptor flags byte, default 0")
     parser.add_argument("--out", default="bootdesc_v1.bin", help="Output descriptor file path")
     parser.add_argument("--device", help=r"Optional raw block device, e.g. /dev/mmcblk0 or \\.\PhysicalDrive5")
@@ -364,19 +88,33 @@ def main() -> int:
     args = parser.parse_args()
 
     out_path = pathlib.Path(args.out)
-    descriptor = build_descriptor(
-        payload_block=args.payload_block,
-        load_addr=args.load_addr,
-        block_count=args.block_count,
-        flags=args.flags,
-    )
+    single = (args.payload_block, args.load_addr, args.block_count)
+    if args.entry:
+        if any(value is not None for value in single):
+            raise ValueError("--entry replaces --payload-block, --load-addr and --block-count.")
+        entries = [parse_entry_spec(value) for value in args.entry]
+        descriptor = build_table_descriptor(entries, args.default_entry, args.flags)
+    else:
+        if any(value is None for value in single):
+            raise ValueError("Give --payload-block, --load-addr and --block-count, or one --entry per payload.")
+        descriptor = build_descriptor(
+            payload_block=args.payload_block,
+            load_addr=args.load_addr,
+            block_count=args.block_count,
+            flags=args.flags,
+        )
 
     write_file(out_path, descriptor)
 
     print(f"Wrote descriptor file: {out_path}")
-    print(f"Payload block: {args.payload_block} (0x{args.payload_block:08X})")
-    print(f"Load address:  0x{args.load_addr:04X}")
-    print(f"Block count:   {args.block_count}")
+    if args.entry:
+        print(f"Entry table: {len(entries)} entries, default {args.default_entry}")
+        for line in describe_entries(entries, args.default_entry):
+            print(f"  {line}")
+    else:
+        print(f"Payload block: {args.payload_block} (0x{args.payload_block:08X})")
+        print(f"Load address:  0x{args.load_addr:04X}")
+        print(f"Block count:   {args.block_count}")
     print(f"First 16 bytes: {format_preview(descriptor, 16)}")
 
     if args.windows_lock_volume and not args.device:
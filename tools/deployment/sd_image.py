@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+SD card image helper for the F8-BB breadboard CPU.
+
+Lets a card be provisioned offline: create a sparse image file, pass it as
+--device to deploy_asm.py, make_bootdesc.py and video_to_oled_sd_delta.py,
+then flash the finished image to a real card in one sequential pass.
+
+Only the blocks the tools wrote take up space in the image, and only those
+blocks are flashed. The tools record every block range they write in
+<image>.written, zeros included, so a zero block that stayed a hole in the
+image still overwrites the card. Blocks that were never written are left
+untouched on the card.
+
+Original version: May 2026
+Fadil Isamotu
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+from block_io import (
+    SECTOR_SIZE,
+    load_written_blocks,
+    lock_windows_volume,
+    open_block_device,
+    sync_block_device,
+    written_record_path,
+)
+
+
+SIZE_SUFFIXES = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+# Flash transfer size. Large enough to keep the card streaming.
+DEFAULT_CHUNK_MIB = 4
+
+
+def eprint(*args, **kwargs) -> None:
+    print(*args, file=sys.stderr, **kwargs)
+
+
+def parse_size(value: str) -> int:
+    # Accepts a byte count or a K/M/G suffix, e.g. 2G or 512M.
+    text = value.strip().upper().rstrip("B").rstrip("I")
+    scale = SIZE_SUFFIXES.get(text[-1:], 1)
+    if scale != 1:
+        text = text[:-1]
+    size = int(text, 0) * scale
+    if size <= 0 or size % SECTOR_SIZE:
+        raise argparse.ArgumentTypeError(f"size must be a positive multiple of {SECTOR_SIZE} bytes")
+    return size
+
+
+def data_extents(path: str) -> List[Tuple[int, int]]:
+    # Returns (offset, length) for each allocated run of the image, in order.
+    # Without SEEK_DATA the image is scanned and all-zero chunks count as holes.
+    size = os.path.getsize(path)
+    extents: List[Tuple[int, int]] = []
+    with open(path, "rb", buffering=0) as f:
+        if hasattr(os, "SEEK_DATA"):
+            fd = f.fileno()
+            offset = 0
+            while offset < size:
+                try:
+                    start = os.lseek(fd, offset, os.SEEK_DATA)
+                except OSError:
+                    break
+                end = min(os.lseek(fd, start, os.SEEK_HOLE), size)
+                start -= start % SECTOR_SIZE
+                extents.append((start, end - start))
+                offset = end
+            return extents
+
+        chunk = DEFAULT_CHUNK_MIB << 20
+        zero = bytes(chunk)
+        offset = 0
+        while offset < size:
+            data = f.read(chunk)
+            if data != zero[:len(data)]:
+                if extents and extents[-1][0] + extents[-1][1] == offset:
+                    extents[-1] = (extents[-1][0], extents[-1][1] + len(data))
+                else:
+                    extents.append((offset, len(data)))
+            offset += len(data)
+    return extents
+
+
+def written_extents(path: str) -> List[Tuple[int, int]]:
+    # Extents to flash: the blocks recorded in <image>.written, plus any
+    # allocated data the record does not cover (e.g. written by another tool).
+    extents = [(first * SECTOR_SIZE, count * SECTOR_SIZE) for first, count in load_written_blocks(path)]
+    merged: List[Tuple[int, int]] = []
+    for offset, length in sorted(extents + data_extents(path)):
+        if merged and offset <= merged[-1][0] + merged[-1][1]:
+            end = max(merged[-1][0] + merged[-1][1], offset + length)
+            merged[-1] = (merged[-1][0], end - merged[-1][0])
+        else:
+            merged.append((offset, length))
+    return merged
+
+
+def device_size(device: str) -> Optional[int]:
+    # Size in bytes of a block device or image, or None when it cannot be read.
+    try:
+        fd = os.open(device, os.O_RDONLY)
+    except OSError:
+        return None
+    try:
+        return os.lseek(fd, 0, os.SEEK_END)
+    except OSError:
+        return None
+    finally:
+        os.close(fd)
+
+
+def format_extent(offset: int, length: int) -> str:
+    first = offset // SECTOR_SIZE
+    last = (offset + length) // SECTOR_SIZE - 1
+    return f"blocks {first}..{last} ({length // 1024} KiB)"
+
+
+def create_mode(args: argparse.Namespace) -> int:
+    if os.path.exists(args.image) and not args.force:
+        raise ValueError(f"{args.image} already exists. Pass --force to replace it.")
+    with open(args.image, "wb") as f:
+        f.truncate(args.size)
+    if os.path.exists(written_record_path(args.image)):
+        os.remove(written_record_path(args.image))
+    print(f"Created sparse image: {args.image}")
+    print(f"Size: {args.size // SECTOR_SIZE} blocks ({args.size / (1 << 20):.1f} MiB)")
+    return 0
+
+
+def info_mode(args: argparse.Namespace) -> int:
+    size = os.path.getsize(args.image)
+    extents = written_extents(args.image)
+    used = sum(length for _, length in extents)
+    print(f"Image: {args.image}")
+    print(f"Size: {size // SECTOR_SIZE} blocks ({size / (1 << 20):.1f} MiB)")
+    print(f"Written: {used // 1024} KiB in {len(extents)} extents")
+    for offset, length in extents:
+        print(f"  {format_extent(offset, length)}")
+    return 0
+
+
+def flash_mode(args: argparse.Namespace) -> int:
+    extents = written_extents(args.image)
+    total = sum(length for _, length in extents)
+    if not extents:
+        print(f"{args.image} has no written blocks; nothing to flash")
+        return 0
+
+    end = extents[-1][0] + extents[-1][1]
+    target_size = device_size(args.device)
+    if target_size is not None and target_size < end:
+        raise ValueError(
+            f"{args.device} holds {target_size // SECTOR_SIZE} blocks but the image writes up to block {end // SECTOR_SIZE - 1}"
+        )
+
+    chunk = args.chunk_mib << 20
+    print(f"Flashing {total // 1024} KiB in {len(extents)} extents from {args.image} to {args.device}")
+    written = 0
+    started = time.perf_counter()
+    with lock_windows_volume(args.windows_lock_volume):
+        with open_block_device(args.image, "rb") as image, open_block_device(args.device, "r+b") as device:
+            for offset, length in extents:
+                for position in range(offset, offset + length, chunk):
+                    count = min(chunk, offset + length - position)
+                    image.seek(position)
+                    device.seek(position)
+                    device.write(image.read(count))
+                    written += count
+                    elapsed = max(time.perf_counter() - started, 1e-9)
+                    print(
+                        f"\r  {written // 1024}/{total // 1024} KiB, {written / 1048576 / elapsed:.2f} MiB/s",
+                        end="",
+                        flush=True,
+                    )
+            sync_block_device(device)
+        print()
+        elapsed = time.perf_counter() - started
+        print(f"Flashed {written // 1024} KiB in {elapsed:.2f}s")
+
+        if not args.verify:
+            return 0
+        mismatches = 0
+        with open_block_device(args.image, "rb") as image, open_block_device(args.device, "rb") as device:
+            for offset, length in extents:
+                for position in range(offset, offset + length, chunk):
+                    count = min(chunk, offset + length - position)
+                    image.seek(position)
+                    device.seek(position)
+                    if device.read(count) != image.read(count):
+                        mismatches += 1
+                        eprint(f"Mismatch in {format_extent(position, count)}")
+    print(f"Readback matches: {'yes' if mismatches == 0 else 'no'}")
+    return 0 if mismatches == 0 else 2
+
+
+def build_parser() -> argparse.ArgumentParser:
+    # CLI layout:
+    #   sd_image.py create IMAGE --size 2G
+    #   sd_image.py info   IMAGE
+    #   sd_image.py flash  IMAGE DEVICE
+    parser = argparse.ArgumentParser(description="Create, inspect and flash sparse SD card images.")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    create = sub.add_parser("create", help="Create an empty sparse card image")
+    create.add_argument("image", help="Image file to create")
+    create.add_argument("--size", required=True, type=parse_size, help="Card size, e.g. 2G, 512M or a byte count")
+    create.add_argument("--force", action="store_true", help="Replace an existing image")
+
+    info = sub.add_parser("info", help="List the written extents of an image")
+    info.add_argument("image", help="Image file to inspect")
+
+    flash = sub.add_parser("flash", help="Write the written extents of an image to a card")
+    flash.add_argument("image", help="Image file to flash")
+    flash.add_argument("device", help=r"Target block device, e.g. /dev/mmcblk0 or \\.\PhysicalDrive5")
+    flash.add_argument(
+        "--windows-lock-volume",
+        help=r"Optional Windows volume GUID to lock during direct raw-disk writes, e.g. \\?\Volume{...}",
+    )
+    flash.add_argument(
+        "--chunk-mib",
+        type=int,
+        default=DEFAULT_CHUNK_MIB,
+        help=f"Transfer size in MiB (default: {DEFAULT_CHUNK_MIB})",
+    )
+    flash.add_argument("--verify", action="store_true", help="Read the flashed extents back and compare them")
+
+    return parser
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+    try:
+        if args.mode == "create":
+            return create_mode(args)
+        if args.mode == "info":
+            return info_mode(args)
+        if args.mode == "flash":
+            if args.chunk_mib < 1:
+                raise ValueError("--chunk-mib must be 1 or greater")
+            return flash_mode(args)
+        raise ValueError(f"Unknown mode: {args.mode}")
+    except Exception as e:
+        eprint(f"Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+SD card layout planner for the F8-BB breadboard CPU.
+
+Reads a JSON card description listing every BT1 descriptor, RAM payload and
+video region, sizes each one from its build output, and assigns it a block
+extent. deploy_asm.py sd mode and video_to_oled_sd_delta.py take the
+resulting plan with --sd-layout instead of hand-picked block numbers, and
+refuse to write a build that has outgrown its extent.
+
+The plan is written next to the card image. Planning again reuses each
+region's extent while the build still fits, so incremental updates only
+move the regions that grew.
+
+Original version: May 2026
+Fadil Isamotu
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import pathlib
+import sys
+from typing import Dict, List, Optional, Tuple
+
+
+SECTOR_SIZE = 512
+PLAN_VERSION = 1
+
+# The bootstrap ROM always reads its BT1 descriptor from this block.
+DEFAULT_DESCRIPTOR_BLOCK = 1002
+
+# Nothing is allocated below the descriptor block unless a region pins it.
+DEFAULT_FIRST_BLOCK = DEFAULT_DESCRIPTOR_BLOCK
+
+REGION_KINDS = ("descriptor", "payload", "video")
+
+
+def eprint(*args, **kwargs) -> None:
+    print(*args, file=sys.stderr, **kwargs)
+
+
+def align_up(value: int, alignment: int) -> int:
+    return (value + alignment - 1) // alignment * alignment
+
+
+def region_blocks(spec: dict, base_dir: pathlib.Path) -> int:
+    # Blocks a region needs now: its build output rounded up to whole sectors,
+    # or an explicit "blocks" count, whichever is larger.
+    if spec["kind"] == "descriptor":
+        return 1
+    blocks = int(spec.get("blocks", 0))
+    source = spec.get("source")
+    if source is not None:
+        path = base_dir / source
+        if path.is_file():
+            blocks = max(blocks, math.ceil(path.stat().st_size / SECTOR_SIZE))
+        elif blocks == 0:
+            raise ValueError(f"Region {spec['name']}: {path} does not exist yet. Build it first or give \"blocks\".")
+    if blocks < 1:
+        raise ValueError(f"Region {spec['name']} needs a \"source\" or a positive \"blocks\" count.")
+    return blocks
+
+
+def load_description(path: pathlib.Path) -> dict:
+    description = json.loads(path.read_text(encoding="utf-8"))
+    names = set()
+    for spec in description.get("regions", []):
+        name = spec.get("name")
+        if not name:
+            raise ValueError("Every region needs a name.")
+        if name in names:
+            raise ValueError(f"Region {name} is declared twice.")
+        names.add(name)
+        if spec.get("kind") not in REGION_KINDS:
+            raise ValueError(f"Region {name}: kind must be one of {', '.join(REGION_KINDS)}.")
+    for spec in description.get("regions", []):
+        descriptor = spec.get("descriptor")
+        if descriptor is None:
+            continue
+        target = next((item for item in description["regions"] if item["name"] == descriptor), None)
+        if target is None or target["kind"] != "descriptor":
+            raise ValueError(f"Region {spec['name']}: descriptor {descriptor} is not a descriptor region.")
+    return description
+
+
+def load_plan(path: pathlib.Path) -> dict:
+    plan = json.loads(pathlib.Path(path).read_text(encoding="utf-8"))
+    if plan.get("version") != PLAN_VERSION:
+        raise ValueError(f"{path} is not a version {PLAN_VERSION} layout plan.")
+    return plan
+
+
+def plan_region(plan: dict, name: str, kind: str) -> dict:
+    # Looks up one region of a plan for a consumer tool.
+    region = next((item for item in plan["regions"] if item["name"] == name), None)
+    if region is None:
+        raise ValueError(f"Layout plan has no region named {name}.")
+    if region["kind"] != kind:
+        raise ValueError(f"Layout region {name} is a {region['kind']} region, not {kind}.")
+    return region
+
+
+def check_region_fits(region: dict, blocks: int) -> None:
+    # Stops a build that grew past its extent from overwriting the next region.
+    if blocks > region["capacity"]:
+        raise ValueError(
+            f"{region['name']} needs {blocks} blocks but its layout extent at block {region['block']} "
+            f"holds {region['capacity']}. Rebuild the layout plan with sd_layout.py plan."
+        )
+
+
+def find_free_extent(occupied: List[Tuple[int, int, str]], first_block: int, blocks: int, alignment: int) -> int:
+    # First fit: the lowest aligned start at or after first_block with room.
+    # Regions are placed in declaration order, so ones read together sit
+    # next to each other on the card.
+    start = align_up(first_block, alignment)
+    for used_start, used_end, _ in sorted(occupied):
+        if used_end <= start:
+            continue
+        if start + blocks <= used_start:
+            break
+        start = align_up(used_end, alignment)
+    return start
+
+
+def overlap(occupied: List[Tuple[int, int, str]], start: int, end: int) -> Optional[str]:
+    for used_start, used_end, name in occupied:
+        if start < used_end and used_start < end:
+            return name
+    return None
+
+
+def build_plan(description: dict, base_dir: pathlib.Path, previous: Optional[dict], card_blocks: Optional[int]) -> Tuple[dict, Dict[str, str]]:
+    # Returns the new plan and a status per region: pinned, kept, resized, moved, or new.
+    first_block = int(description.get("first_block", DEFAULT_FIRST_BLOCK))
+    card_blocks = description.get("card_blocks", card_blocks)
+    old = {item["name"]: item for item in previous["regions"]} if previous else {}
+
+    specs = description.get("regions", [])
+    needs = {spec["name"]: region_blocks(spec, base_dir) for spec in specs}
+    placed: Dict[str, dict] = {}
+    status: Dict[str, str] = {}
+    occupied: List[Tuple[int, int, str]] = []
+
+    def place(spec: dict, block: int, capacity: int, state: str) -> None:
+        placed[spec["name"]] = {
+            "name": spec["name"],
+            "kind": spec["kind"],
+            "block": block,
+            "blocks": needs[spec["name"]],
+            "capacity": capacity,
+        }
+        if spec.get("source") is not None:
+            placed[spec["name"]]["source"] = spec["source"]
+        occupied.append((block, block + capacity, spec["name"]))
+        status[spec["name"]] = state
+
+    # Pinned regions first. Descriptors default to the block the ROM reads.
+    for spec in specs:
+        block = spec.get("block")
+        if block is None and spec["kind"] == "descriptor":
+            block = DEFAULT_DESCRIPTOR_BLOCK
+        if block is None:
+            continue
+        capacity = needs[spec["name"]] + int(spec.get("reserve_blocks", 0))
+        clash = overlap(occupied, int(block), int(block) + capacity)
+        if clash is not None:
+            raise ValueError(f"Pinned region {spec['name']} at block {block} overlaps {clash}.")
+        place(spec, int(block), capacity, "pinned")
+
+    # Then every region whose build still fits its previous extent.
+    for spec in specs:
+        item = old.get(spec["name"])
+        if spec["name"] in placed or item is None or item["kind"] != spec["kind"]:
+            continue
+        wanted = needs[spec["name"]] + int(spec.get("reserve_blocks", 0))
+        alignment = int(spec.get("align_blocks", 1))
+        if wanted > item["capacity"] or item["block"] % alignment or item["block"] < first_block:
+            continue
+        if overlap(occupied, item["block"], item["block"] + item["capacity"]) is not None:
+            continue
+        place(spec, item["block"], item["capacity"], "kept")
+
+    # Everything else goes in the first free extent that fits.
+    for spec in specs:
+        if spec["name"] in placed:
+            continue
+        capacity = needs[spec["name"]] + int(spec.get("reserve_blocks", 0))
+        block = find_free_extent(occupied, first_block, capacity, int(spec.get("align_blocks", 1)))
+        if spec["name"] not in old:
+            state = "new"
+        else:
+            state = "resized" if old[spec["name"]]["block"] == block else "moved"
+        place(spec, block, capacity, state)
+
+    for spec in specs:
+        region = placed[spec["name"]]
+        if spec.get("descriptor") is not None:
+            region["descriptor_block"] = placed[spec["descriptor"]]["block"]
+        end = region["block"] + region["capacity"]
+        if card_blocks is not None and end > card_blocks:
+            raise ValueError(f"Region {spec['name']} ends at block {end - 1}, past the {card_blocks}-block card.")
+
+    plan = {
+        "version": PLAN_VERSION,
+        "first_block": first_block,
+        "card_blocks": card_blocks,
+        "regions": sorted(placed.values(), key=lambda item: item["block"]),
+    }
+    return plan, status
+
+
+def default_plan_path(args: argparse.Namespace) -> pathlib.Path:
+    if args.out is not None:
+        return pathlib.Path(args.out)
+    if args.image is not None:
+        return pathlib.Path(f"{args.image}.layout.json")
+    return pathlib.Path(args.description).with_suffix(".plan.json")
+
+
+def print_plan(plan: dict, status: Optional[Dict[str, str]] = None) -> None:
+    for region in plan["regions"]:
+        end = region["block"] + region["capacity"] - 1
+        line = (
+            f"  {region['name']:16s} {region['kind']:10s} blocks {region['block']}..{end} "
+            f"({region['blocks']} used of {region['capacity']})"
+        )
+        if "descriptor_block" in region:
+            line += f", descriptor {region['descriptor_block']}"
+        if status is not None:
+            line += f" [{status[region['name']]}]"
+        print(line)
+
+
+def plan_mode(args: argparse.Namespace) -> int:
+    description_path = pathlib.Path(args.description)
+    description = load_description(description_path)
+    plan_path = default_plan_path(args)
+
+    previous = None
+    if plan_path.is_file() and not args.fresh:
+        previous = load_plan(plan_path)
+
+    card_blocks = None
+    if args.image is not None and os.path.isfile(args.image):
+        card_blocks = os.path.getsize(args.image) // SECTOR_SIZE
+
+    plan, status = build_plan(description, description_path.parent, previous, card_blocks)
+    plan_path.parent.mkdir(parents=True, exist_ok=True)
+    plan_path.write_text(json.dumps(plan, indent=2) + "\n", encoding="utf-8")
+
+    print(f"Wrote layout plan: {plan_path}")
+    print_plan(plan, status)
+    return 0
+
+
+def show_mode(args: argparse.Namespace) -> int:
+    plan = load_plan(pathlib.Path(args.plan))
+    print(f"Layout plan: {args.plan}")
+    print_plan(plan)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    # CLI layout:
+    #   sd_layout.py plan CARD.json [--image card.img | --out plan.json]
+    #   sd_layout.py show PLAN
+    parser = argparse.ArgumentParser(description="Plan block extents for everything stored on an SD card.")
+    sub = parser.add_subparsers(dest="mode", required=True)
+
+    plan = sub.add_parser("plan", help="Assign block extents from a card description")
+    plan.add_argument("description", help="JSON card description")
+    plan.add_argument("--image", help="Card image the plan belongs to. The plan is stored as <image>.layout.json")
+    plan.add_argument("--out", help="Plan path. Overrides the one derived from --image")
+    plan.add_argument("--fresh", action="store_true", help="Ignore the existing plan and pack every region again")
+
+    show = sub.add_parser("show", help="Print an existing plan")
+    show.add_argument("plan", help="Layout plan file")
+
+    return parser
+
+
+def main() -> int:
+    parser = build_parser()
+    args = parser.parse_args()
+    try:
+        if args.mode == "plan":
+            return plan_mode(args)
+        if args.mode == "show":
+            return show_mode(args)
+        raise ValueError(f"Unknown mode: {args.mode}")
+    except Exception as e:
+        eprint(f"Error: {e}")
+        return 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
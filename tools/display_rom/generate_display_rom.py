@@ -1,79 +1,355 @@
-import array
+import argparse
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise SystemExit("NumPy is required: python -m pip install numpy") from exc
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+REFERENCE_ROM = REPO_ROOT / "generated" / "display_rom" / "segmented_display_rom.bin"
+
+# Images compiled from a --modes description go here unless --out says otherwise, so they never
+# replace the board's image by accident.
+BUILD_DIR = REPO_ROOT / "build" / "display_rom"
+
+# Defines the segment patterns for the digits on a 14-segment display.
+# I modified the the pattern for digits 0, 1, and 5 from the way they are typically represented.
+DIGITS = np.array([0x3f, 0x6, 0xdb, 0x8f, 0xe6, 0xed, 0xfd, 0x7, 0xff, 0xef], dtype="<u2")
+
+# Segment pattern for the minus sign.
+SIGN = 0xc0
+
+# Constants for the ROM's output mode and the ROM size.
+OUTPUT_WORD_SIZE = 16
+ROM_SIZE = 2**OUTPUT_WORD_SIZE
+
+# Number of digits used, excluding sign digit.
+DISPLAY_DIGITS = 5
+
+# Deducting the number of unused states.
+DECODER_SELECTS = 3
+DECODER_STATES = 2**DECODER_SELECTS
+UNUSED_STATES = DECODER_STATES - (DISPLAY_DIGITS + 1)
+
+# Address lines above the decoder selects pick a bank of DECODER_STATES blocks. The board has one,
+# SdM (Signed/_Unsigned), so bank 0 is unsigned and bank 1 signed.
+MODE_BITS = 1
+
+# Segment bits of the 14-segment displays:
+#
+#      ---a---
+#     |\  |  /|
+#     f h j k b
+#     |  \|/  |
+#      -g1-g2-
+#     |  /|\  |
+#     e l m n c
+#     |/  |  \|
+#      ---d---   dp
+SEGMENTS = {
+    "a": 0, "b": 1, "c": 2, "d": 3, "e": 4, "f": 5, "g1": 6, "g2": 7,
+    "h": 8, "j": 9, "k": 10, "l": 11, "m": 12, "n": 13, "dp": 14,
+}
+
+HEX_LETTERS = ["a b c e f g1 g2", "c d e f g1 g2", "a d e f", "b c d e g1 g2", "a d e f g1 g2", "a e f g1 g2"]
+
+# Upper-case text. Lower case is drawn with the same patterns; anything else is blank.
+TEXT_SEGMENTS = {
+    " ": "", "-": "g1 g2", "_": "d", "=": "d g1 g2", "+": "g1 g2 j m", "*": "g1 g2 h j k l m n",
+    "/": "k l", "\\": "h n", "'": "j", "\"": "b j", "(": "k n", ")": "h l", ".": "dp",
+    "A": "a b c e f g1 g2", "B": "a b c d g2 j m", "C": "a d e f", "D": "a b c d j m",
+    "E": "a d e f g1 g2", "F": "a e f g1", "G": "a c d e f g2", "H": "b c e f g1 g2",
+    "I": "a d j m", "J": "b c d e", "K": "e f g1 k n", "L": "d e f",
+    "M": "b c e f h k", "N": "b c e f h n", "O": "a b c d e f", "P": "a b e f g1 g2",
+    "Q": "a b c d e f n", "R": "a b e f g1 g2 n", "S": "a c d f g1 g2", "T": "a j m",
+    "U": "b c d e f", "V": "e f k l", "W": "b c e f l n", "X": "h k l n",
+    "Y": "h k m", "Z": "a d k l",
+}
+
+# Signedness of the 16-bit value a mode displays:
+#   false  - unsigned, 0 to 65535
+#   twos   - two's complement, 0xFFFF shows -1
+#   excess - excess-32768, 0x0000 shows -32768 and 0x8000 shows 0
+SIGNEDNESS = (False, "twos", "excess")
+
+# The modes on the board. The signed half has always been excess-32768, so it stays that way here
+# to keep the image identical.
+DEFAULT_MODES = [
+    {"name": "unsigned", "radix": 10, "glyphs": "decimal", "bank": 0},
+    {"name": "signed", "radix": 10, "glyphs": "decimal", "signed": "excess", "bank": 1},
+]
+
+
+def segments(spec):
+    # Segment pattern for a space-separated list of segment names.
+    return sum(1 << SEGMENTS[name] for name in spec.split())
+
+
+def glyph_set(name):
+    # Patterns indexed by digit value; None where a digit has no glyph.
+    if name == "decimal":
+        return [int(pattern) for pattern in DIGITS]
+    if name == "hex":
+        return [int(pattern) for pattern in DIGITS] + [segments(spec) for spec in HEX_LETTERS]
+    if name == "text":
+        table = [None] * 128
+        for ch, spec in TEXT_SEGMENTS.items():
+            table[ord(ch)] = table[ord(ch.lower())] = segments(spec)
+        return table
+    raise ValueError(f"unknown glyph set {name!r}; expected decimal, hex, text or a list of patterns")
+
+
+@dataclass(frozen=True)
+class Mode:
+    """One way of showing the 16-bit value, e.g. unsigned decimal or hex."""
+
+    name: str
+    radix: int
+    glyphs: tuple
+    signed: object = False
+    blank_leading_zeros: bool = False
+    places: int = 0
+    # Bank the mode is pinned to, with place i at decoder state i and the sign at state
+    # DISPLAY_DIGITS; None packs the mode into unused decoder states.
+    bank: Optional[int] = None
+    # Pattern for a digit the glyph set has no glyph for.
+    invalid: int = 0
+
+
+@dataclass(frozen=True)
+class Placement:
+    """The (bank, decoder state) blocks a mode was laid out into."""
+
+    mode: Mode
+    digits: tuple
+    sign: Optional[tuple]
+    # Remaining states of a pinned mode's bank; their displays stay dark in that mode.
+    blank: tuple = ()
+
+
+def mode_places(radix, signed):
+    # Digits needed for the largest magnitude of a 16-bit value.
+    largest = 2 ** (OUTPUT_WORD_SIZE - 1) if signed else ROM_SIZE - 1
+    places = 1
+    while largest >= radix**places:
+        places += 1
+    return places
+
+
+def parse_mode(spec):
+    name = spec.get("name", "")
+    unknown = set(spec) - {"name", "radix", "glyphs", "signed", "blank_leading_zeros", "places", "bank", "invalid"}
+    if unknown:
+        raise ValueError(f"mode {name!r}: unknown fields {', '.join(sorted(unknown))}")
+    radix = spec.get("radix", 10)
+    if not 2 <= radix <= ROM_SIZE:
+        raise ValueError(f"mode {name!r}: radix {radix} out of range")
+    signed = spec.get("signed", False)
+    if signed not in SIGNEDNESS:
+        raise ValueError(f"mode {name!r}: signed must be false, \"twos\" or \"excess\"")
+    glyphs = spec.get("glyphs", "decimal" if radix <= 10 else "hex")
+    if isinstance(glyphs, str):
+        glyphs = glyph_set(glyphs)
+    else:
+        glyphs = [None if pattern is None else int(str(pattern), 0) for pattern in glyphs]
+    if len(glyphs) > radix:
+        glyphs = glyphs[:radix]
+    places = spec.get("places", mode_places(radix, signed))
+    return Mode(
+        name=name,
+        radix=radix,
+        glyphs=tuple(glyphs),
+        signed=signed,
+        blank_leading_zeros=bool(spec.get("blank_leading_zeros", False)),
+        places=places,
+        bank=spec.get("bank"),
+        invalid=int(str(spec.get("invalid", 0)), 0),
+    )
+
+
+def load_modes(path):
+    # A mode description: {"mode_bits": 1, "modes": [{...}, ...]}.
+    description = json.loads(Path(path).read_text(encoding="utf-8"))
+    return description.get("mode_bits", MODE_BITS), [parse_mode(spec) for spec in description["modes"]]
+
+
+def place_modes(modes, mode_bits=MODE_BITS):
+    # Pinned modes take their whole bank; the others get free blocks in address order, all in one
+    # bank, since the mode lines cannot change between digit places. Block (bank, state) holds the
+    # words for every value while the decoder selects that state in that bank.
+    banks = 2**mode_bits
+    free = [(bank, state) for bank in range(banks) for state in range(DECODER_STATES)]
+    placements = {}
+
+    for mode in modes:
+        if mode.bank is None:
+            continue
+        if not 0 <= mode.bank < banks:
+            raise ValueError(f"mode {mode.name!r}: bank {mode.bank} does not exist with {mode_bits} mode bits")
+        if mode.places > DISPLAY_DIGITS:
+            raise ValueError(f"mode {mode.name!r}: {mode.places} digits do not fit {DISPLAY_DIGITS} displays")
+        bank = [(mode.bank, state) for state in range(DISPLAY_DIGITS + 1)]
+        if any(block not in free for block in bank):
+            raise ValueError(f"mode {mode.name!r}: bank {mode.bank} is already taken")
+        for block in bank:
+            free.remove(block)
+        sign = bank[DISPLAY_DIGITS] if mode.signed else None
+        blank = tuple(block for block in bank[mode.places:] if block != sign)
+        placements[mode.name] = Placement(mode, tuple(bank[:mode.places]), sign, blank)
+
+    for mode in modes:
+        if mode.bank is not None:
+            continue
+        needed = mode.places + (1 if mode.signed else 0)
+        room = {bank: [block for block in free if block[0] == bank] for bank in range(banks)}
+        bank = next((bank for bank in range(banks) if len(room[bank]) >= needed), None)
+        if bank is None:
+            most = max(len(blocks) for blocks in room.values())
+            raise ValueError(
+                f"mode {mode.name!r} needs {needed} blocks in one bank, but no bank has more than {most} free"
+            )
+        blocks = room[bank][:needed]
+        free = [block for block in free if block not in blocks]
+        placements[mode.name] = Placement(mode, tuple(blocks[:mode.places]), blocks[mode.places] if mode.signed else None)
+
+    return [placements[mode.name] for mode in modes]
+
+
+def render_mode(mode):
+    # Words for every address of every place of a mode: (places, ROM_SIZE) digit patterns and the
+    # sign pattern, computed for all values at once.
+    address = np.arange(ROM_SIZE, dtype=np.int64)
+    if mode.signed == "twos":
+        value = np.where(address >= ROM_SIZE // 2, address - ROM_SIZE, address)
+    elif mode.signed == "excess":
+        value = address - ROM_SIZE // 2
+    else:
+        value = address
+    magnitude = np.abs(value)
+
+    table = np.full(mode.radix, mode.invalid, dtype="<u2")
+    for digit, pattern in enumerate(mode.glyphs):
+        if pattern is not None:
+            table[digit] = pattern
+
+    scale = mode.radix ** np.arange(mode.places, dtype=np.int64)[:, None]
+    words = table[magnitude // scale % mode.radix]
+    if mode.blank_leading_zeros:
+        # Places above the leading digit go dark; the units place always shows.
+        words[1:][magnitude // scale[1:] == 0] = 0
+
+    sign = np.where(value < 0, SIGN, 0).astype("<u2")
+    return words, sign
+
+
+def compile_rom(placements, mode_bits=MODE_BITS):
+    # The whole image, one array of 16-bit words indexed by (bank, decoder state, value). Blocks no
+    # mode uses stay zero.
+    rom = np.zeros((2**mode_bits, DECODER_STATES, ROM_SIZE), dtype="<u2")
+    for placement in placements:
+        words, sign = render_mode(placement.mode)
+        for block, place in zip(placement.digits, words):
+            rom[block] = place
+        if placement.sign is not None:
+            rom[placement.sign] = sign
+    return rom
+
 
 def generate_display_rom():
     """
     This function generates a binary decoder ROM image for 6 parallel 14-segment displays, with each
-    display activated sequentially. The ROM is structured to hold data for both unsigned numbers and 
+    display activated sequentially. The ROM is structured to hold data for both unsigned numbers and
     their complements, including the sign representation.
+
+    The image is returned as one array of 16-bit words indexed by (half, decoder state, value); the
+    unused decoder states stay zero.
     """
-    # Defines the segment patterns for the digits on a 14-segment display.
-    # I modified the the pattern for digits 0, 1, and 5 from the way they are typically represented. 
-    digits = [0x3f, 0x6, 0xdb, 0x8f, 0xe6, 0xed, 0xfd, 0x7, 0xff, 0xef]# 14-segment display with modified 0, 1 and 5.
-
-
-    # Opening/Creating the output file in binary mode to save ROM's image.
-    doc = open('segmented_display_rom.bin', 'wb') 
-
-    # Constants for the ROM's output mode and the ROM size.
-    OUTPUT_WORD_SIZE = 16 
-    ROM_SIZE = 2**OUTPUT_WORD_SIZE
-
-    # Number of digits used, excluding sign digit.
-    DISPLAY_DIGITS = 5
-
-    # Deducting the number of unused states.
-    DECODER_SELECTS = 3
-    UNUSED_STATES = 2**DECODER_SELECTS - (DISPLAY_DIGITS + 1)
-
-    # Start address for unsigned numbers.
-    UNSIGNED_START = 0
-
-    # Start and end addresses for the sign of unsigned numbers.
-    UNSIGNED_0_START = UNSIGNED_END = ROM_SIZE*DISPLAY_DIGITS
-    UNSIGNED_0_END = UNSIGNED_0_START + ROM_SIZE
-
-    # Calculates the size to fill unused addresses with zeros.
-    FILL = ROM_SIZE*UNUSED_STATES
-
-    # Start and end addresses for the complements of numbers.
-    COMPLEMENT_START = UNSIGNED_0_END + FILL
-    COMPLEMENTS_SIGN_START = COMPLEMENT_END = COMPLEMENT_START + (ROM_SIZE*DISPLAY_DIGITS)
-    COMPLEMENTS_SIGN_END = COMPLEMENTS_SIGN_START + ROM_SIZE
-
-    # Writes data for unsigned numbers.
-    for i, index in enumerate(range(UNSIGNED_START, UNSIGNED_END, ROM_SIZE)):
-      print(f"{10**i}'s place, from {index:,} to {index+ROM_SIZE:,}")
-      for x in range(ROM_SIZE):
-        doc.write(array.array("H", [ (digits[x % 10] if i==0 else digits[int(x / (10**i))% 10])] ))
-
-    # Writes data for the sign place of unsigned numbers.
-    print(f"signs place, from {UNSIGNED_0_START:,} to {UNSIGNED_0_END:,}\n")
-    for x in range(ROM_SIZE):
-      doc.write(array.array("H", [0x0]))
-
-    # Fills unused addresses with zeros.
-    print(f"Filling {UNSIGNED_0_END:,} to {UNSIGNED_0_END + FILL:,}(unused addresses) with zeros\n")
-    for x in range(FILL):
-      doc.write(array.array("H", [0x0]))
-
-    # Writes data for the complements.
-    for i, index in enumerate(range(COMPLEMENT_START, COMPLEMENT_END, ROM_SIZE)):
-      print(f"Complements {10**i}'s place, from {index:,} to {index+ROM_SIZE:,}")
-      for x in range(-(int(ROM_SIZE/2)), (int(ROM_SIZE/2))):
-        doc.write(array.array("H", [ (digits[abs(int(x/(10**i))) % 10]) ]))
-
-    # Writes data for the complements' sign place.
-    print(f"Complements signs place, from {COMPLEMENTS_SIGN_START:,} to {COMPLEMENTS_SIGN_END:,}")
-    for x in range(-(int(ROM_SIZE/2)), (int(ROM_SIZE/2))):
-        if x < 0:
-            doc.write(array.array("H", [0xc0]))
+    return compile_rom(place_modes([parse_mode(spec) for spec in DEFAULT_MODES]))
+
+
+def describe_rom(placements):
+    # Address ranges (in words) of each block a mode uses.
+    def block_range(block):
+        bank, state = block
+        start = (bank * DECODER_STATES + state) * ROM_SIZE
+        return f"bank {bank} state {state}, from {start:,} to {start + ROM_SIZE:,}"
+
+    for placement in placements:
+        mode = placement.mode
+        signed = {False: "unsigned", "twos": "two's complement", "excess": "excess-32768"}[mode.signed]
+        blanking = ", leading zeros blanked" if mode.blank_leading_zeros else ""
+        print(f"{mode.name}: radix {mode.radix}, {signed}{blanking}")
+        for i, block in enumerate(placement.digits):
+            print(f"  {mode.radix}^{i} place, {block_range(block)}")
+        if placement.sign is not None:
+            print(f"  sign place, {block_range(placement.sign)}")
+        for block in placement.blank:
+            print(f"  blank, {block_range(block)}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compile the 14-segment display decoder ROM image.")
+    parser.add_argument(
+        "--modes",
+        type=Path,
+        help="JSON mode description (default: unsigned and signed decimal, as on the board)",
+    )
+    parser.add_argument(
+        "--out",
+        type=Path,
+        help=f"Output image (default: {REFERENCE_ROM.relative_to(REPO_ROOT)}, or "
+        f"{BUILD_DIR.relative_to(REPO_ROOT)}/<modes>_display_rom.bin with --modes)",
+    )
+    parser.add_argument(
+        "--check",
+        type=Path,
+        nargs="?",
+        const=REFERENCE_ROM,
+        help="Compare the image with a reference image instead of writing it "
+        f"(default: {REFERENCE_ROM.relative_to(REPO_ROOT)})",
+    )
+    args = parser.parse_args()
+
+    try:
+        if args.modes:
+            mode_bits, modes = load_modes(args.modes)
         else:
-            doc.write(array.array("H", [0x0]))
-    # Fills remaining unused addresses with zeros.
-    print(f"Filling {COMPLEMENTS_SIGN_END:,} to {COMPLEMENTS_SIGN_END + FILL:,}(unused addresses) with zeros\n")
-    for x in range(FILL):
-      doc.write(array.array("H", [0x0]))
-    doc.close()
-
-# Calling the function to generate the ROM.
-generate_display_rom()
+            mode_bits, modes = MODE_BITS, [parse_mode(spec) for spec in DEFAULT_MODES]
+        placements = place_modes(modes, mode_bits)
+    except (ValueError, KeyError) as exc:
+        parser.error(f"{args.modes}: {exc}")
+
+    rom = compile_rom(placements, mode_bits)
+    describe_rom(placements)
+    used = sum(len(p.digits) + (p.sign is not None) + len(p.blank) for p in placements)
+    print(f"{used} of {rom.shape[0] * DECODER_STATES} blocks used, {rom.nbytes:,} bytes")
+
+    if args.check:
+        reference = np.fromfile(args.check, dtype="<u2")
+        image = rom.reshape(-1)
+        if reference.shape != image.shape:
+            raise SystemExit(f"{args.check}: {reference.size * 2:,} bytes, the generated image is {image.size * 2:,}")
+        diff = np.flatnonzero(reference != image)
+        if diff.size:
+            raise SystemExit(
+                f"{args.check}: {diff.size:,} words differ, first at word {diff[0]:,} "
+                f"(0x{reference[diff[0]]:04x}, generated 0x{image[diff[0]]:04x})"
+            )
+        print(f"{args.check}: identical, {image.size * 2:,} bytes")
+        return
+
+    out = args.out
+    if out is None:
+        out = BUILD_DIR / f"{args.modes.stem}_display_rom.bin" if args.modes else REFERENCE_ROM
+    out.parent.mkdir(parents=True, exist_ok=True)
+    rom.tofile(out)
+    print(f"Wrote {out}, {rom.nbytes:,} bytes")
+
+
+if __name__ == "__main__":
+    main()
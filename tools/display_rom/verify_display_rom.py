@@ -0,0 +1,262 @@
+import argparse
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise SystemExit("NumPy is required: python -m pip install numpy") from exc
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+REFERENCE_ROM = REPO_ROOT / "generated" / "display_rom" / "segmented_display_rom.bin"
+
+# Failing values listed per digit place in the report.
+SHOWN_FAILURES = 4
+
+# The board is pinned here rather than taken from generate_display_rom.py, so a mistake in the
+# generator's tables or packing cannot pass its own check.
+#
+# Segment patterns of the decimal digits and the minus sign, as burnt into the board's ROM.
+DIGITS = (0x3f, 0x6, 0xdb, 0x8f, 0xe6, 0xed, 0xfd, 0x7, 0xff, 0xef)
+SIGN = 0xc0
+
+OUTPUT_WORD_SIZE = 16
+ROM_SIZE = 2**OUTPUT_WORD_SIZE
+DECODER_STATES = 8
+
+# SdM (Signed/_Unsigned) is the only mode line: bank 0 shows the value unsigned, bank 1 as
+# excess-32768. Decoder state i drives the 10^i place and state 5 the sign display; states 6 and 7
+# drive nothing.
+MODE_BITS = 1
+DISPLAY_DIGITS = 5
+SIGN_STATE = 5
+
+
+@dataclass(frozen=True)
+class BoardMode:
+    """The fields of a generator mode the checks read."""
+
+    name: str
+    signed: object = False
+    radix: int = 10
+    glyphs: tuple = DIGITS
+    blank_leading_zeros: bool = False
+    invalid: int = 0
+
+
+@dataclass(frozen=True)
+class BoardPlacement:
+    mode: BoardMode
+    digits: tuple
+    sign: Optional[tuple]
+    blank: tuple = ()
+
+
+BOARD = [
+    BoardPlacement(
+        BoardMode("unsigned"),
+        tuple((0, state) for state in range(DISPLAY_DIGITS)),
+        None,
+        ((0, SIGN_STATE),),
+    ),
+    BoardPlacement(
+        BoardMode("signed", signed="excess"),
+        tuple((1, state) for state in range(DISPLAY_DIGITS)),
+        (1, SIGN_STATE),
+    ),
+]
+
+
+def load_image(path, mode_bits):
+    # The image as (bank, decoder state, value) words.
+    image = np.fromfile(path, dtype="<u2")
+    expected = 2**mode_bits * DECODER_STATES * ROM_SIZE
+    if image.size != expected:
+        raise ValueError(f"{path}: {image.size * 2:,} bytes, expected {expected * 2:,} for {mode_bits} mode bits")
+    return image.reshape(2**mode_bits, DECODER_STATES, ROM_SIZE)
+
+
+def glyph_name(mode, digit):
+    if digit < 0:
+        return "?"
+    if mode.radix == 256:
+        return repr(chr(digit))
+    return "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"[digit] if digit < 36 else str(digit)
+
+
+def word_name(mode, word):
+    # A ROM word and what it shows: a digit of the mode, the minus sign, or nothing.
+    if word == 0:
+        shows = "dark"
+    elif word == SIGN:
+        shows = "-"
+    elif mode is not None and word in mode.glyphs:
+        shows = glyph_name(mode, mode.glyphs.index(word))
+    else:
+        shows = "no glyph"
+    return f"0x{word:04x} ({shows})"
+
+
+def decoder(mode):
+    # Glyph table turned around: segment pattern -> digit, -1 for patterns that are no digit.
+    # A pattern shared by several digits (upper and lower case text) decodes to the first.
+    lut = np.full(2**OUTPUT_WORD_SIZE, -1, dtype=np.int64)
+    for digit, pattern in reversed(list(enumerate(mode.glyphs))):
+        if pattern is not None:
+            lut[pattern] = digit
+    return lut
+
+
+def mode_values(mode):
+    # The number each address stands for in a mode.
+    address = np.arange(ROM_SIZE, dtype=np.int64)
+    if mode.signed == "twos":
+        return address - (address >= ROM_SIZE // 2) * ROM_SIZE
+    if mode.signed == "excess":
+        return address - ROM_SIZE // 2
+    return address
+
+
+def verify_mode(rom, placement):
+    # Decodes every word a mode owns and checks it against the number the address stands for.
+    # Returns one (block, what, failing values, shown, expected) entry per place with failures.
+    mode = placement.mode
+    lut = decoder(mode)
+    glyphs = np.full(mode.radix, -1, dtype=np.int64)
+    glyphs[:len(mode.glyphs)] = [-1 if pattern is None else lut[pattern] for pattern in mode.glyphs]
+    value = mode_values(mode)
+    remaining = np.abs(value)
+    failures = []
+
+    for place, block in enumerate(placement.digits):
+        words = rom[block]
+        digit = remaining % mode.radix
+        remaining = remaining // mode.radix
+        shown = lut[words]
+        # A digit the glyph set has no glyph for shows the invalid pattern.
+        ok = np.where(glyphs[digit] >= 0, shown == glyphs[digit], words == mode.invalid)
+        if mode.blank_leading_zeros and place > 0:
+            # Above the leading digit the display is dark.
+            dark = np.abs(value) < mode.radix**place
+            ok = np.where(dark, words == 0, ok)
+        bad = np.flatnonzero(~ok)
+        if bad.size:
+            expected = [glyph_name(mode, int(d)) for d in digit[bad[:SHOWN_FAILURES]]]
+            shown_as = [word_name(mode, int(w)) for w in words[bad[:SHOWN_FAILURES]]]
+            failures.append((block, f"{mode.radix}^{place} place", bad, shown_as, expected))
+
+    if placement.sign is not None:
+        words = rom[placement.sign]
+        ok = words == np.where(value < 0, SIGN, 0)
+        bad = np.flatnonzero(~ok)
+        if bad.size:
+            expected = ["-" if value[i] < 0 else "dark" for i in bad[:SHOWN_FAILURES]]
+            shown_as = [word_name(None, int(w)) for w in words[bad[:SHOWN_FAILURES]]]
+            failures.append((placement.sign, "sign place", bad, shown_as, expected))
+
+    for block in placement.blank:
+        bad = np.flatnonzero(rom[block] != 0)
+        if bad.size:
+            shown_as = [word_name(None, int(w)) for w in rom[block][bad[:SHOWN_FAILURES]]]
+            failures.append((block, "blank place", bad, shown_as, ["dark"] * len(shown_as)))
+
+    return failures
+
+
+def verify_image(rom, placements):
+    # Failures per mode, and the blocks no mode owns, which must be all zero.
+    report = {placement.mode.name: verify_mode(rom, placement) for placement in placements}
+    owned = {block for p in placements for block in (*p.digits, *p.blank, *([p.sign] if p.sign else []))}
+    unused = []
+    for bank in range(rom.shape[0]):
+        for state in range(DECODER_STATES):
+            if (bank, state) in owned:
+                continue
+            bad = np.flatnonzero(rom[bank, state] != 0)
+            if bad.size:
+                shown_as = [word_name(None, int(w)) for w in rom[bank, state][bad[:SHOWN_FAILURES]]]
+                unused.append(((bank, state), "unused block", bad, shown_as, ["dark"] * len(shown_as)))
+    if unused:
+        report["(unused)"] = unused
+    return report
+
+
+def diff_images(rom, reference, placements):
+    # Words that differ from a reference image, counted per block with the first few addresses.
+    owners = {}
+    for p in placements:
+        owners.update({block: f"{p.mode.name} {p.mode.radix}^{i} place" for i, block in enumerate(p.digits)})
+        owners.update({block: f"{p.mode.name} blank place" for block in p.blank})
+        if p.sign is not None:
+            owners[p.sign] = f"{p.mode.name} sign place"
+    lines = []
+    for bank, state in zip(*np.nonzero((rom != reference).any(axis=2))):
+        block = (int(bank), int(state))
+        bad = np.flatnonzero(rom[block] != reference[block])
+        lines.append(f"  bank {block[0]} state {block[1]} ({owners.get(block, 'unused')}): {bad.size:,} words differ")
+        for value in bad[:SHOWN_FAILURES]:
+            lines.append(f"    value 0x{value:04x}: reference 0x{reference[block][value]:04x}, image 0x{rom[block][value]:04x}")
+    return lines
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Decode a 14-segment display ROM image and check every word.")
+    parser.add_argument(
+        "image",
+        type=Path,
+        nargs="?",
+        default=REFERENCE_ROM,
+        help=f"ROM image (default: {REFERENCE_ROM.relative_to(REPO_ROOT)})",
+    )
+    parser.add_argument("--modes", type=Path, help="JSON mode description the image was compiled from (default: the board's layout)")
+    parser.add_argument("--reference", type=Path, help="Also list the words that differ from this image")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    try:
+        if args.modes:
+            # Only a description of other modes goes through the generator's parser and packing.
+            import generate_display_rom as rom_compiler
+
+            mode_bits, modes = rom_compiler.load_modes(args.modes)
+            placements = rom_compiler.place_modes(modes, mode_bits)
+        else:
+            mode_bits, placements = MODE_BITS, BOARD
+        rom = load_image(args.image, mode_bits)
+        reference = load_image(args.reference, mode_bits) if args.reference else None
+    except (ValueError, KeyError, OSError) as exc:
+        parser.error(str(exc))
+
+    report = verify_image(rom, placements)
+    diff = diff_images(rom, reference, placements) if reference is not None else []
+    elapsed = time.perf_counter() - start
+
+    failed = 0
+    for name, failures in report.items():
+        if not failures:
+            print(f"{name}: ok")
+            continue
+        print(f"{name}: FAILED")
+        for (bank, state), what, bad, shown_as, expected in failures:
+            failed += bad.size
+            print(f"  {what}, bank {bank} state {state}: {bad.size:,} values wrong")
+            for value, shown, want in zip(bad, shown_as, expected):
+                print(f"    value 0x{value:04x}: {shown}, expected {want}")
+
+    if reference is not None:
+        if diff:
+            print(f"Differences from {args.reference}:")
+            print("\n".join(diff))
+        else:
+            print(f"Identical to {args.reference}")
+
+    print(f"{rom.size:,} words checked in {elapsed:.2f} s")
+    if failed:
+        raise SystemExit(f"{args.image}: {failed:,} words wrong")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,300 @@
+#!/usr/bin/env python3
+"""
+Benchmark video_to_oled_sd_delta.py over the bundled input_media clips.
+
+Each case runs the encoder stages in-process (load, quantize, encode,
+payload, player) and records wall time per stage, peak Python memory, SD
+sectors, run counts, and the estimated player cycles for one loop. The
+replay stage draws the payload on the ssd1325_model.py panel, checks every
+frame against the screen the encoder expects the player to show, and
+records the OLED bytes sent. Runs that rate control left for later frames
+are part of that screen, so frames with dropped runs are checked too. A
+frame the panel draws differently fails the bench.
+
+Results are written as JSON. Pass --baseline to compare against an earlier
+run: sizes and cycles must not grow past --size-tolerance, and time and
+memory must not grow past --time-tolerance.
+
+Exit status:
+  0 = no regressions
+  1 = at least one metric regressed, a case that ran in the baseline
+      fails now, or the panel model disagrees with the encoder
+  2 = error
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib.util
+import itertools
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+
+TOOL_PATH = Path(__file__).with_name("video_to_oled_sd_delta.py")
+MODEL_PATH = Path(__file__).with_name("ssd1325_model.py")
+REPO_ROOT = Path(__file__).resolve().parents[2]
+DEFAULT_MEDIA_DIR = REPO_ROOT / "ASM/programs/loaded_from_SD/oled_animations/input_media"
+DEFAULT_CLIPS = ("eyes.gif", "rick_roll.gif", "stick_fight.webp")
+STAGES = ("load", "quantize", "encode", "payload", "player", "replay")
+
+# name -> tool arguments for the conversion mode.
+MODES = {
+    "threshold": [],
+    "threshold-invert": ["--threshold", "200", "--invert"],
+    "gray4": ["--grayscale", "--gray-levels", "4"],
+    "gray8": ["--grayscale", "--gray-levels", "8"],
+}
+FITS = ("contain", "crop")
+FRAME_STEPS = (1, 2)
+
+SIZE_METRICS = ("total_sectors", "frame_sectors", "max_runs", "total_runs", "loop_cycles", "oled_bytes")
+TIME_METRICS = ("peak_kib",) + tuple(f"{stage}_s" for stage in STAGES)
+
+
+class ModelMismatch(Exception):
+    """The panel model drew something other than the encoder's frames."""
+
+
+def eprint(*args, **kwargs) -> None:
+    print(*args, file=sys.stderr, **kwargs)
+
+
+def load_tool(path: Path = TOOL_PATH):
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    if spec is None or spec.loader is None:
+        raise SystemExit(f"Cannot load {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def tool_args(tool, argv: List[str]) -> argparse.Namespace:
+    saved = sys.argv
+    sys.argv = [str(TOOL_PATH)] + argv
+    try:
+        return tool.parse_args()
+    finally:
+        sys.argv = saved
+
+
+def case_name(clip: str, mode: str, fit: str, step: int) -> str:
+    return f"{Path(clip).stem}/{mode}/{fit}/step{step}"
+
+
+def run_stages(tool, model, args: argparse.Namespace) -> tuple[Dict[str, float], Dict[str, float]]:
+    times: Dict[str, float] = {}
+
+    started = time.perf_counter()
+    frames = tool.load_frames(args.input)
+    chosen = tool.select_frames(frames, args.frame_step, args.max_frames)
+    times["load"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    quantized = tool.quantize_clip(chosen, args)
+    times["quantize"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    screens: List[bytes] = []
+    encoded_frames, infos = tool.encode_clip(chosen, args, quantized, screens)
+    if args.pace:
+        encoded_frames, infos = tool.pace_clip(args, encoded_frames, infos)
+    times["encode"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    payload, frame_index, slot_sectors, resume_block = tool.build_payload(args, encoded_frames)
+    times["payload"] = time.perf_counter() - started
+
+    started = time.perf_counter()
+    tool.make_player_asm(args, len(infos), slot_sectors, len(payload) // tool.SECTOR_SIZE, resume_block)
+    times["player"] = time.perf_counter() - started
+
+    checked: List[int] = []
+    mismatched: List[int] = []
+
+    def check_frame(number: int, panel) -> None:
+        checked.append(number)
+        if panel.gddram[:tool.SAFE_HEIGHT].tobytes() != screens[number]:
+            mismatched.append(number)
+
+    started = time.perf_counter()
+    replayed = model.replay_video(
+        model.SSD1325(), bytes(payload), len(infos), args.layout, slot_sectors, args.player_profile, check_frame
+    )
+    times["replay"] = time.perf_counter() - started
+    if mismatched:
+        raise ModelMismatch(f"panel model differs from the encoder at frames {mismatched[:8]}")
+
+    reads = tool.frame_sector_reads(len(infos), slot_sectors, frame_index)
+    periods = tool.frame_periods(args, infos, reads)
+    sizes = {
+        "frames": len(infos) - 1,
+        "total_sectors": len(payload) // tool.SECTOR_SIZE,
+        "frame_sectors": sum(reads[1:]),
+        "max_runs": max(item.run_count for item in infos),
+        "total_runs": sum(item.run_count for item in infos),
+        "loop_cycles": sum(periods[1:]),
+        "oled_bytes": sum(item.total_bytes for item in replayed[1:]),
+        "model_checked_frames": len(checked),
+    }
+    return times, sizes
+
+
+def run_case(tool, model, clip: Path, argv: List[str], repeat: int) -> Dict[str, float]:
+    """Time one case `repeat` times, keeping the fastest run of each stage.
+
+    Peak memory comes from one extra pass under tracemalloc, which would
+    otherwise slow the timed passes down.
+    """
+    args = tool_args(tool, [str(clip)] + argv)
+    best: Dict[str, float] = {}
+    for _ in range(repeat):
+        times, result = run_stages(tool, model, args)
+        for stage, seconds in times.items():
+            best[stage] = min(best.get(stage, seconds), seconds)
+
+    tracemalloc.start()
+    try:
+        run_stages(tool, model, args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    for stage in STAGES:
+        result[f"{stage}_s"] = round(best[stage], 4)
+    result["peak_kib"] = round(peak / 1024, 1)
+    return result
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    size_tolerance: float,
+    time_tolerance: float,
+    min_seconds: float,
+) -> List[str]:
+    regressions: List[str] = []
+    for name, current in results.items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        failure = current.get("error") or current.get("model_error")
+        if failure:
+            if not before.get("error") and not before.get("model_error"):
+                regressions.append(f"{name}: ran in the baseline, fails now: {failure}")
+            continue
+        for metric in SIZE_METRICS + TIME_METRICS:
+            if metric not in before or metric not in current:
+                continue
+            old = before[metric]
+            new = current[metric]
+            tolerance = size_tolerance if metric in SIZE_METRICS else time_tolerance
+            if metric.endswith("_s") and max(old, new) < min_seconds:
+                continue
+            if new > old * (1.0 + tolerance):
+                change = 100.0 * (new - old) / old if old else float("inf")
+                regressions.append(f"{name}: {metric} {old} -> {new} (+{change:.1f}%)")
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Benchmark the OLED SD delta video encoder.")
+    parser.add_argument("--media-dir", type=Path, default=DEFAULT_MEDIA_DIR)
+    parser.add_argument("--clips", nargs="+", default=list(DEFAULT_CLIPS))
+    parser.add_argument("--modes", nargs="+", choices=tuple(MODES), default=list(MODES))
+    parser.add_argument("--fits", nargs="+", choices=FITS, default=list(FITS))
+    parser.add_argument("--frame-steps", nargs="+", type=int, default=list(FRAME_STEPS))
+    parser.add_argument("--max-frames", type=int, default=24)
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case. The fastest time per stage is kept")
+    parser.add_argument("--out", type=Path, default=REPO_ROOT / "build" / "oled_video_sd_delta_bench.json")
+    parser.add_argument("--baseline", type=Path, default=None, help="Earlier JSON output to compare against")
+    parser.add_argument("--size-tolerance", type=float, default=0.0, help="Allowed growth in sectors, runs and cycles, as a fraction")
+    parser.add_argument("--time-tolerance", type=float, default=0.5, help="Allowed growth in stage time and peak memory, as a fraction")
+    parser.add_argument("--min-seconds", type=float, default=0.1, help="Ignore stage times shorter than this when comparing")
+    parser.add_argument("extra", nargs=argparse.REMAINDER, help="Extra tool options after --, applied to every case")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    extra = [value for value in args.extra if value != "--"]
+    if args.repeat < 1:
+        eprint("--repeat must be 1 or greater")
+        return 2
+
+    baseline = None
+    if args.baseline is not None:
+        try:
+            baseline = json.loads(args.baseline.read_text(encoding="utf-8"))["cases"]
+        except (OSError, ValueError, KeyError) as exc:
+            eprint(f"Cannot read baseline {args.baseline}: {exc}")
+            return 2
+
+    tool = load_tool()
+    model = load_tool(MODEL_PATH)
+    results: Dict[str, Dict[str, float]] = {}
+    model_failures = 0
+    for clip, mode, fit, step in itertools.product(args.clips, args.modes, args.fits, args.frame_steps):
+        path = args.media_dir / clip
+        if not path.is_file():
+            eprint(f"Missing clip: {path}")
+            return 2
+        name = case_name(clip, mode, fit, step)
+        argv = MODES[mode] + ["--fit", fit, "--frame-step", str(step), "--max-frames", str(args.max_frames)] + extra
+        try:
+            result = run_case(tool, model, path, argv, args.repeat)
+        except ModelMismatch as exc:
+            # A correctness failure, not a clip the encoder rejected.
+            results[name] = {"model_error": str(exc)}
+            model_failures += 1
+            print(f"{name:44s} MODEL MISMATCH: {exc}")
+            continue
+        except SystemExit as exc:
+            # The encoder rejects clips it cannot fit; record that instead of stopping.
+            results[name] = {"error": str(exc)}
+            print(f"{name:44s} error: {exc}")
+            continue
+        results[name] = result
+        total = sum(result[f"{stage}_s"] for stage in STAGES)
+        print(
+            f"{name:44s} {total:7.3f}s peak={result['peak_kib']:9.1f}KiB "
+            f"sectors={result['total_sectors']:4d} max_runs={result['max_runs']:3d} "
+            f"loop_cycles={result['loop_cycles']} oled_bytes={result['oled_bytes']} "
+            f"model_checked={result['model_checked_frames']}/{result['frames'] + 1}"
+        )
+
+    report = {
+        "tool": TOOL_PATH.name,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "max_frames": args.max_frames,
+        "extra": extra,
+        "cases": results,
+    }
+    args.out.parent.mkdir(parents=True, exist_ok=True)
+    args.out.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    print(f"Wrote benchmark results: {args.out}")
+
+    for name, result in results.items():
+        if "model_error" in result:
+            print(f"MODEL MISMATCH {name}: {result['model_error']}")
+    if baseline is None:
+        return 1 if model_failures else 0
+    regressions = compare(results, baseline, args.size_tolerance, args.time_tolerance, args.min_seconds)
+    compared = sum(1 for name in results if name in baseline)
+    print(f"Compared {compared} cases against {args.baseline}")
+    for line in regressions:
+        print(f"REGRESSION {line}")
+    if not regressions:
+        print("No regressions")
+    return 1 if regressions or model_failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,2591 @@
+#!/usr/bin/env python3
+# ==========================================================
+# oled_font_compiler.py
+# ==========================================================
+# Compiles a bitmap font into an SSD1325 text/terminal
+# assembly library.
+#
+# Purpose:
+#   One generator for every OLED text layer. The built-in
+#   fonts rebuild oled_text_5x7.asm and oled_text_4x6.asm;
+#   a BDF or PSF file builds a new layer with its own prefix.
+#
+# Fonts:
+#   5x7  - Adafruit_GFX glcdfont.c, 6x8 cells, OLED5_ prefix
+#   4x6  - project compact font, 4x7 cells, OLED4_ prefix
+#   file - .bdf or .psf (PSF1 / PSF2), --cell and --prefix
+#
+# OLED pixel packing:
+#   OLED_INIT uses the SSD1325 remap setting A0h = 0x52.
+#   Each display data byte contains two horizontal pixels:
+#
+#       left pixel  -> high nibble
+#       right pixel -> low nibble
+#
+#   so cells are an even number of pixels wide.
+#
+# Terminal behavior (--wrap):
+#   immediate - the cursor moves to the next row as soon as
+#               the last column is drawn (5x7)
+#   pending   - the cursor stays on the last column until the
+#               next printable character (4x6)
+#
+# Runtime string behavior:
+#   - string pointer passed through $C/$D
+#   - strings are null-terminated
+#   - newline is 0x0A
+#   - printable ASCII coverage from 0x20 through 0x7E
+#
+# Glyph subsets (--charset, --scan):
+#   only the listed characters, or the ones a program prints,
+#   get glyphs; everything else draws the fallback glyph.
+#
+# Compiled libraries are cached in build/oled_font_cache,
+# keyed on the font, the options and this script.
+#
+# Original version: May 2026
+# Fadil Isamotu
+# ==========================================================
+
+import argparse
+import hashlib
+import itertools
+import re
+import struct
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Optional
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+# Constants the library uses, read to size its instructions.
+CONSTANTS_ASM = REPO_ROOT / "ASM" / "drivers" / "oled" / "oled_constants.asm"
+
+DEFAULT_CACHE_DIR = REPO_ROOT / "build" / "oled_font_cache"
+
+# <prefix>_DRAW_CHAR character dispatch:
+#   linear - one compare per glyph and lowercase alias
+#   tree   - balanced binary compare tree, at most 7 compares
+#   table  - jump table indexed by character, entered with JSR [$CD]
+DISPATCH_MODES = ("linear", "tree", "table")
+DEFAULT_DISPATCH = "tree"
+
+# Glyph rendering:
+#   code - one MOV $A, 0x.. / OLD $A pair per glyph byte (fastest drawing)
+#   data - packed glyph bytes read by one shared blitter (smallest payload)
+GLYPH_MODES = ("code", "data")
+DEFAULT_GLYPHS = "code"
+
+# <prefix>_COMPUTE_CURSOR_BASE:
+#   loop  - repeated adds, one per column and row
+#   table - one lookup per axis in generated col / row tables
+CURSOR_MODES = ("loop", "table")
+DEFAULT_CURSOR = "table"
+
+# <prefix>_DRAW_STRING:
+#   char - one SSD1325 window per character
+#   line - one window per run of characters on a text row. The run is
+#          written in vertical address increment mode, so each glyph is
+#          streamed column by column and the next glyph follows on.
+STRING_MODES = ("char", "line")
+DEFAULT_STRINGS = "char"
+
+WRAP_MODES = ("immediate", "pending")
+
+# SSD1325 A0h remap: the OLED_INIT value, and the same with vertical
+# address increment (bit 2) for line runs.
+REMAP_HORIZONTAL = 0x52
+REMAP_VERTICAL = 0x56
+
+# Window commands sent by <prefix>_RENDER_BEGIN: 0x15 start end, 0x75
+# start end, 0x5C. Line runs add A0h 0x56 before and A0h 0x52 after.
+WINDOW_COMMAND_BYTES = 7
+REMAP_COMMAND_BYTES = 4
+
+SECTOR_SIZE = 512
+
+# Panel size, and the rows a file font may use. Raw pixel row 63 is left
+# unused, as the 4x6 layer and the video player do.
+SCREEN_W = 128
+SCREEN_H = 64
+SAFE_ROWS = 63
+GROUPED_COLS = 64
+
+# Pending-wrap flag, the last byte of the OLED RAM-write state.
+PENDING_WRAP_ADDR = 0x701F
+
+# Characters covered by the jump table.
+TABLE_FIRST = 0x20
+TABLE_LAST = 0x7E
+
+# Dispatch cycle costs, counted from the microstep tables in
+# generated/microcode/instructions.md.
+MOV_MEM_CYCLES = 5
+MOV_IMM_CYCLES = 3
+FLAG_CYCLES = 3
+CMP_IMM_CYCLES = 5
+ALU_CYCLES = 6
+BRANCH_TAKEN_CYCLES = 5
+BRANCH_NOT_TAKEN_CYCLES = 4
+ADD_MEM_CYCLES = 8
+OLD_CYCLES = 4
+JMP_CYCLES = 5
+JSR_CYCLES = 8
+RTS_CYCLES = 7
+STACK_CYCLES = 4
+
+FG_NIBBLE = 0xA
+BG_NIBBLE = 0x0
+
+# Glyph subsets (--charset / --scan). Routines that take the character in
+# $A, and library routines that print a fixed set of characters.
+PRINT_ROUTINES = ("PUTC", "DRAW_CHAR", "TYPE_CHAR_WITH_CURSOR")
+HEX_DIGITS = "0123456789ABCDEF"
+HELPER_CHARSETS = {
+    "PRINT_HEX_NIBBLE": HEX_DIGITS,
+    "PRINT_HEX_BYTE": HEX_DIGITS,
+    "PRINT_HEX_WORD_CD": HEX_DIGITS,
+    "PRINT_READY_PROMPT": "READY>",
+}
+
+# Adafruit_GFX glcdfont.c fixed-space ASCII font table.
+# Each glyph is 5 vertical columns. Bit 0 is the top row.
+FONT5X7_COLUMNS = {
+    " ": [0x00, 0x00, 0x00, 0x00, 0x00],
+    "0": [0x3E, 0x51, 0x49, 0x45, 0x3E],
+    "1": [0x00, 0x42, 0x7F, 0x40, 0x00],
+    "2": [0x72, 0x49, 0x49, 0x49, 0x46],
+    "3": [0x21, 0x41, 0x45, 0x4B, 0x31],
+    "4": [0x18, 0x14, 0x12, 0x7F, 0x10],
+    "5": [0x27, 0x45, 0x45, 0x45, 0x39],
+    "6": [0x3C, 0x4A, 0x49, 0x49, 0x30],
+    "7": [0x01, 0x71, 0x09, 0x05, 0x03],
+    "8": [0x36, 0x49, 0x49, 0x49, 0x36],
+    "9": [0x06, 0x49, 0x49, 0x29, 0x1E],
+
+    # Uppercase characters.
+    "A": [0x7C, 0x12, 0x11, 0x12, 0x7C],
+    "B": [0x7F, 0x49, 0x49, 0x49, 0x36],
+    "C": [0x3E, 0x41, 0x41, 0x41, 0x22],
+    "D": [0x7F, 0x41, 0x41, 0x41, 0x3E],
+    "E": [0x7F, 0x49, 0x49, 0x49, 0x41],
+    "F": [0x7F, 0x09, 0x09, 0x09, 0x01],
+    "G": [0x3E, 0x41, 0x41, 0x51, 0x73],
+    "H": [0x7F, 0x08, 0x08, 0x08, 0x7F],
+    "I": [0x00, 0x41, 0x7F, 0x41, 0x00],
+    "J": [0x20, 0x40, 0x41, 0x3F, 0x01],
+    "K": [0x7F, 0x08, 0x14, 0x22, 0x41],
+    "L": [0x7F, 0x40, 0x40, 0x40, 0x40],
+    "M": [0x7F, 0x02, 0x0C, 0x02, 0x7F],
+    "N": [0x7F, 0x04, 0x08, 0x10, 0x7F],
+    "O": [0x3E, 0x41, 0x41, 0x41, 0x3E],
+    "P": [0x7F, 0x09, 0x09, 0x09, 0x06],
+    "Q": [0x3E, 0x41, 0x51, 0x21, 0x5E],
+    "R": [0x7F, 0x09, 0x19, 0x29, 0x46],
+    "S": [0x26, 0x49, 0x49, 0x49, 0x32],
+    "T": [0x03, 0x01, 0x7F, 0x01, 0x03],
+    "U": [0x3F, 0x40, 0x40, 0x40, 0x3F],
+    "V": [0x1F, 0x20, 0x40, 0x20, 0x1F],
+    "W": [0x3F, 0x40, 0x38, 0x40, 0x3F],
+    "X": [0x63, 0x14, 0x08, 0x14, 0x63],
+    "Y": [0x03, 0x04, 0x78, 0x04, 0x03],
+    "Z": [0x61, 0x51, 0x49, 0x45, 0x43],
+    # Lowercase characters.
+    "a": [0x20, 0x54, 0x54, 0x78, 0x40],
+    "b": [0x7F, 0x28, 0x44, 0x44, 0x38],
+    "c": [0x38, 0x44, 0x44, 0x44, 0x28],
+    "d": [0x38, 0x44, 0x44, 0x28, 0x7F],
+    "e": [0x38, 0x54, 0x54, 0x54, 0x18],
+    "f": [0x00, 0x08, 0x7E, 0x09, 0x02],
+    "g": [0x18, 0xA4, 0xA4, 0x9C, 0x78],
+    "h": [0x7F, 0x08, 0x04, 0x04, 0x78],
+    "i": [0x00, 0x44, 0x7D, 0x40, 0x00],
+    "j": [0x20, 0x40, 0x40, 0x3D, 0x00],
+    "k": [0x7F, 0x10, 0x28, 0x44, 0x00],
+    "l": [0x00, 0x41, 0x7F, 0x40, 0x00],
+    "m": [0x7C, 0x04, 0x78, 0x04, 0x78],
+    "n": [0x7C, 0x08, 0x04, 0x04, 0x78],
+    "o": [0x38, 0x44, 0x44, 0x44, 0x38],
+    "p": [0xFC, 0x18, 0x24, 0x24, 0x18],
+    "q": [0x18, 0x24, 0x24, 0x18, 0xFC],
+    "r": [0x7C, 0x08, 0x04, 0x04, 0x08],
+    "s": [0x48, 0x54, 0x54, 0x54, 0x24],
+    "t": [0x04, 0x04, 0x3F, 0x44, 0x24],
+    "u": [0x3C, 0x40, 0x40, 0x20, 0x7C],
+    "v": [0x1C, 0x20, 0x40, 0x20, 0x1C],
+    "w": [0x3C, 0x40, 0x30, 0x40, 0x3C],
+    "x": [0x44, 0x28, 0x10, 0x28, 0x44],
+    "y": [0x4C, 0x90, 0x90, 0x90, 0x7C],
+    "z": [0x44, 0x64, 0x54, 0x4C, 0x44],
+    "=": [0x14, 0x14, 0x14, 0x14, 0x14],
+    "$": [0x24, 0x2A, 0x7F, 0x2A, 0x12],
+    ">": [0x00, 0x41, 0x22, 0x14, 0x08],
+    ":": [0x00, 0x36, 0x36, 0x00, 0x00],
+    "-": [0x08, 0x08, 0x08, 0x08, 0x08],
+    "_": [0x40, 0x40, 0x40, 0x40, 0x40],
+    ".": [0x00, 0x60, 0x60, 0x00, 0x00],
+    "/": [0x20, 0x10, 0x08, 0x04, 0x02],
+
+    # Punctuation glyphs.
+    "!": [0x00, 0x00, 0x5F, 0x00, 0x00],
+    "\"": [0x00, 0x07, 0x00, 0x07, 0x00],
+    "#": [0x14, 0x7F, 0x14, 0x7F, 0x14],
+    "%": [0x23, 0x13, 0x08, 0x64, 0x62],
+    "&": [0x36, 0x49, 0x56, 0x20, 0x50],
+    "'": [0x00, 0x08, 0x07, 0x03, 0x00],
+    "(": [0x00, 0x1C, 0x22, 0x41, 0x00],
+    ")": [0x00, 0x41, 0x22, 0x1C, 0x00],
+    "*": [0x2A, 0x1C, 0x7F, 0x1C, 0x2A],
+    "+": [0x08, 0x08, 0x3E, 0x08, 0x08],
+    ",": [0x00, 0x80, 0x70, 0x30, 0x00],
+    ";": [0x00, 0x40, 0x34, 0x00, 0x00],
+    "<": [0x00, 0x08, 0x14, 0x22, 0x41],
+    "?": [0x02, 0x01, 0x59, 0x09, 0x06],
+    "@": [0x3E, 0x41, 0x5D, 0x59, 0x4E],
+    "[": [0x00, 0x7F, 0x41, 0x41, 0x41],
+    "\\": [0x02, 0x04, 0x08, 0x10, 0x20],
+    "]": [0x00, 0x41, 0x41, 0x41, 0x7F],
+    "^": [0x04, 0x02, 0x01, 0x02, 0x04],
+    "`": [0x00, 0x03, 0x07, 0x08, 0x00],
+    "{": [0x00, 0x08, 0x36, 0x41, 0x00],
+    "|": [0x00, 0x00, 0x77, 0x00, 0x00],
+    "}": [0x00, 0x41, 0x36, 0x08, 0x00],
+    "~": [0x02, 0x01, 0x02, 0x04, 0x02],
+}
+
+# Project compact 4x6 font table, tested first on Arduino.
+# Each glyph row is four bits. Bit 3 is the leftmost pixel.
+FONT4X6_ROWS = {
+    " ": [0x0, 0x0, 0x0, 0x0, 0x0, 0x0],
+    "-": [0x0, 0x0, 0xF, 0x0, 0x0, 0x0],
+    ":": [0x0, 0x6, 0x6, 0x0, 0x6, 0x6],
+    "#": [0x5, 0xF, 0x5, 0xF, 0x5, 0x0],
+    ">": [0x8, 0x4, 0x2, 0x4, 0x8, 0x0],
+    "=": [0x0, 0xF, 0x0, 0xF, 0x0, 0x0],
+    "?": [0x6, 0x9, 0x1, 0x2, 0x0, 0x2],
+    ".": [0x0, 0x0, 0x0, 0x0, 0x6, 0x6],
+    "/": [0x1, 0x1, 0x2, 0x4, 0x8, 0x8],
+    "_": [0x0, 0x0, 0x0, 0x0, 0x0, 0xF],
+
+    "0": [0x6, 0x9, 0xB, 0xD, 0x9, 0x6],
+    "1": [0x2, 0x6, 0x2, 0x2, 0x2, 0x7],
+    "2": [0x6, 0x9, 0x1, 0x2, 0x4, 0xF],
+    "3": [0xE, 0x1, 0x6, 0x1, 0x9, 0x6],
+    "4": [0x2, 0x6, 0xA, 0xF, 0x2, 0x2],
+    "5": [0xF, 0x8, 0xE, 0x1, 0x9, 0x6],
+    "6": [0x6, 0x8, 0xE, 0x9, 0x9, 0x6],
+    "7": [0xF, 0x1, 0x2, 0x4, 0x4, 0x4],
+    "8": [0x6, 0x9, 0x6, 0x9, 0x9, 0x6],
+    "9": [0x6, 0x9, 0x9, 0x7, 0x1, 0x6],
+
+    "A": [0x6, 0x9, 0x9, 0xF, 0x9, 0x9],
+    "B": [0xE, 0x9, 0xE, 0x9, 0x9, 0xE],
+    "C": [0x7, 0x8, 0x8, 0x8, 0x8, 0x7],
+    "D": [0xE, 0x9, 0x9, 0x9, 0x9, 0xE],
+    "E": [0xF, 0x8, 0xE, 0x8, 0x8, 0xF],
+    "F": [0xF, 0x8, 0xE, 0x8, 0x8, 0x8],
+    "G": [0x7, 0x8, 0xB, 0x9, 0x9, 0x7],
+    "H": [0x9, 0x9, 0xF, 0x9, 0x9, 0x9],
+    "I": [0x7, 0x2, 0x2, 0x2, 0x2, 0x7],
+    "J": [0x1, 0x1, 0x1, 0x9, 0x9, 0x6],
+    "K": [0x9, 0xA, 0xC, 0xA, 0xA, 0x9],
+    "L": [0x8, 0x8, 0x8, 0x8, 0x8, 0xF],
+    "M": [0x9, 0xF, 0xF, 0x9, 0x9, 0x9],
+    "N": [0x9, 0xD, 0xB, 0x9, 0x9, 0x9],
+    "O": [0x6, 0x9, 0x9, 0x9, 0x9, 0x6],
+    "P": [0xE, 0x9, 0x9, 0xE, 0x8, 0x8],
+    "Q": [0x6, 0x9, 0x9, 0xB, 0xD, 0x7],
+    "R": [0xE, 0x9, 0x9, 0xE, 0xA, 0x9],
+    "S": [0x7, 0x8, 0x6, 0x1, 0x9, 0x6],
+    "T": [0xF, 0x2, 0x2, 0x2, 0x2, 0x2],
+    "U": [0x9, 0x9, 0x9, 0x9, 0x9, 0x6],
+    "V": [0x9, 0x9, 0x9, 0x9, 0x6, 0x6],
+    "W": [0x9, 0x9, 0x9, 0xF, 0xF, 0x9],
+    "X": [0x9, 0x9, 0x6, 0x6, 0x9, 0x9],
+    "Y": [0x9, 0x9, 0x6, 0x2, 0x2, 0x2],
+    "Z": [0xF, 0x1, 0x2, 0x4, 0x8, 0xF],
+
+    "!": [0x4, 0x4, 0x4, 0x4, 0x0, 0x4],
+    "\"": [0xA, 0xA, 0x0, 0x0, 0x0, 0x0],
+    "$": [0x7, 0xA, 0x6, 0x3, 0xA, 0xE],
+    "%": [0x9, 0x1, 0x2, 0x4, 0x8, 0x9],
+    "&": [0x6, 0x9, 0x6, 0xA, 0x9, 0x7],
+    "'": [0x4, 0x4, 0x0, 0x0, 0x0, 0x0],
+    "(": [0x2, 0x4, 0x8, 0x8, 0x4, 0x2],
+    ")": [0x8, 0x4, 0x2, 0x2, 0x4, 0x8],
+    "*": [0x0, 0xA, 0x4, 0xE, 0x4, 0xA],
+    "+": [0x0, 0x4, 0x4, 0xE, 0x4, 0x4],
+    ",": [0x0, 0x0, 0x0, 0x0, 0x4, 0x8],
+    ";": [0x0, 0x4, 0x0, 0x0, 0x4, 0x8],
+    "<": [0x1, 0x2, 0x4, 0x8, 0x4, 0x2],
+    "@": [0x6, 0x9, 0xB, 0xB, 0x8, 0x7],
+    "[": [0xE, 0x8, 0x8, 0x8, 0x8, 0xE],
+    "\\": [0x8, 0x8, 0x4, 0x2, 0x1, 0x1],
+    "]": [0xE, 0x2, 0x2, 0x2, 0x2, 0xE],
+    "^": [0x4, 0xA, 0x0, 0x0, 0x0, 0x0],
+    "`": [0x8, 0x4, 0x0, 0x0, 0x0, 0x0],
+    "{": [0x3, 0x4, 0xC, 0x4, 0x4, 0x3],
+    "|": [0x4, 0x4, 0x4, 0x4, 0x4, 0x4],
+    "}": [0xC, 0x2, 0x3, 0x2, 0x2, 0xC],
+    "~": [0x0, 0x5, 0xA, 0x0, 0x0, 0x0],
+}
+
+LABEL_NAMES = {
+    " ": "SPACE",
+    "!": "EXCLAMATION",
+    "\"": "DOUBLE_QUOTE",
+    "#": "HASH",
+    "$": "DOLLAR",
+    "%": "PERCENT",
+    "&": "AMPERSAND",
+    "'": "APOSTROPHE",
+    "(": "LPAREN",
+    ")": "RPAREN",
+    "*": "ASTERISK",
+    "+": "PLUS",
+    ",": "COMMA",
+    "-": "DASH",
+    ".": "DOT",
+    "/": "SLASH",
+    ":": "COLON",
+    ";": "SEMICOLON",
+    "<": "LT",
+    "=": "EQUALS",
+    ">": "GT",
+    "?": "QUESTION",
+    "@": "AT",
+    "[": "LBRACKET",
+    "\\": "BACKSLASH",
+    "]": "RBRACKET",
+    "^": "CARET",
+    "_": "UNDERSCORE",
+    "`": "BACKTICK",
+    "{": "LBRACE",
+    "|": "PIPE",
+    "}": "RBRACE",
+    "~": "TILDE",
+}
+
+DIGITS = list("0123456789")
+UPPERCASE = list("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+LOWERCASE = list("abcdefghijklmnopqrstuvwxyz")
+
+# Linear dispatch compares glyphs in this order, so the common monitor
+# characters come first.
+ORDER_5X7 = (
+    [" "] + DIGITS + UPPERCASE + ["=", "$", ">", ":", "-", "_", ".", "/"]
+    + LOWERCASE
+    + ["!", "\"", "#", "%", "&", "'", "(", ")", "*", "+", ",", ";", "<", "?", "@", "[", "\\", "]", "^", "`", "{", "|", "}", "~"]
+)
+ORDER_4X6 = (
+    [" "] + DIGITS + UPPERCASE
+    + ["!", "\"", "#", "$", "%", "&", "'", "(", ")", "*", "+", ",", "-", ".", "/", ":", ";", "<", "=", ">", "?", "@", "[", "\\", "]", "^", "_", "`", "{", "|", "}", "~"]
+)
+
+
+@dataclass(frozen=True)
+class Font:
+    # Glyph rows are width-bit integers, the leftmost pixel in the top bit.
+    name: str
+    width: int
+    height: int
+    glyphs: dict = field(compare=False)
+    source: str = ""
+
+
+@dataclass(frozen=True)
+class Layout:
+    """A font placed in terminal cells, and the runtime built around it."""
+
+    font: Font
+    font_arg: str
+    prefix: str
+    title: str
+    out: str
+    cell_w: int
+    cell_h: int
+    cols: int
+    rows: int
+    origin_x: int
+    origin_y: int
+    wrap: str
+    fallback: str
+    char_order: tuple
+    # Characters drawn with another character's glyph, e.g. lowercase
+    # letters on an uppercase-only font.
+    aliases: dict = field(compare=False)
+    # Geometry names oled_constants.asm already defines; the library
+    # defines the rest itself.
+    external: tuple = ()
+    # <prefix>_PRINT_READY_PROMPT and <prefix>_CLEAR_CURRENT_LINE_LOOP.
+    monitor_helpers: bool = False
+    clear_cols: int = GROUPED_COLS
+    clear_rows: int = SAFE_ROWS
+    safe_max_row: int = SAFE_ROWS - 1
+    # Characters a glyph subset was asked for; empty for the full font.
+    subset: str = ""
+
+    @property
+    def row_bytes(self) -> int:
+        return self.cell_w // 2
+
+    def label(self, name: str) -> str:
+        return f"{self.prefix}_{name}"
+
+
+def font_from_columns(name: str, columns: dict, height: int, source: str) -> Font:
+    # Column-major glyphs, bit 0 at the top, as glcdfont.c stores them.
+    width = len(next(iter(columns.values())))
+    glyphs = {}
+    for ch, cols in columns.items():
+        glyphs[ch] = tuple(
+            sum(((cols[x] >> y) & 1) << (width - 1 - x) for x in range(width))
+            for y in range(height)
+        )
+    return Font(name, width, height, glyphs, source)
+
+
+FONT5X7 = font_from_columns("5x7", FONT5X7_COLUMNS, 8, "Adafruit_GFX glcdfont.c fixed-space ASCII font table")
+FONT4X6 = Font("4x6", 4, 6, {ch: tuple(rows) for ch, rows in FONT4X6_ROWS.items()}, "project compact 4x6 font table")
+
+BUILTIN_LAYOUTS = {
+    "5x7": Layout(
+        font=FONT5X7,
+        font_arg="5x7",
+        prefix="OLED5",
+        title="5x7 monitor",
+        out="oled_text_5x7.asm",
+        cell_w=6,
+        cell_h=8,
+        cols=21,
+        rows=8,
+        origin_x=0x01,
+        origin_y=0x00,
+        wrap="immediate",
+        fallback=" ",
+        char_order=tuple(ORDER_5X7),
+        aliases={},
+        external=("MAX_COLS", "MAX_ROWS", "DEFAULT_X", "DEFAULT_Y", "CLEAR_COLS", "CLEAR_ROWS"),
+        monitor_helpers=True,
+        clear_cols=63,
+        clear_rows=64,
+        safe_max_row=0x3F,
+    ),
+    "4x6": Layout(
+        font=FONT4X6,
+        font_arg="4x6",
+        prefix="OLED4",
+        title="compact 4x6 monitor",
+        out="oled_text_4x6.asm",
+        cell_w=4,
+        cell_h=7,
+        cols=0x20,
+        rows=0x09,
+        origin_x=0x00,
+        origin_y=0x00,
+        wrap="pending",
+        fallback="?",
+        char_order=tuple(ORDER_4X6),
+        aliases={ch: ch.upper() for ch in LOWERCASE},
+    ),
+}
+
+
+def parse_bdf(path: Path) -> Font:
+    # Glyphs are placed in FONTBOUNDINGBOX, on its baseline.
+    box = None
+    glyphs = {}
+    code = -1
+    bbx = None
+    bitmap: Optional[list] = None
+    for number, line in enumerate(path.read_text(encoding="latin-1").splitlines(), start=1):
+        words = line.split()
+        if not words:
+            continue
+        key = words[0]
+        try:
+            if key == "FONTBOUNDINGBOX":
+                box = tuple(int(value) for value in words[1:5])
+            elif key == "ENCODING":
+                code = int(words[-1])
+            elif key == "BBX":
+                bbx = tuple(int(value) for value in words[1:5])
+            elif key == "BITMAP":
+                bitmap = []
+            elif key == "ENDCHAR":
+                if box is None or bbx is None or bitmap is None:
+                    raise ValueError("glyph without FONTBOUNDINGBOX, BBX or BITMAP")
+                if TABLE_FIRST <= code <= TABLE_LAST:
+                    glyphs[chr(code)] = place_bdf_glyph(box, bbx, bitmap)
+                code, bbx, bitmap = -1, None, None
+            elif bitmap is not None:
+                bitmap.append(int(key, 16))
+        except ValueError as exc:
+            raise ValueError(f"{path}:{number}: {exc}") from exc
+    if box is None:
+        raise ValueError(f"{path}: no FONTBOUNDINGBOX")
+    return Font(path.stem, box[0], box[1], glyphs, f"BDF file {path.name}")
+
+
+def place_bdf_glyph(box: tuple, bbx: tuple, bitmap: list) -> tuple:
+    font_w, font_h, font_x, font_y = box
+    width, height, x_off, y_off = bbx
+    row_bits = -(-width // 8) * 8
+    top = (font_h + font_y) - (y_off + height)
+    left = x_off - font_x
+    rows = [0] * font_h
+    for y, value in enumerate(bitmap[:height]):
+        row = top + y
+        if not 0 <= row < font_h:
+            continue
+        for x in range(width):
+            col = left + x
+            if 0 <= col < font_w and (value >> (row_bits - 1 - x)) & 1:
+                rows[row] |= 1 << (font_w - 1 - col)
+    return tuple(rows)
+
+
+PSF1_MAGIC = b"\x36\x04"
+PSF2_MAGIC = b"\x72\xb5\x4a\x86"
+
+
+def parse_psf(path: Path) -> Font:
+    data = path.read_bytes()
+    if data[:2] == PSF1_MAGIC:
+        mode, height = data[2], data[3]
+        width, count, start, size = 8, 512 if mode & 0x01 else 256, 4, height
+        table = psf1_unicode(data[start + count * size:], count) if mode & 0x02 else None
+    elif data[:4] == PSF2_MAGIC:
+        _, start, flags, count, size, height, width = struct.unpack_from("<7I", data, 4)
+        table = psf2_unicode(data[start + count * size:], count) if flags & 0x01 else None
+    else:
+        raise ValueError(f"{path}: not a PSF1 or PSF2 font")
+
+    stride = -(-width // 8)
+    glyphs = {}
+    for index in range(count):
+        codes = table.get(index, ()) if table is not None else (index,)
+        chars = [chr(code) for code in codes if TABLE_FIRST <= code <= TABLE_LAST]
+        if not chars:
+            continue
+        raw = data[start + index * size:start + (index + 1) * size]
+        rows = tuple(int.from_bytes(raw[y * stride:(y + 1) * stride], "big") >> (stride * 8 - width) for y in range(height))
+        for ch in chars:
+            glyphs.setdefault(ch, rows)
+    return Font(path.stem, width, height, glyphs, f"PSF file {path.name}")
+
+
+def psf1_unicode(table: bytes, count: int) -> dict:
+    # Per glyph: u16 code points, 0xFFFE starts sequences, 0xFFFF ends.
+    codes: dict = {}
+    index = 0
+    in_sequence = False
+    for (value,) in struct.iter_unpack("<H", table[:len(table) // 2 * 2]):
+        if index >= count:
+            break
+        if value == 0xFFFF:
+            index += 1
+            in_sequence = False
+        elif value == 0xFFFE:
+            in_sequence = True
+        elif not in_sequence:
+            codes.setdefault(index, []).append(value)
+    return codes
+
+
+def psf2_unicode(table: bytes, count: int) -> dict:
+    # Per glyph: UTF-8 characters, 0xFE starts sequences, 0xFF ends.
+    codes: dict = {}
+    for index, entry in enumerate(table.split(b"\xff")[:count]):
+        single = entry.split(b"\xfe", 1)[0]
+        codes[index] = [ord(ch) for ch in single.decode("utf-8", errors="ignore")]
+    return codes
+
+
+def load_font(path: Path) -> Font:
+    suffix = path.suffix.lower()
+    if suffix == ".bdf":
+        return parse_bdf(path)
+    if suffix in (".psf", ".psfu"):
+        return parse_psf(path)
+    raise ValueError(f"{path}: font files must be .bdf or .psf")
+
+
+def file_layout(
+    font: Font,
+    font_arg: str,
+    prefix: str,
+    cell: Optional[tuple] = None,
+    wrap: str = "pending",
+) -> Layout:
+    # Terminal for a font file: the cell holds the font box, rounded up to
+    # an even width, and as many cells as fit in the safe area.
+    glyphs = dict(font.glyphs)
+    glyphs.setdefault(" ", (0,) * font.height)
+    font = replace(font, glyphs=glyphs)
+    cell_w, cell_h = cell or (font.width + font.width % 2, font.height)
+    order = [" "] + DIGITS + UPPERCASE + LOWERCASE
+    order += [chr(code) for code in range(TABLE_FIRST, TABLE_LAST + 1) if chr(code) not in order]
+    aliases = {ch: ch.upper() for ch in LOWERCASE if ch not in glyphs and ch.upper() in glyphs}
+    return Layout(
+        font=font,
+        font_arg=font_arg,
+        prefix=prefix,
+        title=f"{font.name} {cell_w}x{cell_h}",
+        out=f"oled_text_{font.name.lower()}.asm",
+        cell_w=cell_w,
+        cell_h=cell_h,
+        cols=min(SCREEN_W // cell_w, 0xFF),
+        rows=SAFE_ROWS // cell_h,
+        origin_x=0x00,
+        origin_y=0x00,
+        wrap=wrap,
+        fallback="?" if "?" in glyphs else " ",
+        char_order=tuple(ch for ch in order if ch in glyphs),
+        aliases=aliases,
+    )
+
+
+def check_layout(layout: Layout) -> None:
+    font = layout.font
+    if layout.cell_w < 2 or layout.cell_w % 2:
+        raise ValueError(f"cell width {layout.cell_w} must be even: each SSD1325 byte holds two pixels")
+    if font.width > layout.cell_w or font.height > layout.cell_h:
+        raise ValueError(
+            f"{font.width}x{font.height} glyphs do not fit {layout.cell_w}x{layout.cell_h} cells; pass a larger --cell"
+        )
+    if layout.cols < 1 or layout.rows < 1:
+        raise ValueError(f"{layout.cell_w}x{layout.cell_h} cells do not fit on the screen")
+    if layout.fallback not in font.glyphs:
+        raise ValueError(f"font has no fallback glyph {layout.fallback!r}")
+    if not layout.prefix.isidentifier() or not layout.prefix.isupper():
+        raise ValueError(f"prefix {layout.prefix!r} must be an upper-case assembler name")
+    if layout.wrap not in WRAP_MODES:
+        raise ValueError(f"unknown wrap mode {layout.wrap!r}")
+
+
+@dataclass(frozen=True)
+class ProgramScan:
+    """Characters a program prints through a text layer."""
+
+    path: Path
+    chars: frozenset
+    # (file, line, routine) for calls whose character is not an
+    # immediate, e.g. computed digits or a RAM string.
+    computed: tuple
+
+
+def scan_program(path: Path, prefix: str) -> ProgramScan:
+    # Static scan of a program and the files it includes. A character
+    # routine counts the immediate in the last `MOV $A, ...` before the
+    # JSR, as long as no label or other write to $A is in between; string
+    # literals count for <prefix>_DRAW_STRING. Generated text libraries
+    # are not scanned: their own helpers are covered by HELPER_CHARSETS.
+    chars: set = set()
+    computed: list = []
+    literals: list = []
+    strings: list = []
+    seen: set = set()
+    jsr = re.compile(rf"JSR\s+{prefix}_(\w+)$")
+    mov = re.compile(r"MOV\s+\$A\s*,\s*(0x[0-9A-Fa-f]+|\d+)$")
+    writes_a = re.compile(r"^(?!CMP|PSH|OLD|OLC)\w+\s+\$A\b")
+    literal = re.compile(r'#d\s+"((?:[^"\\]|\\.)*)"')
+
+    def scan(file: Path) -> None:
+        file = file.resolve()
+        if file in seen or not file.is_file():
+            return
+        seen.add(file)
+        text = file.read_text(encoding="utf-8", errors="replace")
+        if "Generated by oled_font_compiler.py" in text:
+            return
+        value = None
+        for number, raw in enumerate(text.splitlines(), 1):
+            literals.extend(literal.findall(raw))
+            line = raw.split(";", 1)[0].strip()
+            if not line:
+                continue
+            if line.startswith("#include"):
+                scan(file.parent / line.split('"')[1])
+                continue
+            if line.endswith(":"):
+                value = None
+                continue
+            call = jsr.match(line)
+            if call:
+                routine = call.group(1)
+                if routine in PRINT_ROUTINES:
+                    if value is None:
+                        computed.append((file, number, f"{prefix}_{routine}"))
+                    else:
+                        chars.add(chr(value))
+                elif routine in HELPER_CHARSETS:
+                    chars.update(HELPER_CHARSETS[routine])
+                elif routine == "DRAW_STRING":
+                    strings.append((file, number, f"{prefix}_DRAW_STRING"))
+                value = None
+                continue
+            immediate = mov.match(line)
+            if immediate:
+                value = int(immediate.group(1), 0) & 0xFF
+            elif writes_a.match(line) or line.startswith(("JSR", "PUL")):
+                value = None
+
+    scan(path)
+    if strings and not literals:
+        computed.extend(strings)
+    for text in literals:
+        chars.update(text.encode("utf-8").decode("unicode_escape"))
+    printable = {ch for ch in chars if TABLE_FIRST <= ord(ch) <= TABLE_LAST}
+    return ProgramScan(path, frozenset(printable), tuple(computed))
+
+
+def subset_layout(layout: Layout, chars: str) -> Layout:
+    # Keep the glyphs for `chars`, plus the fallback and space (clearing and
+    # backspace draw spaces). Everything else dispatches to the fallback.
+    wanted = {ch for ch in chars if TABLE_FIRST <= ord(ch) <= TABLE_LAST}
+    aliases = {ch: glyph for ch, glyph in layout.aliases.items() if ch in wanted}
+    keep = {" ", layout.fallback} | wanted | set(aliases.values())
+    return replace(
+        layout,
+        char_order=tuple(ch for ch in layout.char_order if ch in keep),
+        aliases=aliases,
+        subset="".join(sorted(wanted)),
+    )
+
+
+def label_for_char(ch: str) -> str:
+    if ch in LABEL_NAMES:
+        return LABEL_NAMES[ch]
+    if ch.isdigit():
+        return f"DIGIT_{ch}"
+    if "a" <= ch <= "z":
+        return f"LOWER_{ch.upper()}"
+    return ch
+
+
+def comment_for_char(ch: str) -> str:
+    if ch == " ":
+        return "; Character: SPACE (' ')"
+    return f"; Character: {ch}"
+
+
+def cmp_comment_for_char(ch: str) -> str:
+    if ch == " ":
+        return "SPACE"
+    return ch
+
+
+def pack_pair(left_on: int, right_on: int) -> int:
+    # Pixel packing:
+    #   left pixel  -> high nibble
+    #   right pixel -> low nibble
+    lo = FG_NIBBLE if right_on else BG_NIBBLE
+    hi = FG_NIBBLE if left_on else BG_NIBBLE
+    return (hi << 4) | lo
+
+
+def glyph_rows(layout: Layout, ch: str):
+    # The glyph in its cell, one list of packed bytes per pixel row. Cell
+    # pixels right of and below the font box are spacing.
+    font = layout.font
+    rows = font.glyphs[ch]
+
+    for y in range(layout.cell_h):
+        bits = rows[y] if y < font.height else 0
+        pixels = [x < font.width and (bits >> (font.width - 1 - x)) & 1 for x in range(layout.cell_w)]
+
+        yield [pack_pair(pixels[x], pixels[x + 1]) for x in range(0, layout.cell_w, 2)]
+
+
+def emit_mov_old(lines: list[str], value: int) -> None:
+    lines.append(f"    MOV $A, 0x{value:02X}")
+    lines.append("    OLD $A")
+
+
+def glyph_label(layout: Layout, ch: str) -> str:
+    return layout.label(f"CHAR_{label_for_char(ch)}")
+
+
+def emit_glyph_routine(lines: list[str], layout: Layout, ch: str) -> None:
+    lines.extend([
+        "",
+        comment_for_char(ch),
+        f"{glyph_label(layout, ch)}:",
+        f"    JSR {layout.prefix}_RENDER_BEGIN",
+    ])
+
+    for row_bytes in glyph_rows(layout, ch):
+        for b in row_bytes:
+            emit_mov_old(lines, b)
+
+    lines.extend([
+        f"    JSR {layout.prefix}_ADVANCE_CURSOR",
+        "    RTS",
+    ])
+
+
+def glyph_columns(layout: Layout, ch: str):
+    # Glyph bytes in vertical address increment order: down each grouped
+    # column, then across to the next.
+    rows = list(glyph_rows(layout, ch))
+    for col in range(layout.row_bytes):
+        for row_bytes in rows:
+            yield row_bytes[col]
+
+
+def emit_glyph_body(lines: list[str], layout: Layout, ch: str) -> None:
+    # Line mode: the glyph streams into the window its caller opened and
+    # leaves the cursor to the caller.
+    lines.extend([
+        "",
+        comment_for_char(ch),
+        f"{glyph_label(layout, ch)}:",
+    ])
+
+    for b in glyph_columns(layout, ch):
+        emit_mov_old(lines, b)
+
+    lines.append("    RTS")
+
+
+def emit_glyph_stub(lines: list[str], layout: Layout, ch: str) -> None:
+    # Data mode: the glyph label points CD at its packed bytes and jumps to
+    # the shared blitter. CD is saved first for <prefix>_DRAW_STRING.
+    p = layout.prefix
+    label = label_for_char(ch)
+
+    lines.extend([
+        "",
+        comment_for_char(ch),
+        f"{p}_CHAR_{label}:",
+        "    PSH $C",
+        "    PSH $D",
+        f"    MOV $C, ({p}_GLYPH_{label} & 0xFF)",
+        f"    MOV $D, ({p}_GLYPH_{label} >> 8)",
+        f"    JMP {p}_BLIT_GLYPH",
+    ])
+
+
+def emit_glyph_data(lines: list[str], layout: Layout, ch: str) -> None:
+    lines.extend(["", f"{layout.prefix}_GLYPH_{label_for_char(ch)}:"])
+    for row_bytes in glyph_rows(layout, ch):
+        lines.append("    #d8 " + ", ".join(f"0x{b:02X}" for b in row_bytes))
+
+
+def emit_blitter(lines: list[str], layout: Layout) -> None:
+    # One pass per pixel row, the row's bytes read unrolled.
+    p = layout.prefix
+    lines.extend([
+        "",
+        "; ==========================================================",
+        "; Shared glyph blitter",
+        ";",
+        "; in: CD = packed glyph bytes, caller's CD pushed by the",
+        ";     glyph label",
+        "",
+        f"{p}_BLIT_GLYPH:",
+        f"    JSR {p}_RENDER_BEGIN",
+        f"    MOV $B, 0x{layout.cell_h:02X}",
+        "",
+        f"{p}_BLIT_GLYPH_ROW:",
+    ])
+    for _ in range(layout.row_bytes):
+        lines.extend([
+            "    MOV $A, [$CD]",
+            "    OLD $A",
+            "    CLC",
+            "    ADD $C, 0x01",
+            "    ADD $D, 0x00",
+        ])
+    lines.extend([
+        "",
+        "    STC",
+        "    SUB $B, 0x01",
+        f"    JNZ {p}_BLIT_GLYPH_ROW",
+        "",
+        f"    JSR {p}_ADVANCE_CURSOR",
+        "    PUL $D",
+        "    PUL $C",
+        "    RTS",
+    ])
+
+
+def glyph_cycles(layout: Layout, glyphs: str) -> int:
+    # Cycles per character spent drawing the glyph bytes, leaving out
+    # <prefix>_RENDER_BEGIN and <prefix>_ADVANCE_CURSOR, which both modes call.
+    glyph_bytes = layout.cell_h * layout.row_bytes
+    if glyphs == "code":
+        return glyph_bytes * (MOV_IMM_CYCLES + OLD_CYCLES)
+
+    read_cycles = MOV_MEM_CYCLES + OLD_CYCLES + FLAG_CYCLES + 2 * ALU_CYCLES
+    row_cycles = layout.row_bytes * read_cycles + FLAG_CYCLES + ALU_CYCLES
+    return (
+        # glyph label: PSH, PSH, MOV, MOV, JMP
+        2 * STACK_CYCLES + 2 * MOV_IMM_CYCLES + JMP_CYCLES
+        + MOV_IMM_CYCLES
+        + layout.cell_h * row_cycles
+        + (layout.cell_h - 1) * BRANCH_TAKEN_CYCLES + BRANCH_NOT_TAKEN_CYCLES
+        + 2 * STACK_CYCLES
+    )
+
+
+def instruction_bytes(line: str, constants: dict[str, int]) -> int:
+    # Assembled size of one library line. Operands that are numbers,
+    # byte expressions or byte-sized library constants are immediates;
+    # any other symbol is a 16-bit address.
+    code = line.split(";", 1)[0].strip()
+    if not code or code.endswith(":") or "=" in code:
+        return 0
+    if code.startswith("#d8"):
+        return len(code[3:].split(","))
+    operands = [part.strip() for part in code.split(None, 1)[1:] for part in part.split(",")]
+    size = 1
+    for operand in operands:
+        if operand.startswith(("$", "[$")):
+            continue
+        if operand.startswith(("0x", "(")) or constants.get(operand, 0x100) <= 0xFF:
+            size = max(size, 2)
+        else:
+            size = 3
+    return size
+
+
+def library_bytes(lib: str) -> int:
+    lines = lib.splitlines()
+    constants = {}
+    source = CONSTANTS_ASM.read_text(encoding="utf-8").splitlines() if CONSTANTS_ASM.is_file() else []
+    for line in source + lines:
+        name, sep, value = line.split(";", 1)[0].partition("=")
+        if sep:
+            constants[name.strip()] = int(value, 0)
+    return sum(instruction_bytes(line, constants) for line in lines)
+
+
+def geometry(layout: Layout) -> list[tuple[str, int]]:
+    # Terminal constants the routines use, as (name, value).
+    values = [
+        ("MAX_COLS", layout.cols),
+        ("MAX_ROWS", layout.rows),
+    ]
+    if layout.wrap == "pending":
+        values.append(("LAST_COL", layout.cols - 1))
+    values += [
+        ("CELL_BYTES", layout.row_bytes),
+        ("CELL_H", layout.cell_h),
+        ("DEFAULT_X", layout.origin_x),
+        ("DEFAULT_Y", layout.origin_y),
+        ("CLEAR_COLS", layout.clear_cols),
+        ("CLEAR_ROWS", layout.clear_rows),
+        ("SAFE_MAX_RAW_ROW", layout.safe_max_row),
+    ]
+    if layout.wrap == "pending":
+        values.append(("PENDING_WRAP", PENDING_WRAP_ADDR))
+    return values
+
+
+def emit_geometry(lines: list[str], layout: Layout) -> None:
+    values = [(f"{layout.prefix}_{name}", value) for name, value in geometry(layout) if name not in layout.external]
+    if not values:
+        return
+    width = max(len(name) for name, _ in values)
+    lines.append(f"; ---------- {layout.font.name} terminal geometry ----------")
+    if layout.external:
+        lines.append(f"; {layout.prefix}_{layout.external[0]} and the rest are in oled_constants.asm.")
+    for name, value in values:
+        digits = 4 if value > 0xFF else 2
+        lines.append(f"{name:<{width}} = 0x{value:0{digits}X}")
+    lines.append("")
+
+
+def emit_cursor_base_loop(lines: list[str], layout: Layout) -> None:
+    # Repeated adds, one per column and one per row.
+    p = layout.prefix
+    lines.extend([
+        f"{p}_COMPUTE_CURSOR_BASE:",
+        f"    ; base grouped column = origin_x + col * {layout.row_bytes}",
+        "    MOV $A, OLED_TEXT_ORIGIN_X",
+        "    MOV $B, OLED_CURSOR_COL",
+        "",
+        f"{p}_CURSOR_X_LOOP:",
+        "    STC",
+        "    CMP $B, 0x00",
+        f"    JZ {p}_CURSOR_X_DONE",
+        "",
+        "    CLC",
+        f"    ADD $A, 0x{layout.row_bytes:02X}",
+        "",
+        "    STC",
+        "    SUB $B, 0x01",
+        f"    JMP {p}_CURSOR_X_LOOP",
+        "",
+        f"{p}_CURSOR_X_DONE:",
+        "    MOV OLED_GLYPH_BASE_X, $A",
+        "",
+        f"    ; base row = origin_y + row * {layout.cell_h}",
+        "    MOV $A, OLED_TEXT_ORIGIN_Y",
+        "    MOV $B, OLED_CURSOR_ROW",
+        "",
+        f"{p}_CURSOR_Y_LOOP:",
+        "    STC",
+        "    CMP $B, 0x00",
+        f"    JZ {p}_CURSOR_Y_DONE",
+        "",
+        "    CLC",
+        f"    ADD $A, 0x{layout.cell_h:02X}",
+        "",
+        "    STC",
+        "    SUB $B, 0x01",
+        f"    JMP {p}_CURSOR_Y_LOOP",
+        "",
+        f"{p}_CURSOR_Y_DONE:",
+        "    MOV OLED_GLYPH_BASE_Y, $A",
+        "    RTS",
+    ])
+
+
+def emit_cursor_base_table(lines: list[str], layout: Layout) -> None:
+    # One table read per axis. The tables hold col * cell bytes and
+    # row * cell height for every cursor position; the origins are added at
+    # run time, so <prefix>_SET_DEFAULT_ORIGIN and callers that move the
+    # origin keep working.
+    p = layout.prefix
+    lines.append(f"{p}_COMPUTE_CURSOR_BASE:")
+    lines.extend([
+        "    ; CD is the caller's string pointer.",
+        "    PSH $C",
+        "    PSH $D",
+    ])
+    axes = (
+        ("X", "OLED_CURSOR_COL", "OLED_TEXT_ORIGIN_X", f"grouped column = origin_x + {p}_CURSOR_X_TABLE[col]"),
+        ("Y", "OLED_CURSOR_ROW", "OLED_TEXT_ORIGIN_Y", f"row = origin_y + {p}_CURSOR_Y_TABLE[row]"),
+    )
+    for axis, cursor, origin, comment in axes:
+        lines.extend([
+            "",
+            f"    ; base {comment}",
+            f"    MOV $C, ({p}_CURSOR_{axis}_TABLE & 0xFF)",
+            f"    MOV $D, ({p}_CURSOR_{axis}_TABLE >> 8)",
+            "    CLC",
+            f"    ADD $C, {cursor}",
+            "    ADD $D, 0x00",
+            "    MOV $A, [$CD]",
+            "    CLC",
+            f"    ADD $A, {origin}",
+            f"    MOV OLED_GLYPH_BASE_{axis}, $A",
+        ])
+    lines.extend([
+        "",
+        "    PUL $D",
+        "    PUL $C",
+        "    RTS",
+        "",
+        f"; col * {layout.row_bytes}, cols 0..{layout.cols - 1}",
+        f"{p}_CURSOR_X_TABLE:",
+    ])
+    emit_byte_table(lines, [col * layout.row_bytes for col in range(layout.cols)])
+    lines.extend([
+        "",
+        f"; row * {layout.cell_h}, rows 0..{layout.rows - 1}",
+        f"{p}_CURSOR_Y_TABLE:",
+    ])
+    emit_byte_table(lines, [row * layout.cell_h for row in range(layout.rows)])
+
+
+def emit_byte_table(lines: list[str], values: list[int]) -> None:
+    for start in range(0, len(values), 8):
+        lines.append("    #d8 " + ", ".join(f"0x{value:02X}" for value in values[start:start + 8]))
+
+
+CURSOR_EMITTERS = {
+    "loop": emit_cursor_base_loop,
+    "table": emit_cursor_base_table,
+}
+
+
+def cursor_base_cycles(layout: Layout, cursor: str) -> tuple[int, float]:
+    # Worst and average <prefix>_COMPUTE_CURSOR_BASE cycles over every cell.
+    if cursor == "table":
+        axis = (
+            2 * MOV_IMM_CYCLES + FLAG_CYCLES + ADD_MEM_CYCLES + ALU_CYCLES
+            + MOV_MEM_CYCLES + FLAG_CYCLES + ADD_MEM_CYCLES + MOV_MEM_CYCLES
+        )
+        cycles = 4 * STACK_CYCLES + 2 * axis + RTS_CYCLES
+        return cycles, float(cycles)
+
+    # Per axis: two loads, one pass per step, the exit test and the store.
+    step = (
+        FLAG_CYCLES + CMP_IMM_CYCLES + BRANCH_NOT_TAKEN_CYCLES
+        + FLAG_CYCLES + ALU_CYCLES
+        + FLAG_CYCLES + ALU_CYCLES + JMP_CYCLES
+    )
+    fixed = 2 * (2 * MOV_MEM_CYCLES + FLAG_CYCLES + CMP_IMM_CYCLES + BRANCH_TAKEN_CYCLES + MOV_MEM_CYCLES) + RTS_CYCLES
+    worst = fixed + step * (layout.cols - 1 + layout.rows - 1)
+    average = fixed + step * ((layout.cols - 1) / 2 + (layout.rows - 1) / 2)
+    return worst, average
+
+
+def dispatch_targets(layout: Layout) -> dict[int, str]:
+    # Glyph drawn for every byte value. Anything outside the font draws the
+    # fallback glyph.
+    targets = {code: layout.fallback for code in range(0x100)}
+    for ch in layout.char_order:
+        targets[ord(ch)] = ch
+    for ch, glyph in layout.aliases.items():
+        targets[ord(ch)] = glyph
+    return targets
+
+
+def emit_dispatch_linear(lines: list[str], layout: Layout) -> dict[int, int]:
+    # One compare per glyph in the layout's order, then one per alias.
+    # Returns cycles per byte value, from <prefix>_DRAW_CHAR to the glyph
+    # routine.
+    costs: dict[int, int] = {}
+    spent = MOV_MEM_CYCLES
+    step = MOV_MEM_CYCLES + FLAG_CYCLES + CMP_IMM_CYCLES
+
+    compares = [(ch, ch) for ch in layout.char_order] + list(layout.aliases.items())
+    for ch, glyph in compares:
+        lines.extend([
+            "    MOV $A, OLED_CHAR_TMP",
+            "    STC",
+            f"    CMP $A, 0x{ord(ch):02X}       ; {cmp_comment_for_char(ch)}",
+            f"    JZ {glyph_label(layout, glyph)}",
+            "",
+        ])
+        costs[ord(ch)] = spent + step + BRANCH_TAKEN_CYCLES
+        spent += step + BRANCH_NOT_TAKEN_CYCLES
+
+    lines.extend([
+        "    ; Unsupported character: draw the fallback glyph.",
+        f"    JMP {glyph_label(layout, layout.fallback)}",
+    ])
+    for code in range(0x100):
+        costs.setdefault(code, spent + JMP_CYCLES)
+    return costs
+
+
+def emit_dispatch_tree(lines: list[str], layout: Layout) -> dict[int, int]:
+    # Balanced binary search over runs of byte values that draw the same
+    # glyph. Each node sends $A >= pivot to its right half with JC, so no
+    # path takes more than log2(runs) compares.
+    targets = dispatch_targets(layout)
+    runs: list[list] = []
+    for code in range(0x100):
+        if runs and runs[-1][2] == targets[code]:
+            runs[-1][1] = code
+        else:
+            runs.append([code, code, targets[code]])
+
+    costs: dict[int, int] = {}
+
+    def settle(run: list, cycles: int) -> None:
+        for code in range(run[0], run[1] + 1):
+            costs[code] = cycles
+
+    def emit_node(first: int, last: int, spent: int) -> None:
+        if first == last:
+            lines.append(f"    JMP {glyph_label(layout, runs[first][2])}")
+            settle(runs[first], spent + JMP_CYCLES)
+            return
+
+        mid = (first + last + 1) // 2
+        pivot = runs[mid][0]
+        compared = spent + FLAG_CYCLES + CMP_IMM_CYCLES
+        if mid == last:
+            right = glyph_label(layout, runs[mid][2])
+            settle(runs[mid], compared + BRANCH_TAKEN_CYCLES)
+        else:
+            right = layout.label(f"DRAW_CHAR_GE_{pivot:02X}")
+
+        comment = f"       ; {cmp_comment_for_char(chr(pivot))}" if 0x20 <= pivot <= 0x7E else ""
+        lines.extend([
+            "    STC",
+            f"    CMP $A, 0x{pivot:02X}{comment}",
+            f"    JC {right}",
+        ])
+        emit_node(first, mid - 1, compared + BRANCH_NOT_TAKEN_CYCLES)
+
+        if mid != last:
+            lines.extend(["", f"{right}:"])
+            emit_node(mid, last, compared + BRANCH_TAKEN_CYCLES)
+
+    # $A still holds the character.
+    emit_node(0, len(runs) - 1, MOV_MEM_CYCLES)
+    return costs
+
+
+def emit_dispatch_table(lines: list[str], layout: Layout) -> dict[int, int]:
+    # Jump table indexed by character - 0x20, one JMP (3 bytes) per entry.
+    # JSR [$CD] enters the table through the bridge register; the glyph
+    # routine returns here so the caller's CD string pointer can be restored.
+    p = layout.prefix
+    targets = dispatch_targets(layout)
+    fallback = ord(layout.fallback) - TABLE_FIRST
+    lines.extend([
+        "    PSH $C",
+        "    PSH $D",
+        "",
+        f"    ; table index = character - 0x{TABLE_FIRST:02X}",
+        "    STC",
+        f"    SUB $A, 0x{TABLE_FIRST:02X}",
+        f"    JNC {p}_DRAW_CHAR_UNSUPPORTED",
+        "",
+        "    STC",
+        f"    CMP $A, 0x{TABLE_LAST - TABLE_FIRST + 1:02X}",
+        f"    JNC {p}_DRAW_CHAR_INDEXED",
+        "",
+        f"{p}_DRAW_CHAR_UNSUPPORTED:",
+        "    ; Unsupported character: draw the fallback glyph.",
+        f"    MOV $A, 0x{fallback:02X}",
+        "",
+        f"{p}_DRAW_CHAR_INDEXED:",
+        f"    ; CD = {p}_CHAR_JUMP_TABLE + index * 3",
+        f"    MOV $C, ({p}_CHAR_JUMP_TABLE & 0xFF)",
+        f"    MOV $D, ({p}_CHAR_JUMP_TABLE >> 8)",
+    ])
+    for _ in range(3):
+        lines.extend([
+            "    CLC",
+            "    ADD $C, $A",
+            "    ADD $D, 0x00",
+        ])
+    lines.extend([
+        "",
+        "    JSR [$CD]",
+        "",
+        "    PUL $D",
+        "    PUL $C",
+        "    RTS",
+        "",
+        f"{p}_CHAR_JUMP_TABLE:",
+    ])
+    for code in range(TABLE_FIRST, TABLE_LAST + 1):
+        lines.append(f"    JMP {glyph_label(layout, targets[code])}       ; 0x{code:02X} {cmp_comment_for_char(chr(code))}")
+
+    indexed = (
+        2 * MOV_IMM_CYCLES
+        + 3 * (FLAG_CYCLES + 2 * ALU_CYCLES)
+        + JSR_CYCLES
+        + JMP_CYCLES
+        # PUL $D, PUL $C and RTS after the glyph routine returns.
+        + 2 * STACK_CYCLES
+        + RTS_CYCLES
+    )
+    entered = MOV_MEM_CYCLES + 2 * STACK_CYCLES + FLAG_CYCLES + ALU_CYCLES
+    checked = entered + BRANCH_NOT_TAKEN_CYCLES + FLAG_CYCLES + CMP_IMM_CYCLES
+
+    costs: dict[int, int] = {}
+    for code in range(0x100):
+        if code < TABLE_FIRST:
+            costs[code] = entered + BRANCH_TAKEN_CYCLES + MOV_IMM_CYCLES + indexed
+        elif code > TABLE_LAST:
+            costs[code] = checked + BRANCH_NOT_TAKEN_CYCLES + MOV_IMM_CYCLES + indexed
+        else:
+            costs[code] = checked + BRANCH_TAKEN_CYCLES + indexed
+    return costs
+
+
+DISPATCH_EMITTERS = {
+    "linear": emit_dispatch_linear,
+    "tree": emit_dispatch_tree,
+    "table": emit_dispatch_table,
+}
+
+
+def dispatch_cycles(layout: Layout, dispatch: str) -> tuple[int, float]:
+    # Worst and average dispatch cycles over the printable characters.
+    costs = DISPATCH_EMITTERS[dispatch]([], layout)
+    printable = [costs[code] for code in range(0x20, 0x7F)]
+    return max(printable), sum(printable) / len(printable)
+
+
+def control_codes(layout: Layout) -> tuple:
+    # Bytes <prefix>_DRAW_STRING does not draw. With pending wrap every
+    # <prefix>_PUTC control code ends a run; the immediate-wrap monitor only
+    # acts on newline and draws anything else.
+    return (0x0A, 0x0D, 0x08) if layout.wrap == "pending" else (0x0A,)
+
+
+def emit_draw_string_char(lines: list[str], layout: Layout) -> None:
+    # One <prefix>_DRAW_CHAR, and so one window, per character.
+    p = layout.prefix
+    lines.extend([
+        f"{p}_DRAW_STRING:",
+        f"{p}_DRAW_STRING_LOOP:",
+        "    MOV $A, [$CD]",
+        "",
+        "    STC",
+        "    CMP $A, 0x00",
+        f"    JZ {p}_DRAW_STRING_DONE",
+        "",
+    ])
+    if layout.wrap == "pending":
+        # Pending wraps and control codes are <prefix>_PUTC's job.
+        lines.extend([
+            f"    JSR {p}_PUTC",
+            f"    JSR {p}_INC_CD",
+            f"    JMP {p}_DRAW_STRING_LOOP",
+        ])
+    else:
+        lines.extend([
+            "    STC",
+            "    CMP $A, 0x0A",
+            f"    JZ {p}_DRAW_STRING_NEWLINE",
+            "",
+            f"    JSR {p}_DRAW_CHAR",
+            f"    JSR {p}_INC_CD",
+            f"    JMP {p}_DRAW_STRING_LOOP",
+            "",
+            f"{p}_DRAW_STRING_NEWLINE:",
+            f"    JSR {p}_NEWLINE",
+            f"    JSR {p}_INC_CD",
+            f"    JMP {p}_DRAW_STRING_LOOP",
+        ])
+    lines.extend([
+        "",
+        f"{p}_DRAW_STRING_DONE:",
+        "    RTS",
+        "",
+        f"{p}_DRAW_CHAR:",
+        "    MOV OLED_CHAR_TMP, $A",
+        "",
+    ])
+
+
+def emit_draw_string_line(lines: list[str], layout: Layout) -> None:
+    # One window per run of characters up to the end of the string, a
+    # control code or the end of the text row. <prefix>_DRAW_GLYPH streams
+    # one glyph into the open window and keeps B, C and D.
+    p = layout.prefix
+    pending = layout.wrap == "pending"
+    control = f"{p}_DRAW_STRING_CONTROL" if pending else f"{p}_DRAW_STRING_NEWLINE"
+    lines.extend([
+        f"{p}_DRAW_STRING:",
+        f"{p}_DRAW_STRING_LOOP:",
+        "    MOV $A, [$CD]",
+        "",
+        "    STC",
+        "    CMP $A, 0x00",
+        f"    JZ {p}_DRAW_STRING_DONE",
+        "",
+    ])
+    for code in control_codes(layout):
+        lines.extend([
+            "    STC",
+            f"    CMP $A, 0x{code:02X}",
+            f"    JZ {control}",
+            "",
+        ])
+    lines.extend([
+        f"    JSR {p}_DRAW_RUN",
+        f"    JMP {p}_DRAW_STRING_LOOP",
+        "",
+        f"{control}:",
+        f"    JSR {p}_PUTC" if pending else f"    JSR {p}_NEWLINE",
+        f"    JSR {p}_INC_CD",
+        f"    JMP {p}_DRAW_STRING_LOOP",
+        "",
+        f"{p}_DRAW_STRING_DONE:",
+        "    RTS",
+        "",
+        f"{p}_DRAW_RUN:",
+        "    ; in: CD = first character of the run",
+        "    ; out: CD = first character after it",
+        "    MOV OLED_RUN_SRC_LO, $C",
+        "    MOV OLED_RUN_SRC_HI, $D",
+    ])
+    if pending:
+        lines.append(f"    JSR {p}_APPLY_PENDING_WRAP")
+    lines.extend([
+        "",
+        "    ; B = cells left on this text row",
+        f"    MOV $A, {p}_MAX_COLS",
+        "    STC",
+        "    SUB $A, OLED_CURSOR_COL",
+        "    MOV $B, $A",
+        "    MOV $A, 0x00",
+        "    MOV OLED_RUN_COUNT, $A",
+        "",
+        f"{p}_DRAW_RUN_COUNT:",
+        "    MOV $A, [$CD]",
+        "",
+    ])
+    for code in (0x00,) + control_codes(layout):
+        lines.extend([
+            "    STC",
+            f"    CMP $A, 0x{code:02X}",
+            f"    JZ {p}_DRAW_RUN_OPEN",
+            "",
+        ])
+    lines.extend([
+        "    MOV $A, OLED_RUN_COUNT",
+        "    CLC",
+        "    ADD $A, 0x01",
+        "    MOV OLED_RUN_COUNT, $A",
+        f"    JSR {p}_INC_CD",
+        "",
+        "    STC",
+        "    SUB $B, 0x01",
+        f"    JNZ {p}_DRAW_RUN_COUNT",
+        "",
+        f"{p}_DRAW_RUN_OPEN:",
+        f"    JSR {p}_RENDER_BEGIN",
+        "",
+        "    MOV $C, OLED_RUN_SRC_LO",
+        "    MOV $D, OLED_RUN_SRC_HI",
+        "    MOV $B, OLED_RUN_COUNT",
+        "",
+        f"{p}_DRAW_RUN_GLYPH:",
+        "    MOV $A, [$CD]",
+        f"    JSR {p}_DRAW_GLYPH",
+        f"    JSR {p}_INC_CD",
+        "",
+        "    STC",
+        "    SUB $B, 0x01",
+        f"    JNZ {p}_DRAW_RUN_GLYPH",
+        "",
+        f"    JSR {p}_RENDER_END",
+        "",
+        "    ; col += run length",
+        "    MOV $A, OLED_CURSOR_COL",
+        "    CLC",
+        "    ADD $A, OLED_RUN_COUNT",
+    ])
+    if pending:
+        lines.extend([
+            "",
+            "    ; A full row stays on the last column with the wrap pending,",
+            f"    ; as {p}_ADVANCE_CURSOR leaves it.",
+            "    STC",
+            f"    CMP $A, {p}_MAX_COLS",
+            f"    JZ {p}_DRAW_RUN_PENDING",
+            "",
+            "    MOV OLED_CURSOR_COL, $A",
+            "    RTS",
+            "",
+            f"{p}_DRAW_RUN_PENDING:",
+            f"    MOV $A, {p}_LAST_COL",
+            "    MOV OLED_CURSOR_COL, $A",
+            "    MOV $A, 0x01",
+            f"    MOV {p}_PENDING_WRAP, $A",
+            "    RTS",
+        ])
+    else:
+        lines.extend([
+            "    MOV OLED_CURSOR_COL, $A",
+            "",
+            f"    ; If col == {p}_MAX_COLS, wrap to the next row.",
+            "    STC",
+            f"    CMP $A, {p}_MAX_COLS",
+            f"    JZ {p}_DRAW_RUN_WRAP",
+            "",
+            "    RTS",
+            "",
+            f"{p}_DRAW_RUN_WRAP:",
+            f"    JSR {p}_NEWLINE",
+            "    RTS",
+        ])
+    lines.extend([
+        "",
+        f"{p}_DRAW_CHAR:",
+        "    ; A one-character run.",
+        "    MOV OLED_CHAR_TMP, $A",
+        "    MOV $A, 0x01",
+        "    MOV OLED_RUN_COUNT, $A",
+        f"    JSR {p}_RENDER_BEGIN",
+        "",
+        "    MOV $A, OLED_CHAR_TMP",
+        f"    JSR {p}_DRAW_GLYPH",
+        f"    JSR {p}_RENDER_END",
+        f"    JSR {p}_ADVANCE_CURSOR",
+        "    RTS",
+        "",
+        f"{p}_DRAW_GLYPH:",
+        "    MOV OLED_CHAR_TMP, $A",
+        "",
+    ])
+
+
+def emit_render_char(lines: list[str], layout: Layout) -> None:
+    # Window for the cell at the cursor, filled row by row.
+    p = layout.prefix
+    lines.extend([
+        f"{p}_RENDER_BEGIN:",
+        f"    JSR {p}_COMPUTE_CURSOR_BASE",
+        "",
+        f"    ; column window: {layout.row_bytes} grouped columns",
+        "    MOV $A, 0x15",
+        "    OLC $A",
+        "    MOV $A, OLED_GLYPH_BASE_X",
+        "    OLC $A",
+        "    CLC",
+        f"    ADD $A, 0x{layout.row_bytes - 1:02X}",
+        "    OLC $A",
+        "",
+        f"    ; row window: {layout.cell_h} pixel rows",
+        "    MOV $A, 0x75",
+        "    OLC $A",
+        "    MOV $A, OLED_GLYPH_BASE_Y",
+        "    OLC $A",
+        "    CLC",
+        f"    ADD $A, 0x{layout.cell_h - 1:02X}",
+        "    OLC $A",
+        "",
+        "    ; begin GDDRAM burst",
+        "    MOV $A, 0x5C",
+        "    OLC $A",
+        "    RTS",
+    ])
+
+
+def emit_render_line(lines: list[str], layout: Layout) -> None:
+    # Window for OLED_RUN_COUNT cells from the cursor, filled column by
+    # column until <prefix>_RENDER_END restores the remap.
+    p = layout.prefix
+    lines.extend([
+        f"{p}_RENDER_BEGIN:",
+        f"    JSR {p}_COMPUTE_CURSOR_BASE",
+        "",
+        f"    ; column window: {layout.row_bytes} grouped columns per cell",
+        "    MOV $A, 0x15",
+        "    OLC $A",
+        "    MOV $A, OLED_GLYPH_BASE_X",
+        "    OLC $A",
+    ])
+    for _ in range(layout.row_bytes):
+        lines.extend([
+            "    CLC",
+            "    ADD $A, OLED_RUN_COUNT",
+        ])
+    lines.extend([
+        "    STC",
+        "    SUB $A, 0x01",
+        "    OLC $A",
+        "",
+        f"    ; row window: {layout.cell_h} pixel rows",
+        "    MOV $A, 0x75",
+        "    OLC $A",
+        "    MOV $A, OLED_GLYPH_BASE_Y",
+        "    OLC $A",
+        "    CLC",
+        f"    ADD $A, 0x{layout.cell_h - 1:02X}",
+        "    OLC $A",
+        "",
+        "    ; vertical address increment",
+        "    MOV $A, 0xA0",
+        "    OLC $A",
+        f"    MOV $A, 0x{REMAP_VERTICAL:02X}",
+        "    OLC $A",
+        "",
+        "    ; begin GDDRAM burst",
+        "    MOV $A, 0x5C",
+        "    OLC $A",
+        "    RTS",
+        "",
+        f"{p}_RENDER_END:",
+        "    ; back to the OLED_INIT remap",
+        "    MOV $A, 0xA0",
+        "    OLC $A",
+        f"    MOV $A, 0x{REMAP_HORIZONTAL:02X}",
+        "    OLC $A",
+        "    RTS",
+    ])
+
+
+STRING_EMITTERS = {
+    "char": (emit_draw_string_char, emit_render_char),
+    "line": (emit_draw_string_line, emit_render_line),
+}
+
+
+def emit_cursor_routines(lines: list[str], layout: Layout, strings: str) -> None:
+    p = layout.prefix
+    pending = layout.wrap == "pending"
+    clear_wrap = ["    MOV $A, 0x00", f"    MOV {p}_PENDING_WRAP, $A"] if pending else []
+
+    lines.extend([
+        f"{p}_SET_CURSOR:",
+        "    ; in: A = col, B = row",
+        "    MOV OLED_CURSOR_COL, $A",
+        "    MOV OLED_CURSOR_ROW, $B",
+        *clear_wrap,
+        "    RTS",
+        "",
+        f"{p}_NEWLINE:",
+        "    ; Move to column 0.",
+        "    MOV $A, 0x00",
+        "    MOV OLED_CURSOR_COL, $A",
+        *clear_wrap[1:],
+        "",
+        "    ; row++",
+        "    MOV $A, OLED_CURSOR_ROW",
+        "    CLC",
+        "    ADD $A, 0x01",
+        "    MOV OLED_CURSOR_ROW, $A",
+        "",
+        f"    ; If row == {p}_MAX_ROWS, wrap back to row 0.",
+        "    STC",
+        f"    CMP $A, {p}_MAX_ROWS",
+        f"    JZ {p}_NEWLINE_WRAP_TOP",
+        "",
+        "    RTS",
+        "",
+        f"{p}_NEWLINE_WRAP_TOP:",
+        "    MOV $A, 0x00",
+        "    MOV OLED_CURSOR_ROW, $A",
+        "    RTS",
+        "",
+        f"{p}_ADVANCE_CURSOR:",
+    ])
+    if pending:
+        lines.extend([
+            "    ; On the last column, set the pending wrap instead of col++.",
+            "    MOV $A, OLED_CURSOR_COL",
+            "    STC",
+            f"    CMP $A, {p}_LAST_COL",
+            f"    JZ {p}_ADVANCE_CURSOR_PENDING",
+            "",
+            "    CLC",
+            "    ADD $A, 0x01",
+            "    MOV OLED_CURSOR_COL, $A",
+            "    RTS",
+            "",
+            f"{p}_ADVANCE_CURSOR_PENDING:",
+            "    MOV $A, 0x01",
+            f"    MOV {p}_PENDING_WRAP, $A",
+            "    RTS",
+            "",
+        ])
+    else:
+        lines.extend([
+            "    ; col++",
+            "    MOV $A, OLED_CURSOR_COL",
+            "    CLC",
+            "    ADD $A, 0x01",
+            "    MOV OLED_CURSOR_COL, $A",
+            "",
+            f"    ; If col == {p}_MAX_COLS, wrap to the next row.",
+            "    STC",
+            f"    CMP $A, {p}_MAX_COLS",
+            f"    JZ {p}_ADVANCE_CURSOR_WRAP",
+            "",
+            "    RTS",
+            "",
+            f"{p}_ADVANCE_CURSOR_WRAP:",
+            f"    JSR {p}_NEWLINE",
+            "    RTS",
+            "",
+        ])
+
+    if layout.monitor_helpers:
+        # CLEAR_CURRENT_LINE draws spaces. Line-mode glyphs need a window
+        # opened for them, so they go through <prefix>_DRAW_CHAR.
+        if strings == "line":
+            clear_cell = ["    MOV $A, 0x20", f"    JSR {p}_DRAW_CHAR"]
+        else:
+            clear_cell = [f"    JSR {glyph_label(layout, ' ')}"]
+        lines.extend([
+            f"{p}_CLEAR_CURRENT_LINE_LOOP:",
+            "    STC",
+            "    CMP $B, 0x00",
+            f"    JZ {p}_CLEAR_CURRENT_LINE_DONE",
+            "",
+            *clear_cell,
+            "",
+            "    STC",
+            "    SUB $B, 0x01",
+            f"    JMP {p}_CLEAR_CURRENT_LINE_LOOP",
+            "",
+            f"{p}_CLEAR_CURRENT_LINE_DONE:",
+            "    MOV $A, 0x00",
+            "    MOV OLED_CURSOR_COL, $A",
+            "    RTS",
+            "",
+        ])
+
+    lines.extend([
+        f"{p}_INC_CD:",
+        "    CLC",
+        "    ADD $C, 0x01",
+        f"    JNC {p}_INC_CD_DONE",
+        "",
+        "    CLC",
+        "    ADD $D, 0x01",
+        "",
+        f"{p}_INC_CD_DONE:",
+        "    RTS",
+        "",
+    ])
+
+
+# Terminal helper routines, with {p} for the prefix.
+HELPERS_HEAD = """; ==========================================================
+; Terminal helper routines
+; ==========================================================
+
+{p}_HOME:
+    MOV $A, 0x00
+    MOV OLED_CURSOR_COL, $A
+    MOV OLED_CURSOR_ROW, $A
+{clear_wrap}    RTS
+
+{p}_SET_DEFAULT_ORIGIN:
+    MOV $A, {p}_DEFAULT_X
+    MOV OLED_TEXT_ORIGIN_X, $A
+    MOV $A, {p}_DEFAULT_Y
+    MOV OLED_TEXT_ORIGIN_Y, $A
+    RTS
+
+{p}_CLEAR_TEXT_SCREEN:
+    PSH $A
+    PSH $B
+    PSH $D
+
+    MOV $A, 0x15
+    OLC $A
+    MOV $A, 0x00
+    OLC $A
+    MOV $A, 0x3F
+    OLC $A
+
+    MOV $A, 0x75
+    OLC $A
+    MOV $A, 0x00
+    OLC $A
+    MOV $A, {p}_SAFE_MAX_RAW_ROW
+    OLC $A
+
+    MOV $A, 0x5C
+    OLC $A
+
+    MOV $A, 0x00
+    MOV $D, {p}_CLEAR_ROWS
+
+.{p}_CLEAR_TEXT_ROW:
+    MOV $B, {p}_CLEAR_COLS
+
+.{p}_CLEAR_TEXT_COL:
+    OLD $A
+    STC
+    SUB $B, 0x01
+    JNZ .{p}_CLEAR_TEXT_COL
+
+    STC
+    SUB $D, 0x01
+    JNZ .{p}_CLEAR_TEXT_ROW
+
+    PUL $D
+    PUL $B
+    PUL $A
+    RTS
+
+{p}_PUTC:
+    STC
+    CMP $A, 0x0A
+    JZ {p}_PUTC_NEWLINE
+
+    STC
+    CMP $A, 0x0D
+    JZ {p}_PUTC_CR
+
+    STC
+    CMP $A, 0x08
+    JZ {p}_PUTC_BACKSPACE
+
+{putc_draw}    RTS
+
+{p}_PUTC_NEWLINE:
+    JSR {p}_NEWLINE
+    RTS
+
+{p}_PUTC_CR:
+    JSR {p}_CARRIAGE_RETURN
+    RTS
+
+{p}_PUTC_BACKSPACE:
+    JSR {p}_BACKSPACE
+    RTS
+
+{p}_CARRIAGE_RETURN:
+    MOV $A, 0x00
+    MOV OLED_CURSOR_COL, $A
+{clear_wrap}    RTS
+"""
+
+BACKSPACE_IMMEDIATE = """
+{p}_BACKSPACE:
+    MOV $A, OLED_CURSOR_COL
+    STC
+    CMP $A, 0x00
+    JZ {p}_BACKSPACE_DONE
+
+    STC
+    SUB $A, 0x01
+    MOV OLED_CURSOR_COL, $A
+
+    MOV $A, 0x20
+    JSR {p}_DRAW_CHAR
+
+    MOV $A, OLED_CURSOR_COL
+    STC
+    SUB $A, 0x01
+    MOV OLED_CURSOR_COL, $A
+
+{p}_BACKSPACE_DONE:
+    RTS
+"""
+
+BACKSPACE_PENDING = """
+{p}_BACKSPACE:
+    MOV $A, {p}_PENDING_WRAP
+    STC
+    CMP $A, 0x00
+    JNZ .{p}_BACKSPACE_CLEAR_CURRENT
+
+    MOV $A, OLED_CURSOR_COL
+    STC
+    CMP $A, 0x00
+    JZ {p}_BACKSPACE_DONE
+
+    STC
+    SUB $A, 0x01
+    MOV OLED_CURSOR_COL, $A
+
+.{p}_BACKSPACE_CLEAR_CURRENT:
+    MOV $A, 0x00
+    MOV {p}_PENDING_WRAP, $A
+    JSR {p}_CLEAR_CURRENT_CELL_DIRECT
+
+{p}_BACKSPACE_DONE:
+    RTS
+
+{p}_APPLY_PENDING_WRAP:
+    MOV $A, {p}_PENDING_WRAP
+    STC
+    CMP $A, 0x00
+    JNZ .{p}_APPLY_WRAP
+
+    RTS
+
+.{p}_APPLY_WRAP:
+    MOV $A, 0x00
+    MOV {p}_PENDING_WRAP, $A
+    MOV OLED_CURSOR_COL, $A
+
+    MOV $A, OLED_CURSOR_ROW
+    CLC
+    ADD $A, 0x01
+    MOV OLED_CURSOR_ROW, $A
+
+    STC
+    CMP $A, {p}_MAX_ROWS
+    JZ .{p}_APPLY_WRAP_TOP
+
+    RTS
+
+.{p}_APPLY_WRAP_TOP:
+    MOV $A, 0x00
+    MOV OLED_CURSOR_ROW, $A
+    RTS
+"""
+
+# Fills the cell at the cursor with {fill}; {name} and {tag} name the
+# routine and its loop labels.
+CELL_FILL = """
+{p}_{name}:
+    PSH $A
+    PSH $B
+    PSH $D
+
+    JSR {p}_COMPUTE_CURSOR_BASE
+
+    MOV $A, 0x15
+    OLC $A
+    MOV $A, OLED_GLYPH_BASE_X
+    OLC $A
+    CLC
+    ADD $A, 0x{col_span:02X}
+    OLC $A
+
+    MOV $A, 0x75
+    OLC $A
+    MOV $A, OLED_GLYPH_BASE_Y
+    OLC $A
+    CLC
+    ADD $A, 0x{row_span:02X}
+    OLC $A
+
+    MOV $A, 0x5C
+    OLC $A
+    MOV $A, 0x{fill:02X}
+    MOV $D, {p}_CELL_H
+
+.{p}_{tag}_ROW:
+    MOV $B, {p}_CELL_BYTES
+
+.{p}_{tag}_COL:
+    OLD $A
+    STC
+    SUB $B, 0x01
+    JNZ .{p}_{tag}_COL
+
+    STC
+    SUB $D, 0x01
+    JNZ .{p}_{tag}_ROW
+
+    PUL $D
+    PUL $B
+    PUL $A
+    RTS
+"""
+
+READY_PROMPT = """
+{p}_PRINT_READY_PROMPT:
+    MOV $A, 0x52
+    JSR {p}_PUTC
+    MOV $A, 0x45
+    JSR {p}_PUTC
+    MOV $A, 0x41
+    JSR {p}_PUTC
+    MOV $A, 0x44
+    JSR {p}_PUTC
+    MOV $A, 0x59
+    JSR {p}_PUTC
+    MOV $A, 0x3E
+    JSR {p}_PUTC
+    RTS
+"""
+
+HELPERS_TAIL = """
+{p}_CURSOR_SHOW:
+    JSR {p}_DRAW_CURRENT_CELL_BLOCK_DIRECT
+    RTS
+
+{p}_CURSOR_HIDE:
+    JSR {p}_CLEAR_CURRENT_CELL_DIRECT
+    RTS
+
+{p}_TYPE_CHAR_WITH_CURSOR:
+    MOV OLED_CHAR_TMP, $A
+    JSR {p}_CURSOR_HIDE
+    MOV $A, OLED_CHAR_TMP
+    JSR {p}_PUTC
+    JSR {p}_CURSOR_SHOW
+    RTS
+
+{p}_PRINT_HEX_NIBBLE:
+    STC
+    CMP $A, 0x0A
+    JC .{p}_HEX_LETTER
+
+.{p}_HEX_DIGIT:
+    CLC
+    ADD $A, 0x30
+    JSR {p}_PUTC
+    RTS
+
+.{p}_HEX_LETTER:
+    STC
+    SUB $A, 0x0A
+    CLC
+    ADD $A, 0x41
+    JSR {p}_PUTC
+    RTS
+
+{p}_PRINT_HEX_BYTE:
+    MOV OLED_HEX_TMP, $A
+    AND $A, 0xF0
+    LSR $A
+    LSR $A
+    LSR $A
+    LSR $A
+    JSR {p}_PRINT_HEX_NIBBLE
+
+    MOV $A, OLED_HEX_TMP
+    AND $A, 0x0F
+    JSR {p}_PRINT_HEX_NIBBLE
+    RTS
+
+{p}_PRINT_HEX_WORD_CD:
+    MOV OLED_HEX_WORD_LO, $C
+    MOV OLED_HEX_WORD_HI, $D
+
+    MOV $A, OLED_HEX_WORD_HI
+    JSR {p}_PRINT_HEX_BYTE
+
+    MOV $A, OLED_HEX_WORD_LO
+    JSR {p}_PRINT_HEX_BYTE
+    RTS
+"""
+
+
+def emit_helpers(lines: list[str], layout: Layout) -> None:
+    p = layout.prefix
+    if layout.wrap == "pending":
+        clear_wrap = f"    MOV {p}_PENDING_WRAP, $A\n"
+        putc_draw = (
+            "    MOV OLED_CHAR_TMP, $A\n"
+            f"    JSR {p}_APPLY_PENDING_WRAP\n"
+            "    MOV $A, OLED_CHAR_TMP\n"
+            f"    JSR {p}_DRAW_CHAR\n"
+        )
+        backspace = BACKSPACE_PENDING
+    else:
+        clear_wrap = ""
+        putc_draw = f"    JSR {p}_DRAW_CHAR\n"
+        backspace = BACKSPACE_IMMEDIATE
+
+    spans = {"col_span": layout.row_bytes - 1, "row_span": layout.cell_h - 1}
+    parts = [
+        HELPERS_HEAD.format(p=p, clear_wrap=clear_wrap, putc_draw=putc_draw),
+        backspace.format(p=p),
+        CELL_FILL.format(p=p, name="CLEAR_CURRENT_CELL_DIRECT", tag="CLEAR_CELL", fill=0x00, **spans),
+        CELL_FILL.format(p=p, name="DRAW_CURRENT_CELL_BLOCK_DIRECT", tag="DRAW_CELL_BLOCK", fill=0xFF, **spans),
+    ]
+    if layout.monitor_helpers:
+        parts.append(READY_PROMPT.format(p=p))
+    parts.append(HELPERS_TAIL.format(p=p))
+    lines.append("".join(parts).rstrip())
+
+
+class LibraryRunner:
+    # Runs routines of a compiled library and records the bytes they send
+    # with OLC / OLD. Covers the instructions the compiler emits, with the
+    # CPU's flag rules: carry in on ADD / SUB / CMP, carry out of LSR, and
+    # MOV, PSH and PUL leave the flags alone. Lines are laid out with
+    # instruction_bytes(), so tables and JSR [$CD] see real addresses.
+
+    ORIGIN = 0x8000
+    STACK_TOP = 0xBFFF
+    RETURN = 0xFFFF
+    REGISTERS = ("$A", "$B", "$C", "$D")
+
+    def __init__(self, lib: str, max_steps: int = 2_000_000):
+        self.max_steps = max_steps
+        self.constants: dict[str, int] = {}
+        source = CONSTANTS_ASM.read_text(encoding="utf-8").splitlines() if CONSTANTS_ASM.is_file() else []
+        for line in source + lib.splitlines():
+            name, sep, value = line.split(";", 1)[0].partition("=")
+            if sep:
+                self.constants[name.strip()] = int(value, 0)
+
+        self.ram = bytearray(0x10000)
+        self.code: dict[int, tuple[int, str, list[str]]] = {}
+        self.labels: dict[str, int] = {}
+        scope = ""
+        addr = self.ORIGIN
+        placed = []
+        for line in lib.splitlines():
+            text = line.split(";", 1)[0].strip()
+            label = re.match(r"^(\.?\w+):\s*(.*)$", text)
+            if label:
+                name = label.group(1)
+                if not name.startswith("."):
+                    scope = name
+                self.labels[scope + name if name.startswith(".") else name] = addr
+                text = label.group(2)
+            size = instruction_bytes(text, self.constants)
+            if size:
+                placed.append((addr, size, scope, text))
+                addr += size
+        for addr, size, scope, text in placed:
+            if text.startswith("#d8"):
+                for offset, value in enumerate(text[3:].split(",")):
+                    self.ram[addr + offset] = self.value(value, scope) & 0xFF
+                continue
+            mnemonic, _, rest = text.partition(" ")
+            operands = [part.strip() for part in rest.split(",")] if rest.strip() else []
+            self.code[addr] = (size, mnemonic.upper(), [self.local(op, scope) for op in operands])
+        self.reset()
+
+    def local(self, operand: str, scope: str) -> str:
+        return re.sub(r"(?<![\w.])\.(\w+)", lambda m: f"{scope}.{m.group(1)}", operand)
+
+    def value(self, expr: str, scope: str = "") -> int:
+        # Numbers, labels and constants joined by ( ) & >> + -.
+        def token(match):
+            word = match.group(0)
+            if word[0].isdigit():
+                return str(int(word, 0))
+            if word in self.labels:
+                return str(self.labels[word])
+            if word in self.constants:
+                return str(self.constants[word])
+            raise ValueError(f"undefined symbol {word}")
+
+        expr = re.sub(r"0[xXbB][0-9A-Fa-f]+|\d+|[A-Za-z_][\w.]*", token, self.local(expr.strip(), scope))
+        if not re.fullmatch(r"[\d\s()&|<>+\-]*", expr):
+            raise ValueError(f"cannot evaluate {expr!r}")
+        return eval(expr)
+
+    def reset(self) -> None:
+        self.regs = {name: 0 for name in self.REGISTERS}
+        self.carry = 0
+        self.zero = 0
+        self.sp = self.STACK_TOP
+        self.sent: list[tuple[str, int]] = []
+
+    def immediate(self, operand: str) -> bool:
+        # The same rule instruction_bytes() sizes operands by.
+        return operand.startswith(("0x", "(")) or self.constants.get(operand, 0x100) <= 0xFF
+
+    def read(self, operand: str) -> int:
+        if operand in self.regs:
+            return self.regs[operand]
+        if operand == "[$CD]":
+            return self.ram[self.regs["$C"] | self.regs["$D"] << 8]
+        if self.immediate(operand):
+            return self.value(operand) & 0xFF
+        return self.ram[self.value(operand)]
+
+    def write(self, operand: str, value: int) -> None:
+        if operand in self.regs:
+            self.regs[operand] = value & 0xFF
+        else:
+            self.ram[self.value(operand)] = value & 0xFF
+
+    def push(self, value: int) -> None:
+        self.ram[self.sp] = value & 0xFF
+        self.sp = (self.sp - 1) & 0xFFFF
+
+    def pull(self) -> int:
+        self.sp = (self.sp + 1) & 0xFFFF
+        return self.ram[self.sp]
+
+    def alu(self, mnemonic: str, a: int, b: int) -> int:
+        if mnemonic == "ADD":
+            total = a + b + self.carry
+        elif mnemonic in ("SUB", "CMP"):
+            total = a + (~b & 0xFF) + self.carry
+        else:
+            total = {"AND": a & b, "OR": a | b, "XOR": a ^ b}[mnemonic]
+        self.carry = int(total > 0xFF) if mnemonic in ("ADD", "SUB", "CMP") else 0
+        self.zero = int(total & 0xFF == 0)
+        return total & 0xFF
+
+    def call(self, label: str, **regs: int) -> None:
+        # Runs label as a subroutine with the given registers ($A as a=...).
+        for name, value in regs.items():
+            self.regs[f"${name.upper()}"] = value & 0xFF
+        self.push(self.RETURN >> 8)
+        self.push(self.RETURN & 0xFF)
+        pc = self.labels[label]
+        for _ in range(self.max_steps):
+            if pc == self.RETURN:
+                return
+            if pc not in self.code:
+                raise ValueError(f"{label} ran into 0x{pc:04X}, which holds no instruction")
+            size, mnemonic, ops = self.code[pc]
+            pc += size
+            if mnemonic in ("JMP", "JSR", "JZ", "JNZ", "JC", "JNC"):
+                target = self.regs["$C"] | self.regs["$D"] << 8 if ops[0] == "[$CD]" else self.value(ops[0])
+                if mnemonic == "JSR":
+                    self.push(pc & 0xFF)
+                    self.push(pc >> 8)
+                taken = {"JZ": self.zero, "JNZ": not self.zero, "JC": self.carry, "JNC": not self.carry}.get(mnemonic, True)
+                if taken:
+                    pc = target
+            elif mnemonic == "RTS":
+                high = self.pull()
+                pc = high << 8 | self.pull()
+            elif mnemonic == "MOV":
+                self.write(ops[0], self.read(ops[1]))
+            elif mnemonic in ("ADD", "SUB", "CMP", "AND", "OR", "XOR"):
+                result = self.alu(mnemonic, self.read(ops[0]), self.read(ops[1]))
+                if mnemonic != "CMP":
+                    self.write(ops[0], result)
+            elif mnemonic in ("LSR", "LSL"):
+                value = self.read(ops[0])
+                self.carry = value & 1 if mnemonic == "LSR" else value >> 7
+                value = value >> 1 if mnemonic == "LSR" else value << 1 & 0xFF
+                self.zero = int(value == 0)
+                self.write(ops[0], value)
+            elif mnemonic in ("STC", "CLC"):
+                self.carry = int(mnemonic == "STC")
+            elif mnemonic == "PSH":
+                self.push(self.regs[ops[0]])
+            elif mnemonic == "PUL":
+                self.regs[ops[0]] = self.pull()
+            elif mnemonic in ("OLC", "OLD"):
+                self.sent.append((mnemonic, self.read(ops[0])))
+            else:
+                raise ValueError(f"{mnemonic} is not modelled")
+        raise ValueError(f"{label} did not return within {self.max_steps} instructions")
+
+
+def verify_strings(layout: Layout) -> tuple:
+    # Strings checked against the per-character path: every printable
+    # character, runs that fill or wrap a row, newlines, carriage returns,
+    # unsupported bytes and a string long enough to wrap back to the top row.
+    last_col, last_row = layout.cols - 1, layout.rows - 1
+    return (
+        ("".join(chr(code) for code in range(0x20, 0x7F)), 0, 0),
+        ("READY\n> load 2\r\nOK", 0, 0),
+        ("FILLS THE ROW", max(layout.cols - 13, 0), min(3, last_row)),
+        ("WRAPS ACROSS THE END OF A TEXT ROW", max(layout.cols - 6, 0), min(3, last_row)),
+        ("\x01\x7f\xff TAB\tEND\rX\n\n", last_col, last_row),
+        ("0123456789" * (layout.cols * layout.rows // 10 + 2), min(5, last_col), min(2, last_row)),
+    )
+
+
+STRING_ADDR = 0x6000
+
+
+def draw_on_model(runner: LibraryRunner, layout: Layout, text: str, col: int, row: int):
+    # <prefix>_DRAW_STRING run on the emitted code, its OLC / OLD bytes
+    # sent to a freshly initialised SSD1325 model.
+    from ssd1325_model import SSD1325
+
+    p = layout.prefix
+    runner.reset()
+    data = text.encode("latin-1") + b"\0"
+    runner.ram[STRING_ADDR:STRING_ADDR + len(data)] = data
+    runner.call(f"{p}_SET_DEFAULT_ORIGIN")
+    runner.call(f"{p}_SET_CURSOR", a=col, b=row)
+    runner.call(f"{p}_DRAW_STRING", c=STRING_ADDR & 0xFF, d=STRING_ADDR >> 8)
+
+    panel = SSD1325()
+    for kind, group in itertools.groupby(runner.sent, key=lambda item: item[0]):
+        values = bytes(value for _, value in group)
+        if kind == "OLC":
+            panel.command(values)
+        else:
+            panel.data(values)
+    return panel
+
+
+def verify_line_mode(layout: Layout, line_lib: str, char_lib: str) -> int:
+    # Runs verify_strings() through the emitted <prefix>_DRAW_STRING of the
+    # line-mode library and of the per-character library with the same
+    # options, and raises if the two SSD1325 models differ or line mode
+    # leaves the remap anywhere but OLED_INIT's 0x52. Returns the
+    # characters checked.
+    line_runner = LibraryRunner(line_lib)
+    char_runner = LibraryRunner(char_lib)
+    checked = 0
+    for text, col, row in verify_strings(layout):
+        expected = draw_on_model(char_runner, layout, text, col, row)
+        actual = draw_on_model(line_runner, layout, text, col, row)
+        if actual.remap != REMAP_HORIZONTAL:
+            raise ValueError(f"Line rendering of {text!r} leaves the remap at 0x{actual.remap:02X}")
+        if (actual.gddram != expected.gddram).any():
+            rows, cols = (actual.gddram != expected.gddram).nonzero()
+            diff = list(zip(cols.tolist(), rows.tolist()))
+            raise ValueError(f"Line rendering of {text!r} differs from per-character rendering at {diff[:4]}")
+        checked += len(text)
+    return checked
+
+
+def emit_header(lines: list[str], layout: Layout, dispatch: str, glyphs: str, cursor: str, strings: str) -> None:
+    p = layout.prefix
+    font = layout.font
+    spacer = layout.cell_h - font.height
+    rows = f"{font.height} font rows" + (f" + {spacer} spacer row{'s' if spacer > 1 else ''}" if spacer else "")
+    lines.extend([
+        "; ==========================================================",
+        f"; {layout.out}",
+        "; ==========================================================",
+        f"; Generated by oled_font_compiler.py --font {layout.font_arg}",
+        f"; SSD1325 {layout.title} text layer.",
+        f"; Font: {font.source}",
+        ";",
+        "; Cell size:",
+        f";   {layout.cell_w} pixels wide  = {layout.row_bytes} grouped SSD1325 columns",
+        f";   {layout.cell_h} pixels tall  = {rows}",
+        f";   {layout.cols} columns by {layout.rows} rows, {layout.wrap} wrap",
+        ";",
+    ])
+    if layout.subset:
+        lines.extend([
+            f"; Glyph subset: {len(layout.char_order)} glyphs for {layout.subset!r}",
+            f";   other characters draw as {layout.fallback!r}",
+            ";",
+        ])
+    lines.extend([
+        "; Pixel packing for OLED_INIT / A0h = 0x52:",
+        ";   left pixel  -> high nibble",
+        ";   right pixel -> low nibble",
+        ";",
+    ])
+    if layout.safe_max_row < SCREEN_H - 1:
+        lines.extend([
+            "; Safe drawing area:",
+            f";   text rows use raw pixel rows 0 through {layout.safe_max_row}",
+            f";   raw pixel rows {layout.safe_max_row + 1} through {SCREEN_H - 1} are left unused by normal text"
+            if layout.safe_max_row < SCREEN_H - 2
+            else f";   raw pixel row {SCREEN_H - 1} is left unused by normal text",
+            ";",
+        ])
+    lines.extend([
+        "; API:",
+        f";   {p}_SET_CURSOR",
+        f";   {p}_DRAW_CHAR",
+        f";   {p}_DRAW_STRING",
+        f";   {p}_PUTC",
+        ";",
+        "; Calling convention:",
+        f";   {p}_SET_CURSOR:",
+        ";       A = column",
+        ";       B = row",
+        ";",
+        f";   {p}_DRAW_CHAR:",
+        ";       A = ASCII character",
+        f";       character dispatch: {dispatch}",
+        f";       glyph rendering: {glyphs}",
+        f";       cursor base: {cursor}",
+        ";",
+        f";   {p}_DRAW_STRING:",
+        ";       CD = pointer to null-terminated RAM string",
+        ";       newline = 0x0A",
+        f";       string rendering: {strings}",
+        ";",
+        ";   This renderer uses fixed foreground/background bytes for",
+        ";   monitor text output.",
+        "; ==========================================================",
+        "",
+    ])
+
+
+def build_library(
+    layout: Layout,
+    dispatch: str = DEFAULT_DISPATCH,
+    glyphs: str = DEFAULT_GLYPHS,
+    cursor: str = DEFAULT_CURSOR,
+    strings: str = DEFAULT_STRINGS,
+) -> str:
+    if strings == "line" and glyphs != "code":
+        raise ValueError("--strings line streams inline glyph code and needs --glyphs code")
+
+    lines: list[str] = []
+    emit_header(lines, layout, dispatch, glyphs, cursor, strings)
+    emit_geometry(lines, layout)
+    emit_cursor_routines(lines, layout, strings)
+
+    draw_string, render = STRING_EMITTERS[strings]
+    draw_string(lines, layout)
+
+    DISPATCH_EMITTERS[dispatch](lines, layout)
+    lines.append("")
+
+    CURSOR_EMITTERS[cursor](lines, layout)
+
+    lines.append("")
+    render(lines, layout)
+    lines.append("")
+
+    if strings == "line":
+        for ch in layout.char_order:
+            emit_glyph_body(lines, layout, ch)
+    elif glyphs == "code":
+        for ch in layout.char_order:
+            emit_glyph_routine(lines, layout, ch)
+    else:
+        for ch in layout.char_order:
+            emit_glyph_stub(lines, layout, ch)
+        emit_blitter(lines, layout)
+        for ch in layout.char_order:
+            emit_glyph_data(lines, layout, ch)
+        lines.append("")
+
+    emit_helpers(lines, layout)
+
+    return "\n".join(lines) + "\n"
+
+
+def cache_key(layout: Layout, *options: str) -> str:
+    # The compiled library depends on the layout (font included), the
+    # options and this script; any change to one of them misses the cache.
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(repr(layout).encode("utf-8"))
+    digest.update(repr(options).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def compile_library(layout: Layout, options: tuple, cache_dir: Optional[Path]) -> tuple[str, bool]:
+    # Returns (library, cache hit). A line-mode library is run against the
+    # per-character one on the SSD1325 model before it is cached, so a hit
+    # was checked when it was built.
+    path = cache_dir / f"{cache_key(layout, *options)}.asm" if cache_dir is not None else None
+    if path is not None and path.is_file():
+        return path.read_text(encoding="utf-8"), True
+
+    lib = build_library(layout, *options)
+    if options[3] == "line":
+        verify_line_mode(layout, lib, build_library(layout, *options[:3], "char"))
+    if path is not None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(lib, encoding="utf-8")
+    return lib, False
+
+
+def parse_cell(value: str) -> tuple:
+    try:
+        width, height = (int(part) for part in value.lower().split("x"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"expected WxH, got {value!r}") from None
+    return width, height
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compile a bitmap font into an SSD1325 text library.")
+    parser.add_argument(
+        "--font",
+        default="5x7",
+        help=f"Built-in font ({', '.join(BUILTIN_LAYOUTS)}) or a .bdf / .psf file (default: 5x7)",
+    )
+    parser.add_argument("--prefix", help="Label prefix for a font file (default: OLEDF)")
+    parser.add_argument("--cell", type=parse_cell, help="Cell size WxH for a font file (default: the font box, even width)")
+    parser.add_argument("--wrap", choices=WRAP_MODES, help="Wrap behavior for a font file (default: pending)")
+    parser.add_argument(
+        "--dispatch",
+        choices=DISPATCH_MODES,
+        default=DEFAULT_DISPATCH,
+        help=f"<prefix>_DRAW_CHAR character dispatch (default: {DEFAULT_DISPATCH})",
+    )
+    parser.add_argument(
+        "--glyphs",
+        choices=GLYPH_MODES,
+        default=DEFAULT_GLYPHS,
+        help=f"Glyph rendering: inline code or packed data and a shared blitter (default: {DEFAULT_GLYPHS})",
+    )
+    parser.add_argument(
+        "--cursor",
+        choices=CURSOR_MODES,
+        default=DEFAULT_CURSOR,
+        help=f"<prefix>_COMPUTE_CURSOR_BASE: add loops or lookup tables (default: {DEFAULT_CURSOR})",
+    )
+    parser.add_argument(
+        "--strings",
+        choices=STRING_MODES,
+        default=DEFAULT_STRINGS,
+        help=f"<prefix>_DRAW_STRING: one window per character or per run on a text row (default: {DEFAULT_STRINGS})",
+    )
+    parser.add_argument(
+        "--charset",
+        help="Only compile glyphs for these characters, plus the fallback and space",
+    )
+    parser.add_argument(
+        "--scan",
+        type=Path,
+        action="append",
+        default=[],
+        metavar="PROGRAM",
+        help="Only compile glyphs PROGRAM.asm prints; repeat for several programs",
+    )
+    parser.add_argument("--out", help="Output file (default: oled_text_<font>.asm, oled_text_<font>_subset.asm for a subset)")
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help=f"Compiled library cache (default: {DEFAULT_CACHE_DIR.relative_to(REPO_ROOT)})",
+    )
+    parser.add_argument("--no-cache", action="store_true", help="Always compile, and leave the cache alone")
+    args = parser.parse_args()
+
+    if args.strings == "line" and args.glyphs != "code":
+        parser.error("--strings line needs --glyphs code")
+
+    try:
+        if args.font in BUILTIN_LAYOUTS:
+            if args.prefix or args.cell or args.wrap:
+                parser.error("--prefix, --cell and --wrap apply to font files; the built-in fonts have fixed layouts")
+            layout = BUILTIN_LAYOUTS[args.font]
+        else:
+            path = Path(args.font)
+            if not path.is_file():
+                parser.error(f"--font: no built-in font or file named {args.font!r}")
+            font = load_font(path)
+            layout = file_layout(font, path.name, args.prefix or "OLEDF", args.cell, args.wrap or "pending")
+        check_layout(layout)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    for path in args.scan:
+        if not path.is_file():
+            parser.error(f"--scan: no program named {str(path)!r}")
+    scans = [scan_program(path, layout.prefix) for path in args.scan]
+    computed = [site for scan in scans for site in scan.computed]
+    if computed and args.charset is None:
+        file, number, routine = computed[0]
+        more = f" (and {len(computed) - 1} more)" if len(computed) > 1 else ""
+        parser.error(
+            f"{file.name}:{number} passes a computed character to {routine}{more}; "
+            "list the characters it can print with --charset"
+        )
+    full = layout
+    charset = args.charset or ""
+    if args.charset is not None or scans:
+        layout = subset_layout(layout, charset + "".join("".join(scan.chars) for scan in scans))
+        layout = replace(layout, out=f"{Path(full.out).stem}_subset.asm")
+
+    out = args.out or layout.out
+    if args.out:
+        layout = replace(layout, out=Path(out).name)
+    cache_dir = None if args.no_cache else args.cache_dir
+    options = (args.dispatch, args.glyphs, args.cursor, args.strings)
+    lib, cached = compile_library(layout, options, cache_dir)
+    Path(out).write_text(lib, encoding="utf-8")
+
+    print(f"Wrote {out}{' (cached)' if cached else ''}")
+    print(f"Font: {layout.font_arg}, {layout.font.width}x{layout.font.height} in {layout.cell_w}x{layout.cell_h} cells")
+    print(f"Terminal: {layout.cols} columns by {layout.rows} rows, {layout.wrap} wrap, {layout.prefix}_ labels")
+    if layout.subset:
+        print(f"Glyphs: {len(layout.char_order)} of {len(full.char_order)} printable ASCII characters")
+    else:
+        print(f"Glyphs: {len(layout.char_order)} printable ASCII characters")
+    if layout.aliases:
+        print(f"Lowercase aliases: {len(layout.aliases)}")
+    missing = [chr(code) for code in range(TABLE_FIRST, TABLE_LAST + 1) if dispatch_targets(layout)[code] == layout.fallback and chr(code) != layout.fallback]
+    if missing:
+        print(f"Drawn as {layout.fallback!r}: {''.join(missing)!r}")
+    print(f"Dispatch: {args.dispatch}")
+    for mode in DISPATCH_MODES:
+        worst, average = dispatch_cycles(layout, mode)
+        marker = "*" if mode == args.dispatch else " "
+        print(f"  {marker}{mode:7s} worst {worst} cycles, average {average:.1f} cycles per printable character")
+    print(f"Glyph rendering: {args.glyphs}")
+    for mode in GLYPH_MODES:
+        if args.strings == "line" and mode != "code":
+            continue
+        variant = lib if mode == args.glyphs else compile_library(layout, (args.dispatch, mode, args.cursor, args.strings), cache_dir)[0]
+        size = library_bytes(variant)
+        sectors = -(-size // SECTOR_SIZE)
+        marker = "*" if mode == args.glyphs else " "
+        print(f"  {marker}{mode:7s} {size} bytes ({sectors} sectors), {glyph_cycles(layout, mode)} glyph cycles per character")
+    print(f"Cursor base: {args.cursor}")
+    for mode in CURSOR_MODES:
+        worst, average = cursor_base_cycles(layout, mode)
+        marker = "*" if mode == args.cursor else " "
+        print(f"  {marker}{mode:7s} worst {worst} cycles, average {average:.1f} cycles per character")
+    print(f"String rendering: {args.strings}")
+    run_bytes = WINDOW_COMMAND_BYTES + REMAP_COMMAND_BYTES
+    print(f"  {'*' if args.strings == 'char' else ' '}char    {WINDOW_COMMAND_BYTES} command bytes per character")
+    print(
+        f"  {'*' if args.strings == 'line' else ' '}line    {run_bytes} command bytes per run, "
+        f"{run_bytes / layout.cols:.2f} per character across a full row"
+    )
+    if args.strings == "line":
+        print("  emitted line and per-character routines draw the same SSD1325 model framebuffer"
+              + (" (checked when cached)" if cached else ""))
+    if layout.subset:
+        full_size = library_bytes(compile_library(full, options, cache_dir)[0])
+        print(f"Subset: {full_size} bytes ({-(-full_size // SECTOR_SIZE)} sectors) for the full font")
+        programs = [(scan.path.name, subset_layout(full, charset + "".join(scan.chars))) for scan in scans]
+        if len(programs) != 1:
+            programs.append(("written library", layout))
+        for name, subset in programs:
+            size = library_bytes(lib if subset == layout else compile_library(subset, options, cache_dir)[0])
+            print(
+                f"  {name:24s} {len(subset.char_order):3d} glyphs, {size} bytes ({-(-size // SECTOR_SIZE)} sectors), "
+                f"{full_size - size} bytes saved"
+            )
+        for file, number, routine in computed:
+            print(f"  {file.name}:{number} {routine}: computed character, covered by --charset")
+    print(f"Foreground nibble: 0x{FG_NIBBLE:X}")
+    print(f"Background nibble: 0x{BG_NIBBLE:X}")
+    print("Packing: left pixel -> high nibble, right pixel -> low nibble")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,510 @@
+#!/usr/bin/env python3
+"""
+Offline SSD1325 model for checking OLED code without the panel.
+
+SSD1325 takes the same command and data bytes the F8-BB sends with OLC and
+OLD, and writes the data into a NumPy copy of GDDRAM. The model covers the
+commands the repo uses: the 0x15 / 0x75 address window, 0x5C before a RAM
+write, 0xA0 remap (nibble order and vertical address increment), 0xA1 start
+line, 0xA2 display offset and the A4..A7 display modes. The 128x64 4-bit
+framebuffer can be saved as a PNG. Command and data bytes are counted per
+frame.
+
+Display rows are taken relative to OLED_INIT: with its start line and
+offset 0x4B, display line 0 shows GDDRAM row 0.
+
+The video subcommand replays video_delta_frames.bin the way the generated
+player draws it, runs and keyframe clears included:
+
+  python3 tools/oled/ssd1325_model.py video build/oled_video/video_delta_frames.bin \\
+      --png-dir build/oled_video/model_frames
+
+The trace subcommand replays a text capture, one transfer per line:
+
+  C 15 00 3F     command bytes (hex)
+  D FF 00 12     data bytes (hex)
+  F              end of frame
+  # comment
+
+Original version: May 2026
+Fadil Isamotu
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence
+
+try:
+    from PIL import Image
+except ImportError as exc:  # pragma: no cover
+    raise SystemExit("Pillow is required: python -m pip install pillow") from exc
+
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise SystemExit("NumPy is required: python -m pip install numpy") from exc
+
+
+SCREEN_W = 128
+SCREEN_H = 64
+GDDRAM_COLS = 64
+GDDRAM_ROWS = 80
+
+REMAP_COLUMN = 0x01
+REMAP_NIBBLE = 0x02
+REMAP_VERTICAL = 0x04
+REMAP_COM = 0x10
+
+# OLED_INIT in ASM/drivers/oled/oled_lowlevel.asm.
+INIT_OFFSET = 0x4B
+OLED_INIT_COMMANDS = bytes([
+    0xAE,
+    0x15, 0x00, 0x3F,
+    0x75, 0x00, 0x3F,
+    0x81, 0x7F,
+    0xA0, 0x52,
+    0xA1, 0x00,
+    0xA2, INIT_OFFSET,
+    0xA4,
+    0x86,
+    0xB3, 0xF1,
+    0xA8, 0x3F,
+    0xAF,
+])
+
+# Argument bytes that follow each command byte.
+COMMAND_ARGS = {
+    0x15: 2,  # column address
+    0x75: 2,  # row address
+    0x5C: 0,  # begin GDDRAM write
+    0x81: 1,  # contrast
+    0x84: 0,  # current range
+    0x85: 0,
+    0x86: 0,
+    0xA0: 1,  # remap
+    0xA1: 1,  # display start line
+    0xA2: 1,  # display offset
+    0xA4: 0,  # normal display
+    0xA5: 0,  # all on
+    0xA6: 0,  # all off
+    0xA7: 0,  # inverse
+    0xA8: 1,  # multiplex ratio
+    0xAD: 1,  # master configuration
+    0xAE: 0,  # display off
+    0xAF: 0,  # display on
+    0xB0: 1,  # precharge compensation
+    0xB1: 1,  # phase length
+    0xB2: 1,  # row period
+    0xB3: 1,  # clock divide
+    0xB4: 1,  # precharge compensation enable
+    0xB8: 8,  # gray scale table
+    0xBC: 1,  # precharge voltage
+    0xBE: 1,  # VCOMH
+    0xBF: 1,  # VSL
+    0xE3: 0,  # no operation
+}
+
+# Graphic acceleration and scrolling change GDDRAM without data writes.
+UNMODELLED_COMMANDS = {0x23: "graphic acceleration", 0x24: "draw rectangle", 0x25: "copy", 0x26: "scroll", 0x2E: "scroll", 0x2F: "scroll"}
+
+# Video frame format, see video_to_oled_sd_delta.py.
+SECTOR_SIZE = 512
+INDEX_RESTART_FLAG = 0x80
+INDEX_SECTOR_MASK = 0x0F
+FRAME_FLAG_KEYFRAME = 0x80
+RUN_KIND_FILL = 0x40
+RUN_KIND_COPY = 0x80
+RUN_COL_MASK = 0x3F
+RUN_KIND_MASK = 0xC0
+SAFE_COLS = 64
+SAFE_ROWS = 63
+PLAYER_PROFILES = ("standard", "fast")
+
+
+@dataclass(frozen=True)
+class FrameStats:
+    command_bytes: int
+    data_bytes: int
+
+    @property
+    def total_bytes(self) -> int:
+        return self.command_bytes + self.data_bytes
+
+
+class SSD1325:
+    """GDDRAM, address pointer and display settings of one panel.
+
+    With init=True the panel starts in the state OLED_INIT leaves it in,
+    and the init bytes are not counted.
+    """
+
+    def __init__(self, init: bool = True) -> None:
+        self.gddram = np.zeros((GDDRAM_ROWS, GDDRAM_COLS), dtype=np.uint8)
+        self.col_start = 0
+        self.col_end = GDDRAM_COLS - 1
+        self.row_start = 0
+        self.row_end = GDDRAM_ROWS - 1
+        self.col = 0
+        self.row = 0
+        self.remap = 0x00
+        self.start_line = 0
+        self.offset = 0
+        self.mode = 0xA4
+        self.on = False
+        self.command_bytes = 0
+        self.data_bytes = 0
+        self.frames: List[FrameStats] = []
+        self._opcode: Optional[int] = None
+        self._args: List[int] = []
+        if init:
+            self.command(OLED_INIT_COMMANDS)
+            self.command_bytes = 0
+
+    def command(self, values: Iterable[int] | int) -> None:
+        if isinstance(values, int):
+            values = (values,)
+        for value in values:
+            self.command_bytes += 1
+            if self._opcode is not None:
+                self._args.append(value)
+                if len(self._args) == COMMAND_ARGS[self._opcode]:
+                    self._apply(self._opcode, self._args)
+                    self._opcode = None
+                continue
+            if value in UNMODELLED_COMMANDS:
+                raise ValueError(f"command 0x{value:02X} ({UNMODELLED_COMMANDS[value]}) is not modelled")
+            if value not in COMMAND_ARGS:
+                raise ValueError(f"unknown SSD1325 command 0x{value:02X}")
+            if COMMAND_ARGS[value] == 0:
+                self._apply(value, [])
+            else:
+                self._opcode = value
+                self._args = []
+
+    def _apply(self, opcode: int, args: Sequence[int]) -> None:
+        if opcode == 0x15:
+            self.col_start, self.col_end = args[0] & 0x3F, args[1] & 0x3F
+            self.col = self.col_start
+        elif opcode == 0x75:
+            self.row_start, self.row_end = args[0] & 0x7F, args[1] & 0x7F
+            self.row = self.row_start
+        elif opcode == 0xA0:
+            self.remap = args[0]
+        elif opcode == 0xA1:
+            self.start_line = args[0] & 0x7F
+        elif opcode == 0xA2:
+            self.offset = args[0] & 0x7F
+        elif 0xA4 <= opcode <= 0xA7:
+            self.mode = opcode
+        elif opcode in (0xAE, 0xAF):
+            self.on = opcode == 0xAF
+
+    def data(self, values: bytes | Sequence[int]) -> None:
+        """Write a burst of GDDRAM bytes at the address pointer.
+
+        The pointer steps along the window and wraps to its first row or
+        column, as the controller does. The whole burst is written with one
+        NumPy assignment.
+        """
+        count = len(values)
+        if count == 0:
+            return
+        if self._opcode is not None:
+            raise ValueError(f"data written before command 0x{self._opcode:02X} got its arguments")
+        width = self.col_end - self.col_start + 1
+        height = self.row_end - self.row_start + 1
+        if width <= 0 or height <= 0 or self.row_end >= GDDRAM_ROWS:
+            raise ValueError(
+                f"window columns {self.col_start}..{self.col_end}, rows {self.row_start}..{self.row_end} is not writable"
+            )
+        self.data_bytes += count
+
+        vertical = bool(self.remap & REMAP_VERTICAL)
+        area = width * height
+        if vertical:
+            first = (self.col - self.col_start) * height + (self.row - self.row_start)
+        else:
+            first = (self.row - self.row_start) * width + (self.col - self.col_start)
+        data = np.frombuffer(bytes(values), dtype=np.uint8)
+        skipped = max(0, count - area)
+        steps = (first + skipped + np.arange(count - skipped)) % area
+        if vertical:
+            rows = self.row_start + steps % height
+            cols = self.col_start + steps // height
+        else:
+            rows = self.row_start + steps // width
+            cols = self.col_start + steps % width
+        self.gddram[rows, cols] = data[skipped:]
+
+        after = (first + count) % area
+        if vertical:
+            self.col, self.row = self.col_start + after // height, self.row_start + after % height
+        else:
+            self.col, self.row = self.col_start + after % width, self.row_start + after // width
+
+    def end_frame(self) -> FrameStats:
+        stats = FrameStats(self.command_bytes, self.data_bytes)
+        self.frames.append(stats)
+        self.command_bytes = 0
+        self.data_bytes = 0
+        return stats
+
+    def framebuffer(self) -> np.ndarray:
+        """Pixels as shown, SCREEN_H x SCREEN_W gray levels 0..15."""
+        if not self.on or self.mode == 0xA6:
+            return np.zeros((SCREEN_H, SCREEN_W), dtype=np.uint8)
+        if self.mode == 0xA5:
+            return np.full((SCREEN_H, SCREEN_W), 0x0F, dtype=np.uint8)
+
+        lines = np.arange(SCREEN_H)
+        if not self.remap & REMAP_COM:
+            lines = lines[::-1]
+        rows = (lines + self.start_line + self.offset - INIT_OFFSET) % GDDRAM_ROWS
+        packed = self.gddram[rows]
+        high = packed >> 4
+        low = packed & 0x0F
+        pixels = np.empty((SCREEN_H, SCREEN_W), dtype=np.uint8)
+        if self.remap & REMAP_NIBBLE:
+            pixels[:, 0::2], pixels[:, 1::2] = high, low
+        else:
+            pixels[:, 0::2], pixels[:, 1::2] = low, high
+        if self.remap & REMAP_COLUMN:
+            pixels = pixels[:, ::-1]
+        if self.mode == 0xA7:
+            pixels = 0x0F - pixels
+        return pixels
+
+    def image(self, scale: int = 1) -> Image.Image:
+        image = Image.fromarray(self.framebuffer() * 17, mode="L")
+        if scale > 1:
+            image = image.resize((SCREEN_W * scale, SCREEN_H * scale), Image.NEAREST)
+        return image
+
+    def save_png(self, path: Path, scale: int = 1) -> None:
+        self.image(scale).save(path)
+
+
+def draw_video_frame(panel: SSD1325, buffer: bytes, start: int, profile: str = "standard") -> int:
+    """Send one encoded video frame to panel, as the generated player does.
+
+    buffer holds the frame at start; copy runs read earlier bytes of the
+    same frame. Returns the offset just past the frame.
+    """
+    run_count = buffer[start]
+    flags = buffer[start + 1]
+    pos = start + 2
+    if flags & FRAME_FLAG_KEYFRAME:
+        # OLEDG_CLEAR_SAFE_AREA
+        panel.command((0x15, 0x00, SAFE_COLS - 1, 0x75, 0x00, SAFE_ROWS - 1, 0x5C))
+        panel.data(bytes(SAFE_COLS * SAFE_ROWS))
+
+    last_row = 0xFF
+    for _ in range(run_count):
+        kind = buffer[pos] & RUN_KIND_MASK
+        col = buffer[pos] & RUN_COL_MASK
+        row = buffer[pos + 1]
+        count = buffer[pos + 2]
+        pos += 3
+        if kind == RUN_KIND_FILL:
+            data = bytes([buffer[pos]]) * count
+            pos += 1
+        elif kind == RUN_KIND_COPY:
+            distance = buffer[pos] | buffer[pos + 1] << 8
+            pos += 2
+            source = pos - distance
+            if source < start:
+                raise ValueError(f"copy run at offset {pos - 5} reads before its frame")
+            data = buffer[source:source + count]
+        else:
+            data = buffer[pos:pos + count]
+            pos += count
+        if len(data) != count:
+            raise ValueError(f"run at offset {pos} runs past the end of the payload")
+
+        if profile == "fast":
+            # The fast player only resends the row window when it changes.
+            if row != last_row:
+                panel.command((0x75, row, row))
+                last_row = row
+            panel.command((0x15, col, col + count - 1, 0x5C))
+        else:
+            panel.command((0x15, col, col + count - 1, 0x75, row, row, 0x5C))
+        panel.data(data)
+    return pos
+
+
+def replay_video(
+    panel: SSD1325,
+    payload: bytes,
+    frame_count: int,
+    layout: str = "packed",
+    slot_sectors: int = 1,
+    profile: str = "standard",
+    on_frame=None,
+) -> List[FrameStats]:
+    """Draw every frame of a video payload once, frame 0 to the loop frame.
+
+    Packed payloads are walked the way the player follows its index sector.
+    Each frame only sees the sectors loaded so far, so a frame the index
+    does not fully load fails here. on_frame(number, panel) runs after each
+    frame is drawn.
+    """
+    if profile not in PLAYER_PROFILES:
+        raise ValueError(f"unknown player profile {profile!r}")
+    if layout not in ("packed", "slot"):
+        raise ValueError(f"unknown layout {layout!r}")
+
+    frames: List[FrameStats] = []
+    index = payload[:SECTOR_SIZE]
+    stream = payload[SECTOR_SIZE:] if layout == "packed" else payload
+    slot = slot_sectors * SECTOR_SIZE
+    loaded = 0
+    draw = 0
+    for number in range(frame_count):
+        if layout == "slot":
+            draw = number * slot
+            loaded = draw + slot
+        else:
+            if index[number] & INDEX_RESTART_FLAG:
+                draw = loaded
+            loaded += (index[number] & INDEX_SECTOR_MASK) * SECTOR_SIZE
+        draw = draw_video_frame(panel, stream[:loaded], draw, profile)
+        frames.append(panel.end_frame())
+        if on_frame is not None:
+            on_frame(number, panel)
+    return frames
+
+
+def read_manifest(path: Path) -> Dict[str, str]:
+    # Top-level "key: value" lines of video_delta_manifest.txt.
+    fields: Dict[str, str] = {}
+    for line in path.read_text(encoding="utf-8").splitlines():
+        if not line or line.startswith(" ") or ": " not in line:
+            continue
+        key, value = line.split(": ", 1)
+        fields.setdefault(key, value)
+    return fields
+
+
+def replay_trace(panel: SSD1325, lines: Iterable[str], on_frame=None) -> List[FrameStats]:
+    frames: List[FrameStats] = []
+    pending = False
+    for number, line in enumerate(lines, start=1):
+        parts = line.split("#", 1)[0].split()
+        if not parts:
+            continue
+        kind = parts[0].upper()
+        try:
+            values = bytes(int(part, 16) for part in parts[1:])
+        except ValueError as exc:
+            raise ValueError(f"line {number}: {exc}") from exc
+        if kind == "C":
+            panel.command(values)
+            pending = True
+        elif kind == "D":
+            panel.data(values)
+            pending = True
+        elif kind == "F":
+            frames.append(panel.end_frame())
+            if on_frame is not None:
+                on_frame(len(frames) - 1, panel)
+            pending = False
+        else:
+            raise ValueError(f"line {number}: expected C, D or F, got {parts[0]!r}")
+    if pending:
+        frames.append(panel.end_frame())
+        if on_frame is not None:
+            on_frame(len(frames) - 1, panel)
+    return frames
+
+
+def png_writer(out_dir: Optional[Path], scale: int):
+    if out_dir is None:
+        return None
+    out_dir.mkdir(parents=True, exist_ok=True)
+
+    def write(number: int, panel: SSD1325) -> None:
+        panel.save_png(out_dir / f"frame_{number:04d}.png", scale)
+
+    return write
+
+
+def print_stats(frames: Sequence[FrameStats], elapsed: float) -> None:
+    total_command = sum(item.command_bytes for item in frames)
+    total_data = sum(item.data_bytes for item in frames)
+    busiest = max(range(len(frames)), key=lambda number: frames[number].total_bytes)
+    print(f"Frames: {len(frames)}")
+    print(f"Command bytes: {total_command}")
+    print(f"Data bytes: {total_data}")
+    print(f"Bytes per frame: {(total_command + total_data) / len(frames):.1f} average, {frames[busiest].total_bytes} max (frame {busiest})")
+    print(f"Replay time: {elapsed:.3f}s, {elapsed * 1000.0 / len(frames):.3f} ms per frame")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Replay OLED command and data bytes into an SSD1325 model.")
+    sub = parser.add_subparsers(dest="source", required=True)
+
+    video = sub.add_parser("video", help="Replay a video_to_oled_sd_delta.py payload")
+    video.add_argument("payload", type=Path, help="video_delta_frames.bin")
+    video.add_argument("--manifest", type=Path, default=None, help="Manifest written with the payload. Default: video_delta_manifest.txt next to it")
+    video.add_argument("--profile", choices=PLAYER_PROFILES, default=None, help="Player profile. Default: the manifest's player_profile")
+
+    trace = sub.add_parser("trace", help="Replay a text trace of C / D / F lines")
+    trace.add_argument("trace", type=Path)
+
+    for item in (video, trace):
+        item.add_argument("--png-dir", type=Path, default=None, help="Write the screen after every frame as a PNG")
+        item.add_argument("--png", type=Path, default=None, help="Write the final screen as a PNG")
+        item.add_argument("--scale", type=int, default=4, help="PNG pixel scale")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    if args.scale < 1:
+        raise SystemExit("--scale must be 1 or greater")
+
+    panel = SSD1325()
+    on_frame = png_writer(args.png_dir, args.scale)
+    started = time.perf_counter()
+    try:
+        if args.source == "video":
+            manifest = read_manifest(args.manifest or args.payload.with_name("video_delta_manifest.txt"))
+            profile = args.profile or manifest.get("player_profile", "standard")
+            frames = replay_video(
+                panel,
+                args.payload.read_bytes(),
+                int(manifest["frame_count"]),
+                manifest.get("layout", "packed"),
+                int(manifest.get("slot_sectors", "1")),
+                profile,
+                on_frame,
+            )
+        else:
+            with args.trace.open(encoding="utf-8") as handle:
+                frames = replay_trace(panel, handle, on_frame)
+    except (OSError, KeyError, ValueError, IndexError) as exc:
+        raise SystemExit(f"Replay failed: {exc}") from exc
+    elapsed = time.perf_counter() - started
+
+    if not frames:
+        raise SystemExit("Nothing to replay")
+    print_stats(frames, elapsed)
+    if args.source == "video" and "estimated_loop_fps" in manifest:
+        playback = len(frames) / float(manifest["estimated_loop_fps"])
+        print(f"Estimated playback time: {playback:.2f}s, replay runs {playback / max(elapsed, 1e-9):.0f}x faster")
+    if args.png is not None:
+        panel.save_png(args.png, args.scale)
+        print(f"Wrote {args.png}")
+    if args.png_dir is not None:
+        print(f"Wrote {len(frames)} frames to {args.png_dir}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,8 +2,10 @@
 """
 Build an SD-backed delta-run OLED video payload for F8-BB.
 
-The player keeps code in RAM and reads compact frame slots from SD.
+The player keeps code in RAM and reads compact frames from SD.
 Each frame stores horizontal byte-runs that differ from the previous frame.
+Frames are packed back-to-back behind an index sector, or padded to fixed
+slots with --layout slot.
 
 Original version: May 2026
 Fadil Isamotu
@@ -12,20 +14,31 @@ Fadil Isamotu
 from __future__ import annotations
 
 import argparse
-import ctypes
-import ctypes.wintypes as wintypes
+import concurrent.futures
+import hashlib
+import json
 import math
 import os
-from contextlib import nullcontext
-from dataclasses import dataclass
+import sys
+import time
+from dataclasses import dataclass, replace
 from pathlib import Path
 from typing import List, Optional, Sequence
 
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "deployment"))
+from block_io import lock_windows_volume, open_block_device, sync_block_device
+from sd_layout import check_region_fits, load_plan, plan_region
+
 try:
     from PIL import Image, ImageOps, ImageSequence
 except ImportError as exc:  # pragma: no cover
     raise SystemExit("Pillow is required: python -m pip install pillow") from exc
 
+try:
+    import numpy as np
+except ImportError as exc:  # pragma: no cover
+    raise SystemExit("NumPy is required: python -m pip install numpy") from exc
+
 
 SAFE_WIDTH = 128
 SAFE_HEIGHT = 63
@@ -35,6 +48,69 @@ DEFAULT_VIDEO_BLOCK = 2000
 DEFAULT_THRESHOLD = 220
 MAX_SLOT_SECTORS = 8
 FRAME_BUFFER_ADDR = 0x6000
+FRAME_INDEX_ADDR = 0x5E00
+LIBRARY_DIR_ADDR = 0x5C00
+LIBRARY_MAGIC = b"VL1"
+LIBRARY_ENTRY_SIZE = 32
+LIBRARY_NAME_SIZE = 12
+LIBRARY_MAX_CLIPS = SECTOR_SIZE // LIBRARY_ENTRY_SIZE - 1
+LIBRARY_LAYOUTS = {"packed": 0, "slot": 1}
+# Boot argument mailbox the monitor's BOOT N XX fills (bt1_table.asm).
+BOOT_ARG_ADDR = 0x0120
+BOOT_ARG_MAGIC = 0xA7
+INDEX_RESTART_FLAG = 0x80
+INDEX_SECTOR_MASK = 0x0F
+FRAME_FLAG_KEYFRAME = 0x80
+FRAME_PACE_MASK = 0x7F
+MAX_RUNS_PER_FRAME = 255
+DEFAULT_CLOCK_HZ = 2_200_000
+DEFAULT_SD_SECTOR_CYCLES = 290_000
+
+# Player cycle costs, counted from the microstep tables in
+# generated/microcode/instructions.md for the code make_player_asm emits.
+PLAYER_FRAME_CYCLES = 250
+INDEX_LOOKUP_CYCLES = 70
+PLAYER_RUN_CYCLES = 305
+PLAYER_BYTE_CYCLES = 52
+KIND_DISPATCH_CYCLES = 11
+KIND_CHECK_CYCLES = 15
+FILL_RUN_CYCLES = 360
+FILL_BYTE_CYCLES = 18
+COPY_RUN_CYCLES = 475
+
+# The same costs for --player-profile fast.
+FAST_FRAME_CYCLES = 222
+FAST_RUN_CYCLES = 131
+FAST_ROW_CYCLES = 21
+FAST_BYTE_CYCLES = 30
+FAST_UNROLL_MIN = 4
+FAST_LONG_RUN_CYCLES = 10
+FAST_QUAD_CYCLES = 87
+FAST_KIND_CYCLES = 29
+FAST_FILL_RUN_CYCLES = 171
+FAST_FILL_BYTE_CYCLES = 15
+FAST_COPY_RUN_CYCLES = 239
+FAST_FILL_CHECK_CYCLES = 10
+FAST_COPY_CHECK_CYCLES = 11
+PLAYER_PROFILES = ("standard", "fast")
+
+RUN_KIND_RAW = 0x00
+RUN_KIND_FILL = 0x40
+RUN_KIND_COPY = 0x80
+RUN_COL_MASK = 0x3F
+RUN_KIND_MASK = 0xC0
+RUN_CODECS = ("raw", "fill", "copy")
+CLEAR_SAFE_AREA_CYCLES = 73_800
+DELAY_FRAME_CYCLES = 147_425
+# VID_READ_AHEAD_WAIT bookkeeping, excluding the VID_DELAY_FRAME calls.
+READ_AHEAD_WAIT_CYCLES = 40
+READ_AHEAD_SECTOR_CYCLES = 34
+READ_AHEAD_CALL_CYCLES = 26
+# VID_PACE_WAIT: fixed cost, cost per tick on top of the loop passes, and
+# one pass of the 0xFF inner loop in VID_PACE_TICK.
+PACE_WAIT_CYCLES = 60
+PACE_TICK_CYCLES = 53
+PACE_LOOP_CYCLES = 4_606
 
 
 @dataclass(frozen=True)
@@ -42,6 +118,9 @@ class RunRecord:
     row: int
     col: int
     data: bytes
+    kind: str = "raw"
+    source_run: int = -1
+    source_offset: int = 0
 
 
 @dataclass(frozen=True)
@@ -52,280 +131,168 @@ class FrameInfo:
     encoded_bytes: int
     changed_bytes: int
     lit_pixels: int
+    kind: str = "delta"
+    dropped_runs: int = 0
+    draw_cycles: int = 0
+    fill_runs: int = 0
+    copy_runs: int = 0
+    changed_hysteresis: int = 0
+    changed_plain: int = 0
+    # Draw cycles for the same runs on each of PLAYER_PROFILES.
+    profile_cycles: tuple = ()
+    pace_ticks: int = 0
 
 
-class WindowsRawDevice:
-    GENERIC_READ = 0x80000000
-    GENERIC_WRITE = 0x40000000
-    FILE_SHARE_READ = 0x00000001
-    FILE_SHARE_WRITE = 0x00000002
-    OPEN_EXISTING = 3
-    FILE_ATTRIBUTE_NORMAL = 0x00000080
-
-    def __init__(self, device: str, mode: str):
-        if mode not in {"rb", "r+b"}:
-            raise ValueError("Windows raw device mode must be rb or r+b")
-
-        self.device = device
-        self.writable = "+" in mode
-        self.handle = None
-        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-        self.kernel32 = kernel32
-
-        kernel32.CreateFileW.argtypes = [
-            wintypes.LPCWSTR,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            wintypes.HANDLE,
-        ]
-        kernel32.CreateFileW.restype = wintypes.HANDLE
-        kernel32.ReadFile.argtypes = [
-            wintypes.HANDLE,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.DWORD),
-            wintypes.LPVOID,
-        ]
-        kernel32.ReadFile.restype = wintypes.BOOL
-        kernel32.WriteFile.argtypes = [
-            wintypes.HANDLE,
-            wintypes.LPCVOID,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.DWORD),
-            wintypes.LPVOID,
-        ]
-        kernel32.WriteFile.restype = wintypes.BOOL
-        kernel32.SetFilePointerEx.argtypes = [
-            wintypes.HANDLE,
-            ctypes.c_longlong,
-            ctypes.POINTER(ctypes.c_longlong),
-            wintypes.DWORD,
-        ]
-        kernel32.SetFilePointerEx.restype = wintypes.BOOL
-        kernel32.FlushFileBuffers.argtypes = [wintypes.HANDLE]
-        kernel32.FlushFileBuffers.restype = wintypes.BOOL
-        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
-        kernel32.CloseHandle.restype = wintypes.BOOL
-
-        access = self.GENERIC_READ
-        if self.writable:
-            access |= self.GENERIC_WRITE
-
-        handle = kernel32.CreateFileW(
-            device,
-            access,
-            self.FILE_SHARE_READ | self.FILE_SHARE_WRITE,
-            None,
-            self.OPEN_EXISTING,
-            self.FILE_ATTRIBUTE_NORMAL,
-            None,
-        )
-        if handle == wintypes.HANDLE(-1).value:
-            self._raise_last_error()
-        self.handle = handle
-
-    def _raise_last_error(self) -> None:
-        code = ctypes.get_last_error()
-        raise OSError(code, ctypes.FormatError(code), self.device)
-
-    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
-        new_pos = ctypes.c_longlong(0)
-        if not self.kernel32.SetFilePointerEx(
-            self.handle,
-            ctypes.c_longlong(offset),
-            ctypes.byref(new_pos),
-            whence,
-        ):
-            self._raise_last_error()
-        return new_pos.value
-
-    def read(self, size: int = -1) -> bytes:
-        if size < 0:
-            raise ValueError("raw block-device reads need an explicit byte count")
-        buffer = ctypes.create_string_buffer(size)
-        bytes_read = wintypes.DWORD(0)
-        if not self.kernel32.ReadFile(
-            self.handle,
-            buffer,
-            size,
-            ctypes.byref(bytes_read),
-            None,
-        ):
-            self._raise_last_error()
-        return buffer.raw[:bytes_read.value]
-
-    def write(self, data: bytes) -> int:
-        view = memoryview(data)
-        total = 0
-        while total < len(view):
-            chunk = view[total:total + 0x100000].tobytes()
-            buffer = ctypes.create_string_buffer(chunk)
-            bytes_written = wintypes.DWORD(0)
-            if not self.kernel32.WriteFile(
-                self.handle,
-                buffer,
-                len(chunk),
-                ctypes.byref(bytes_written),
-                None,
-            ):
-                self._raise_last_error()
-            if bytes_written.value != len(chunk):
-                raise OSError(f"Short write to {self.device}")
-            total += bytes_written.value
-        return total
-
-    def flush(self) -> None:
-        if self.writable and not self.kernel32.FlushFileBuffers(self.handle):
-            self._raise_last_error()
-
-    def close(self) -> None:
-        if self.handle is not None:
-            self.kernel32.CloseHandle(self.handle)
-            self.handle = None
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        self.close()
-        return False
-
-
-class WindowsVolumeLock:
-    GENERIC_READ = 0x80000000
-    GENERIC_WRITE = 0x40000000
-    FILE_SHARE_READ = 0x00000001
-    FILE_SHARE_WRITE = 0x00000002
-    OPEN_EXISTING = 3
-    FILE_ATTRIBUTE_NORMAL = 0x00000080
-    FSCTL_LOCK_VOLUME = 0x00090018
-    FSCTL_UNLOCK_VOLUME = 0x0009001C
-    FSCTL_DISMOUNT_VOLUME = 0x00090020
-
-    def __init__(self, volume: str):
-        self.volume = volume.rstrip(r"\/")
-        self.handle = None
-        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
-        self.kernel32 = kernel32
-
-        kernel32.CreateFileW.argtypes = [
-            wintypes.LPCWSTR,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            wintypes.DWORD,
-            wintypes.HANDLE,
-        ]
-        kernel32.CreateFileW.restype = wintypes.HANDLE
-        kernel32.DeviceIoControl.argtypes = [
-            wintypes.HANDLE,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            wintypes.LPVOID,
-            wintypes.DWORD,
-            ctypes.POINTER(wintypes.DWORD),
-            wintypes.LPVOID,
-        ]
-        kernel32.DeviceIoControl.restype = wintypes.BOOL
-        kernel32.CloseHandle.argtypes = [wintypes.HANDLE]
-        kernel32.CloseHandle.restype = wintypes.BOOL
-
-        handle = kernel32.CreateFileW(
-            self.volume,
-            self.GENERIC_READ | self.GENERIC_WRITE,
-            self.FILE_SHARE_READ | self.FILE_SHARE_WRITE,
-            None,
-            self.OPEN_EXISTING,
-            self.FILE_ATTRIBUTE_NORMAL,
-            None,
-        )
-        if handle == wintypes.HANDLE(-1).value:
-            self._raise_last_error()
-        self.handle = handle
-        self._device_io_control(self.FSCTL_LOCK_VOLUME)
-        self._device_io_control(self.FSCTL_DISMOUNT_VOLUME)
-
-    def _raise_last_error(self) -> None:
-        code = ctypes.get_last_error()
-        raise OSError(code, ctypes.FormatError(code), self.volume)
-
-    def _device_io_control(self, code: int) -> None:
-        bytes_returned = wintypes.DWORD(0)
-        if not self.kernel32.DeviceIoControl(
-            self.handle,
-            code,
-            None,
-            0,
-            None,
-            0,
-            ctypes.byref(bytes_returned),
-            None,
-        ):
-            self._raise_last_error()
-
-    def close(self) -> None:
-        if self.handle is not None:
-            self.kernel32.DeviceIoControl(
-                self.handle,
-                self.FSCTL_UNLOCK_VOLUME,
-                None,
-                0,
-                None,
-                0,
-                ctypes.byref(wintypes.DWORD(0)),
-                None,
-            )
-            self.kernel32.CloseHandle(self.handle)
-            self.handle = None
-
-    def __enter__(self):
-        return self
-
-    def __exit__(self, exc_type, exc, tb):
-        self.close()
-        return False
-
-
-def lock_windows_volume(volume: Optional[str]):
-    if volume is None:
-        return nullcontext()
-    if os.name != "nt":
-        raise ValueError("--windows-lock-volume is only supported on Windows")
-    return WindowsVolumeLock(volume)
+@dataclass(frozen=True)
+class LibraryClip:
+    name: str
+    args: argparse.Namespace
+    infos: List[FrameInfo]
+    payload: bytes
+    frame_index: Optional[List[int]]
+    slot_sectors: int
+    resume_block: int
 
 
-def is_windows_raw_device(device: str) -> bool:
-    return os.name == "nt" and device.startswith("\\\\.\\")
+@dataclass(frozen=True)
+class PlayerTiming:
+    frame_cycles: int
+    run_cycles: int
+    byte_cycles: int
+    keyframe_cycles: int
+    sector_cycles: int
+    fill_run_cycles: int = 0
+    fill_byte_cycles: int = 0
+    copy_run_cycles: int = 0
+    row_cycles: int = 0
+    unroll_min: int = 0
+    long_run_cycles: int = 0
+    quad_cycles: int = 0
+
+
+def chunk_ranges(start_block: int, block_count: int, chunk_blocks: int) -> List[tuple[int, int]]:
+    """Split a block range into (first block, count) pieces.
+
+    Piece boundaries fall on multiples of chunk_blocks on the device, so
+    every piece after the first is aligned to the chunk size.
+    """
+    ranges: List[tuple[int, int]] = []
+    block = start_block
+    end = start_block + block_count
+    while block < end:
+        stop = min(end, (block // chunk_blocks + 1) * chunk_blocks)
+        ranges.append((block, stop - block))
+        block = stop
+    return ranges
+
+
+def load_write_journal(path: Path, key: dict) -> set:
+    try:
+        journal = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return set()
+    if journal.get("key") != key:
+        return set()
+    return set(journal.get("done", []))
 
 
-def open_block_device(device: str, mode: str):
-    if is_windows_raw_device(device):
-        return WindowsRawDevice(device, mode)
-    return open(device, mode, buffering=0)
+def save_write_journal(path: Path, key: dict, done: set) -> None:
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_text(json.dumps({"key": key, "done": sorted(done)}) + "\n", encoding="utf-8")
+    os.replace(temp, path)
 
 
-def write_blocks_to_device(device: str, start_block: int, payload: bytes) -> None:
+def write_blocks_chunked(
+    device: str,
+    start_block: int,
+    payload: bytes,
+    chunk_bytes: int,
+    journal_path: Path,
+    retries: int,
+) -> int:
+    """Write payload in aligned chunks, verifying each one, and return the chunks written.
+
+    Chunk k is synced and read back on a second handle while chunk k + 1 is
+    written. On Linux block devices both handles use O_DIRECT, so the
+    readback comes from the card rather than the page cache.
+    Verified chunks are recorded in journal_path, so a write that is cut
+    off resumes with the first unverified chunk. A chunk that fails to
+    write or verify is retried up to retries times. The journal is
+    removed once every chunk checks out.
+    """
     if len(payload) % SECTOR_SIZE != 0:
         raise ValueError("payload length must be a whole number of sectors")
-    with open_block_device(device, "r+b") as f:
-        f.seek(start_block * SECTOR_SIZE)
-        f.write(payload)
-        if hasattr(f, "flush"):
-            f.flush()
-
+    ranges = chunk_ranges(start_block, len(payload) // SECTOR_SIZE, chunk_bytes // SECTOR_SIZE)
+    key = {
+        "device": device,
+        "start_block": start_block,
+        "bytes": len(payload),
+        "sha256": hashlib.sha256(payload).hexdigest(),
+        "chunk_bytes": chunk_bytes,
+    }
+    done = load_write_journal(journal_path, key)
+    pending = [number for number in range(len(ranges)) if number not in done]
+    if done:
+        print(f"Resuming from {journal_path}: {len(done)} of {len(ranges)} chunks already written")
+
+    def chunk_data(number: int) -> bytes:
+        block, count = ranges[number]
+        offset = (block - start_block) * SECTOR_SIZE
+        return payload[offset:offset + count * SECTOR_SIZE]
+
+    def write_chunk(f, number: int) -> None:
+        block, _ = ranges[number]
+        f.seek(block * SECTOR_SIZE)
+        f.write(chunk_data(number))
+        sync_block_device(f)
+
+    def verify_chunk(f, number: int) -> bool:
+        block, count = ranges[number]
+        f.seek(block * SECTOR_SIZE)
+        return f.read(count * SECTOR_SIZE) == chunk_data(number)
+
+    total = sum(len(chunk_data(number)) for number in pending)
+    written = 0
+    started = time.perf_counter()
+    with open_block_device(device, "r+b") as writer, open_block_device(device, "rb") as reader, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=1) as verifier:
+
+        def finish(number: int, future) -> None:
+            nonlocal written
+            attempts = 0
+            while not future.result():
+                attempts += 1
+                if attempts > retries:
+                    raise RuntimeError(f"chunk {number} at block {ranges[number][0]} did not verify after {retries} retries")
+                write_chunk(writer, number)
+                future = verifier.submit(verify_chunk, reader, number)
+            done.add(number)
+            save_write_journal(journal_path, key, done)
+            written += len(chunk_data(number))
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            print(
+                f"  chunk {len(done)}/{len(ranges)}: {written // 1024}/{total // 1024} KiB, "
+                f"{written / 1048576 / elapsed:.2f} MiB/s",
+                flush=True,
+            )
 
-def read_blocks_from_device(device: str, start_block: int, block_count: int) -> bytes:
-    with open_block_device(device, "rb") as f:
-        f.seek(start_block * SECTOR_SIZE)
-        data = f.read(block_count * SECTOR_SIZE)
-    if len(data) != block_count * SECTOR_SIZE:
-        raise RuntimeError("could not read the full video payload back")
-    return data
+        previous = None
+        for number in pending:
+            for attempt in range(retries + 1):
+                try:
+                    write_chunk(writer, number)
+                    break
+                except OSError:
+                    if attempt == retries:
+                        raise
+            if previous is not None:
+                finish(*previous)
+            previous = (number, verifier.submit(verify_chunk, reader, number))
+        if previous is not None:
+            finish(*previous)
+
+    journal_path.unlink(missing_ok=True)
+    return len(pending)
 
 
 def load_frames(path: Path) -> List[Image.Image]:
@@ -388,51 +355,171 @@ def effective_threshold(args: argparse.Namespace) -> int:
     return args.threshold if args.threshold is not None else DEFAULT_THRESHOLD
 
 
-def quantize_frame(frame: Image.Image, args: argparse.Namespace) -> List[int]:
+BAYER_4X4 = np.array(
+    [
+        [0, 8, 2, 10],
+        [12, 4, 14, 6],
+        [3, 11, 1, 9],
+        [15, 7, 13, 5],
+    ],
+    dtype=np.float64,
+)
+
+
+def level_table(args: argparse.Namespace) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Return the level edges, level intensities and level nibbles.
+
+    A source value v maps to the number of edges at or below it. Intensities
+    are the 0..255 values each level stands for, used for diffused error.
+    """
+    if conversion_mode(args) == "threshold":
+        return (
+            np.array([effective_threshold(args)], dtype=np.float64),
+            np.array([0.0, 255.0]),
+            np.array([0, args.fg], dtype=np.uint8),
+        )
+
+    levels = args.gray_levels
+    if levels < 2 or levels > 16:
+        raise ValueError("gray levels must be 2..16")
+    scale = levels - 1
+    step = 255.0 / scale
+    return (
+        np.array([(level - 0.5) * step for level in range(1, levels)]),
+        np.array([level * step for level in range(levels)]),
+        np.array([int(round((level / scale) * 15.0)) for level in range(levels)], dtype=np.uint8),
+    )
+
+
+def pick_levels(
+    values: np.ndarray,
+    edges: np.ndarray,
+    previous: Optional[np.ndarray],
+    margin: int,
+) -> np.ndarray:
+    levels = np.searchsorted(edges, values, side="right")
+    if previous is None or margin <= 0:
+        return levels
+
+    # Hold the previous level while the value stays inside its widened band.
+    lower = np.concatenate(([-np.inf], edges))[previous] - margin
+    upper = np.concatenate((edges, [np.inf]))[previous] + margin
+    return np.where((values >= lower) & (values < upper), previous, levels)
+
+
+def diffuse_levels(
+    values: np.ndarray,
+    edges: np.ndarray,
+    intensity: np.ndarray,
+    previous: Optional[np.ndarray],
+    margin: int,
+) -> np.ndarray:
+    # Floyd-Steinberg, one anti-diagonal (2*y + x == t) at a time. Pixels on a
+    # diagonal never feed each other, so each step is a single numpy pass.
+    height, width = values.shape
+    work = np.zeros((height + 1, width + 2))
+    work[:height, 1:width + 1] = values
+    levels = np.zeros((height, width), dtype=np.intp)
+    rows = np.arange(height)
+    for t in range(2 * (height - 1) + width):
+        cols = t - 2 * rows
+        on_diagonal = (cols >= 0) & (cols < width)
+        y = rows[on_diagonal]
+        x = cols[on_diagonal]
+        value = work[y, x + 1]
+        held = None if previous is None else previous[y, x]
+        level = pick_levels(value, edges, held, margin)
+        levels[y, x] = level
+        error = value - intensity[level]
+        work[y, x + 2] += error * (7 / 16)
+        np.add.at(work, (y + 1, x), error * (3 / 16))
+        np.add.at(work, (y + 1, x + 1), error * (5 / 16))
+        np.add.at(work, (y + 1, x + 2), error * (1 / 16))
+    return levels
+
+
+def frame_levels(
+    frame: Image.Image,
+    args: argparse.Namespace,
+    previous: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """Quantize one frame to a SAFE_HEIGHT x SAFE_WIDTH array of level indices.
+
+    previous holds the levels of the frame before. With --hysteresis a pixel
+    keeps its previous level unless the (dithered) source value moves more
+    than the margin outside that level's band.
+    """
     img = fit_frame(frame, args.fit, args.invert)
-    pixels = list(img.tobytes())
+    values = np.asarray(img, dtype=np.float64)
 
     if args.invert:
-        pixels = [255 - value for value in pixels]
+        values = 255.0 - values
 
-    nibbles: List[int] = []
-    if conversion_mode(args) == "threshold":
-        threshold = effective_threshold(args)
-        for value in pixels:
-            nibbles.append(args.fg if value >= threshold else 0)
+    edges, intensity, _ = level_table(args)
+    if args.dither == "floyd-steinberg":
+        levels = diffuse_levels(values, edges, intensity, previous, args.hysteresis)
     else:
-        levels = args.gray_levels
-        if levels < 2 or levels > 16:
-            raise ValueError("gray levels must be 2..16")
-        scale = levels - 1
-        for value in pixels:
-            level = int(round((value / 255.0) * scale))
-            nibble = int(round((level / scale) * 15.0))
-            nibbles.append(max(0, min(15, nibble)))
+        if args.dither == "bayer":
+            height, width = values.shape
+            offsets = np.tile((BAYER_4X4 + 0.5) / 16.0 - 0.5, (height // 4 + 1, width // 4 + 1))
+            values = values + offsets[:height, :width] * (intensity[-1] - intensity[0]) / (len(intensity) - 1)
+        levels = pick_levels(values, edges, previous, args.hysteresis)
 
     if args.inset_x or args.inset_y:
-        x0 = args.inset_x
-        x1 = SAFE_WIDTH - args.inset_x
-        y0 = args.inset_y
-        y1 = SAFE_HEIGHT - args.inset_y
-        for y in range(SAFE_HEIGHT):
-            row = y * SAFE_WIDTH
-            for x in range(SAFE_WIDTH):
-                if x < x0 or x >= x1 or y < y0 or y >= y1:
-                    nibbles[row + x] = 0
+        mask = np.ones(levels.shape, dtype=bool)
+        mask[args.inset_y:SAFE_HEIGHT - args.inset_y, args.inset_x:SAFE_WIDTH - args.inset_x] = False
+        levels[mask] = 0
+
+    return levels
 
-    return nibbles
+
+def quantize_frame(frame: Image.Image, args: argparse.Namespace) -> List[int]:
+    _, _, nibbles = level_table(args)
+    return nibbles[frame_levels(frame, args)].ravel().tolist()
+
+
+def quantize_clip(
+    chosen: Sequence[tuple[int, Image.Image]],
+    args: argparse.Namespace,
+) -> tuple[List[np.ndarray], List[int], List[int]]:
+    """Quantize the selected frames in order, carrying hysteresis forward.
+
+    Returns the nibble frames plus the bytes each frame changes against the
+    frame before, with and without hysteresis. Frame 0 counts against black.
+    """
+    _, _, table = level_table(args)
+    black = bytes(GROUPED_COLS * SAFE_HEIGHT)
+    frames: List[np.ndarray] = []
+    changed_held: List[int] = []
+    changed_plain: List[int] = []
+    held_levels: Optional[np.ndarray] = None
+    last_held = black
+    last_plain = black
+    for _, frame in chosen:
+        plain_levels = frame_levels(frame, args)
+        if args.hysteresis > 0 and held_levels is not None:
+            held_levels = frame_levels(frame, args, held_levels)
+        else:
+            held_levels = plain_levels
+
+        nibbles = table[held_levels]
+        packed = pack_frame(nibbles)
+        plain = packed if held_levels is plain_levels else pack_frame(table[plain_levels])
+        changed_held.append(changed_bytes(packed, last_held))
+        changed_plain.append(changed_bytes(plain, last_plain))
+        frames.append(nibbles)
+        last_held = packed
+        last_plain = plain
+    return frames, changed_held, changed_plain
 
 
 def pack_frame(nibbles: Sequence[int]) -> bytes:
-    packed = bytearray()
-    for y in range(SAFE_HEIGHT):
-        row = y * SAFE_WIDTH
-        for x in range(0, SAFE_WIDTH, 2):
-            left = nibbles[row + x]
-            right = nibbles[row + x + 1]
-            packed.append((left << 4) | right)
-    return bytes(packed)
+    grid = np.asarray(nibbles, dtype=np.uint8).reshape(SAFE_HEIGHT, SAFE_WIDTH)
+    return ((grid[:, 0::2] << 4) | grid[:, 1::2]).tobytes()
+
+
+def changed_bytes(current: bytes, previous: bytes) -> int:
+    return int(np.count_nonzero(np.frombuffer(current, dtype=np.uint8) != np.frombuffer(previous, dtype=np.uint8)))
 
 
 def frame_delta_runs(current: bytes, previous: bytes) -> List[RunRecord]:
@@ -458,14 +545,15 @@ def frame_delta_runs(current: bytes, previous: bytes) -> List[RunRecord]:
     return runs
 
 
-def encode_runs(runs: Sequence[RunRecord]) -> bytes:
-    if len(runs) > 255:
+def encode_runs(runs: Sequence[RunRecord], flags: int = 0) -> bytes:
+    if len(runs) > MAX_RUNS_PER_FRAME:
         raise ValueError(
-            f"frame has {len(runs)} runs; the current player supports at most 255 runs per frame"
+            f"frame has {len(runs)} runs; the current player supports at most {MAX_RUNS_PER_FRAME} runs per frame"
         )
     out = bytearray()
     out.append(len(runs))
-    out.append(0x00)
+    out.append(flags)
+    data_starts: List[int] = []
     for run in runs:
         if not 0 <= run.col <= 63:
             raise ValueError("run column is outside 0..63")
@@ -473,11 +561,514 @@ def encode_runs(runs: Sequence[RunRecord]) -> bytes:
             raise ValueError("run row is outside 0..62")
         if not 1 <= len(run.data) <= 64:
             raise ValueError("run byte count must be 1..64")
-        out.extend([run.col, run.row, len(run.data)])
-        out.extend(run.data)
+
+        if run.kind == "fill":
+            if run.data != bytes([run.data[0]]) * len(run.data):
+                raise ValueError("fill run data must repeat one byte")
+            out.extend([run.col | RUN_KIND_FILL, run.row, len(run.data), run.data[0]])
+            data_starts.append(-1)
+        elif run.kind == "copy":
+            if not 0 <= run.source_run < len(data_starts) or data_starts[run.source_run] < 0:
+                raise ValueError("copy run must point at an earlier raw run")
+            source = data_starts[run.source_run] + run.source_offset
+            if bytes(out[source:source + len(run.data)]) != run.data:
+                raise ValueError("copy run source does not match its data")
+            out.extend([run.col | RUN_KIND_COPY, run.row, len(run.data)])
+            distance = len(out) + 2 - source
+            out.extend([distance & 0xFF, distance >> 8])
+            data_starts.append(-1)
+        else:
+            out.extend([run.col, run.row, len(run.data)])
+            data_starts.append(len(out))
+            out.extend(run.data)
     return bytes(out)
 
 
+def player_timing(args: argparse.Namespace, profile: Optional[str] = None) -> PlayerTiming:
+    profile = profile or args.player_profile
+    fill = "fill" in args.run_codecs
+    copy = "copy" in args.run_codecs
+    if profile == "fast":
+        frame_cycles = FAST_FRAME_CYCLES
+        if args.layout == "packed":
+            frame_cycles += INDEX_LOOKUP_CYCLES
+        return PlayerTiming(
+            frame_cycles=frame_cycles,
+            run_cycles=FAST_RUN_CYCLES + (FAST_KIND_CYCLES if fill or copy else 0),
+            byte_cycles=FAST_BYTE_CYCLES,
+            keyframe_cycles=CLEAR_SAFE_AREA_CYCLES,
+            sector_cycles=args.sd_sector_cycles,
+            fill_run_cycles=FAST_FILL_RUN_CYCLES + (FAST_FILL_CHECK_CYCLES if copy else 0),
+            fill_byte_cycles=FAST_FILL_BYTE_CYCLES,
+            copy_run_cycles=FAST_COPY_RUN_CYCLES + (FAST_COPY_CHECK_CYCLES if fill else 0),
+            row_cycles=FAST_ROW_CYCLES,
+            unroll_min=FAST_UNROLL_MIN,
+            long_run_cycles=FAST_LONG_RUN_CYCLES,
+            quad_cycles=FAST_QUAD_CYCLES,
+        )
+
+    frame_cycles = PLAYER_FRAME_CYCLES
+    if args.layout == "packed":
+        frame_cycles += INDEX_LOOKUP_CYCLES
+
+    # Raw runs pay for the kind checks of every enabled codec ahead of them.
+    run_cost = PLAYER_RUN_CYCLES
+    checks = int(fill) + int(copy)
+    if checks:
+        run_cost += KIND_DISPATCH_CYCLES + checks * KIND_CHECK_CYCLES
+    return PlayerTiming(
+        frame_cycles=frame_cycles,
+        run_cycles=run_cost,
+        byte_cycles=PLAYER_BYTE_CYCLES,
+        keyframe_cycles=CLEAR_SAFE_AREA_CYCLES,
+        sector_cycles=args.sd_sector_cycles,
+        fill_run_cycles=FILL_RUN_CYCLES,
+        fill_byte_cycles=FILL_BYTE_CYCLES,
+        copy_run_cycles=COPY_RUN_CYCLES + (KIND_CHECK_CYCLES if fill else 0),
+    )
+
+
+def raw_byte_cycles(timing: PlayerTiming, length: int) -> int:
+    if not timing.unroll_min or length < timing.unroll_min:
+        return length * timing.byte_cycles
+    # Unrolled loop: four bytes per pass, then the single-byte loop for the rest.
+    quads, rest = divmod(length, 4)
+    tail = 5 if rest == 0 else 8 + rest * timing.byte_cycles
+    return timing.long_run_cycles + quads * timing.quad_cycles + tail
+
+
+def piece_cycles(timing: PlayerTiming, kind: str, length: int) -> int:
+    # Draw time plus the piece's share of the SD sector reads.
+    if kind == "fill":
+        draw, stored = timing.fill_run_cycles + length * timing.fill_byte_cycles, 4
+    elif kind == "copy":
+        draw, stored = timing.copy_run_cycles + length * timing.byte_cycles, 5
+    else:
+        draw, stored = timing.run_cycles + raw_byte_cycles(timing, length), 3 + length
+    return draw + stored * timing.sector_cycles // SECTOR_SIZE
+
+
+def row_changes(runs: Sequence[RunRecord]) -> int:
+    return sum(1 for i, run in enumerate(runs) if i == 0 or runs[i - 1].row != run.row)
+
+
+def run_stored_bytes(run: RunRecord) -> int:
+    if run.kind == "fill":
+        return 4
+    if run.kind == "copy":
+        return 5
+    return 3 + len(run.data)
+
+
+def run_draw_cycles(timing: PlayerTiming, run: RunRecord) -> int:
+    return piece_cycles(timing, run.kind, len(run.data)) - run_stored_bytes(run) * timing.sector_cycles // SECTOR_SIZE
+
+
+def run_cycles(timing: PlayerTiming, run: RunRecord) -> int:
+    return piece_cycles(timing, run.kind, len(run.data))
+
+
+def estimate_frame_cycles(timing: PlayerTiming, runs: Sequence[RunRecord], keyframe: bool = False) -> int:
+    cycles = timing.frame_cycles + 2 * timing.sector_cycles // SECTOR_SIZE
+    cycles += sum(run_cycles(timing, run) for run in runs)
+    cycles += row_changes(runs) * timing.row_cycles
+    if keyframe:
+        cycles += timing.keyframe_cycles
+    return cycles
+
+
+def draw_cycles(timing: PlayerTiming, runs: Sequence[RunRecord], keyframe: bool = False) -> int:
+    cycles = timing.frame_cycles
+    cycles += sum(run_draw_cycles(timing, run) for run in runs)
+    cycles += row_changes(runs) * timing.row_cycles
+    if keyframe:
+        cycles += timing.keyframe_cycles
+    return cycles
+
+
+def encoded_size(runs: Sequence[RunRecord]) -> int:
+    return 2 + sum(run_stored_bytes(run) for run in runs)
+
+
+def copy_sources(runs: Sequence[RunRecord], row: int) -> List[tuple[int, RunRecord]]:
+    return [(i, run) for i, run in enumerate(runs) if run.kind == "raw" and run.row == row - 1]
+
+
+def longest_copy(data: bytes, start: int, sources: Sequence[tuple[int, RunRecord]]) -> tuple[int, int, int]:
+    # Longest prefix of data[start:] found in earlier raw data on the row above.
+    best = (0, -1, 0)
+    for index, source in sources:
+        src = source.data
+        for offset in range(len(src)):
+            length = 0
+            while (
+                start + length < len(data)
+                and offset + length < len(src)
+                and data[start + length] == src[offset + length]
+            ):
+                length += 1
+            if length > best[0]:
+                best = (length, index, offset)
+    return best
+
+
+def choose_run_codecs(
+    runs: Sequence[RunRecord],
+    timing: PlayerTiming,
+    codecs: Sequence[str],
+) -> List[RunRecord]:
+    """Split each run into raw, fill and copy pieces by modelled player cost.
+
+    Fill pieces repeat one byte. Copy pieces replay bytes already stored for
+    a raw run on the row above, so vertical edges and stripes are sent once.
+    A run is only split while the frame stays within MAX_RUNS_PER_FRAME.
+    """
+    if set(codecs) == {"raw"}:
+        return list(runs)
+
+    chosen: List[RunRecord] = []
+    for number, run in enumerate(runs):
+        data = run.data
+        size = len(data)
+        sources = copy_sources(chosen, run.row) if "copy" in codecs else []
+
+        same = [1] * size
+        for i in range(size - 2, -1, -1):
+            if data[i] == data[i + 1]:
+                same[i] = same[i + 1] + 1
+        copies = [longest_copy(data, i, sources) for i in range(size)] if sources else []
+
+        # best[i] is the cheapest cost of sending data[i:]; step[i] is its first piece.
+        best = [0] * (size + 1)
+        step: List[tuple[str, int]] = [("raw", size)] * (size + 1)
+        for i in range(size - 1, -1, -1):
+            options = [("raw", end) for end in range(i + 1, size + 1)]
+            if "fill" in codecs:
+                options.extend(("fill", i + length) for length in range(2, same[i] + 1))
+            if copies:
+                options.extend(("copy", i + length) for length in range(2, copies[i][0] + 1))
+            best[i], step[i] = min(
+                ((piece_cycles(timing, kind, end - i) + best[end], (kind, end)) for kind, end in options),
+                key=lambda item: item[0],
+            )
+
+        pieces: List[RunRecord] = []
+        i = 0
+        while i < size:
+            kind, end = step[i]
+            source = copies[i] if kind == "copy" else (0, -1, 0)
+            pieces.append(RunRecord(run.row, run.col + i, data[i:end], kind, source[1], source[2]))
+            i = end
+
+        remaining = len(runs) - number - 1
+        if len(chosen) + len(pieces) + remaining > MAX_RUNS_PER_FRAME:
+            pieces = [RunRecord(run.row, run.col, data)]
+            if "fill" in codecs and same[0] == size and size > 1:
+                pieces = [min(pieces + [RunRecord(run.row, run.col, data, "fill")], key=lambda item: run_cycles(timing, item))]
+        chosen.extend(pieces)
+    return chosen
+
+
+def merge_runs(runs: Sequence[RunRecord], current: bytes, limit: int) -> List[RunRecord]:
+    # Join the closest same-row neighbours until the run count fits.
+    merged = list(runs)
+    while len(merged) > limit:
+        best: Optional[tuple[int, int]] = None
+        for i in range(len(merged) - 1):
+            left = merged[i]
+            right = merged[i + 1]
+            if left.row != right.row:
+                continue
+            gap = right.col - (left.col + len(left.data))
+            if best is None or gap < best[0]:
+                best = (gap, i)
+        if best is None:
+            break
+        i = best[1]
+        left = merged[i]
+        right = merged[i + 1]
+        base = left.row * GROUPED_COLS
+        data = current[base + left.col:base + right.col + len(right.data)]
+        merged[i:i + 2] = [RunRecord(row=left.row, col=left.col, data=bytes(data))]
+    return merged
+
+
+def merge_cheap_gaps(runs: Sequence[RunRecord], current: bytes, timing: PlayerTiming) -> List[RunRecord]:
+    # Join same-row runs when resending the gap is cheaper than a new run.
+    byte_cost = timing.byte_cycles + timing.sector_cycles // SECTOR_SIZE
+    run_cost = timing.run_cycles + 3 * timing.sector_cycles // SECTOR_SIZE
+    merged: List[RunRecord] = []
+    for run in runs:
+        if merged:
+            last = merged[-1]
+            gap = run.col - (last.col + len(last.data))
+            if last.row == run.row and gap * byte_cost < run_cost:
+                base = last.row * GROUPED_COLS
+                data = current[base + last.col:base + run.col + len(run.data)]
+                merged[-1] = RunRecord(row=last.row, col=last.col, data=bytes(data))
+                continue
+        merged.append(run)
+    return merged
+
+
+def run_value(run: RunRecord, displayed: bytes) -> int:
+    # Visible error removed by drawing the run, in summed nibble steps.
+    base = run.row * GROUPED_COLS + run.col
+    value = 0
+    for offset, new in enumerate(run.data):
+        old = displayed[base + offset]
+        value += abs((new >> 4) - (old >> 4)) + abs((new & 0x0F) - (old & 0x0F))
+    return value
+
+
+def fit_runs_to_budget(
+    runs: Sequence[RunRecord],
+    displayed: bytes,
+    timing: PlayerTiming,
+    budget_cycles: Optional[int],
+    byte_cap: int,
+    keyframe: bool = False,
+) -> tuple[List[RunRecord], int]:
+    """Drop the runs with the least visible change per cycle until the frame fits.
+
+    Dropped pixels stay stale on screen. The next frame is diffed against
+    what is actually displayed, so the error is repaired later instead of lost.
+    """
+    kept = list(runs)
+    cycles = estimate_frame_cycles(timing, kept, keyframe)
+    size = encoded_size(kept)
+    if (budget_cycles is None or cycles <= budget_cycles) and size <= byte_cap:
+        return kept, 0
+
+    order = sorted(
+        range(len(kept)),
+        key=lambda i: run_value(kept[i], displayed) / run_cycles(timing, kept[i]),
+    )
+    dropped = set()
+    for i in order:
+        if (budget_cycles is None or cycles <= budget_cycles) and size <= byte_cap:
+            break
+        dropped.add(i)
+        cycles -= run_cycles(timing, kept[i])
+        size -= 3 + len(kept[i].data)
+    return [run for i, run in enumerate(kept) if i not in dropped], len(dropped)
+
+
+def apply_runs(displayed: bytes, runs: Sequence[RunRecord]) -> bytes:
+    screen = bytearray(displayed)
+    for run in runs:
+        base = run.row * GROUPED_COLS + run.col
+        screen[base:base + len(run.data)] = run.data
+    return bytes(screen)
+
+
+def frame_budget_cycles(args: argparse.Namespace) -> Optional[int]:
+    if args.target_fps is None:
+        return None
+    if args.pace:
+        return int(args.clock_hz / args.target_fps) - PACE_WAIT_CYCLES
+    budget = int(args.clock_hz / args.target_fps) - max(0, args.delay_calls) * DELAY_FRAME_CYCLES
+    if budget <= PLAYER_FRAME_CYCLES:
+        raise SystemExit(
+            f"--target-fps {args.target_fps} leaves no time to draw at {args.clock_hz} Hz. "
+            "Lower the target or use fewer --delay-calls."
+        )
+    return budget
+
+
+def pace_unit(args: argparse.Namespace) -> int:
+    """Inner loop passes per pace tick, so a whole frame period fits in the tick field."""
+    period = args.clock_hz / args.target_fps
+    return max(1, math.ceil(period / (FRAME_PACE_MASK * PACE_LOOP_CYCLES)))
+
+
+def pace_tick_cycles(args: argparse.Namespace) -> int:
+    return pace_unit(args) * PACE_LOOP_CYCLES + PACE_TICK_CYCLES
+
+
+def pace_clip(
+    args: argparse.Namespace,
+    encoded_frames: Sequence[bytes],
+    infos: Sequence[FrameInfo],
+) -> tuple[List[bytes], List[FrameInfo]]:
+    """Store each frame's pace ticks in the low bits of its flags byte.
+
+    The ticks fill the time between the frame's modelled read and draw and
+    one --target-fps period. Setting them does not change any frame size, so
+    the sector reads from a first layout pass still hold.
+    """
+    _, frame_index, slot_sectors, _ = build_payload(args, encoded_frames)
+    reads = frame_sector_reads(len(infos), slot_sectors, frame_index)
+    period = args.clock_hz / args.target_fps
+    tick = pace_tick_cycles(args)
+    paced_frames: List[bytes] = []
+    paced_infos: List[FrameInfo] = []
+    for encoded, item, sectors in zip(encoded_frames, infos, reads):
+        busy = frame_period_cycles(args, replace(item, pace_ticks=0), sectors)
+        ticks = min(FRAME_PACE_MASK, max(0, round((period - busy) / tick)))
+        frame = bytearray(encoded)
+        frame[1] = (frame[1] & ~FRAME_PACE_MASK) | ticks
+        paced_frames.append(bytes(frame))
+        paced_infos.append(replace(item, pace_ticks=ticks))
+    return paced_frames, paced_infos
+
+
+def encode_clip(
+    chosen: Sequence[tuple[int, Image.Image]],
+    args: argparse.Namespace,
+    quantized: Optional[tuple[List[np.ndarray], List[int], List[int]]] = None,
+    screens: Optional[List[bytes]] = None,
+) -> tuple[List[bytes], List[FrameInfo]]:
+    """Encode the selected frames followed by a loop frame back to frame 0.
+
+    Each frame is diffed against what the player has actually drawn. Keyframes
+    clear the safe area and draw against black. The loop frame lets playback
+    wrap to frame 1 without clearing the screen or redrawing frame 0.
+    quantized is the result of quantize_clip when the caller already has it.
+    screens, when given, receives the packed screen the player shows after
+    each stored frame, including runs rate control left for later frames.
+    """
+    timing = player_timing(args)
+    profile_timings = [player_timing(args, profile) for profile in PLAYER_PROFILES]
+    budget = frame_budget_cycles(args)
+    byte_cap = MAX_SLOT_SECTORS * SECTOR_SIZE
+    black = bytes(GROUPED_COLS * SAFE_HEIGHT)
+    displayed = black
+    first_displayed = black
+
+    frames, changed_held, changed_plain = quantized or quantize_clip(chosen, args)
+    encoded_frames: List[bytes] = []
+    infos: List[FrameInfo] = []
+    for out_index, (source_index, _) in enumerate(chosen):
+        nibbles = frames[out_index]
+        packed = pack_frame(nibbles)
+
+        runs = frame_delta_runs(packed, displayed)
+        keyframe = out_index > 0 and args.keyframe_interval > 0 and out_index % args.keyframe_interval == 0
+        if out_index > 0 and not keyframe and args.scene_cut:
+            key_runs = frame_delta_runs(packed, black)
+            keyframe = estimate_frame_cycles(timing, key_runs, True) < estimate_frame_cycles(timing, runs)
+        base = black if keyframe else displayed
+        if keyframe:
+            runs = frame_delta_runs(packed, black)
+
+        if budget is not None:
+            runs = merge_cheap_gaps(runs, packed, timing)
+        runs = merge_runs(runs, packed, MAX_RUNS_PER_FRAME)
+        runs, dropped = fit_runs_to_budget(runs, base, timing, budget, byte_cap, keyframe)
+        runs = choose_run_codecs(runs, timing, args.run_codecs)
+
+        encoded = encode_runs(runs, FRAME_FLAG_KEYFRAME if keyframe else 0)
+        encoded_frames.append(encoded)
+        infos.append(FrameInfo(
+            out_index,
+            source_index,
+            len(runs),
+            len(encoded),
+            sum(len(run.data) for run in runs),
+            int(np.count_nonzero(nibbles)),
+            "key" if keyframe else "delta",
+            dropped,
+            draw_cycles(timing, runs, keyframe),
+            sum(1 for run in runs if run.kind == "fill"),
+            sum(1 for run in runs if run.kind == "copy"),
+            changed_held[out_index],
+            changed_plain[out_index],
+            tuple(draw_cycles(item, runs, keyframe) for item in profile_timings),
+        ))
+        displayed = apply_runs(base, runs)
+        if screens is not None:
+            screens.append(displayed)
+        if out_index == 0:
+            first_displayed = displayed
+
+    loop_runs = merge_runs(frame_delta_runs(first_displayed, displayed), first_displayed, MAX_RUNS_PER_FRAME)
+    loop_key = encoded_size(loop_runs) > byte_cap
+    if not loop_key and args.scene_cut:
+        key_runs = frame_delta_runs(first_displayed, black)
+        loop_key = estimate_frame_cycles(timing, key_runs, True) < estimate_frame_cycles(timing, loop_runs)
+    if loop_key:
+        loop_runs = merge_runs(frame_delta_runs(first_displayed, black), first_displayed, MAX_RUNS_PER_FRAME)
+    loop_runs = choose_run_codecs(loop_runs, timing, args.run_codecs)
+    encoded = encode_runs(loop_runs, FRAME_FLAG_KEYFRAME if loop_key else 0)
+    if len(encoded) > byte_cap:
+        raise SystemExit(f"Loop frame needs {len(encoded)} bytes; the player buffer holds {byte_cap} bytes.")
+    encoded_frames.append(encoded)
+    if screens is not None:
+        screens.append(apply_runs(black if loop_key else displayed, loop_runs))
+    infos.append(FrameInfo(
+        len(chosen),
+        chosen[0][0],
+        len(loop_runs),
+        len(encoded),
+        sum(len(run.data) for run in loop_runs),
+        infos[0].lit_pixels,
+        "loop-key" if loop_key else "loop",
+        0,
+        draw_cycles(timing, loop_runs, loop_key),
+        sum(1 for run in loop_runs if run.kind == "fill"),
+        sum(1 for run in loop_runs if run.kind == "copy"),
+        changed_bytes(first_displayed, displayed),
+        changed_bytes(first_displayed, displayed),
+        tuple(draw_cycles(item, loop_runs, loop_key) for item in profile_timings),
+    ))
+    return encoded_frames, infos
+
+
+def pack_frame_stream(
+    encoded_frames: Sequence[bytes],
+    restart: Sequence[int] = (),
+) -> tuple[bytes, List[int], List[int]]:
+    """Lay frames back-to-back and build the per-frame index bytes.
+
+    The player buffer holds MAX_SLOT_SECTORS sectors. A frame that is already
+    loaded needs no read. A frame that runs past the loaded sectors appends
+    just the missing sectors. A frame that would overflow the buffer, or is
+    listed in restart, starts at the buffer base on a fresh sector.
+    Returns the stream, the index bytes and each frame's stream offset.
+    """
+    capacity = MAX_SLOT_SECTORS * SECTOR_SIZE
+    stream = bytearray()
+    index: List[int] = []
+    starts: List[int] = []
+    group_base = 0
+    loaded = 0
+    used = 0
+
+    for number, frame in enumerate(encoded_frames):
+        size = len(frame)
+        if size > capacity:
+            raise ValueError(f"frame {number} needs {size} bytes; the player buffer holds {capacity} bytes")
+
+        continues = number > 0 and number not in restart
+        if continues and used + size <= loaded:
+            index.append(0)
+        elif continues and used + size <= capacity:
+            needed = math.ceil((used + size) / SECTOR_SIZE) - loaded // SECTOR_SIZE
+            index.append(needed)
+            loaded += needed * SECTOR_SIZE
+        else:
+            group_base = len(stream)
+            used = 0
+            needed = max(1, math.ceil(size / SECTOR_SIZE))
+            index.append(INDEX_RESTART_FLAG | needed)
+            loaded = needed * SECTOR_SIZE
+
+        stream.extend(bytes(group_base + loaded - len(stream)))
+        start = group_base + used
+        stream[start:start + size] = frame
+        starts.append(start)
+        used += size
+
+    return bytes(stream), index, starts
+
+
+def frame_index_sector(index: Sequence[int]) -> bytes:
+    if len(index) > SECTOR_SIZE:
+        raise ValueError("frame index does not fit in one sector")
+    return bytes(index) + bytes(SECTOR_SIZE - len(index))
+
+
 def block_bytes(block: int) -> tuple[int, int, int, int]:
     if not 0 <= block <= 0xFFFFFFFF:
         raise ValueError("video block must fit in 32 bits")
@@ -504,76 +1095,34 @@ def asm_puts(lines: List[str], text: str) -> None:
             asm_putc(lines, ord(ch), ch if ch != " " else "space")
 
 
-def make_player_asm(args: argparse.Namespace, frame_count: int, slot_sectors: int) -> str:
-    b0, b1, b2, b3 = block_bytes(args.video_block)
-    lines: List[str] = []
-    delay_calls = max(0, args.delay_calls)
-
+def asm_copy_block(lines: List[str], source: str) -> None:
+    # source holds a block number MSB first, like the directory entries.
     lines.extend([
-        "#addr 0x0200",
-        f"#include \"{args.ruledef}\"",
-        f"#include \"{args.constants}\"",
-        "",
-        "JMP START",
-        "",
-        f"#include \"{args.lowlevel}\"",
-        f"#include \"{args.text4}\"",
-        f"#include \"{args.graphics}\"",
-        f"#include \"{args.spi_routines}\"",
-        f"#include \"{args.spi_init}\"",
-        f"#include \"{args.sd_block_io}\"",
-        "",
-        "; ---------- SD delta video state ----------",
-        "VID_FRAME_LEFT    = 0x7340",
-        "VID_SECTORS_LEFT  = 0x7341",
-        "VID_RUNS_LEFT     = 0x7342",
-        "VID_RUN_COL       = 0x7343",
-        "VID_RUN_ROW       = 0x7344",
-        "VID_RUN_COUNT     = 0x7345",
-        "VID_PTR_LO        = 0x7346",
-        "VID_PTR_HI        = 0x7347",
-        "",
-        "VID_BUFFER_LO     = 0x00",
-        "VID_BUFFER_HI     = 0x60",
-        f"VID_FRAME_COUNT   = 0x{frame_count:02X}",
-        f"VID_SLOT_SECTORS  = 0x{slot_sectors:02X}",
-        "",
-        "START:",
-        "    MOV $CLK, 0x07",
-        "    JSR OLED_INIT",
-        "    JSR OLED4_SET_DEFAULT_ORIGIN",
-        "    JSR OLED4_HOME",
-        "    JSR OLEDG_CLEAR_SAFE_AREA",
-        "    JSR VID_PRINT_START_TEXT",
-        "    JSR SD_INIT_RELIABLE",
-        "",
-        "VID_LOOP:",
-        "    JSR OLEDG_CLEAR_SAFE_AREA",
-        "    JSR VID_SET_START_BLOCK",
-        "    MOV $A, VID_FRAME_COUNT",
-        "    MOV VID_FRAME_LEFT, $A",
-        "",
-        "VID_FRAME_LOOP:",
-        "    JSR VID_LOAD_SLOT_TO_BUFFER",
-        "    JC VID_READ_FAIL",
-        "",
-        "    JSR VID_DRAW_DELTA_SLOT",
+        f"    MOV $A, {source}",
+        "    MOV SD_BLOCK_ADDR_MSB, $A",
+        f"    MOV $A, {source} + 1",
+        "    MOV SD_BLOCK_ADDR_B2, $A",
+        f"    MOV $A, {source} + 2",
+        "    MOV SD_BLOCK_ADDR_B1, $A",
+        f"    MOV $A, {source} + 3",
+        "    MOV SD_BLOCK_ADDR_LSB, $A",
+        "    RTS",
     ])
-    for _ in range(delay_calls):
-        lines.append("    JSR VID_DELAY_FRAME")
+
+
+def asm_copy_entry_byte(lines: List[str], target: str) -> None:
+    # Copy [$CD] to target and step C. Directory entries never cross a page.
     lines.extend([
-        "",
-        "    MOV $A, VID_FRAME_LEFT",
+        "    MOV $A, [$CD]",
+        f"    MOV {target}, $A",
         "    STC",
-        "    SUB $A, 0x01",
-        "    PSF",
-        "    MOV VID_FRAME_LEFT, $A",
-        "    PLF",
-        "    JNZ VID_FRAME_LOOP",
-        "",
-        "    JMP VID_LOOP",
-        "",
-        "VID_SET_START_BLOCK:",
+        "    ADD $C, 0x00",
+    ])
+
+
+def asm_set_block(lines: List[str], block: int) -> None:
+    b0, b1, b2, b3 = block_bytes(block)
+    lines.extend([
         f"    MOV $A, 0x{b0:02X}",
         "    MOV SD_BLOCK_ADDR_MSB, $A",
         f"    MOV $A, 0x{b1:02X}",
@@ -583,66 +1132,13 @@ def make_player_asm(args: argparse.Namespace, frame_count: int, slot_sectors: in
         f"    MOV $A, 0x{b3:02X}",
         "    MOV SD_BLOCK_ADDR_LSB, $A",
         "    RTS",
-        "",
-        "VID_INC_SD_BLOCK:",
-        "    MOV $A, SD_BLOCK_ADDR_LSB",
-        "    CLC",
-        "    ADD $A, 0x01",
-        "    PSF",
-        "    MOV SD_BLOCK_ADDR_LSB, $A",
-        "    PLF",
-        "    JNC .VID_INC_DONE",
-        "",
-        "    MOV $A, SD_BLOCK_ADDR_B1",
-        "    CLC",
-        "    ADD $A, 0x01",
-        "    PSF",
-        "    MOV SD_BLOCK_ADDR_B1, $A",
-        "    PLF",
-        "    JNC .VID_INC_DONE",
-        "",
-        "    MOV $A, SD_BLOCK_ADDR_B2",
-        "    CLC",
-        "    ADD $A, 0x01",
-        "    PSF",
-        "    MOV SD_BLOCK_ADDR_B2, $A",
-        "    PLF",
-        "    JNC .VID_INC_DONE",
-        "",
-        "    MOV $A, SD_BLOCK_ADDR_MSB",
-        "    CLC",
-        "    ADD $A, 0x01",
-        "    MOV SD_BLOCK_ADDR_MSB, $A",
-        "",
-        ".VID_INC_DONE:",
-        "    RTS",
-        "",
-        "VID_LOAD_SLOT_TO_BUFFER:",
-        "    MOV $C, VID_BUFFER_LO",
-        "    MOV $D, VID_BUFFER_HI",
-        "    MOV $A, VID_SLOT_SECTORS",
-        "    MOV VID_SECTORS_LEFT, $A",
-        "",
-        ".VID_LOAD_SECTOR:",
-        "    JSR SD_READ_BLOCK_TO_RAM_512",
-        "    JC .VID_LOAD_FAIL",
-        "    JSR VID_INC_SD_BLOCK",
-        "",
-        "    MOV $A, VID_SECTORS_LEFT",
-        "    STC",
-        "    SUB $A, 0x01",
-        "    PSF",
-        "    MOV VID_SECTORS_LEFT, $A",
-        "    PLF",
-        "    JNZ .VID_LOAD_SECTOR",
-        "",
-        "    CLC",
-        "    RTS",
-        "",
-        ".VID_LOAD_FAIL:",
-        "    STC",
-        "    RTS",
-        "",
+    ])
+
+
+def standard_draw_asm(packed: bool, fill: bool, copy: bool) -> List[str]:
+    """Draw routine for --player-profile standard."""
+    lines: List[str] = []
+    lines.extend([
         "VID_INC_CD:",
         "    CLC",
         "    ADD $C, 0x01",
@@ -663,23 +1159,52 @@ def make_player_asm(args: argparse.Namespace, frame_count: int, slot_sectors: in
         "    MOV $D, VID_PTR_HI",
         "    RTS",
         "",
-        "VID_DRAW_DELTA_SLOT:",
-        "    MOV $C, VID_BUFFER_LO",
-        "    MOV $D, VID_BUFFER_HI",
+    ])
+    if packed:
+        lines.extend([
+            "VID_DRAW_DELTA_FRAME:",
+            "    MOV $C, VID_DRAW_LO",
+            "    MOV $D, VID_DRAW_HI",
+        ])
+    else:
+        lines.extend([
+            "VID_DRAW_DELTA_SLOT:",
+            "    MOV $C, VID_BUFFER_LO",
+            "    MOV $D, VID_BUFFER_HI",
+        ])
+    lines.extend([
         "    MOV $A, [$CD]",
         "    MOV VID_RUNS_LEFT, $A",
         "    JSR VID_INC_CD",
+        "    MOV $A, [$CD]",
         "    JSR VID_INC_CD",
         "",
+        "    AND $A, VID_KEYFRAME_FLAG",
+        "    JZ .VID_RUN_LOOP",
+        "    JSR OLEDG_CLEAR_SAFE_AREA",
+        "",
         ".VID_RUN_LOOP:",
         "    MOV $A, VID_RUNS_LEFT",
         "    STC",
         "    CMP $A, 0x00",
         "    JZ .VID_RUNS_DONE",
         "",
-        "    MOV $A, [$CD]",
-        "    MOV VID_RUN_COL, $A",
-        "    JSR VID_INC_CD",
+    ])
+    if fill or copy:
+        lines.extend([
+            "    MOV $A, [$CD]",
+            "    MOV VID_RUN_KIND, $A",
+            "    AND $A, VID_COL_MASK",
+            "    MOV VID_RUN_COL, $A",
+            "    JSR VID_INC_CD",
+        ])
+    else:
+        lines.extend([
+            "    MOV $A, [$CD]",
+            "    MOV VID_RUN_COL, $A",
+            "    JSR VID_INC_CD",
+        ])
+    lines.extend([
         "",
         "    MOV $A, [$CD]",
         "    MOV VID_RUN_ROW, $A",
@@ -694,6 +1219,20 @@ def make_player_asm(args: argparse.Namespace, frame_count: int, slot_sectors: in
         "    JSR VID_RESTORE_PTR",
         "",
         "    MOV $B, VID_RUN_COUNT",
+    ])
+    if fill:
+        lines.extend([
+            "    MOV $A, VID_RUN_KIND",
+            "    AND $A, VID_KIND_FILL",
+            "    JNZ .VID_FILL_RUN",
+        ])
+    if copy:
+        lines.extend([
+            "    MOV $A, VID_RUN_KIND",
+            "    AND $A, VID_KIND_COPY",
+            "    JNZ .VID_COPY_RUN",
+        ])
+    lines.extend([
         "",
         ".VID_DATA_LOOP:",
         "    MOV $A, [$CD]",
@@ -703,6 +1242,10 @@ def make_player_asm(args: argparse.Namespace, frame_count: int, slot_sectors: in
         "    SUB $B, 0x01",
         "    JNZ .VID_DATA_LOOP",
         "",
+    ])
+    if fill or copy:
+        lines.append(".VID_RUN_NEXT:")
+    lines.extend([
         "    MOV $A, VID_RUNS_LEFT",
         "    STC",
         "    SUB $A, 0x01",
@@ -710,8 +1253,58 @@ def make_player_asm(args: argparse.Namespace, frame_count: int, slot_sectors: in
         "    JMP .VID_RUN_LOOP",
         "",
         ".VID_RUNS_DONE:",
+    ])
+    if packed:
+        lines.extend([
+            "    MOV VID_DRAW_LO, $C",
+            "    MOV VID_DRAW_HI, $D",
+        ])
+    lines.extend([
         "    RTS",
         "",
+    ])
+    if fill:
+        lines.extend([
+            ".VID_FILL_RUN:",
+            "    ; One stored byte repeated for the whole run.",
+            "    MOV $A, [$CD]",
+            "    JSR VID_INC_CD",
+            "",
+            ".VID_FILL_LOOP:",
+            "    OLD $A",
+            "    STC",
+            "    SUB $B, 0x01",
+            "    JNZ .VID_FILL_LOOP",
+            "    JMP .VID_RUN_NEXT",
+            "",
+        ])
+    if copy:
+        lines.extend([
+            ".VID_COPY_RUN:",
+            "    ; 16-bit distance back from the next byte to earlier raw run data.",
+            "    MOV $A, [$CD]",
+            "    JSR VID_INC_CD",
+            "    MOV $B, [$CD]",
+            "    JSR VID_INC_CD",
+            "    JSR VID_SAVE_PTR",
+            "    STC",
+            "    SUB $C, $A",
+            "    SUB $D, $B",
+            "    MOV $B, VID_RUN_COUNT",
+            "",
+            ".VID_COPY_LOOP:",
+            "    MOV $A, [$CD]",
+            "    OLD $A",
+            "    JSR VID_INC_CD",
+            "    STC",
+            "    SUB $B, 0x01",
+            "    JNZ .VID_COPY_LOOP",
+            "",
+            "    JSR VID_RESTORE_PTR",
+            "    JMP .VID_RUN_NEXT",
+            "",
+        ])
+    lines.extend([
         "VID_BEGIN_RUN_WINDOW:",
         "    MOV $A, 0x15",
         "    OLC $A",
@@ -735,18 +1328,746 @@ def make_player_asm(args: argparse.Namespace, frame_count: int, slot_sectors: in
         "    OLC $A",
         "    RTS",
         "",
-        "VID_DELAY_FRAME:",
-        "    PSH $A",
-        "    PSH $B",
-        "    MOV $A, 0x20",
+    ])
+    return lines
+
+
+def fast_data_loop(prefix: str, done: str) -> List[str]:
+    # Single-byte loop. Enter with carry set and B = bytes; leaves carry set.
+    return [
+        f".{prefix}_LOOP:",
+        "    MOV $A, [$CD]",
+        "    OLD $A",
+        "    ADD $C, 0x00",
+        f"    JC .{prefix}_WRAP",
+        f".{prefix}_NEXT:",
+        "    SUB $B, 0x00",
+        f"    JNZ .{prefix}_LOOP",
+        f"    JMP {done}",
         "",
-        ".VID_DELAY_FRAME_OUTER:",
-        "    MOV $B, 0xFF",
+        f".{prefix}_WRAP:",
+        "    ADD $D, 0x00",
+        f"    JMP .{prefix}_NEXT",
         "",
-        ".VID_DELAY_FRAME_INNER:",
-        "    NOP",
-        "    NOP",
-        "    STC",
+    ]
+
+
+def fast_draw_asm(packed: bool, fill: bool, copy: bool) -> List[str]:
+    """Draw routine for --player-profile fast.
+
+    Keeps the runs left in E and the run length in B, increments CD inline,
+    and sends the row window only when a run starts a new row. Runs of
+    VID_UNROLL_MIN bytes or more go through a four-byte unrolled loop. Carry
+    stays set around the byte loops, so ADD $C, 0x00 steps the pointer
+    without a STC.
+    """
+    inc_cd = [
+        "    STC",
+        "    ADD $C, 0x00",
+        "    ADD $D, 0x00",
+    ]
+    lines: List[str] = []
+    if packed:
+        lines.extend([
+            "VID_DRAW_DELTA_FRAME:",
+            "    MOV $C, VID_DRAW_LO",
+            "    MOV $D, VID_DRAW_HI",
+        ])
+    else:
+        lines.extend([
+            "VID_DRAW_DELTA_SLOT:",
+            "    MOV $C, VID_BUFFER_LO",
+            "    MOV $D, VID_BUFFER_HI",
+        ])
+    lines.extend([
+        "    MOV $A, [$CD]",
+        "    MOV $E, $A",
+        *inc_cd,
+        "    MOV $A, [$CD]",
+        *inc_cd,
+        "",
+        "    AND $A, VID_KEYFRAME_FLAG",
+        "    JZ .VID_NO_CLEAR",
+        "    JSR OLEDG_CLEAR_SAFE_AREA",
+        "",
+        ".VID_NO_CLEAR:",
+        "    ; No row window is known to be open yet.",
+        "    MOV $A, 0xFF",
+        "    MOV VID_RUN_ROW, $A",
+        "    STC",
+        "    CMP $E, 0x00",
+        "    JZ .VID_RUNS_DONE",
+        "",
+        ".VID_RUN_LOOP:",
+        "    MOV $A, [$CD]",
+    ])
+    if fill or copy:
+        lines.extend([
+            "    MOV VID_RUN_KIND, $A",
+            "    AND $A, VID_COL_MASK",
+        ])
+    lines.extend([
+        "    MOV $B, $A",
+        *inc_cd,
+        "",
+        "    MOV $A, [$CD]",
+        "    STC",
+        "    CMP $A, VID_RUN_ROW",
+        "    JZ .VID_SAME_ROW",
+        "    MOV VID_RUN_ROW, $A",
+        "    OLC 0x75",
+        "    OLC $A",
+        "    OLC $A",
+        "",
+        ".VID_SAME_ROW:",
+        *inc_cd,
+        "",
+        "    ; A = count, B = column. Carry is clear here.",
+        "    MOV $A, [$CD]",
+        "    OLC 0x15",
+        "    OLC $B",
+        "    ADD $B, $A",
+        "    SUB $B, 0x00",
+        "    OLC $B",
+        "    OLC 0x5C",
+        "    MOV $B, $A",
+        "    ADD $C, 0x00",
+        "    ADD $D, 0x00",
+    ])
+    if fill or copy:
+        lines.extend([
+            "",
+            "    MOV $A, VID_RUN_KIND",
+            "    AND $A, VID_KIND_MASK",
+            "    JNZ .VID_CODED_RUN",
+            "    MOV $A, $B",
+        ])
+    lines.extend([
+        "",
+        "    STC",
+        "    CMP $A, VID_UNROLL_MIN",
+        "    JC .VID_LONG_RUN",
+        "    STC",
+    ])
+    lines.extend(fast_data_loop("VID_DATA", ".VID_RUN_NEXT"))
+    lines.extend([
+        ".VID_LONG_RUN:",
+        "    ; Four bytes per pass. B counts the bytes after the current pass.",
+        "    SUB $B, 0x04",
+        "",
+        ".VID_QUAD_LOOP:",
+    ])
+    for step in range(4):
+        lines.extend([
+            "    MOV $A, [$CD]",
+            "    OLD $A",
+            "    ADD $C, 0x00" if step == 0 else "    ADD $C, 0x01",
+            f"    JC .VID_QUAD_WRAP_{step}",
+            f".VID_QUAD_NEXT_{step}:",
+        ])
+    lines.extend([
+        "    SUB $B, 0x03",
+        "    JC .VID_QUAD_LOOP",
+        "    ADD $B, 0x04",
+        "    JZ .VID_RUN_NEXT",
+        "    JMP .VID_DATA_LOOP",
+        "",
+    ])
+    for step in range(4):
+        lines.extend([
+            f".VID_QUAD_WRAP_{step}:",
+            "    ADD $D, 0x00",
+            f"    JMP .VID_QUAD_NEXT_{step}",
+            "",
+        ])
+    lines.extend([
+        ".VID_RUN_NEXT:",
+        "    SUB $E, 0x01",
+        "    JNZ .VID_RUN_LOOP",
+        "",
+        ".VID_RUNS_DONE:",
+    ])
+    if packed:
+        lines.extend([
+            "    MOV VID_DRAW_LO, $C",
+            "    MOV VID_DRAW_HI, $D",
+        ])
+    lines.extend([
+        "    RTS",
+        "",
+    ])
+    if fill or copy:
+        lines.append(".VID_CODED_RUN:")
+    if fill and copy:
+        lines.extend([
+            "    AND $A, VID_KIND_FILL",
+            "    JZ .VID_COPY_RUN",
+            "",
+        ])
+    if fill:
+        lines.extend([
+            ".VID_FILL_RUN:",
+            "    MOV $A, [$CD]",
+            *inc_cd,
+            "    STC",
+            "",
+            ".VID_FILL_LOOP:",
+            "    OLD $A",
+            "    SUB $B, 0x01",
+            "    JNZ .VID_FILL_LOOP",
+            "    JMP .VID_RUN_NEXT",
+            "",
+        ])
+    if copy:
+        lines.extend([
+            ".VID_COPY_RUN:",
+            "    MOV VID_RUN_COUNT, $B",
+            "    MOV $A, [$CD]",
+            *inc_cd,
+            "    MOV $B, [$CD]",
+            *inc_cd,
+            "    MOV VID_PTR_LO, $C",
+            "    MOV VID_PTR_HI, $D",
+            "    STC",
+            "    SUB $C, $A",
+            "    SUB $D, $B",
+            "    MOV $B, VID_RUN_COUNT",
+            "    STC",
+        ])
+        lines.extend(fast_data_loop("VID_COPY", ".VID_COPY_DONE"))
+        lines.extend([
+            ".VID_COPY_DONE:",
+            "    MOV $C, VID_PTR_LO",
+            "    MOV $D, VID_PTR_HI",
+            "    STC",
+            "    JMP .VID_RUN_NEXT",
+            "",
+        ])
+    return lines
+
+
+def make_player_asm(
+    args: argparse.Namespace,
+    frame_count: int,
+    slot_sectors: int,
+    total_sectors: int = 0,
+    resume_block: Optional[int] = None,
+    library: bool = False,
+) -> str:
+    """Emit the player for frame_count stored frames.
+
+    The last stored frame is the loop frame. After it, playback resumes at
+    frame 1 from resume_block without clearing the screen.
+
+    With library set, the clip's blocks, frame count, and slot size come from
+    the library directory at --video-block instead. The player starts with the
+    clip the monitor's BOOT N XX asked for, or --start-clip, and plays each
+    clip for --clip-loops passes before moving on to the next one.
+    """
+    if resume_block is None:
+        resume_block = args.video_block + slot_sectors
+    lines: List[str] = []
+    delay_calls = max(0, args.delay_calls)
+    packed = args.layout == "packed"
+    fill = "fill" in args.run_codecs
+    copy = "copy" in args.run_codecs
+
+    lines.extend([
+        "#addr 0x0200",
+        f"#include \"{args.ruledef}\"",
+        f"#include \"{args.constants}\"",
+        "",
+        "JMP START",
+        "",
+        f"#include \"{args.lowlevel}\"",
+        f"#include \"{args.text4}\"",
+        f"#include \"{args.graphics}\"",
+        f"#include \"{args.spi_routines}\"",
+        f"#include \"{args.spi_init}\"",
+        f"#include \"{args.sd_block_io}\"",
+        "",
+        "; ---------- SD delta video state ----------",
+        "VID_FRAME_LEFT    = 0x7340",
+        "VID_SECTORS_LEFT  = 0x7341",
+        "VID_RUNS_LEFT     = 0x7342",
+        "VID_RUN_COL       = 0x7343",
+        "VID_RUN_ROW       = 0x7344",
+        "VID_RUN_COUNT     = 0x7345",
+        "VID_PTR_LO        = 0x7346",
+        "VID_PTR_HI        = 0x7347",
+    ])
+    if packed:
+        lines.extend([
+            "VID_FRAME_NUM     = 0x7348",
+            "VID_LOAD_LO       = 0x7349",
+            "VID_LOAD_HI       = 0x734A",
+            "VID_DRAW_LO       = 0x734B",
+            "VID_DRAW_HI       = 0x734C",
+        ])
+    if fill or copy:
+        lines.append("VID_RUN_KIND      = 0x734D")
+    if library:
+        lines.extend([
+            "VID_CLIP_NUM      = 0x734E",
+            "VID_CLIP_LOOPS    = 0x734F",
+            "VID_CLIP_FRAMES   = 0x7350",
+            "VID_CLIP_RESUMES  = 0x7351",
+            "VID_CLIP_SLOT     = 0x7352",
+            "VID_CLIP_START    = 0x7353",
+            "VID_CLIP_RESUME   = 0x7357",
+            "VID_CLIP_COUNT    = 0x735B",
+        ])
+    lines.extend([
+        "",
+        "VID_BUFFER_LO     = 0x00",
+        "VID_BUFFER_HI     = 0x60",
+    ])
+    if packed:
+        lines.extend([
+            f"VID_INDEX_LO      = 0x{FRAME_INDEX_ADDR & 0xFF:02X}",
+            f"VID_INDEX_HI      = 0x{FRAME_INDEX_ADDR >> 8:02X}",
+            f"VID_RESTART_FLAG  = 0x{INDEX_RESTART_FLAG:02X}",
+            f"VID_SECTOR_MASK   = 0x{INDEX_SECTOR_MASK:02X}",
+        ])
+    if library:
+        lines.extend([
+            f"VID_DIR_LO        = 0x{LIBRARY_DIR_ADDR & 0xFF:02X}",
+            f"VID_DIR_HI        = 0x{LIBRARY_DIR_ADDR >> 8:02X}",
+            f"VID_ENTRY_SIZE    = 0x{LIBRARY_ENTRY_SIZE:02X}",
+            f"VID_START_CLIP    = 0x{args.start_clip:02X}",
+            f"VID_ARG_MAGIC     = 0x{BOOT_ARG_ADDR:04X}",
+            f"VID_ARG_VALUE     = 0x{BOOT_ARG_ADDR + 1:04X}",
+            f"VID_ARG_CHECK     = 0x{BOOT_ARG_ADDR + 2:04X}",
+            f"VID_ARG_MAGIC_VALUE = 0x{BOOT_ARG_MAGIC:02X}",
+            f"VID_LOOPS_PER_CLIP = 0x{args.clip_loops:02X}",
+            "VID_RESUME_FRAME  = 0x01",
+        ])
+    else:
+        lines.extend([
+            f"VID_FRAME_COUNT   = 0x{frame_count:02X}",
+            "VID_RESUME_FRAME  = 0x01",
+            f"VID_RESUME_COUNT  = 0x{frame_count - 1:02X}",
+        ])
+    lines.append(f"VID_KEYFRAME_FLAG = 0x{FRAME_FLAG_KEYFRAME:02X}")
+    if fill or copy:
+        lines.append(f"VID_COL_MASK      = 0x{RUN_COL_MASK:02X}")
+    if fill:
+        lines.append(f"VID_KIND_FILL     = 0x{RUN_KIND_FILL:02X}")
+    if copy:
+        lines.append(f"VID_KIND_COPY     = 0x{RUN_KIND_COPY:02X}")
+    if args.player_profile == "fast":
+        lines.append(f"VID_UNROLL_MIN    = 0x{FAST_UNROLL_MIN:02X}")
+        if fill or copy:
+            lines.append(f"VID_KIND_MASK     = 0x{RUN_KIND_MASK:02X}")
+    if not packed and not library:
+        lines.append(f"VID_SLOT_SECTORS  = 0x{slot_sectors:02X}")
+    if args.pace:
+        lines.extend([
+            f"VID_PACE_MASK     = 0x{FRAME_PACE_MASK:02X}",
+            f"VID_PACE_UNIT     = 0x{pace_unit(args):02X}",
+        ])
+    if args.read_ahead:
+        lines.extend([
+            f"VID_DELAY_CALLS   = 0x{delay_calls:02X}",
+            f"VID_SECTOR_WAITS  = 0x{read_ahead_sector_waits(args):02X}",
+        ])
+    lines.extend([
+        "",
+        "START:",
+        "    MOV $CLK, 0x07",
+        "    JSR OLED_INIT",
+        "    JSR OLED4_SET_DEFAULT_ORIGIN",
+        "    JSR OLED4_HOME",
+        "    JSR OLEDG_CLEAR_SAFE_AREA",
+        "    JSR VID_PRINT_START_TEXT",
+        "    JSR SD_INIT_RELIABLE",
+    ])
+    if library:
+        lines.extend([
+            "    JSR VID_LOAD_DIRECTORY",
+            "    JC VID_READ_FAIL",
+            "    JSR VID_TAKE_CLIP_REQUEST",
+            "    MOV VID_CLIP_NUM, $A",
+            "",
+            "VID_CLIP_BEGIN:",
+            "    JSR VID_SELECT_CLIP",
+        ])
+    if packed:
+        lines.extend([
+            "    JSR VID_LOAD_INDEX",
+            "    JC VID_READ_FAIL",
+        ])
+    lines.extend([
+        "",
+        "VID_LOOP:",
+        "    JSR OLEDG_CLEAR_SAFE_AREA",
+        "    JSR VID_SET_START_BLOCK",
+    ])
+    if packed:
+        lines.extend([
+            "    JSR VID_INC_SD_BLOCK",
+            "    MOV $A, 0x00",
+            "    MOV VID_FRAME_NUM, $A",
+        ])
+    lines.extend([
+        "    MOV $A, VID_CLIP_FRAMES" if library else "    MOV $A, VID_FRAME_COUNT",
+        "    MOV VID_FRAME_LEFT, $A",
+        "",
+        "VID_FRAME_LOOP:",
+    ])
+    if packed:
+        lines.extend([
+            "    JSR VID_LOAD_FRAME_SECTORS",
+            "    JC VID_READ_FAIL",
+        ])
+    else:
+        lines.extend([
+            "    JSR VID_LOAD_SLOT_TO_BUFFER",
+            "    JC VID_READ_FAIL",
+        ])
+    if args.read_ahead:
+        # The previous frame stays up while this one loads, so the read
+        # counts toward its hold time and only the rest is spent waiting.
+        lines.append("    JSR VID_READ_AHEAD_WAIT")
+    if args.pace:
+        lines.append("    JSR VID_PACE_WAIT")
+    lines.append("")
+    lines.append("    JSR VID_DRAW_DELTA_FRAME" if packed else "    JSR VID_DRAW_DELTA_SLOT")
+    if not args.read_ahead and not args.pace:
+        for _ in range(delay_calls):
+            lines.append("    JSR VID_DELAY_FRAME")
+    lines.append("")
+    if packed:
+        lines.extend([
+            "    MOV $A, VID_FRAME_NUM",
+            "    CLC",
+            "    ADD $A, 0x01",
+            "    MOV VID_FRAME_NUM, $A",
+            "",
+        ])
+    lines.extend([
+        "    MOV $A, VID_FRAME_LEFT",
+        "    STC",
+        "    SUB $A, 0x01",
+        "    PSF",
+        "    MOV VID_FRAME_LEFT, $A",
+        "    PLF",
+        "    JNZ VID_FRAME_LOOP",
+        "",
+        "VID_RESUME:",
+    ])
+    if library:
+        lines.extend([
+            "    MOV $A, VID_CLIP_LOOPS",
+            "    STC",
+            "    SUB $A, 0x01",
+            "    PSF",
+            "    MOV VID_CLIP_LOOPS, $A",
+            "    PLF",
+            "    JNZ .VID_SAME_CLIP",
+            "",
+            "    ; Last pass of this clip: step to the next directory entry.",
+            "    MOV $A, VID_CLIP_NUM",
+            "    CLC",
+            "    ADD $A, 0x01",
+            "    STC",
+            "    CMP $A, VID_CLIP_COUNT",
+            "    JNZ .VID_STORE_CLIP",
+            "    MOV $A, 0x00",
+            "",
+            ".VID_STORE_CLIP:",
+            "    MOV VID_CLIP_NUM, $A",
+            "    JMP VID_CLIP_BEGIN",
+            "",
+            ".VID_SAME_CLIP:",
+        ])
+    lines.extend([
+        "    ; The loop frame restored frame 0, so carry on from frame 1.",
+        "    JSR VID_SET_RESUME_BLOCK",
+    ])
+    if packed:
+        lines.extend([
+            "    MOV $A, VID_RESUME_FRAME",
+            "    MOV VID_FRAME_NUM, $A",
+        ])
+    lines.extend([
+        "    MOV $A, VID_CLIP_RESUMES" if library else "    MOV $A, VID_RESUME_COUNT",
+        "    MOV VID_FRAME_LEFT, $A",
+        "    JMP VID_FRAME_LOOP",
+        "",
+        "VID_SET_START_BLOCK:",
+    ])
+    if library:
+        asm_copy_block(lines, "VID_CLIP_START")
+    else:
+        asm_set_block(lines, args.video_block)
+    lines.extend([
+        "",
+        "VID_SET_RESUME_BLOCK:",
+    ])
+    if library:
+        asm_copy_block(lines, "VID_CLIP_RESUME")
+    else:
+        asm_set_block(lines, resume_block)
+    if library:
+        lines.extend([
+            "",
+            "VID_SET_DIRECTORY_BLOCK:",
+        ])
+        asm_set_block(lines, args.video_block)
+        lines.extend([
+            "",
+            "VID_LOAD_DIRECTORY:",
+            "    JSR VID_SET_DIRECTORY_BLOCK",
+            "    MOV $C, VID_DIR_LO",
+            "    MOV $D, VID_DIR_HI",
+            "    JSR SD_READ_BLOCK_TO_RAM_512",
+            "    JC .VID_DIR_FAIL",
+            "",
+            "    ; Directory header: V L 1, clip count. Anything else on the",
+            "    ; card is not a library, whatever byte 3 holds.",
+            "    MOV $D, VID_DIR_HI",
+        ])
+        for offset, char in enumerate(LIBRARY_MAGIC.decode("ascii")):
+            lines.extend([
+                f"    MOV $C, VID_DIR_LO + {offset}",
+                "    MOV $A, [$CD]",
+                "    STC",
+                f"    CMP $A, 0x{ord(char):02X}       ; {char}",
+                "    JNZ .VID_DIR_FAIL",
+            ])
+        lines.extend([
+            "    MOV $C, VID_DIR_LO + 3",
+            "    MOV $A, [$CD]",
+            "    MOV VID_CLIP_COUNT, $A",
+            "    STC",
+            "    CMP $A, 0x00",
+            "    JZ .VID_DIR_FAIL",
+            "    CLC",
+            "    RTS",
+            "",
+            ".VID_DIR_FAIL:",
+            "    STC",
+            "    RTS",
+            "",
+            "VID_TAKE_CLIP_REQUEST:",
+            "    ; The monitor's BOOT N XX leaves clip XX in the boot argument",
+            "    ; mailbox. Without a request, play starts at VID_START_CLIP.",
+            "    MOV $A, VID_ARG_MAGIC",
+            "    STC",
+            "    CMP $A, VID_ARG_MAGIC_VALUE",
+            "    JNZ .VID_NO_REQUEST",
+            "",
+            "    ; Value and complement must agree, so stale RAM is ignored.",
+            "    MOV $A, VID_ARG_VALUE",
+            "    XOR $A, 0xFF",
+            "    STC",
+            "    CMP $A, VID_ARG_CHECK",
+            "    JNZ .VID_NO_REQUEST",
+            "",
+            "    MOV $A, 0x00",
+            "    MOV VID_ARG_MAGIC, $A",
+            "    MOV $A, VID_ARG_VALUE",
+            "    RTS",
+            "",
+            ".VID_NO_REQUEST:",
+            "    MOV $A, 0x00",
+            "    MOV VID_ARG_MAGIC, $A",
+            "    MOV $A, VID_START_CLIP",
+            "    RTS",
+            "",
+            "VID_SELECT_CLIP:",
+            "    ; Entry n sits at VID_DIR + (n + 1) * VID_ENTRY_SIZE. Out-of-range",
+            "    ; clip numbers fall back to clip 0.",
+            "    MOV $A, VID_CLIP_NUM",
+            "    STC",
+            "    CMP $A, VID_CLIP_COUNT",
+            "    JNC .VID_ENTRY_BASE",
+            "    MOV $A, 0x00",
+            "    MOV VID_CLIP_NUM, $A",
+            "",
+            ".VID_ENTRY_BASE:",
+            "    MOV $C, VID_DIR_LO",
+            "    MOV $D, VID_DIR_HI",
+            "",
+            ".VID_ENTRY_STEP:",
+            "    CLC",
+            "    ADD $C, VID_ENTRY_SIZE",
+            "    ADD $D, 0x00",
+            "    STC",
+            "    SUB $A, 0x01",
+            "    JC .VID_ENTRY_STEP",
+            "",
+            f"    ; Skip the {LIBRARY_NAME_SIZE}-byte name. Entries never cross a page.",
+            "    CLC",
+            f"    ADD $C, 0x{LIBRARY_NAME_SIZE:02X}",
+        ])
+        for offset in range(4):
+            asm_copy_entry_byte(lines, f"VID_CLIP_START + {offset}")
+        for offset in range(4):
+            asm_copy_entry_byte(lines, f"VID_CLIP_RESUME + {offset}")
+        asm_copy_entry_byte(lines, "VID_CLIP_FRAMES")
+        lines.extend([
+            "    ; Skip the layout byte; the player is built for one layout.",
+            "    STC",
+            "    ADD $C, 0x00",
+        ])
+        asm_copy_entry_byte(lines, "VID_CLIP_SLOT")
+        lines.extend([
+            "    MOV $A, VID_CLIP_FRAMES",
+            "    STC",
+            "    SUB $A, 0x01",
+            "    MOV VID_CLIP_RESUMES, $A",
+            "    MOV $A, VID_LOOPS_PER_CLIP",
+            "    MOV VID_CLIP_LOOPS, $A",
+            "    RTS",
+        ])
+    lines.extend([
+        "",
+        "VID_INC_SD_BLOCK:",
+        "    MOV $A, SD_BLOCK_ADDR_LSB",
+        "    CLC",
+        "    ADD $A, 0x01",
+        "    PSF",
+        "    MOV SD_BLOCK_ADDR_LSB, $A",
+        "    PLF",
+        "    JNC .VID_INC_DONE",
+        "",
+        "    MOV $A, SD_BLOCK_ADDR_B1",
+        "    CLC",
+        "    ADD $A, 0x01",
+        "    PSF",
+        "    MOV SD_BLOCK_ADDR_B1, $A",
+        "    PLF",
+        "    JNC .VID_INC_DONE",
+        "",
+        "    MOV $A, SD_BLOCK_ADDR_B2",
+        "    CLC",
+        "    ADD $A, 0x01",
+        "    PSF",
+        "    MOV SD_BLOCK_ADDR_B2, $A",
+        "    PLF",
+        "    JNC .VID_INC_DONE",
+        "",
+        "    MOV $A, SD_BLOCK_ADDR_MSB",
+        "    CLC",
+        "    ADD $A, 0x01",
+        "    MOV SD_BLOCK_ADDR_MSB, $A",
+        "",
+        ".VID_INC_DONE:",
+        "    RTS",
+        "",
+    ])
+    if packed:
+        lines.extend([
+            "VID_LOAD_INDEX:",
+            "    ; Frame index sector sits at the first video block.",
+            "    JSR VID_SET_START_BLOCK",
+            "    MOV $C, VID_INDEX_LO",
+            "    MOV $D, VID_INDEX_HI",
+            "    JSR SD_READ_BLOCK_TO_RAM_512",
+            "    RTS",
+            "",
+            "VID_LOAD_FRAME_SECTORS:",
+            "    ; Index byte: bit 7 restarts at the buffer base, low bits are sectors to append.",
+            "    MOV $C, VID_FRAME_NUM",
+            "    MOV $D, VID_INDEX_HI",
+            "    MOV $A, [$CD]",
+            "    MOV $B, $A",
+            "    AND $A, VID_SECTOR_MASK",
+            "    MOV VID_SECTORS_LEFT, $A",
+            "",
+            "    MOV $A, $B",
+            "    AND $A, VID_RESTART_FLAG",
+            "    JZ .VID_LOAD_APPEND",
+            "",
+            "    MOV $A, VID_BUFFER_LO",
+            "    MOV VID_LOAD_LO, $A",
+            "    MOV VID_DRAW_LO, $A",
+            "    MOV $A, VID_BUFFER_HI",
+            "    MOV VID_LOAD_HI, $A",
+            "    MOV VID_DRAW_HI, $A",
+            "",
+            ".VID_LOAD_APPEND:",
+            "    MOV $A, VID_SECTORS_LEFT",
+            "    STC",
+            "    CMP $A, 0x00",
+            "    JZ .VID_LOAD_DONE",
+            "",
+            "    MOV $C, VID_LOAD_LO",
+            "    MOV $D, VID_LOAD_HI",
+            "",
+            ".VID_LOAD_SECTOR:",
+            "    JSR SD_READ_BLOCK_TO_RAM_512",
+            "    JC .VID_LOAD_FAIL",
+            "    JSR VID_INC_SD_BLOCK",
+            "",
+            "    MOV $A, VID_SECTORS_LEFT",
+            "    STC",
+            "    SUB $A, 0x01",
+            "    PSF",
+            "    MOV VID_SECTORS_LEFT, $A",
+            "    PLF",
+            "    JNZ .VID_LOAD_SECTOR",
+            "",
+            "    MOV VID_LOAD_LO, $C",
+            "    MOV VID_LOAD_HI, $D",
+            "",
+            ".VID_LOAD_DONE:",
+            "    CLC",
+            "    RTS",
+            "",
+            ".VID_LOAD_FAIL:",
+            "    STC",
+            "    RTS",
+            "",
+        ])
+    else:
+        lines.extend([
+            "VID_LOAD_SLOT_TO_BUFFER:",
+            "    MOV $C, VID_BUFFER_LO",
+            "    MOV $D, VID_BUFFER_HI",
+            "    MOV $A, VID_CLIP_SLOT" if library else "    MOV $A, VID_SLOT_SECTORS",
+            "    MOV VID_SECTORS_LEFT, $A",
+            "",
+            ".VID_LOAD_SECTOR:",
+            "    JSR SD_READ_BLOCK_TO_RAM_512",
+            "    JC .VID_LOAD_FAIL",
+            "    JSR VID_INC_SD_BLOCK",
+            "",
+            "    MOV $A, VID_SECTORS_LEFT",
+            "    STC",
+            "    SUB $A, 0x01",
+            "    PSF",
+            "    MOV VID_SECTORS_LEFT, $A",
+            "    PLF",
+            "    JNZ .VID_LOAD_SECTOR",
+            "",
+            "    CLC",
+            "    RTS",
+            "",
+            ".VID_LOAD_FAIL:",
+            "    STC",
+            "    RTS",
+            "",
+        ])
+    if args.player_profile == "fast":
+        lines.extend(fast_draw_asm(packed, fill, copy))
+    else:
+        lines.extend(standard_draw_asm(packed, fill, copy))
+    lines.extend([
+        "VID_DELAY_FRAME:",
+        "    PSH $A",
+        "    PSH $B",
+        "    MOV $A, 0x20",
+        "",
+        ".VID_DELAY_FRAME_OUTER:",
+        "    MOV $B, 0xFF",
+        "",
+        ".VID_DELAY_FRAME_INNER:",
+        "    NOP",
+        "    NOP",
+        "    STC",
         "    SUB $B, 0x01",
         "    JNZ .VID_DELAY_FRAME_INNER",
         "",
@@ -763,6 +2084,94 @@ def make_player_asm(args: argparse.Namespace, frame_count: int, slot_sectors: in
         "    JSR VID_DELAY_FRAME",
         "    RTS",
         "",
+    ])
+    if args.pace:
+        lines.extend([
+            "VID_PACE_WAIT:",
+            "    ; Pace ticks sit in the low bits of the flags byte, after the run count.",
+            "    MOV $C, VID_DRAW_LO" if packed else "    MOV $C, VID_BUFFER_LO",
+            "    MOV $D, VID_DRAW_HI" if packed else "    MOV $D, VID_BUFFER_HI",
+            "    STC",
+            "    ADD $C, 0x00",
+            "    ADD $D, 0x00",
+            "    MOV $A, [$CD]",
+            "    AND $A, VID_PACE_MASK",
+            "",
+            ".VID_PACE_LOOP:",
+            "    STC",
+            "    CMP $A, 0x00",
+            "    JZ .VID_PACE_DONE",
+            "    JSR VID_PACE_TICK",
+            "    STC",
+            "    SUB $A, 0x01",
+            "    JMP .VID_PACE_LOOP",
+            "",
+            ".VID_PACE_DONE:",
+            "    RTS",
+            "",
+            "VID_PACE_TICK:",
+            "    PSH $A",
+            "    MOV $A, VID_PACE_UNIT",
+            "",
+            ".VID_PACE_OUTER:",
+            "    MOV $B, 0xFF",
+            "",
+            ".VID_PACE_INNER:",
+            "    NOP",
+            "    NOP",
+            "    STC",
+            "    SUB $B, 0x01",
+            "    JNZ .VID_PACE_INNER",
+            "",
+            "    STC",
+            "    SUB $A, 0x01",
+            "    JNZ .VID_PACE_OUTER",
+            "",
+            "    PUL $A",
+            "    RTS",
+            "",
+        ])
+    if args.read_ahead:
+        lines.append("VID_READ_AHEAD_WAIT:")
+        if packed:
+            lines.extend([
+                "    ; Sectors just read come from this frame's index byte.",
+                "    MOV $C, VID_FRAME_NUM",
+                "    MOV $D, VID_INDEX_HI",
+                "    MOV $A, [$CD]",
+                "    AND $A, VID_SECTOR_MASK",
+            ])
+        else:
+            lines.append("    MOV $A, VID_CLIP_SLOT" if library else "    MOV $A, VID_SLOT_SECTORS")
+        lines.extend([
+            "    MOV $B, VID_DELAY_CALLS",
+            "",
+            ".VID_WAIT_SECTOR:",
+            "    ; Each sector read stands in for VID_SECTOR_WAITS delay calls.",
+            "    STC",
+            "    CMP $A, 0x00",
+            "    JZ .VID_WAIT_CALL",
+            "    STC",
+            "    SUB $B, VID_SECTOR_WAITS",
+            "    JNC .VID_WAIT_DONE",
+            "    STC",
+            "    SUB $A, 0x01",
+            "    JMP .VID_WAIT_SECTOR",
+            "",
+            ".VID_WAIT_CALL:",
+            "    STC",
+            "    CMP $B, 0x00",
+            "    JZ .VID_WAIT_DONE",
+            "    JSR VID_DELAY_FRAME",
+            "    STC",
+            "    SUB $B, 0x01",
+            "    JMP .VID_WAIT_CALL",
+            "",
+            ".VID_WAIT_DONE:",
+            "    RTS",
+            "",
+        ])
+    lines.extend([
         "VID_READ_FAIL:",
         "    JSR OLEDG_CLEAR_SAFE_AREA",
         "    JSR OLED4_HOME",
@@ -774,10 +2183,15 @@ def make_player_asm(args: argparse.Namespace, frame_count: int, slot_sectors: in
         "",
         "VID_PRINT_START_TEXT:",
     ])
-    asm_puts(lines, "SD DELTA VIDEO\n")
+    asm_puts(lines, "SD VIDEO LIBRARY\n" if library else "SD DELTA VIDEO\n")
     asm_puts(lines, f"BLOCK {args.video_block}\n")
-    asm_puts(lines, f"FRAMES {frame_count}\n")
-    asm_puts(lines, f"SLOT {slot_sectors}\n")
+    # A library's clip details live in its directory and can change without a rebuild.
+    if not library:
+        asm_puts(lines, f"FRAMES {frame_count - 1}\n")
+        if packed:
+            asm_puts(lines, f"SECTORS {total_sectors}\n")
+        else:
+            asm_puts(lines, f"SLOT {slot_sectors}\n")
     lines.extend([
         "    RTS",
         "",
@@ -788,19 +2202,74 @@ def make_player_asm(args: argparse.Namespace, frame_count: int, slot_sectors: in
     return "\n".join(lines) + "\n"
 
 
+def build_payload(
+    args: argparse.Namespace,
+    encoded_frames: Sequence[bytes],
+) -> tuple[bytearray, Optional[List[int]], int, int]:
+    """Lay out the encoded frames for --layout.
+
+    Returns the SD payload, the frame index (packed layout only), the slot
+    size in sectors, and the block the player resumes from after a loop.
+    """
+    max_frame_bytes = max(len(frame) for frame in encoded_frames)
+    if args.slot_sectors == 0:
+        slot_sectors = max(1, math.ceil(max_frame_bytes / SECTOR_SIZE))
+    else:
+        slot_sectors = args.slot_sectors
+
+    if slot_sectors > MAX_SLOT_SECTORS:
+        raise SystemExit(
+            f"Largest encoded frame needs {math.ceil(max_frame_bytes / SECTOR_SIZE)} sectors; max supported is {MAX_SLOT_SECTORS}. "
+            "Use a higher threshold, larger frame step, fewer frames, or more inset."
+        )
+
+    slot_bytes = slot_sectors * SECTOR_SIZE
+    too_large = [(i, len(frame)) for i, frame in enumerate(encoded_frames) if len(frame) > slot_bytes]
+    if too_large and args.layout == "slot":
+        index, size = too_large[0]
+        raise SystemExit(
+            f"Frame {index} needs {size} bytes, but --slot-sectors {slot_sectors} gives {slot_bytes} bytes. "
+            "Use more slot sectors or reduce frame complexity."
+        )
+
+    frame_index: Optional[List[int]] = None
+    payload = bytearray()
+    if args.layout == "packed":
+        stream, frame_index, starts = pack_frame_stream(encoded_frames, restart=(1,))
+        payload.extend(frame_index_sector(frame_index))
+        payload.extend(stream)
+        resume_block = args.video_block + 1 + starts[1] // SECTOR_SIZE
+    else:
+        for frame in encoded_frames:
+            payload.extend(frame)
+            payload.extend(bytes(slot_bytes - len(frame)))
+        resume_block = args.video_block + slot_sectors
+    return payload, frame_index, slot_sectors, resume_block
+
+
 def write_manifest(
     path: Path,
     args: argparse.Namespace,
     frame_infos: Sequence[FrameInfo],
     payload: bytes,
     slot_sectors: int,
+    index: Optional[Sequence[int]] = None,
 ) -> None:
     total_sectors = len(payload) // SECTOR_SIZE
     max_encoded = max(item.encoded_bytes for item in frame_infos)
     max_runs = max(item.run_count for item in frame_infos)
+    slot_layout_sectors = len(frame_infos) * slot_sectors
+    reads = frame_sector_reads(len(frame_infos), slot_sectors, index)
+    periods = frame_periods(args, frame_infos, reads)
+    loop_cycles = sum(periods[1:])
+    profile_periods = {
+        profile: frame_periods(args, [replace(item, draw_cycles=item.profile_cycles[number]) for item in frame_infos], reads)
+        for number, profile in enumerate(PLAYER_PROFILES)
+    }
     lines = [
         "OLED SD delta video manifest",
         f"input: {args.input}",
+        f"layout: {args.layout}",
         f"video_block: {args.video_block}",
         f"frame_count: {len(frame_infos)}",
         f"frame_step: {args.frame_step}",
@@ -814,6 +2283,10 @@ def write_manifest(
         f"inset_x: {args.inset_x}",
         f"inset_y: {args.inset_y}",
         f"fg: 0x{args.fg:X}",
+        f"dither: {args.dither}",
+        f"hysteresis: {args.hysteresis}",
+        f"changed_bytes_hysteresis: {sum(item.changed_hysteresis for item in frame_infos[:-1])}",
+        f"changed_bytes_plain: {sum(item.changed_plain for item in frame_infos[:-1])}",
         f"safe_width: {SAFE_WIDTH}",
         f"safe_height: {SAFE_HEIGHT}",
         f"slot_sectors: {slot_sectors}",
@@ -822,44 +2295,278 @@ def write_manifest(
         f"total_sectors: {total_sectors}",
         f"max_encoded_frame_bytes: {max_encoded}",
         f"max_runs_per_frame: {max_runs}",
-        f"player_buffer: 0x{FRAME_BUFFER_ADDR:04X}..0x{FRAME_BUFFER_ADDR + slot_sectors * SECTOR_SIZE - 1:04X}",
+        f"keyframe_interval: {args.keyframe_interval}",
+        f"scene_cut: {args.scene_cut}",
+        f"keyframes: {sum(1 for item in frame_infos if item.kind in ('key', 'loop-key'))}",
+        f"dropped_runs: {sum(item.dropped_runs for item in frame_infos)}",
+        f"run_codecs: {','.join(args.run_codecs)}",
+        f"fill_runs: {sum(item.fill_runs for item in frame_infos)}",
+        f"copy_runs: {sum(item.copy_runs for item in frame_infos)}",
+        f"clock_hz: {args.clock_hz}",
+        f"sd_sector_cycles: {args.sd_sector_cycles}",
+        f"target_fps: {args.target_fps if args.target_fps is not None else 'none'}",
+        f"player_profile: {args.player_profile}",
+        f"delay_calls: {max(0, args.delay_calls)}",
+        f"read_ahead: {args.read_ahead}",
+        f"pace: {args.pace}",
+        f"estimated_loop_fps: {args.clock_hz * (len(periods) - 1) / loop_cycles:.2f}",
+    ]
+    for profile, values in profile_periods.items():
+        lines.append(f"estimated_loop_fps_{profile}: {args.clock_hz * (len(values) - 1) / sum(values[1:]):.2f}")
+    if args.pace:
+        lines.extend([
+            f"pace_unit: {pace_unit(args)}",
+            f"pace_tick_cycles: {pace_tick_cycles(args)}",
+            # Frames whose read and draw alone overrun the period by more than half a tick.
+            f"late_frames: {sum(1 for period in periods if period > args.clock_hz / args.target_fps + pace_tick_cycles(args) / 2)}",
+        ])
+    if index is not None:
+        frame_sectors = sum(value & INDEX_SECTOR_MASK for value in index)
+        lines.extend([
+            f"index_block: {args.video_block}",
+            f"first_frame_block: {args.video_block + 1}",
+            f"frame_sectors_per_loop: {frame_sectors}",
+            f"slot_layout_sectors_per_loop: {slot_layout_sectors}",
+            f"sector_reads_saved: {100.0 * (1.0 - frame_sectors / slot_layout_sectors):.1f}%",
+            f"player_index: 0x{FRAME_INDEX_ADDR:04X}..0x{FRAME_INDEX_ADDR + SECTOR_SIZE - 1:04X}",
+            f"player_buffer: 0x{FRAME_BUFFER_ADDR:04X}..0x{FRAME_BUFFER_ADDR + MAX_SLOT_SECTORS * SECTOR_SIZE - 1:04X}",
+            "",
+            "index format:",
+            "  one byte per frame in the first video block",
+            "  bit 7: restart at the buffer base on a fresh sector",
+            "  bits 3..0: sectors to read before drawing, 0 when already loaded",
+        ])
+    else:
+        lines.append(
+            f"player_buffer: 0x{FRAME_BUFFER_ADDR:04X}..0x{FRAME_BUFFER_ADDR + slot_sectors * SECTOR_SIZE - 1:04X}"
+        )
+    lines.extend([
         "",
         "frame format:",
         "  byte 0: run count",
-        "  byte 1: flags / reserved",
+        "  byte 1: flags, bit 7 = keyframe (clear the safe area first), bits 6..0 = pace ticks (--pace)",
         "  each run: column, row, byte count, data bytes",
+        "  the last frame is the loop frame back to frame 0; playback resumes at frame 1",
         "",
         "frames:",
+    ])
+    for number, (item, sectors, period) in enumerate(zip(frame_infos, reads, periods)):
+        profile_text = " ".join(f"cycles_{profile}={values[number]}" for profile, values in profile_periods.items())
+        if args.pace:
+            profile_text += f" pace_ticks={item.pace_ticks} requested_fps={args.target_fps:.2f}"
+        lines.append(
+            f"  frame {item.index:03d}: kind={item.kind} source={item.source_index} runs={item.run_count} encoded={item.encoded_bytes} changed={item.changed_bytes} changed_hysteresis={item.changed_hysteresis} changed_plain={item.changed_plain} lit_pixels={item.lit_pixels} dropped_runs={item.dropped_runs} fill_runs={item.fill_runs} copy_runs={item.copy_runs} sectors_read={sectors} cycles={period} {profile_text} fps={args.clock_hz / period:.2f}"
+        )
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def frame_sector_reads(frame_count: int, slot_sectors: int, index: Optional[Sequence[int]]) -> List[int]:
+    if index is None:
+        return [slot_sectors] * frame_count
+    return [value & INDEX_SECTOR_MASK for value in index]
+
+
+def read_ahead_sector_waits(args: argparse.Namespace) -> int:
+    """Delay calls one SD sector read stands in for under --read-ahead."""
+    return round(args.sd_sector_cycles / DELAY_FRAME_CYCLES)
+
+
+def frame_period_cycles(args: argparse.Namespace, item: FrameInfo, sectors: int) -> int:
+    if args.pace:
+        return (
+            item.draw_cycles
+            + sectors * args.sd_sector_cycles
+            + PACE_WAIT_CYCLES
+            + item.pace_ticks * pace_tick_cycles(args)
+        )
+    delay_calls = max(0, args.delay_calls)
+    if not args.read_ahead:
+        return (
+            item.draw_cycles
+            + sectors * args.sd_sector_cycles
+            + delay_calls * DELAY_FRAME_CYCLES
+        )
+    waits = max(0, delay_calls - sectors * read_ahead_sector_waits(args))
+    return (
+        item.draw_cycles
+        + sectors * args.sd_sector_cycles
+        + READ_AHEAD_WAIT_CYCLES
+        + min(sectors, delay_calls) * READ_AHEAD_SECTOR_CYCLES
+        + waits * (DELAY_FRAME_CYCLES + READ_AHEAD_CALL_CYCLES)
+    )
+
+
+def frame_periods(args: argparse.Namespace, frame_infos: Sequence[FrameInfo], reads: Sequence[int]) -> List[int]:
+    return [frame_period_cycles(args, item, sectors) for item, sectors in zip(frame_infos, reads)]
+
+
+def encode_clip_file(args: argparse.Namespace) -> tuple[List[bytes], List[FrameInfo]]:
+    """Load, encode, and pace args.input. Runs in a worker process for libraries."""
+    source_frames = load_frames(args.input)
+    chosen = select_frames(source_frames, args.frame_step, args.max_frames)
+    if not chosen:
+        raise SystemExit(f"No frames selected from {args.input}")
+    encoded_frames, infos = encode_clip(chosen, args)
+    if args.pace:
+        encoded_frames, infos = pace_clip(args, encoded_frames, infos)
+    return encoded_frames, infos
+
+
+def library_clip_name(path: Path) -> str:
+    name = path.stem.encode("ascii", errors="replace").decode("ascii")
+    return name[:LIBRARY_NAME_SIZE]
+
+
+def build_library(args: argparse.Namespace) -> tuple[bytearray, List[LibraryClip]]:
+    """Encode every input and lay the clips out behind one directory sector.
+
+    Clips are encoded in parallel with --jobs worker processes and then placed
+    back-to-back from --video-block + 1, in the order given.
+    """
+    names = [library_clip_name(path) for path in args.inputs]
+    duplicates = sorted({name for name in names if names.count(name) > 1})
+    if duplicates:
+        raise SystemExit(f"Clip names must be unique in the first {LIBRARY_NAME_SIZE} characters: {', '.join(duplicates)}")
+
+    clip_args = [argparse.Namespace(**{**vars(args), "input": path}) for path in args.inputs]
+    jobs = args.jobs or os.cpu_count() or 1
+    if jobs == 1 or len(clip_args) == 1:
+        encoded = [encode_clip_file(item) for item in clip_args]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=min(jobs, len(clip_args))) as pool:
+            encoded = list(pool.map(encode_clip_file, clip_args))
+
+    clips: List[LibraryClip] = []
+    block = args.video_block + 1
+    for name, item, (encoded_frames, infos) in zip(names, clip_args, encoded):
+        item.video_block = block
+        payload, frame_index, slot_sectors, resume_block = build_payload(item, encoded_frames)
+        clips.append(LibraryClip(name, item, infos, bytes(payload), frame_index, slot_sectors, resume_block))
+        block += len(payload) // SECTOR_SIZE
+
+    library = bytearray(library_directory(clips))
+    for clip in clips:
+        library.extend(clip.payload)
+    return library, clips
+
+
+def library_directory(clips: Sequence[LibraryClip]) -> bytes:
+    """Build the directory sector read by the library player.
+
+    Header: "VL1", clip count. Entry n starts at (n + 1) * 32:
+    name (12 bytes, zero padded), start block (4, MSB first), resume block
+    (4, MSB first), stored frame count, layout (0 packed, 1 slot), slot
+    sectors, reserved byte, clip sectors (2, MSB first), 6 reserved bytes.
+    """
+    data = bytearray(SECTOR_SIZE)
+    data[0:3] = LIBRARY_MAGIC
+    data[3] = len(clips)
+    for number, clip in enumerate(clips):
+        base = (number + 1) * LIBRARY_ENTRY_SIZE
+        name = clip.name.encode("ascii")
+        data[base:base + len(name)] = name
+        data[base + 12:base + 16] = bytes(block_bytes(clip.args.video_block))
+        data[base + 16:base + 20] = bytes(block_bytes(clip.resume_block))
+        data[base + 20] = len(clip.infos)
+        data[base + 21] = LIBRARY_LAYOUTS[clip.args.layout]
+        data[base + 22] = clip.slot_sectors
+        data[base + 24:base + 26] = (len(clip.payload) // SECTOR_SIZE).to_bytes(2, "big")
+    return bytes(data)
+
+
+def write_library_manifest(
+    path: Path,
+    args: argparse.Namespace,
+    clips: Sequence[LibraryClip],
+    payload: bytes,
+    clip_manifests: Sequence[Path],
+) -> None:
+    lines = [
+        "OLED SD delta video library manifest",
+        f"directory_block: {args.video_block}",
+        f"clip_count: {len(clips)}",
+        f"start_clip: {args.start_clip}",
+        f"clip_request: BOOT N XX, mailbox 0x{BOOT_ARG_ADDR:04X}..0x{BOOT_ARG_ADDR + 2:04X}",
+        f"clip_loops: {args.clip_loops}",
+        f"layout: {args.layout}",
+        f"player_profile: {args.player_profile}",
+        f"run_codecs: {','.join(args.run_codecs)}",
+        f"total_bytes: {len(payload)}",
+        f"total_sectors: {len(payload) // SECTOR_SIZE}",
+        f"player_directory: 0x{LIBRARY_DIR_ADDR:04X}..0x{LIBRARY_DIR_ADDR + SECTOR_SIZE - 1:04X}",
+        "",
+        "directory format:",
+        "  bytes 0..2: VL1, byte 3: clip count",
+        f"  entry n at (n + 1) * {LIBRARY_ENTRY_SIZE}, up to {LIBRARY_MAX_CLIPS} entries:",
+        f"    bytes 0..{LIBRARY_NAME_SIZE - 1}: name, zero padded",
+        "    bytes 12..15: start block, MSB first",
+        "    bytes 16..19: resume block, MSB first",
+        "    byte 20: stored frame count, including the loop frame",
+        "    byte 21: layout, 0 = packed, 1 = slot",
+        "    byte 22: slot sectors",
+        "    bytes 24..25: clip sectors, MSB first",
+        "",
+        "clips:",
     ]
-    for item in frame_infos:
+    for number, (clip, clip_manifest) in enumerate(zip(clips, clip_manifests)):
+        reads = frame_sector_reads(len(clip.infos), clip.slot_sectors, clip.frame_index)
+        periods = frame_periods(clip.args, clip.infos, reads)
         lines.append(
-            f"  frame {item.index:03d}: source={item.source_index} runs={item.run_count} encoded={item.encoded_bytes} changed={item.changed_bytes} lit_pixels={item.lit_pixels}"
+            f"  clip {number:02d}: name={clip.name} input={clip.args.input} start_block={clip.args.video_block} "
+            f"resume_block={clip.resume_block} frames={len(clip.infos) - 1} sectors={len(clip.payload) // SECTOR_SIZE} "
+            f"slot_sectors={clip.slot_sectors} estimated_loop_fps={clip.args.clock_hz * (len(periods) - 1) / sum(periods[1:]):.2f} "
+            f"manifest={clip_manifest.name}"
         )
     path.write_text("\n".join(lines) + "\n", encoding="utf-8")
 
 
+def parse_run_codecs(text: str) -> tuple[str, ...]:
+    names = [name.strip() for name in text.split(",") if name.strip()]
+    unknown = [name for name in names if name not in RUN_CODECS]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown run codec: {', '.join(unknown)}")
+    return tuple(name for name in RUN_CODECS if name == "raw" or name in names)
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Build an SD-backed delta-run OLED video payload and player.")
-    parser.add_argument("input", type=Path)
+    parser.add_argument("input", type=Path, nargs="+", help="Video or animation file. Several files build a clip library")
     parser.add_argument("--out-dir", type=Path, default=Path("build/oled_video_sd_delta"))
     parser.add_argument("--out-asm", type=Path, default=Path("ASM/programs/oled_video_sd_delta_player/VIDEO_PLAYER.asm"))
     parser.add_argument("--video-bin", type=Path, default=None)
     parser.add_argument("--manifest", type=Path, default=None)
-    parser.add_argument("--video-block", type=int, default=DEFAULT_VIDEO_BLOCK)
+    parser.add_argument("--video-block", type=int, default=None, help=f"First SD block of the video (default: {DEFAULT_VIDEO_BLOCK})")
+    parser.add_argument("--sd-layout", type=Path, default=None, help="Layout plan from sd_layout.py. Sets --video-block from the plan")
+    parser.add_argument("--sd-layout-region", default="video", help="Video region name in the --sd-layout plan")
     parser.add_argument("--max-frames", type=int, default=24)
     parser.add_argument("--frame-step", type=int, default=2)
     parser.add_argument("--threshold", type=int, default=None, help="Black/white cutoff. Overrides grayscale mode when present.")
     parser.add_argument("--grayscale", action="store_true", help="Use quantized grayscale when --threshold is not present.")
     parser.add_argument("--gray-levels", "--levels", dest="gray_levels", type=int, default=4, help="Number of gray levels for grayscale mode, 2..16.")
     parser.add_argument("--fg", type=lambda s: int(s, 0), default=0x0F)
+    parser.add_argument("--dither", choices=("none", "bayer", "floyd-steinberg"), default="none", help="Dither before quantizing to the output levels")
+    parser.add_argument("--hysteresis", type=int, default=0, help="Keep a pixel's previous level until the source moves this far past its band, 0..255")
     parser.add_argument("--invert", action="store_true")
     parser.add_argument("--fit", choices=("stretch", "contain", "crop"), default="contain")
     parser.add_argument("--inset-x", type=int, default=0)
     parser.add_argument("--inset-y", type=int, default=0)
     parser.add_argument("--delay-calls", type=int, default=1)
-    parser.add_argument("--slot-sectors", type=int, default=0, help="0 selects the smallest slot that fits every frame")
+    parser.add_argument("--read-ahead", action="store_true", help="Count the next frame's SD read toward the frame delay instead of waiting on top of it")
+    parser.add_argument("--pace", action="store_true", help="Hold every frame for one --target-fps period with a per-frame delay in the frame header. Replaces --delay-calls")
+    parser.add_argument("--layout", choices=("packed", "slot"), default="packed", help="packed frames behind an index sector, or one fixed slot per frame")
+    parser.add_argument("--slot-sectors", type=int, default=0, help="Slot layout only. 0 selects the smallest slot that fits every frame")
+    parser.add_argument("--player-profile", choices=PLAYER_PROFILES, default="standard", help="standard player, or fast with inline pointer steps, unrolled loops and row window reuse")
+    parser.add_argument("--run-codecs", type=parse_run_codecs, default=RUN_CODECS, help="Comma list of run kinds the encoder may use: raw, fill, copy")
+    parser.add_argument("--keyframe-interval", type=int, default=0, help="Clear and redraw against black every N frames. 0 disables periodic keyframes")
+    parser.add_argument("--scene-cut", action="store_true", help="Use a keyframe whenever it is cheaper than the delta")
+    parser.add_argument("--target-fps", type=float, default=None, help="Rate control: drop low-value runs so each frame fits this frame rate")
+    parser.add_argument("--clock-hz", type=int, default=DEFAULT_CLOCK_HZ, help="CPU clock used by the timing model")
+    parser.add_argument("--sd-sector-cycles", type=int, default=DEFAULT_SD_SECTOR_CYCLES, help="Measured CPU cycles per SD sector read")
     parser.add_argument("--device", help=r"Raw block device, e.g. /dev/sdb or \\.\PhysicalDrive5")
     parser.add_argument("--windows-lock-volume", help="Optional Windows volume GUID lock, e.g. \\\\?\\Volume{...}\\")
+    parser.add_argument("--write-chunk-kib", type=int, default=1024, help="Device write chunk size in KiB. Chunks are verified one by one")
+    parser.add_argument("--write-journal", type=Path, default=None, help="Journal of verified chunks, used to resume an interrupted write. Default: <out-dir>/video_delta_write.journal")
+    parser.add_argument("--write-retries", type=int, default=3, help="Retries for a device chunk that fails to write or verify")
     parser.add_argument("--ruledef", default="../../../../ruledef.asm")
     parser.add_argument("--constants", default="../../../../drivers/oled/oled_constants.asm")
     parser.add_argument("--lowlevel", default="../../../../drivers/oled/oled_lowlevel.asm")
@@ -868,7 +2575,35 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--spi-routines", default="../../../../drivers/spi_sd/SPI_routines.asm")
     parser.add_argument("--spi-init", default="../../../../drivers/spi_sd/SPI_init.asm")
     parser.add_argument("--sd-block-io", default="../../../../drivers/spi_sd/sd_block_io.asm")
-    return parser.parse_args()
+    parser.add_argument("--library", action="store_true", help="Build a clip library with a directory sector, even for one input")
+    parser.add_argument("--clip-loops", type=int, default=2, help="Library only. Passes through each clip before the player moves to the next")
+    parser.add_argument("--start-clip", type=int, default=0, help="Library only. Directory entry the player starts with when BOOT N XX asks for none")
+    parser.add_argument("--jobs", type=int, default=0, help="Library only. Worker processes for encoding clips. 0 uses every CPU")
+    args = parser.parse_args()
+    args.inputs = args.input
+    args.input = args.inputs[0]
+    args.library = args.library or len(args.inputs) > 1
+    args.layout_extent = None
+    if args.sd_layout is not None:
+        if args.video_block is not None:
+            raise SystemExit("--sd-layout replaces --video-block. Pass one or the other")
+        try:
+            args.layout_extent = plan_region(load_plan(args.sd_layout), args.sd_layout_region, "video")
+        except (OSError, ValueError) as exc:
+            raise SystemExit(f"--sd-layout: {exc}") from exc
+        args.video_block = args.layout_extent["block"]
+    elif args.video_block is None:
+        args.video_block = DEFAULT_VIDEO_BLOCK
+    return args
+
+
+def check_layout_fit(args: argparse.Namespace, block_count: int) -> None:
+    if args.layout_extent is None:
+        return
+    try:
+        check_region_fits(args.layout_extent, block_count)
+    except ValueError as exc:
+        raise SystemExit(str(exc)) from exc
 
 
 def main() -> None:
@@ -876,104 +2611,165 @@ def main() -> None:
 
     if args.frame_step < 1:
         raise SystemExit("--frame-step must be 1 or greater")
-    if args.max_frames < 1 or args.max_frames > 255:
-        raise SystemExit("--max-frames must be 1..255 for the generated player")
+    if args.max_frames < 1 or args.max_frames > 254:
+        raise SystemExit("--max-frames must be 1..254 for the generated player")
     if args.threshold is not None and not 0 <= args.threshold <= 255:
         raise SystemExit("--threshold must be 0..255")
     if args.gray_levels < 2 or args.gray_levels > 16:
         raise SystemExit("--gray-levels must be 2..16")
     if not 0 <= args.fg <= 15:
         raise SystemExit("--fg must be 0..15")
+    if not 0 <= args.hysteresis <= 255:
+        raise SystemExit("--hysteresis must be 0..255")
     if not 0 <= args.inset_x <= 63:
         raise SystemExit("--inset-x must be 0..63")
     if not 0 <= args.inset_y <= 31:
         raise SystemExit("--inset-y must be 0..31")
     if args.slot_sectors < 0 or args.slot_sectors > MAX_SLOT_SECTORS:
         raise SystemExit(f"--slot-sectors must be 0..{MAX_SLOT_SECTORS}")
+    if args.keyframe_interval < 0:
+        raise SystemExit("--keyframe-interval must be 0 or greater")
+    if args.target_fps is not None and args.target_fps <= 0:
+        raise SystemExit("--target-fps must be greater than 0")
+    if args.clock_hz <= 0 or args.sd_sector_cycles < 0:
+        raise SystemExit("--clock-hz must be positive and --sd-sector-cycles must not be negative")
+    if args.pace and args.target_fps is None:
+        raise SystemExit("--pace needs --target-fps")
+    if args.pace and args.read_ahead:
+        raise SystemExit("--pace already counts the SD read toward each frame's hold time; drop --read-ahead")
+    if args.pace and pace_unit(args) > 255:
+        raise SystemExit(f"--target-fps {args.target_fps} is too slow to pace at {args.clock_hz} Hz")
+    if args.read_ahead and not (args.delay_calls <= 255 and read_ahead_sector_waits(args) <= 255):
+        raise SystemExit("--read-ahead needs --delay-calls up to 255 and at most 255 delay calls per SD sector")
+
+    if args.write_chunk_kib < 1 or args.write_retries < 0:
+        raise SystemExit("--write-chunk-kib must be 1 or greater and --write-retries must not be negative")
+
+    if args.library:
+        if len(args.inputs) > LIBRARY_MAX_CLIPS:
+            raise SystemExit(f"A library holds at most {LIBRARY_MAX_CLIPS} clips")
+        if not 1 <= args.clip_loops <= 255:
+            raise SystemExit("--clip-loops must be 1..255")
+        if not 0 <= args.start_clip < len(args.inputs):
+            raise SystemExit(f"--start-clip must be 0..{len(args.inputs) - 1}")
+        if args.jobs < 0:
+            raise SystemExit("--jobs must be 0 or greater")
 
     args.out_dir.mkdir(parents=True, exist_ok=True)
     video_bin = args.video_bin or (args.out_dir / "video_delta_frames.bin")
     manifest = args.manifest or (args.out_dir / "video_delta_manifest.txt")
 
-    source_frames = load_frames(args.input)
-    chosen = select_frames(source_frames, args.frame_step, args.max_frames)
-    if not chosen:
-        raise SystemExit("No frames selected")
+    if args.library:
+        library_main(args, video_bin, manifest)
+        return
 
-    encoded_frames: List[bytes] = []
-    infos: List[FrameInfo] = []
-    previous = bytes(GROUPED_COLS * SAFE_HEIGHT)
-
-    for out_index, (source_index, frame) in enumerate(chosen):
-        nibbles = quantize_frame(frame, args)
-        packed = pack_frame(nibbles)
-        runs = frame_delta_runs(packed, previous)
-        encoded = encode_runs(runs)
-        encoded_frames.append(encoded)
-        changed = sum(len(run.data) for run in runs)
-        lit_pixels = sum(1 for value in nibbles if value)
-        infos.append(FrameInfo(out_index, source_index, len(runs), len(encoded), changed, lit_pixels))
-        previous = packed
+    encoded_frames, infos = encode_clip_file(args)
 
+    payload, frame_index, slot_sectors, resume_block = build_payload(args, encoded_frames)
     max_frame_bytes = max(len(frame) for frame in encoded_frames)
-    if args.slot_sectors == 0:
-        slot_sectors = max(1, math.ceil(max_frame_bytes / SECTOR_SIZE))
-    else:
-        slot_sectors = args.slot_sectors
-
-    if slot_sectors > MAX_SLOT_SECTORS:
-        raise SystemExit(
-            f"Largest encoded frame needs {math.ceil(max_frame_bytes / SECTOR_SIZE)} sectors; max supported is {MAX_SLOT_SECTORS}. "
-            "Use a higher threshold, larger frame step, fewer frames, or more inset."
-        )
-
-    slot_bytes = slot_sectors * SECTOR_SIZE
-    too_large = [(i, len(frame)) for i, frame in enumerate(encoded_frames) if len(frame) > slot_bytes]
-    if too_large:
-        index, size = too_large[0]
-        raise SystemExit(
-            f"Frame {index} needs {size} bytes, but --slot-sectors {slot_sectors} gives {slot_bytes} bytes. "
-            "Use more slot sectors or reduce frame complexity."
-        )
-
-    payload = bytearray()
-    for frame in encoded_frames:
-        payload.extend(frame)
-        payload.extend(bytes(slot_bytes - len(frame)))
+    block_count = len(payload) // SECTOR_SIZE
+    check_layout_fit(args, block_count)
 
     video_bin.parent.mkdir(parents=True, exist_ok=True)
     video_bin.write_bytes(bytes(payload))
 
     args.out_asm.parent.mkdir(parents=True, exist_ok=True)
-    args.out_asm.write_text(make_player_asm(args, len(infos), slot_sectors), encoding="utf-8")
+    args.out_asm.write_text(
+        make_player_asm(args, len(infos), slot_sectors, block_count, resume_block),
+        encoding="utf-8",
+    )
 
     manifest.parent.mkdir(parents=True, exist_ok=True)
-    write_manifest(manifest, args, infos, bytes(payload), slot_sectors)
+    write_manifest(manifest, args, infos, bytes(payload), slot_sectors, frame_index)
 
-    block_count = len(payload) // SECTOR_SIZE
     print(f"Wrote delta video binary: {video_bin}")
     print(f"Wrote delta player ASM:   {args.out_asm}")
     print(f"Wrote manifest:           {manifest}")
-    print(f"Frames: {len(infos)}")
+    print(f"Frames: {len(infos) - 1} + loop frame")
     print(f"Mode: {conversion_mode(args)}")
     if conversion_mode(args) == "threshold":
         print(f"Threshold: {effective_threshold(args)}")
     else:
         print(f"Gray levels: {args.gray_levels}")
-    print(f"Slot sectors: {slot_sectors}")
+    print(f"Dither: {args.dither}")
+    if args.hysteresis:
+        print(
+            f"Hysteresis: {args.hysteresis}, changed bytes "
+            f"{sum(item.changed_hysteresis for item in infos[:-1])} "
+            f"(without: {sum(item.changed_plain for item in infos[:-1])})"
+        )
+    print(f"Layout: {args.layout}")
+    if frame_index is not None:
+        frame_sectors = sum(value & INDEX_SECTOR_MASK for value in frame_index)
+        print(f"Frame sectors per loop: {frame_sectors} (slot layout: {len(infos) * slot_sectors})")
+    else:
+        print(f"Slot sectors: {slot_sectors}")
     print(f"Total video sectors: {block_count}")
     print(f"Video start block: {args.video_block}")
     print(f"Largest encoded frame: {max_frame_bytes} bytes")
     print(f"Max runs per frame: {max(item.run_count for item in infos)}")
+    print(f"Keyframes: {sum(1 for item in infos if item.kind in ('key', 'loop-key'))}")
+    print(f"Run codecs: {','.join(args.run_codecs)} ({sum(item.fill_runs for item in infos)} fill, {sum(item.copy_runs for item in infos)} copy)")
+    if args.target_fps is not None:
+        print(f"Rate control: {args.target_fps} fps target, {sum(item.dropped_runs for item in infos)} runs dropped")
+
+    if args.device:
+        write_video_to_device(args, bytes(payload))
+
+
+def write_video_to_device(args: argparse.Namespace, payload: bytes) -> None:
+    block_count = len(payload) // SECTOR_SIZE
+    journal = args.write_journal or (args.out_dir / "video_delta_write.journal")
+    started = time.perf_counter()
+    with lock_windows_volume(args.windows_lock_volume):
+        written = write_blocks_chunked(
+            args.device,
+            args.video_block,
+            payload,
+            args.write_chunk_kib * 1024,
+            journal,
+            args.write_retries,
+        )
+    elapsed = time.perf_counter() - started
+    print(f"Wrote {block_count} video sectors to {args.device} at block {args.video_block} ({written} chunks in {elapsed:.2f}s)")
+    print("Video readback matches: yes")
+    print("Video first 16 bytes: " + " ".join(f"{b:02X}" for b in payload[:16]))
+    print("Video last 16 bytes:  " + " ".join(f"{b:02X}" for b in payload[-16:]))
+
+
+def library_main(args: argparse.Namespace, video_bin: Path, manifest: Path) -> None:
+    payload, clips = build_library(args)
+    block_count = len(payload) // SECTOR_SIZE
+    check_layout_fit(args, block_count)
+
+    video_bin.parent.mkdir(parents=True, exist_ok=True)
+    video_bin.write_bytes(bytes(payload))
+
+    args.out_asm.parent.mkdir(parents=True, exist_ok=True)
+    args.out_asm.write_text(
+        make_player_asm(args, max(len(clip.infos) for clip in clips), 0, block_count, library=True),
+        encoding="utf-8",
+    )
+
+    manifest.parent.mkdir(parents=True, exist_ok=True)
+    clip_manifests = [manifest.with_name(f"{manifest.stem}_{clip.name}{manifest.suffix}") for clip in clips]
+    for clip, clip_manifest in zip(clips, clip_manifests):
+        write_manifest(clip_manifest, clip.args, clip.infos, clip.payload, clip.slot_sectors, clip.frame_index)
+    write_library_manifest(manifest, args, clips, bytes(payload), clip_manifests)
+
+    print(f"Wrote video library binary: {video_bin}")
+    print(f"Wrote library player ASM:   {args.out_asm}")
+    print(f"Wrote library manifest:     {manifest}")
+    print(f"Directory block: {args.video_block}")
+    for number, clip in enumerate(clips):
+        print(
+            f"Clip {number:02d} {clip.name:{LIBRARY_NAME_SIZE}s} block {clip.args.video_block}, "
+            f"{len(clip.infos) - 1} frames, {len(clip.payload) // SECTOR_SIZE} sectors"
+        )
+    print(f"Total video sectors: {block_count}")
 
     if args.device:
-        with lock_windows_volume(args.windows_lock_volume):
-            write_blocks_to_device(args.device, args.video_block, bytes(payload))
-            readback = read_blocks_from_device(args.device, args.video_block, block_count)
-        print(f"Wrote {block_count} video sectors to {args.device} at block {args.video_block}")
-        print(f"Video readback matches: {'yes' if readback == bytes(payload) else 'no'}")
-        print("Video first 16 bytes: " + " ".join(f"{b:02X}" for b in payload[:16]))
-        print("Video last 16 bytes:  " + " ".join(f"{b:02X}" for b in payload[-16:]))
+        write_video_to_device(args, bytes(payload))
 
 
 if __name__ == "__main__":